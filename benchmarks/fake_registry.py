@@ -0,0 +1,135 @@
+"""A fake OCI registry that runs in-process (on a background thread).
+
+It implements just enough of the OCI distribution API for `OCIRegistryClient.push_chart` (blobs are only remembered by digest, nothing is checked).
+Every request is recorded, so what the client actually sent can be checked (Ex. that blobs the registry already has aren't uploaded again).
+
+Optionally the registry requires a bearer token (from it's own `/token` service, given the right basic credentials),
+delays every request, fails a share of the manifest pushes (with a 503) or answers them with a fixed status (Ex. a 400 for an invalid manifest).
+"""
+
+import base64, hashlib, json, random, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class FakeRegistryHandler (BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format: str, *args):
+        pass
+
+    def respond(self, status: int, headers: dict[str, str] | None = None, body: bytes = b''):
+        time.sleep(self.server.latency)
+
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def read_body(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+    def authorized(self) -> bool:
+        """Check the request's token (if the registry requires one), responding with a challenge if it's missing or wrong.
+
+        Returns:
+            bool: If the request can go ahead
+        """
+
+        with self.server.lock:
+            self.server.requests.append((self.command, self.path))
+
+        if self.server.token is None or self.headers.get('Authorization') == f'Bearer {self.server.token}':
+            return True
+
+        host = f'127.0.0.1:{self.server.server_address[1]}'
+        self.respond(401, { 'WWW-Authenticate': f'Bearer realm="http://{host}/token",service="{host}"' })
+        return False
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.requests.append((self.command, self.path))
+
+        if not self.path.startswith('/token'):
+            self.respond(404)
+            return
+
+        credentials = 'Basic ' + base64.b64encode(f'{self.server.username}:{self.server.password}'.encode('utf-8')).decode('ascii')
+        if self.headers.get('Authorization') != credentials:
+            self.respond(401, body=b'invalid credentials')
+            return
+
+        self.respond(200, { 'Content-Type': 'application/json' }, json.dumps({ 'token': self.server.token }).encode('utf-8'))
+
+    def do_HEAD(self):
+        if not self.authorized():
+            return
+
+        digest = self.path.rsplit('/', 1)[-1]
+        self.respond(200 if digest in self.server.blobs else 404)
+
+    def do_POST(self):
+        self.read_body()
+        if not self.authorized():
+            return
+
+        self.respond(202, { 'Location': self.path + 'upload' })
+
+    def do_PUT(self):
+        self.read_body()
+        if not self.authorized():
+            return
+
+        if '/manifests/' in self.path:
+            with self.server.lock:
+                self.server.manifests += 1
+                fail = self.server.random.random() < self.server.failure_rate
+
+            if self.server.manifest_status is not None:
+                self.respond(self.server.manifest_status, body=b'manifest rejected')
+            elif fail:
+                self.respond(503)
+            else:
+                self.respond(201, { 'Docker-Content-Digest': 'sha256:' + hashlib.sha256(self.path.encode('utf-8')).hexdigest() })
+            return
+
+        digest = self.path.split('digest=')[-1].replace('%3A', ':')
+        with self.server.lock:
+            self.server.blobs.add(digest)
+        self.respond(201)
+
+def start_fake_registry(latency: float = 0.0, failure_rate: float = 0.0, token: str | None = None, username: str = 'user', password: str = 'password', manifest_status: int | None = None) -> ThreadingHTTPServer:
+    """Start the fake registry on a free local port (on a background thread).
+
+    Args:
+        latency (float, Optional): How long (in seconds) every request takes. Default 0.0
+        failure_rate (float, Optional): The share of manifest pushes that fail (with a 503). Default 0.0
+        token (str, Optional): The bearer token every request needs (given out by `/token` for the `username` and `password`). Default None (no authentication)
+        username (str, Optional): The username the token service accepts. Default 'user'
+        password (str, Optional): The password the token service accepts. Default 'password'
+        manifest_status (int, Optional): The status every manifest push is answered with. Default None (201, or a 503 based on the `failure_rate`)
+
+    Returns:
+        ThreadingHTTPServer: The fake registry (`requests` has the method and path of every request, `blobs` the digests of the uploaded blobs)
+    """
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeRegistryHandler)
+    server.daemon_threads = True
+    server.request_queue_size = 128
+    server.latency = latency
+    server.failure_rate = failure_rate
+    server.token = token
+    server.username = username
+    server.password = password
+    server.manifest_status = manifest_status
+    server.random = random.Random(0)
+    server.lock = threading.Lock()
+    server.requests = []
+    server.blobs = set()
+    server.manifests = 0
+
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    return server
@@ -0,0 +1,86 @@
+"""Check the start up (import) time of the generator.
+
+The CLI is imported in a fresh interpreter (with `-X importtime`) several times and the fastest run is reported.
+It also checks that none of the components (templates) or optional modules (pools, packager, registry client, etc.) are imported at start up.
+Those should only be loaded once a chart actually needs them.
+
+Usage:
+    python benchmarks/import_time.py [--runs 10] [--budget 80]
+"""
+
+import argparse, os, re, subprocess, sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+sys.path.insert(0, ROOT)
+
+from src.Components import COMPONENTS
+
+# Modules that should never be imported just to start the generator
+LAZY_MODULES = [f'src.{kind}' for kind in COMPONENTS] + [
+    'src.Batch',
+    'src.ChartPackager',
+    'src.OCIRegistryClient',
+    'src.RenderCache',
+    'concurrent.futures',
+    'http.client',
+    'subprocess'
+]
+
+# Ex. `import time:       420 |       5859 |       src.Template`
+IMPORT_TIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$')
+
+def measure() -> tuple[float, set[str]]:
+    """Import the CLI in a fresh interpreter.
+
+    Returns:
+        tuple[float, set[str]]: The cumulative import time of the CLI (in ms) and the names of every module that was imported
+    """
+
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import src.CLI'], cwd=ROOT, capture_output=True, text=True, check=True)
+
+    total = 0.0
+    modules = set()
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match is None:
+            continue
+
+        modules.add(match.group(4))
+
+        # Only the top level imports (no indentation) are counted, the rest are already part of their cumulative time
+        if len(match.group(3)) == 1:
+            total += int(match.group(2)) / 1000
+
+    return (total, modules)
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Check the start up (import) time of the generator')
+    parser.add_argument('--runs', type=int, default=10, help='The number of times to import the CLI (Default: 10)')
+    parser.add_argument('--budget', type=float, help='Fail if the fastest import takes longer than this (in ms)')
+    args = parser.parse_args()
+
+    timings = []
+    modules = set()
+    for _ in range(args.runs):
+        total, modules = measure()
+        timings.append(total)
+
+    timings.sort()
+    print(f'Import time: {timings[0]:.1f} ms (fastest), {timings[len(timings) // 2]:.1f} ms (median) over {args.runs} run(s)')
+
+    success = True
+
+    eager = sorted(module for module in LAZY_MODULES if module in modules)
+    if len(eager) > 0:
+        print(f'Imported at start up (should be lazy): {", ".join(eager)}')
+        success = False
+
+    if args.budget is not None and timings[0] > args.budget:
+        print(f'Over the budget of {args.budget:.1f} ms')
+        success = False
+
+    return 0 if success else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""Synthetic inputs (of any size) for the benchmarks.
+
+Everything that can be a list in an input is scaled: the extra environment variables, the NoSQL tables and the maintainers.
+The input format only knows about the OpenAI and Stripe third party services, so extra third party services are added to the chart directly (see `create_helm_chart`).
+"""
+
+import copy, json, os, sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+sys.path.insert(0, ROOT)
+
+from src.ChartBuilder import build_helm_chart
+from src.Components import load_component
+from src.HelmChart import HelmChart
+
+def create_input(size: int) -> dict:
+    """Create an input document with `size` extra environment variables, NoSQL tables and maintainers.
+
+    Args:
+        size (int): The number of entries of each list.
+
+    Returns:
+        dict: The input document
+    """
+
+    with open(os.path.join(ROOT, 'input.example.json'), 'r') as f:
+        data = copy.deepcopy(json.load(f))
+
+    data['chart']['name'] = f'benchmark-{size}'
+    data['chart']['maintainers'] = [{ 'name': f'Maintainer {i}', 'email': f'maintainer{i}@example.com' } for i in range(size)]
+    data['nosql']['tables'] = { f'TABLE_{i}': { 'name': f'table-{i}', 'value': f'table{i}' } for i in range(size) }
+    data['extraEnvVars'] = {}
+    for i in range(size):
+        # An even mix of the 3 kinds of extra environment variables
+        if i % 3 == 0:
+            data['extraEnvVars'][f'EXTRA_SECRET_{i}'] = { 'type': 'Secret', 'name': '{{ .Release.Name }}-extra-secret-' + str(i), 'key': 'value', 'description': f'Secret {i}', 'value': f'secret-{i}' }
+        elif i % 3 == 1:
+            data['extraEnvVars'][f'EXTRA_CONFIG_{i}'] = { 'type': 'ConfigMap', 'name': '{{ .Release.Name }}-extra-config-' + str(i), 'key': 'value', 'description': f'Config {i}', 'value': f'config-{i}' }
+        else:
+            data['extraEnvVars'][f'EXTRA_VALUE_{i}'] = f"'value-{i}'"
+
+    # Nothing should ever be pushed by a benchmark
+    data.pop('registry', None)
+
+    return data
+
+def create_helm_chart(size: int, root: str = '.') -> HelmChart:
+    """Create the Helm chart of a synthetic input, with `size` extra third party services (of 4 variables each) added.
+
+    Args:
+        size (int): The number of entries of each list (see `create_input`) and third party services.
+        root (str, Optional): The directory the Helm chart would be written into. Default '.'
+
+    Returns:
+        HelmChart: The Helm chart
+    """
+
+    chart = build_helm_chart(create_input(size), root)
+
+    ThirdPartyService = load_component('ThirdPartyService')
+    services = [ThirdPartyService(f'service{i}', i % 2 == 0, api_key=f'key-{i}', api_secret=f'secret-{i}', base_url=f'https://service{i}.example.com', region='ca-central-1') for i in range(size)]
+
+    # Re-created (rather than modified) so the components are indexed and wired up the same as any other chart
+    return HelmChart(chart.chartName, chart.chartDescription, chart.maintainers, chart.chartHomepage, chart.sources, chart.appVersion, chart.chartVersion, chart.apiVersion, *chart.templates, *services, root=root)
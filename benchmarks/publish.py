@@ -0,0 +1,80 @@
+"""Benchmark the publish queue (see `PublishQueue`) against a fake OCI registry.
+
+The fake registry (see `fake_registry.py`) runs in-process and implements just enough of the OCI distribution API for `OCIRegistryClient.push_chart`.
+Every request is delayed by `--latency` and a `--failure-rate` share of the manifest pushes fail (with a 503), so the retries are exercised.
+
+The same packaged chart is pushed `--charts` times (under different names), at each `--concurrency`, and the wall time, throughput and per-chart latency are printed.
+
+Usage:
+    python benchmarks/publish.py [--charts 200] [--concurrency 1 4 16] [--latency 0.01] [--failure-rate 0.1] [--rate-limit 100]
+"""
+
+import argparse, asyncio, functools, os, statistics, sys, time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from fake_registry import start_fake_registry
+from inputs import create_input
+
+from src.ChartBuilder import build_helm_chart
+from src.OCIRegistryClient import OCIRegistryClient
+from src.PublishQueue import PublishQueue
+
+async def publish(registry: str, archive: bytes, metadata: dict, charts: int, concurrency: int, retries: int, rate_limit: float | None) -> list:
+    """Push the same chart (under different names) with a publish queue.
+
+    Args:
+        registry (str): The registry to push to.
+        archive (bytes): The packaged chart.
+        metadata (dict): The metadata of the chart.
+        charts (int): How many charts to push.
+        concurrency (int): The concurrency of the publish queue.
+        retries (int): The retries of the publish queue.
+        rate_limit (float | None): The rate limit of the publish queue.
+
+    Returns:
+        list[PublishResult]: The outcome of each chart
+    """
+
+    queue = PublishQueue(concurrency, retries, backoff=0.01, rate_limit=rate_limit, client_factory=functools.partial(OCIRegistryClient, plain_http=True))
+
+    async with queue:
+        for i in range(charts):
+            queue.submit(f'chart-{i}', registry, f'chart-{i}', metadata['version'], archive, metadata)
+
+    return queue.results
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the publish queue against a fake OCI registry.')
+    parser.add_argument('--charts', type=int, default=200, help='How many charts to push (Default: 200)')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16], help='The concurrency levels to run (Default: 1 4 16)')
+    parser.add_argument('--latency', type=float, default=0.01, help='How long (in seconds) every request to the fake registry takes (Default: 0.01)')
+    parser.add_argument('--failure-rate', type=float, default=0.1, help='The share of manifest pushes that fail (Default: 0.1)')
+    parser.add_argument('--retries', type=int, default=3, help='How many times a failed push is retried (Default: 3)')
+    parser.add_argument('--rate-limit', type=float, help='The maximum number of pushes started per second (Default: no limit)')
+    args = parser.parse_args()
+
+    helmChart = build_helm_chart(create_input(10), '.')
+    helmChart.render()
+    archive = helmChart.create_archive()
+
+    server = start_fake_registry(args.latency, args.failure_rate)
+    registry = f'127.0.0.1:{server.server_address[1]}/charts'
+
+    print(f'{"concurrency":>11} {"wall (s)":>9} {"charts/s":>9} {"p50 (ms)":>9} {"p95 (ms)":>9} {"pushed":>7} {"failed":>7} {"retried":>8}')
+
+    for concurrency in args.concurrency:
+        start = time.perf_counter()
+        results = asyncio.run(publish(registry, archive, helmChart.get_chart_metadata(), args.charts, concurrency, args.retries, args.rate_limit))
+        wall = time.perf_counter() - start
+
+        latencies = sorted(result.latency * 1000 for result in results)
+        pushed = sum(1 for result in results if result.success)
+        retried = sum(1 for result in results if result.attempts > 1)
+
+        print(f'{concurrency:>11} {wall:>9.3f} {len(results) / wall:>9.1f} {statistics.median(latencies):>9.1f} {latencies[int(len(latencies) * 0.95) - 1]:>9.1f} {pushed:>7} {len(results) - pushed:>7} {retried:>8}')
+
+    server.shutdown()
+
+if __name__ == '__main__':
+    main()
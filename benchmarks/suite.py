@@ -0,0 +1,183 @@
+"""The benchmark suite of the generator.
+
+Each piece of chart generation is timed against synthetic inputs of growing size (see `inputs.py`):
+- `template:<kind>`: `Template.write()` of every template of that kind
+- `values:<section>`: each `create_..._section_of_values_yaml` of the `HelmChart`
+- `chart_yaml`: `HelmChart.write_yaml()`
+- `full`: the whole `create-helm-chart.py` flow (read the input, render, write to disk and package)
+
+Every case is run several times and the minimum, median and mean are saved (as JSON) so they can be used as a baseline.
+`compare` then flags any case whose median got slower than the baseline by more than a threshold.
+It can also hold the full flow to a per-chart latency budget.
+
+Usage:
+    python benchmarks/suite.py run [--sizes 10 100 1000 10000] [--repeat 5] [--output results.json]
+    python benchmarks/suite.py compare <baseline.json> <results.json> [--threshold 0.1] [--budget 500]
+"""
+
+import argparse, contextlib, io, json, os, platform, statistics, sys, tempfile, time
+
+from inputs import create_helm_chart, create_input
+
+from src.CLI import main as cli_main
+from src.VirtualFileTree import VirtualFileTree
+from src.Version import VERSION
+
+def time_call(function, repeat: int) -> dict[str, float]:
+    """Time a function.
+
+    Args:
+        function (Callable[[], Any]): The function to time.
+        repeat (int): The number of times to run the function.
+
+    Returns:
+        dict[str, float]: The `min`, `median` and `mean` time (in seconds) of the runs
+    """
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+
+    return { 'min': min(timings), 'median': statistics.median(timings), 'mean': statistics.mean(timings) }
+
+def write_templates(templates: list):
+    """Write templates into a fresh file tree.
+
+    Args:
+        templates (list[Template]): The templates to write.
+    """
+
+    files = VirtualFileTree()
+    for template in templates:
+        template.write(files)
+
+def run_full_flow(data: dict):
+    """Run the whole `create-helm-chart.py` flow (read the input, render, write to disk and package) in a temporary directory.
+
+    Args:
+        data (dict): The input document.
+    """
+
+    with tempfile.TemporaryDirectory() as directory:
+        input_file = os.path.join(directory, 'input.json')
+        with open(input_file, 'w') as f:
+            json.dump(data, f)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            cli_main(['--input', input_file, '--output', os.path.join(directory, 'chart')])
+
+def run_size(size: int, repeat: int) -> dict[str, dict[str, float]]:
+    """Run every benchmark for one input size.
+
+    Args:
+        size (int): The size of the synthetic input.
+        repeat (int): The number of times to run each benchmark.
+
+    Returns:
+        dict[str, dict[str, float]]: The timings of each benchmark (keyed by `<name>@<size>`)
+    """
+
+    results = {}
+
+    chart = create_helm_chart(size)
+
+    kinds = {}
+    for template in chart.templates:
+        kinds.setdefault(type(template).__name__, []).append(template)
+
+    for kind, templates in kinds.items():
+        results[f'template:{kind}@{size}'] = time_call(lambda: write_templates(templates), repeat)
+
+    for builder in chart.get_values_yaml_section_builders():
+        name = builder.__name__.removeprefix('create_').removesuffix('_section_of_values_yaml')
+        results[f'values:{name}@{size}'] = time_call(lambda: ''.join(builder()), repeat)
+
+    results[f'chart_yaml@{size}'] = time_call(chart.write_yaml, repeat)
+
+    data = create_input(size)
+    results[f'full@{size}'] = time_call(lambda: run_full_flow(data), repeat)
+
+    return results
+
+def run(args) -> int:
+    results = {}
+    for size in args.sizes:
+        print(f'Running size {size}...', file=sys.stderr)
+        results.update(run_size(size, args.repeat))
+
+    document = {
+        'generator': VERSION,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'results': results
+    }
+
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump(document, f, indent=2, sort_keys=True)
+
+    print(f'{"benchmark":<45} {"min (ms)":>10} {"median (ms)":>12}')
+    for name, timing in results.items():
+        print(f'{name:<45} {timing["min"] * 1000:>10.3f} {timing["median"] * 1000:>12.3f}')
+
+    return 0
+
+def compare(args) -> int:
+    with open(args.baseline, 'r') as f:
+        baseline = json.load(f)['results']
+
+    with open(args.results, 'r') as f:
+        results = json.load(f)['results']
+
+    failures = 0
+
+    print(f'{"benchmark":<45} {"baseline (ms)":>14} {"current (ms)":>13} {"change":>8}')
+    for name, timing in results.items():
+        if name not in baseline:
+            print(f'{name:<45} {"-":>14} {timing["median"] * 1000:>13.3f} {"new":>8}')
+            continue
+
+        change = timing['median'] / baseline[name]['median'] - 1 if baseline[name]['median'] > 0 else 0
+        flag = ''
+        if change > args.threshold:
+            flag = ' REGRESSION'
+            failures += 1
+
+        print(f'{name:<45} {baseline[name]["median"] * 1000:>14.3f} {timing["median"] * 1000:>13.3f} {change:>+8.1%}{flag}')
+
+    if args.budget is not None:
+        for name, timing in results.items():
+            if name.startswith('full@') and timing['median'] * 1000 > args.budget:
+                print(f'{name} took {timing["median"] * 1000:.1f} ms per chart (budget {args.budget:.1f} ms)')
+                failures += 1
+
+    if failures > 0:
+        print(f'{failures} benchmark(s) failed')
+        return 1
+
+    return 0
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='The benchmark suite of the generator')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='Run the benchmarks')
+    run_parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000, 10000], help='The sizes of the synthetic inputs (Default: 10 100 1000 10000)')
+    run_parser.add_argument('--repeat', type=int, default=5, help='The number of times to run each benchmark (Default: 5)')
+    run_parser.add_argument('--output', help='The file to save the results to (Ex. as a new baseline)')
+
+    compare_parser = commands.add_parser('compare', help='Compare results against a baseline')
+    compare_parser.add_argument('baseline', help='The baseline results')
+    compare_parser.add_argument('results', help='The results to check')
+    compare_parser.add_argument('--threshold', type=float, default=0.1, help='The slow down (of the median) that counts as a regression (Default: 0.1, 10%%)')
+    compare_parser.add_argument('--budget', type=float, help='The maximum time (in ms) the full flow may take per chart')
+
+    args = parser.parse_args()
+
+    return run(args) if args.command == 'run' else compare(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
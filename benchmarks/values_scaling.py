@@ -0,0 +1,90 @@
+"""Check how building the `values.yaml` file scales with the size of the input.
+
+For each size, a chart with that many NoSQL tables and extra environment variables is created.
+Its `values.yaml` sections are then streamed into a sink that only counts what's written.
+The time and the peak memory (tracemalloc) used while building are printed.
+
+Because the section builders stream line by line, time should grow linearly with the size.
+Peak memory should stay (roughly) flat, since nothing but the current line is held.
+
+Usage:
+    python benchmarks/values_scaling.py [--sizes 10 100 1000 10000 100000]
+"""
+
+import argparse, copy, json, os, sys, time, tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.ChartBuilder import build_helm_chart
+
+class CountingSink:
+    def __init__(self):
+        """A file like object that only counts the characters written to it."""
+
+        self.size = 0
+
+    def write(self, text: str):
+        self.size += len(text)
+
+    def writelines(self, lines):
+        for line in lines:
+            self.write(line)
+
+def create_input(size: int) -> dict:
+    """Create an input document with `size` NoSQL tables and `size` extra environment variables.
+
+    Args:
+        size (int): The number of tables (and environment variables).
+    
+    Returns:
+        dict: The input document
+    """
+
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'input.example.json'), 'r') as f:
+        data = copy.deepcopy(json.load(f))
+
+    data['chart']['name'] = f'values-scaling-{size}'
+    data['nosql']['tables'] = { f'TABLE_{i}': { 'name': f'table-{i}', 'value': f'table{i}' } for i in range(size) }
+    data['extraEnvVars'] = { f'EXTRA_VAR_{i}': { 'type': 'Secret', 'name': '{{ .Release.Name }}-extra-var-' + str(i), 'key': 'value', 'value': f'value-{i}' } for i in range(size) }
+
+    return data
+
+def measure(size: int) -> tuple[float, int, int]:
+    """Build the `values.yaml` sections of a chart with `size` tables/environment variables.
+
+    Args:
+        size (int): The number of tables (and environment variables).
+    
+    Returns:
+        tuple[float, int, int]: The time (in seconds), peak memory (in bytes) and size of the output (in characters)
+    """
+
+    helmChart = build_helm_chart(create_input(size), '.')
+
+    # Timed without tracing (tracemalloc slows every allocation down a lot)
+    sink = CountingSink()
+    start = time.perf_counter()
+    for builder in helmChart.get_values_yaml_section_builders():
+        sink.writelines(builder())
+    duration = time.perf_counter() - start
+
+    tracemalloc.start()
+    for builder in helmChart.get_values_yaml_section_builders():
+        CountingSink().writelines(builder())
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return (duration, peak, sink.size)
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure how building values.yaml scales with the size of the input.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000, 10000, 100000], help='The numbers of tables/environment variables to measure')
+    args = parser.parse_args()
+
+    print(f'{"size":>8} {"time (s)":>10} {"us/item":>10} {"peak (KiB)":>12} {"output (KiB)":>14}')
+    for size in args.sizes:
+        duration, peak, output_size = measure(size)
+        print(f'{size:>8} {duration:>10.4f} {duration / size * 1e6:>10.2f} {peak / 1024:>12.1f} {output_size / 1024:>14.1f}')
+
+if __name__ == '__main__':
+    main()
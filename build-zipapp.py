@@ -0,0 +1,101 @@
+"""Build a single file (zipapp) distribution of the generator.
+
+The archive only contains precompiled bytecode (no sources), so nothing has to be compiled the first time it's run.
+Because the components are loaded lazily (see `src/Components.py`) only the modules a chart actually uses are read from the archive.
+
+The result can be run directly (Ex. `./dist/create-helm-chart.pyz --input input.json`) or with `python3 dist/create-helm-chart.pyz`.
+Note, the bytecode is specific to the Python version used to build it, so the archive should be built with the same version it's run with.
+
+Usage:
+    python build-zipapp.py [--output dist/create-helm-chart.pyz] [--python "/usr/bin/env python3"]
+"""
+
+import argparse, importlib.util, marshal, os, stat, sys, zipfile
+
+# A fixed timestamp for every entry (so building the same sources twice results in the same archive)
+ZIP_TIMESTAMP = (1980, 1, 1, 0, 0, 0)
+
+MAIN = '''import sys
+
+from src.CLI import main
+
+sys.exit(main())
+'''
+
+def compile_source(source: str, filename: str) -> bytes:
+    """Compile a Python source file to the contents of a `.pyc` file.
+
+    The `.pyc` is "unchecked hash" based, so it's used as is and never compared against a (non-existent) source file.
+
+    Args:
+        source (str): The source code.
+        filename (str): The file name to use in tracebacks.
+
+    Returns:
+        bytes: The contents of the `.pyc` file
+    """
+
+    code = compile(source, filename, 'exec', dont_inherit=True, optimize=0)
+    source_hash = importlib.util.source_hash(source.encode('utf-8'))
+
+    # Magic number, flags (hash based and unchecked), source hash and the code itself
+    return importlib.util.MAGIC_NUMBER + (0b01).to_bytes(4, 'little') + source_hash + marshal.dumps(code)
+
+def add_file(archive: zipfile.ZipFile, name: str, data: bytes):
+    """Add a file to the archive (with a fixed timestamp and permissions).
+
+    Args:
+        archive (zipfile.ZipFile): The archive to add the file to.
+        name (str): The path of the file in the archive.
+        data (bytes): The contents of the file.
+    """
+
+    info = zipfile.ZipInfo(name, ZIP_TIMESTAMP)
+    info.compress_type = zipfile.ZIP_DEFLATED
+    info.external_attr = (stat.S_IFREG | 0o644) << 16
+
+    archive.writestr(info, data)
+
+def build(output: str, interpreter: str):
+    """Build the zipapp.
+
+    Args:
+        output (str): The path of the archive to create.
+        interpreter (str): The interpreter to put in the shebang line.
+    """
+
+    root = os.path.dirname(os.path.abspath(__file__))
+    src_dir = os.path.join(root, 'src')
+
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+
+    with open(output, 'wb') as f:
+        f.write(f'#!{interpreter}\n'.encode('utf-8'))
+
+        with zipfile.ZipFile(f, 'w') as archive:
+            add_file(archive, '__main__.pyc', compile_source(MAIN, '__main__.py'))
+
+            # Zip imports don't support namespace packages, so the (empty) package module is added explicitly
+            add_file(archive, 'src/__init__.pyc', compile_source('', 'src/__init__.py'))
+
+            for name in sorted(os.listdir(src_dir)):
+                if not name.endswith('.py'):
+                    continue
+
+                with open(os.path.join(src_dir, name), 'r') as source:
+                    add_file(archive, f'src/{name}c', compile_source(source.read(), f'src/{name}'))
+
+    os.chmod(output, 0o755)
+
+def main():
+    parser = argparse.ArgumentParser(description='Build a single file (zipapp) distribution of the generator')
+    parser.add_argument('--output', default=os.path.join('dist', 'create-helm-chart.pyz'), help='The archive to create (Default: dist/create-helm-chart.pyz)')
+    parser.add_argument('--python', default='/usr/bin/env python3', help='The interpreter to put in the shebang line (Default: /usr/bin/env python3)')
+    args = parser.parse_args()
+
+    build(args.output, args.python)
+
+    print(f'Built {args.output} (for Python {sys.version_info.major}.{sys.version_info.minor})')
+
+if __name__ == '__main__':
+    main()
@@ -9,4 +9,4 @@ else
 fi
 
 # Call the Python script with the arguments passed to the PowerShell script
-$python $(realpath ./create-helm-chart.py) $args
\ No newline at end of file
+$python $(realpath ./create-helm-chart.py) "$@"
\ No newline at end of file
@@ -1,4 +1,6 @@
 from .SecretsVault import SecretsVault
+from .VirtualFileTree import VirtualFileTree
+from .YAML import Directive
 
 class AzureKeyVault(SecretsVault):
     def __init__(self, name: str, client_id: str, client_secret: str, tenant_id: str):
@@ -9,17 +11,23 @@ class AzureKeyVault(SecretsVault):
         self.client_secret = client_secret
         self.tenant_id = tenant_id
     
-    def write(self):
-        with open('templates/vault-keyvault-secret.yaml', 'w') as f:
-            f.write('{{- if and (.Values.vault.enabled) (eq .Values.vault.type "azure") -}}' + '\n')
-            f.write('apiVersion: v1' + '\n')
-            f.write('kind: Secret' + '\n')
-            f.write('metadata:' + '\n')
-            f.write('  ' + 'name: {{ .Release.Name }}-vault-secret' + '\n')
-            f.write('type: opaque' + '\n')
-            f.write('data:' + '\n')
-            f.write('  ' + 'client-id: {{ .Values.vault.clientId | b64enc }}' + '\n')
-            f.write('  ' + 'client-secret: {{ .Values.vault.clientSecret | b64enc }}' + '\n')
-            f.write('  ' + 'name: {{ .Values.vault.vaultName | b64enc }}' + '\n')
-            f.write('  ' + 'tenant-id: {{ .Values.vault.tenantId | b64enc }}' + '\n')
-            f.write('{{- end -}}')
\ No newline at end of file
+    def get_config(self) -> dict:
+        """None of the attributes affect the rendered files (everything comes from the `values.yaml` file)."""
+
+        return {}
+    
+    def write(self, files: VirtualFileTree):
+        self.write_document(files, 'templates/vault-keyvault-secret.yaml', Directive('{{- if and (.Values.vault.enabled) (eq .Values.vault.type "azure") -}}'), {
+            'apiVersion': 'v1',
+            'kind': 'Secret',
+            'metadata': {
+                'name': '{{ .Release.Name }}-vault-secret'
+            },
+            'type': 'opaque',
+            'data': {
+                'client-id': '{{ .Values.vault.clientId | b64enc }}',
+                'client-secret': '{{ .Values.vault.clientSecret | b64enc }}',
+                'name': '{{ .Values.vault.vaultName | b64enc }}',
+                'tenant-id': '{{ .Values.vault.tenantId | b64enc }}'
+            }
+        }, Directive('{{- end -}}'))
@@ -1,4 +1,6 @@
 from .NoSQL import NoSQL
+from .VirtualFileTree import VirtualFileTree
+from .YAML import Directive
 
 class AzureTableStorage (NoSQL):
     def __init__(self, db_name: str, key: str, tables: dict[str, dict[str, str]]):
@@ -18,49 +20,38 @@ class AzureTableStorage (NoSQL):
         
         self.key = key
     
-    def write_config_map(self, filename: str = 'azure-tables-configmap.yaml'):
+    def write_config_map(self, files: VirtualFileTree, filename: str = 'azure-tables-configmap.yaml'):
         """Writes the configmap file for the Azure Table Storage
 
         This configmap contains non-sensitive information about the Azure Table Storage.
         Such as the name of the Azure Storage Account to connect to.
         
         Args:
+            files (VirtualFileTree): The in-memory file tree to write to.
             filename (str, optional): The name of the file to write to. Defaults to 'azure-tables-configmap.yaml'.
         """
 
-        with open(f'templates/{filename}', 'w') as f:
-            f.write('{{- if eq .Values.nosql.type "azure" -}}' + '\n')
-            f.write('apiVersion: v1' + '\n')
-            f.write('kind: ConfigMap' + '\n')
-            f.write('metadata:' + '\n')
-            f.write('  ' + 'name: {{ .Release.Name }}-azure-tables-config' + '\n')
-            f.write('data:' + '\n')
-            f.write('  ' + 'name: {{ .Values.nosql.name }}' + '\n')
-            f.write('{{- end -}}' + '\n')
+        self.write_document(files, f'templates/{filename}', Directive('{{- if eq .Values.nosql.type "azure" -}}'), self.create_data_object('ConfigMap', '{{ .Release.Name }}-azure-tables-config', {
+            'name': '{{ .Values.nosql.name }}'
+        }), Directive('{{- end -}}'))
     
-    def write_secret(self, filename: str = 'azure-tables-credentials-secret.yaml'):
+    def write_secret(self, files: VirtualFileTree, filename: str = 'azure-tables-credentials-secret.yaml'):
         """Writes the secret file for the Azure Table Storage
         
         This secret contains sensitive information about the Azure Table Storage.
         Such as the key to use to connect to the Azure Storage Account.
 
         Args:
+            files (VirtualFileTree): The in-memory file tree to write to.
             filename (str, optional): The name of the file to write to. Defaults to 'azure-tables-credentials-secret.yaml'.
         """
 
-        with open(f'templates/{filename}', 'w') as f:
-            f.write('{{- if eq .Values.nosql.type "azure" -}}' + '\n')
-            f.write('apiVersion: v1' + '\n')
-            f.write('kind: Secret' + '\n')
-            f.write('metadata:' + '\n')
-            f.write('  ' + 'name: {{ .Release.Name }}-azure-tables-credentials' + '\n')
-            f.write('type: Opaque' + '\n')
-            f.write('data:' + '\n')
-            f.write('  ' + 'key: {{ .Values.nosql.key | b64enc }}' + '\n')
-            f.write('{{- end -}}' + '\n')
+        self.write_document(files, f'templates/{filename}', Directive('{{- if eq .Values.nosql.type "azure" -}}'), self.create_data_object('Secret', '{{ .Release.Name }}-azure-tables-credentials', {
+            'key': '{{ .Values.nosql.key | b64enc }}'
+        }), Directive('{{- end -}}'))
     
-    def write(self):
+    def write(self, files: VirtualFileTree):
         """Writes the needed template files for the Azure Table Storage"""
         
-        self.write_config_map()
-        self.write_secret()
\ No newline at end of file
+        self.write_config_map(files)
+        self.write_secret(files)
\ No newline at end of file
@@ -0,0 +1,309 @@
+import asyncio, json, os, time
+from concurrent.futures import ProcessPoolExecutor
+
+from .ChartBuilder import build_helm_chart
+from .ChartRepository import ChartRepository
+from .InputSchema import validate_input
+from .Metrics import Metrics
+from .OCIRegistryClient import OCIRegistryClient
+from .PackageCache import PackageCache
+from .PublishQueue import PublishQueue, PublishResult
+from .RenderCache import RenderCache
+
+# The registry client of the (worker) process, shared by every chart the process pushes so connections are reused
+registry_client: OCIRegistryClient | None = None
+
+# The render cache of the (worker) process, shared by every chart the process generates so common templates are only rendered once
+render_cache: RenderCache | None = None
+
+# The package cache of the (worker) process (the packages themselves are shared through the cache's directory)
+package_cache: PackageCache | None = None
+
+class ChartResult:
+    def __init__(self, name: str, root: str, success: bool, error: str | None = None, duration: float = 0.0, metrics: dict | None = None, cached: bool = False, package: str | None = None, registry: str | None = None, chart: dict | None = None):
+        """The outcome of generating a single chart as part of a batch.
+
+        Args:
+            name (str): The name used to identify the chart within the batch.
+            root (str): The directory the chart was generated into.
+            success (bool): If the chart was generated successfully.
+            error (str, Optional): The error message if generating the chart failed. Default None
+            duration (float, Optional): How long (in seconds) generating the chart took. Default 0.0
+            metrics (dict, Optional): The timings and counters of generating the chart (see `Metrics.to_dict`). Default None (not collected)
+            cached (bool, Optional): If the chart was restored from the package cache (rather than rendered and packaged). Default False
+            package (str, Optional): The path of the packaged chart, if it was packaged. Default None
+            registry (str, Optional): The registry to push the packaged chart to, if it still needs to be pushed (see `run_batch`'s `publish_queue`). Default None
+            chart (dict, Optional): The metadata of the chart (the contents of `Chart.yaml`), if it was packaged. Default None
+        """
+
+        self.name = name
+        self.root = root
+        self.success = success
+        self.error = error
+        self.duration = duration
+        self.metrics = metrics
+        self.cached = cached
+        self.package = package
+        self.registry = registry
+        self.chart = chart
+
+        # The outcome of pushing the chart (if it was pushed by a `PublishQueue`)
+        self.publish: PublishResult | None = None
+
+def load_batch_inputs(source: str) -> list[tuple[str, dict | None, str | None]]:
+    """Load the input documents of a batch.
+
+    The source can either be:
+    - A directory, in which case every `.json` file in it is an input document (named after the file)
+    - A JSONL file, in which case every (non-blank) line is an input document (named after the chart)
+
+    Args:
+        source (str): The directory or JSONL file to load the input documents from.
+    
+    Every input document is checked against the schema of the input format (see `validate_input`) as it's loaded.
+    So invalid documents are rejected before any chart is rendered (or anything is written).
+
+    Returns:
+        list[tuple[str, dict | None, str | None]]: The name, input document and error (if the document couldn't be parsed or isn't valid) of each chart in the batch
+    """
+
+    inputs = []
+
+    if os.path.isdir(source):
+        for filename in sorted(os.listdir(source)):
+            if not filename.endswith('.json'):
+                continue
+            
+            name = filename[:-len('.json')]
+            try:
+                with open(os.path.join(source, filename), 'r') as f:
+                    inputs.append((name, json.load(f), None))
+            except ValueError as e:
+                inputs.append((name, None, f'Invalid JSON: {e}'))
+                continue
+            
+            problems = validate_input(inputs[-1][1])
+            if len(problems) > 0:
+                inputs[-1] = (name, None, f'Invalid input ({len(problems)} problem(s)): ' + '; '.join(problems))
+    else:
+        names = set()
+        with open(source, 'r') as f:
+            for line_number, line in enumerate(f, start=1):
+                if line.strip() == '':
+                    continue
+                
+                try:
+                    data = json.loads(line)
+                except ValueError as e:
+                    inputs.append((f'line-{line_number}', None, f'Invalid JSON on line {line_number}: {e}'))
+                    continue
+
+                problems = validate_input(data)
+                if len(problems) > 0:
+                    inputs.append((f'line-{line_number}', None, f'Invalid input on line {line_number} ({len(problems)} problem(s)): ' + '; '.join(problems)))
+                    continue
+
+                name = data['chart']['name']
+                
+                # Because each chart is generated into a directory named after it, two charts can't share a name
+                if name in names:
+                    inputs.append((f'{name}-line-{line_number}', None, f'Duplicate chart name "{name}" on line {line_number}'))
+                    continue
+                
+                names.add(name)
+                inputs.append((name, data, None))
+
+    return inputs
+
+def generate_chart(name: str, data: dict, root: str, package: bool = True, incremental: bool = False, plain_http: bool = False, render_cache_dir: str | None = None, collect_metrics: bool = False, validate: bool = False, manifest_layout: str | None = None, package_cache_dir: str | None = None, package_cache_size: int = 1024 * 1024 * 1024, push: bool = True) -> ChartResult:
+    """Generate (and optionally package and push) a single chart of a batch.
+
+    This is a module level function so it can be run on a process pool.
+    Any error is captured in the result rather than raised so that one bad chart doesn't stop the rest of the batch.
+
+    Args:
+        name (str): The name used to identify the chart within the batch.
+        data (dict): The input document of the chart.
+        root (str): The directory to generate the chart into.
+        package (bool, Optional): If the chart should be packaged (and pushed if the input document includes a `registry`). Default True
+        incremental (bool, Optional): If only the files whose content changed should be written (see `HelmChart.flush`). Default False
+        plain_http (bool, Optional): Push to the registry over HTTP instead of HTTPS. Default False
+        render_cache_dir (str, Optional): The directory of the on-disk render cache (shared between the processes and runs). Default None (in memory only)
+        collect_metrics (bool, Optional): If the timings and counters of generating the chart should be included in the result. Default False
+        validate (bool, Optional): Check the rendered templates (see `HelmChart.validate`) and fail the chart if there are any problems. Default False
+        manifest_layout (str, Optional): Combine the templates into multi-document files (see `HelmChart`). Default None (a file per template)
+        package_cache_dir (str, Optional): The directory of the package cache (see `PackageCache`), only used if `package`. Default None (no package cache)
+        package_cache_size (int, Optional): The maximum size (in bytes) of the package cache. Default 1 GiB
+        push (bool, Optional): Push the packaged chart (if the input document includes a `registry`), otherwise it's left in the result for the caller to push. Default True
+    
+    Returns:
+        ChartResult: The outcome of generating the chart
+    """
+
+    global registry_client, render_cache, package_cache
+
+    start = time.perf_counter()
+
+    if render_cache is None:
+        render_cache = RenderCache(directory=render_cache_dir)
+
+    if package and package_cache_dir is not None and package_cache is None:
+        package_cache = PackageCache(package_cache_dir, package_cache_size)
+
+    metrics = Metrics(name)
+    cached = False
+    packaged = {}
+
+    try:
+        with metrics.span('build'):
+            helmChart = build_helm_chart(data, root, cache=render_cache, metrics=metrics, manifest_layout=manifest_layout)
+        cached = package and package_cache is not None and helmChart.restore(package_cache)
+        if not cached:
+            helmChart.render()
+        helmChart.flush(incremental=incremental)
+
+        if validate:
+            with metrics.span('validate'):
+                problems = helmChart.validate()
+            
+            if len(problems) > 0:
+                raise Exception(f'{len(problems)} problem(s): ' + '; '.join(problems))
+
+        if package:
+            helmChart.package(cache=package_cache)
+
+            packaged = { 'package': helmChart.get_package_filename(), 'chart': helmChart.get_chart_metadata() }
+
+            if 'registry' in data and not push:
+                packaged['registry'] = data['registry']
+            elif 'registry' in data:
+                if registry_client is None:
+                    registry_client = OCIRegistryClient(plain_http=plain_http)
+                
+                helmChart.push(data['registry'], client=registry_client)
+    except Exception as e:
+        return ChartResult(name, root, False, f'{type(e).__name__}: {e}', time.perf_counter() - start, metrics.to_dict() if collect_metrics else None)
+    
+    return ChartResult(name, root, True, duration=time.perf_counter() - start, metrics=metrics.to_dict() if collect_metrics else None, cached=cached, **packaged)
+
+def run_batch(source: str, output_dir: str, max_workers: int | None = None, package: bool = True, incremental: bool = False, plain_http: bool = False, render_cache_dir: str | None = None, collect_metrics: bool = False, validate: bool = False, manifest_layout: str | None = None, package_cache_dir: str | None = None, package_cache_size: int = 1024 * 1024 * 1024, publish_queue: PublishQueue | None = None, repository: ChartRepository | None = None) -> list[ChartResult]:
+    """Generate every chart of a batch on a (bounded) process pool.
+
+    Each chart is generated into it's own directory (`<output_dir>/<name>`).
+
+    Args:
+        source (str): The directory or JSONL file to load the input documents from (see `load_batch_inputs`).
+        output_dir (str): The directory to generate the charts into.
+        max_workers (int, Optional): The maximum number of processes to use. Default None (the number of CPUs)
+        package (bool, Optional): If the charts should be packaged (and pushed). Default True
+        incremental (bool, Optional): If only the files whose content changed should be written. Default False
+        plain_http (bool, Optional): Push to the registry over HTTP instead of HTTPS. Default False
+        render_cache_dir (str, Optional): The directory of the on-disk render cache. Default None (each process only caches in memory)
+        collect_metrics (bool, Optional): If the timings and counters of generating each chart should be included in the results. Default False
+        validate (bool, Optional): Check the rendered templates of each chart and fail the chart if there are any problems. Default False
+        manifest_layout (str, Optional): Combine the templates of each chart into multi-document files (see `HelmChart`). Default None (a file per template)
+        package_cache_dir (str, Optional): The directory of the package cache shared by every process (see `PackageCache`). Default None (no package cache)
+        package_cache_size (int, Optional): The maximum size (in bytes) of the package cache. Default 1 GiB
+        publish_queue (PublishQueue, Optional): Push the packaged charts with a (not yet started) publish queue as they're produced, instead of from each process (see `generate_and_publish`). Default None
+        repository (ChartRepository, Optional): Add the packaged charts to a local chart repository (and update it's `index.yaml`) once the batch is done. Default None
+    
+    Returns:
+        list[ChartResult]: The outcome of each chart in the batch (in the order they were loaded)
+    """
+
+    results = []
+
+    jobs = [(name, os.path.join(output_dir, name), data, error) for name, data, error in load_batch_inputs(source)]
+    options = (package, incremental, plain_http, render_cache_dir, collect_metrics, validate, manifest_layout, package_cache_dir, package_cache_size, publish_queue is None)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        if publish_queue is not None:
+            results = asyncio.run(generate_and_publish(executor, jobs, options, publish_queue))
+
+        else:
+            # Either the (already known) result of an input that couldn't be loaded or the future of a chart being generated
+            pending = []
+            for name, root, data, error in jobs:
+                if error is not None:
+                    pending.append(ChartResult(name, root, False, error))
+                else:
+                    pending.append(executor.submit(generate_chart, name, data, root, *options))
+            
+            for item in pending:
+                results.append(item if isinstance(item, ChartResult) else item.result())
+    
+    if repository is not None:
+        # Only the charts that were just packaged are added (read and hashed), the rest of the index is reused as is
+        for result in results:
+            if result.success and result.package is not None:
+                repository.add(result.package, result.chart)
+        
+        repository.save()
+
+    return results
+
+async def generate_and_publish(executor: ProcessPoolExecutor, jobs: list[tuple[str, str, dict | None, str | None]], options: tuple, publish_queue: PublishQueue) -> list[ChartResult]:
+    """Generate the charts of a batch on a process pool and push each one with a publish queue as soon as it's packaged.
+
+    So pushing overlaps with generating the rest of the batch and the number of pushes at once (and their retries and rate) is controlled by the queue rather than the number of processes.
+
+    Args:
+        executor (ProcessPoolExecutor): The process pool to generate the charts on.
+        jobs (list[tuple[str, str, dict | None, str | None]]): The name, directory, input document and error (if it couldn't be loaded) of each chart.
+        options (tuple): The rest of the arguments of `generate_chart` (with `push` False).
+        publish_queue (PublishQueue): The (not yet started) publish queue.
+
+    Returns:
+        list[ChartResult]: The outcome of each chart in the batch (in the order of the jobs), including the outcome of pushing it (`publish`)
+    """
+
+    loop = asyncio.get_running_loop()
+
+    # Keyed by the index of the job, as names aren't unique (Ex. invalid JSON on line 2 is `line-2`, which is also a valid chart name)
+    results: dict[int, ChartResult] = {}
+    futures = []
+
+    async def generate(index: int, name: str, root: str, data: dict) -> tuple[int, ChartResult]:
+        return index, await loop.run_in_executor(executor, generate_chart, name, data, root, *options)
+
+    for index, (name, root, data, error) in enumerate(jobs):
+        if error is not None:
+            results[index] = ChartResult(name, root, False, error)
+        else:
+            futures.append(generate(index, name, root, data))
+
+    # The job of each chart submitted to the publish queue (by the index it was submitted as)
+    published: dict[int, int] = {}
+
+    async with publish_queue:
+        for future in asyncio.as_completed(futures):
+            index, result = await future
+            results[index] = result
+
+            if result.success and result.registry is not None:
+                with open(result.package, 'rb') as f:
+                    archive = f.read()
+
+                published[publish_queue.submit(result.name, result.registry, result.chart['name'], result.chart['version'], archive, result.chart)] = index
+
+    for publish in publish_queue.results:
+        results[published[publish.index]].publish = publish
+
+    return [results[index] for index in range(len(jobs))]
+
+def print_batch_summary(results: list[ChartResult]):
+    """Print the per-chart outcome of a batch followed by the totals.
+
+    Args:
+        results (list[ChartResult]): The outcome of each chart in the batch.
+    """
+
+    for result in results:
+        if result.success:
+            print(f'OK      {result.name} ({result.duration:.3f}s{", cached" if result.cached else ""}) -> {result.root}')
+        else:
+            print(f'FAILED  {result.name}: {result.error}')
+    
+    succeeded = sum(1 for result in results if result.success)
+    cached = sum(1 for result in results if result.cached)
+    print(f'{succeeded} succeeded' + (f' ({cached} from the package cache)' if cached > 0 else '') + f', {len(results) - succeeded} failed ({len(results)} total)')
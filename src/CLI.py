@@ -0,0 +1,262 @@
+import argparse, json, sys
+
+from .ChartBuilder import InputError, build_helm_chart
+from .Metrics import Metrics, export_metrics
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse the command line arguments of the generator.
+
+    Args:
+        argv (list[str], Optional): The arguments to parse. Default None (`sys.argv`)
+    
+    Returns:
+        argparse.Namespace: The parsed arguments
+    """
+
+    parser = argparse.ArgumentParser(prog='create-helm-chart', description='Create a Helm chart from an input file.')
+    parser.add_argument('--input', default='input.json', help='The input file to create the Helm chart from (Default: input.json)')
+    parser.add_argument('--output', default='.', help='The directory to create the Helm chart in (Default: the current directory)')
+    parser.add_argument('--incremental', action='store_true', help='Only rewrite files whose content changed (and remove files that are no longer generated)')
+    parser.add_argument('--no-package', action='store_true', help='Don\'t package (or push) the Helm chart(s)')
+    parser.add_argument('--use-helm', action='store_true', help='Package and push the Helm chart with `helm package`/`helm push` instead of the built-in packager and registry client')
+    parser.add_argument('--plain-http', action='store_true', help='Push to the registry over HTTP instead of HTTPS (Ex. for a local registry)')
+    parser.add_argument('--validate', action='store_true', help='Check the rendered templates (against the generated values.yaml) without helm and fail if there are any problems')
+    parser.add_argument('--verify-package', action='store_true', help='Check that helm accepts the packaged Helm chart (using `helm show chart`)')
+    parser.add_argument('--parallel', choices=['thread', 'process'], help='Render the templates and values.yaml sections of a chart concurrently')
+    parser.add_argument('--max-workers', type=int, help='The maximum number of workers used by --parallel')
+    parser.add_argument('--manifest-layout', choices=['single', 'component'], help='Combine the templates into multi-document files, either all of them in templates/all.yaml (single) or one file per component (component)')
+    parser.add_argument('--render-cache', metavar='DIR', help='Reuse rendered templates from (and store them in) an on-disk cache shared between runs')
+    parser.add_argument('--package-cache', metavar='DIR', help='Reuse packaged charts from (and store them in) a content-addressed cache shared between runs (and CI runners), unchanged charts aren\'t rendered or packaged again')
+    parser.add_argument('--package-cache-size', type=int, default=1024, metavar='MB', help='The maximum size of --package-cache before the least recently used packages are removed (Default: 1024)')
+    parser.add_argument('--repo-index', metavar='DIR', help='Add the packaged Helm chart(s) to a local (plain HTTP) chart repository and update it\'s index.yaml incrementally (only new or changed packages are read and hashed)')
+    parser.add_argument('--repo-url', metavar='URL', help='The URL --repo-index is served from, used for the URLs of the packages in index.yaml (Default: relative URLs)')
+    parser.add_argument('--batch', metavar='SOURCE', help='Create a Helm chart for every input in a directory of input files or a JSONL file (one input per line)')
+    parser.add_argument('--output-dir', default='charts', help='The directory each chart of a batch is created in (Default: charts)')
+    parser.add_argument('--workers', type=int, help='The maximum number of processes used for a batch (Default: the number of CPUs)')
+    parser.add_argument('--publish-concurrency', type=int, metavar='N', help='Push the charts of a batch from an asynchronous queue as they\'re packaged, at most N at once (Default: each process pushes it\'s own charts)')
+    parser.add_argument('--publish-retries', type=int, default=3, help='How many times a failed push is retried (with exponential backoff) by --publish-concurrency (Default: 3)')
+    parser.add_argument('--publish-rate-limit', type=float, metavar='PER_SECOND', help='The maximum number of pushes started per second to each registry by --publish-concurrency (Default: no limit)')
+    parser.add_argument('--watch', action='store_true', help='Keep running and regenerate the Helm chart every time the input file is saved (only changed files are rewritten)')
+    parser.add_argument('--watch-interval', type=float, default=0.2, help='How often (in seconds) --watch checks the input file (Default: 0.2)')
+    parser.add_argument('--lint', action='store_true', help='Check the Helm chart with `helm lint` after it\'s (re)generated with --watch')
+    parser.add_argument('--serve', metavar='ADDRESS', help='Run as a server (on <host>:<port> or unix:<path>) that renders/packages the input documents it\'s sent, keeping everything loaded between requests')
+    parser.add_argument('--metrics-out', metavar='FILE', help='Write the timings (per stage and per template) and counters of the run to a file')
+    parser.add_argument('--metrics-format', choices=['json', 'otel'], default='json', help='The format of --metrics-out, either plain JSON or OpenTelemetry (OTLP JSON) spans (Default: json)')
+    parser.add_argument('--profile', action='store_true', help='Profile the run (with cProfile and tracemalloc) and print the results')
+
+    return parser.parse_args(argv)
+
+def main(argv: list[str] | None = None) -> int:
+    """The entry point of the generator.
+
+    Args:
+        argv (list[str], Optional): The command line arguments. Default None (`sys.argv`)
+    
+    Returns:
+        int: The exit code
+    """
+
+    args = parse_args(argv)
+
+    if args.profile:
+        return profile(args)
+
+    return run(args)
+
+def profile(args: argparse.Namespace) -> int:
+    """Run the generator under cProfile and tracemalloc and print the slowest functions and the peak memory (to stderr).
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+    
+    Returns:
+        int: The exit code
+    """
+
+    import cProfile, pstats, tracemalloc
+
+    profiler = cProfile.Profile()
+
+    tracemalloc.start()
+    profiler.enable()
+    try:
+        return run(args)
+    finally:
+        profiler.disable()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        pstats.Stats(profiler, stream=sys.stderr).sort_stats('cumulative').print_stats(25)
+        print(f'Peak memory (tracemalloc): {peak / 1024:.1f} KiB', file=sys.stderr)
+
+def run(args: argparse.Namespace) -> int:
+    """Create the Helm chart(s) described by the arguments.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+    
+    Returns:
+        int: The exit code
+    """
+
+    # Everything that isn't needed by every run is imported only when it's used (to keep the start up time down)
+    if args.serve is not None:
+        from .RenderCache import RenderCache
+        from .Server import serve
+
+        try:
+            serve(args.serve, RenderCache(max_entries=4096, directory=args.render_cache))
+        except Exception as e:
+            # Ex. an invalid address or one that's already in use
+            print(f'Failed to start the server: {e}')
+            return 1
+
+        return 0
+
+    if args.watch:
+        from .RenderCache import RenderCache
+        from .Watch import watch
+
+        watch(args.input, args.output, args.watch_interval, args.lint, RenderCache(directory=args.render_cache), args.manifest_layout)
+
+        return 0
+
+    if args.batch is not None:
+        from .Batch import run_batch, print_batch_summary
+
+        publish_queue = None
+        if args.publish_concurrency is not None:
+            import functools
+            from .OCIRegistryClient import OCIRegistryClient
+            from .PublishQueue import PublishQueue
+
+            publish_queue = PublishQueue(args.publish_concurrency, args.publish_retries, rate_limit=args.publish_rate_limit, client_factory=functools.partial(OCIRegistryClient, plain_http=args.plain_http))
+
+        repository = None
+        if args.repo_index is not None and not args.no_package:
+            from .ChartRepository import ChartRepository
+
+            repository = ChartRepository(args.repo_index, args.repo_url)
+
+        results = run_batch(args.batch, args.output_dir, args.workers, not args.no_package, args.incremental, args.plain_http, args.render_cache, args.metrics_out is not None, args.validate, args.manifest_layout, args.package_cache, args.package_cache_size * 1024 * 1024, publish_queue, repository)
+        print_batch_summary(results)
+
+        published = [result.publish for result in results if result.publish is not None]
+        if publish_queue is not None:
+            from .PublishQueue import print_publish_summary
+
+            print_publish_summary(published)
+
+        if args.metrics_out is not None:
+            export_metrics(args.metrics_out, [result.metrics for result in results if result.metrics is not None], args.metrics_format)
+        
+        return 0 if all(result.success for result in results) and all(result.success for result in published) else 1
+
+    metrics = Metrics()
+
+    try:
+        return create_chart(args, metrics)
+    finally:
+        if args.metrics_out is not None:
+            export_metrics(args.metrics_out, [metrics.to_dict()], args.metrics_format)
+
+def create_chart(args: argparse.Namespace, metrics: Metrics) -> int:
+    """Create (and package and push) a single Helm chart.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+        metrics (Metrics): Where to record the timings and counters of creating the chart.
+    
+    Returns:
+        int: The exit code
+    """
+
+    with metrics.span('parse_input', input=args.input):
+        with open(args.input, 'r') as f:
+            data = json.load(f)
+
+        cache = None
+        if args.render_cache is not None:
+            from .RenderCache import RenderCache
+
+            cache = RenderCache(directory=args.render_cache)
+        
+        # Every problem with the input (including it's environments) is reported up front (before anything is written)
+        try:
+            helmChart = build_helm_chart(data, args.output, parallel=args.parallel, max_workers=args.max_workers, cache=cache, metrics=metrics, manifest_layout=args.manifest_layout)
+        except InputError as e:
+            print(f'The input file {args.input} has {len(e.problems)} problem(s):')
+            for problem in e.problems:
+                print(f'  {problem}')
+            
+            return 1
+
+        metrics.chart_name = helmChart.chartName
+
+    # The package cache only has packages made by the built-in packager
+    package_cache = None
+    if args.package_cache is not None and not args.no_package and not args.use_helm:
+        from .PackageCache import PackageCache
+
+        package_cache = PackageCache(args.package_cache, args.package_cache_size * 1024 * 1024)
+
+    if package_cache is not None and helmChart.restore(package_cache):
+        print(f'{helmChart.chartName} is unchanged, restored from the package cache')
+    else:
+        helmChart.render()
+    
+    changes = helmChart.flush(incremental=args.incremental)
+
+    if changes is not None:
+        print(f'{len(changes["written"])} file(s) written, {len(changes["deleted"])} file(s) removed, {len(changes["unchanged"])} file(s) unchanged')
+
+    if args.validate:
+        with metrics.span('validate') as span:
+            problems = helmChart.validate()
+            span.attributes['problems'] = len(problems)
+
+        if len(problems) > 0:
+            print(f'The Helm chart has {len(problems)} problem(s):')
+            for problem in problems:
+                print(f'  {problem}')
+            
+            return 1
+
+    if args.no_package:
+        return 0
+    
+    try:
+        helmChart.package(args.use_helm, cache=package_cache)
+
+        if args.verify_package:
+            helmChart.verify_package()
+
+        if args.repo_index is not None:
+            from .ChartRepository import ChartRepository
+
+            repository = ChartRepository(args.repo_index, args.repo_url)
+            repository.add(helmChart.get_package_filename(), helmChart.get_chart_metadata())
+            repository.save()
+            print(f'Added {helmChart.chartName} {helmChart.chartVersion} to {repository.directory}/index.yaml')
+
+        if 'registry' in data:
+            helm_registry = data['registry']
+            try:
+                from .OCIRegistryClient import OCIRegistryClient
+
+                with OCIRegistryClient(plain_http=args.plain_http) as client:
+                    reference = helmChart.push(helm_registry, args.use_helm, client)
+                if reference is not None:
+                    print(f'Pushed {reference}')
+            except Exception as ex:
+                print('Push to the registry failed. Please check the error message below:')
+                print(ex)
+
+                return 1
+    except Exception as e:
+        print('Packaging the Helm chart failed. Please check the error message below:')
+        print(e)
+
+        return 1
+    
+    return 0
@@ -0,0 +1,199 @@
+import re
+
+from .Components import load_component
+from .HelmChart import HelmChart
+from .InputSchema import join_path, validate_input
+from .ValuesOverlay import merge_values
+
+class InputError (Exception):
+    def __init__(self, problems: list[str]):
+        """The problems of an input document that mean a Helm chart can't be built from it (see `build_helm_chart`).
+
+        Args:
+            problems (list[str]): Every problem found (`<JSON path>: <problem>`).
+        """
+
+        super().__init__(f'The input document has {len(problems)} problem(s): ' + '; '.join(problems))
+
+        self.problems = problems
+
+def build_helm_chart(data: dict, root: str = '.', **options) -> HelmChart:
+    """Build a Helm chart (and all of it's templates) from an input document (the contents of an `input.json` file).
+
+    Nothing is rendered or written by this function, it only creates the `HelmChart` object.
+    The input document is checked (see `validate_input`) before anything else, so an invalid document never produces partial output.
+    As are it's environments, which can only change values (not the templates).
+
+    Args:
+        data (dict): The input document.
+        root (str, Optional): The directory the Helm chart will be written into. Default '.'
+        options (Any, Optional): Any other keyword arguments to pass to the `HelmChart` (Ex. `parallel`, `max_workers`).
+    
+    Returns:
+        HelmChart: The Helm chart described by the input document
+
+    Raises:
+        InputError: If the input document has any problems
+    """
+
+    problems = validate_input(data)
+    if len(problems) > 0:
+        raise InputError(problems)
+
+    # The API version of the Helm chart itself
+    api_version = data['chart']['apiVersion']
+    # The version of the application that the Helm chart is deploying
+    app_version = data['chart']['appVersion']
+    # A description of the Helm chart
+    chart_description = data['chart']['description']
+    # The URL of the Helm chart's home page
+    chart_homepage = data['chart']['homepage']
+    # The maintainers of the Helm chart
+    maintainers = data['chart']['maintainers']
+    # The name of the Helm chart
+    chart_name = data['chart']['name']
+    # The sources of the Helm chart
+    sources = data['chart']['sources']
+    # The version of the Helm chart
+    chart_version = data['chart']['version']
+
+    image_repository = data['image']['repository']
+    image_pull_policy = data['image']['pullPolicy']
+    
+    hostname = data['ingress']['hostname']
+
+    # Components are loaded (imported) as they're needed (see `load_component`)
+    ingress = load_component('Ingress')(hostname)
+    service = load_component('Service')()
+
+    templates = [ingress, service]
+
+    # Put the boilerplate every template repeats (labels and the Secret/ConfigMap skeletons) into named templates in a `_helpers.tpl` file
+    if data.get('helpers', False):
+        templates.insert(0, load_component('Helpers')(chart_name))
+
+    extra_env_vars = {}
+
+    if 'db' in data and data['db'] != False:
+        db_name = data['db']['name']
+        db_host = data['db']['host']
+        db_user = data['db']['user']
+        db_password = data['db']['password']
+
+        db = load_component('Database')(db_name, db_host, db_user, db_password)
+
+        templates.append(db)
+    
+    if 'vault' in data and data['vault'] != False:
+        vault_image = {
+            'repository': data['vault']['image']['repository'],
+            'tag': data['vault']['image']['tag']
+        }
+        vault_hostname = data['vault']['hostname']
+        vault_storage_class = data['vault']['storageClass']
+
+        vault = load_component('HashicorpVault')(image=vault_image, hostname=vault_hostname, storage_class=vault_storage_class)
+
+        templates.append(vault)
+    
+    if 'nosql' in data and data['nosql'] != False:
+        nosql_db_name = data['nosql']['dbName']
+        nosql_user = data['nosql']['user']
+        nosql_password = data['nosql']['password']
+
+        tables = data['nosql']['tables']
+
+        mongo = load_component('MongoDB')(nosql_db_name, nosql_user, nosql_password, tables)
+
+        templates.append(mongo)
+
+    if 'cache' in data and data['cache'] != False:
+        cache_password = data['cache']['password']
+
+        redis = load_component('Redis')(cache_password)
+
+        templates.append(redis)
+    
+    if 'oauth' in data and data['oauth'] != False:
+        base_app_url = data['oauth']['baseAppUrl']
+        app_abbreviation = data['oauth']['appAbbreviation']
+        app_name = data['oauth']['appName']
+        service_name = data['oauth']['serviceName']
+        dev_port = data['oauth']['devPort']
+
+        oauth = load_component('OAuth')(base_app_url, app_abbreviation, app_name, service_name, dev_port)
+
+        templates.append(oauth)
+    
+    if 'thirdPartyServices' in data:
+        if 'openai' in data['thirdPartyServices']:
+            openai_api_key = data['thirdPartyServices']['openai']['apiKey']
+
+            openai = load_component('ThirdPartyService')('openai', False, api_key=openai_api_key)
+
+            templates.append(openai)
+        
+        if 'stripe' in data['thirdPartyServices']:
+            stripe_public_key = data['thirdPartyServices']['stripe']['publicKey']
+            stripe_secret_key = data['thirdPartyServices']['stripe']['secretKey']
+            stripe_test_public_key = data['thirdPartyServices']['stripe']['testPublicKey']
+            stripe_test_secret_key = data['thirdPartyServices']['stripe']['testSecretKey']
+
+            stripe = load_component('ThirdPartyService')('stripe', True, public_key=stripe_public_key, secret_key=stripe_secret_key, test_public_key=stripe_test_public_key, test_secret_key=stripe_test_secret_key)
+
+            templates.append(stripe)
+
+    if 'extraEnvVars' in data:
+        # Copy so the input document isn't modified by the quote replacement below
+        extra_env_vars = dict(data['extraEnvVars'])
+        for key, value in extra_env_vars.items():
+            if not isinstance(value, dict) and value.find("'") != -1:
+                extra_env_vars[key] = value.replace("'", '"')
+            # The group is part of the name of it's Secret/ConfigMap
+            elif isinstance(value, dict) and 'group' in value and not re.match(r'^[a-z0-9]([a-z0-9-]*[a-z0-9])?$', value['group']):
+                problems.append(f'{join_path(join_path("$.extraEnvVars", key), "group")}: invalid group "{value["group"]}" (only lowercase letters, numbers and `-` are allowed)')
+
+    # Put the Secret/ConfigMap environment variables into one Secret/ConfigMap (per group) instead of one each
+    consolidate_env_vars = data.get('consolidateEnvVars', False)
+
+    # What the Deployment uses (database, vault, etc...) is wired up by the `HelmChart` based on the other templates
+    deployment = load_component('Deployment')(image_repository, image_pull_policy=image_pull_policy, consolidate_env_vars=consolidate_env_vars, **extra_env_vars)
+    templates.append(deployment)
+
+    environments = {}
+    if 'environments' in data:
+        base = { key: value for key, value in data.items() if key != 'environments' }
+
+        for name, overrides in data['environments'].items():
+            # The name of the environment is part of the name of it's values file
+            if not re.match(r'^[A-Za-z0-9][A-Za-z0-9_.-]*$', name):
+                problems.append(f'$.environments.{name}: invalid environment name (only letters, numbers, `.`, `_` and `-` are allowed)')
+                continue
+
+            # The `Chart.yaml` file is shared by every environment, so none of the chart's metadata (Ex. the version) can differ
+            chart_overrides = overrides.get('chart')
+            if isinstance(chart_overrides, dict):
+                for key, value in chart_overrides.items():
+                    if value != data['chart'].get(key):
+                        problems.append(f'{join_path(f"$.environments.{name}.chart", key)}: can\'t differ between environments (only values can, the Chart.yaml file is shared)')
+
+            # An environment is the input with it's overrides merged in (and any values that aren't part of the input)
+            environment_data = merge_values(base, { key: value for key, value in overrides.items() if key != 'values' })
+            try:
+                environments[name] = build_helm_chart(environment_data, root, values_overrides=overrides.get('values'))
+            except InputError as e:
+                # The paths are relative to the environment (Ex. `$.chart.name` is `$.environments.<name>.chart.name`)
+                problems.extend(f'$.environments.{name}{problem[1:]}' for problem in e.problems)
+
+    helmChart = HelmChart(chart_name, chart_description, maintainers, chart_homepage, sources, app_version, chart_version, api_version, *templates, root=root, environments=environments, **options)
+
+    # An environment can only change values, if it changed the templates they couldn't be shared (see `HelmChart.write_environment_values_yaml`)
+    template_keys = [template.config_key() for template in helmChart.templates]
+    for name, environment in environments.items():
+        if [template.config_key() for template in environment.templates] != template_keys:
+            problems.append(f'$.environments.{name}: changes the templates of the Helm chart (only values can differ between environments, Ex. not turning a section on or off)')
+
+    if len(problems) > 0:
+        raise InputError(problems)
+
+    return helmChart
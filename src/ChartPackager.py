@@ -0,0 +1,132 @@
+import fnmatch, gzip, io, os, tarfile
+
+from .VirtualFileTree import VirtualFileTree
+
+class ChartPackager:
+    def __init__(self, gzip_level: int = 9, mtime: int | None = None):
+        """A class for packaging a Helm chart (`.tgz`) straight from an in-memory file tree.
+
+        The archive is byte-for-byte reproducible: the entries are sorted, owned by root and given a fixed modification time.
+        The gzip header also doesn't include a timestamp or filename.
+
+        Args:
+            gzip_level (int, Optional): The gzip compression level (0-9). Default 9
+            mtime (int, Optional): The modification time to give every entry (and the gzip header). Default None (`SOURCE_DATE_EPOCH` if it's set, otherwise 0)
+        """
+
+        if mtime is None:
+            mtime = int(os.environ.get('SOURCE_DATE_EPOCH', 0))
+
+        self.gzip_level = gzip_level
+        self.mtime = mtime
+
+    @staticmethod
+    def parse_helmignore(content: str) -> list[str]:
+        """Get the patterns of a `.helmignore` file.
+
+        Args:
+            content (str): The contents of the `.helmignore` file.
+
+        Returns:
+            list[str]: The patterns (blank lines and comments removed)
+        """
+
+        return [line.strip() for line in content.splitlines() if line.strip() != '' and not line.strip().startswith('#')]
+
+    @staticmethod
+    def is_ignored(path: str, patterns: list[str]) -> bool:
+        """Check if a path is ignored by a set of `.helmignore` patterns.
+
+        This follows the same rules as Helm, a pattern without a slash matches the name of any file or directory in the path.
+        A pattern with a slash matches the path from the root of the chart.
+        A pattern ending in a slash only matches directories and a pattern starting with `!` negates an earlier match.
+
+        Args:
+            path (str): The path relative to the root of the chart (Ex. `templates/deployment.yaml`).
+            patterns (list[str]): The `.helmignore` patterns.
+
+        Returns:
+            bool: If the path should be left out of the package
+        """
+
+        parts = path.split('/')
+
+        ignored = False
+        for pattern in patterns:
+            negate = pattern.startswith('!')
+            if negate:
+                pattern = pattern[1:]
+
+            directory_only = pattern.endswith('/')
+            pattern = pattern.strip('/')
+
+            if '/' in pattern:
+                # Match against the path (or any parent directory of the path) from the root of the chart
+                candidates = ['/'.join(parts[:i]) for i in range(1, len(parts) + (0 if directory_only else 1))]
+            else:
+                # Match against the name of any directory in the path (or the file itself)
+                candidates = parts[:-1] if directory_only else parts
+
+            if any(fnmatch.fnmatchcase(candidate, pattern) for candidate in candidates):
+                ignored = not negate
+
+        return ignored
+
+    def package(self, files: VirtualFileTree, chart_name: str) -> bytes:
+        """Package the files of a Helm chart into a `.tgz` archive.
+
+        Like `helm package`, every file is put in a directory named after the chart and anything matched by the chart's `.helmignore` is left out.
+
+        Args:
+            files (VirtualFileTree): The rendered files of the Helm chart.
+            chart_name (str): The name of the Helm chart.
+
+        Returns:
+            bytes: The contents of the `.tgz` archive
+        """
+
+        patterns = self.parse_helmignore(files.read_file('.helmignore')) if '.helmignore' in files else []
+
+        output = io.BytesIO()
+        with gzip.GzipFile(filename='', mode='wb', fileobj=output, compresslevel=self.gzip_level, mtime=self.mtime) as compressed:
+            with tarfile.open(fileobj=compressed, mode='w', format=tarfile.PAX_FORMAT) as archive:
+                for path in files.paths():
+                    if self.is_ignored(path, patterns):
+                        continue
+
+                    data = files.read_file(path).encode('utf-8')
+
+                    info = tarfile.TarInfo(f'{chart_name}/{path}')
+                    info.size = len(data)
+                    info.mode = 0o644
+                    info.mtime = self.mtime
+                    info.uid = info.gid = 0
+                    info.uname = info.gname = ''
+
+                    archive.addfile(info, io.BytesIO(data))
+
+        return output.getvalue()
+
+    @staticmethod
+    def unpack(archive: bytes, chart_name: str) -> VirtualFileTree:
+        """Get the files of a packaged Helm chart (the reverse of `package`).
+
+        Args:
+            archive (bytes): The contents of the `.tgz` archive.
+            chart_name (str): The name of the Helm chart (the directory every file is in).
+
+        Returns:
+            VirtualFileTree: The files of the Helm chart (anything that was ignored when it was packaged isn't included)
+        """
+
+        files = VirtualFileTree()
+        prefix = f'{chart_name}/'
+
+        with tarfile.open(fileobj=io.BytesIO(archive), mode='r:gz') as tar:
+            for member in tar.getmembers():
+                if not member.isfile() or not member.name.startswith(prefix):
+                    continue
+
+                files.write_file(member.name[len(prefix):], tar.extractfile(member).read().decode('utf-8'))
+
+        return files
@@ -0,0 +1,306 @@
+import datetime, hashlib, io, json, os, re, tarfile, tempfile
+
+from .YAML import Quoted, dump, load
+
+# The index of the repository (the same file `helm repo index` writes)
+INDEX_FILENAME = 'index.yaml'
+
+# The sidecar cache of the index (the entries and the digest, size and modification time of each package) so the index is never parsed or the packages re-hashed
+CACHE_FILENAME = '.index-cache.json'
+
+def version_key(version: str) -> tuple:
+    """Get a key to sort chart versions by (in SemVer order, a pre-release before it's release).
+
+    Args:
+        version (str): The version (Ex. `1.2.3` or `1.2.3-rc.1`).
+
+    Returns:
+        tuple: The sort key
+    """
+
+    match = re.match(r'^v?(\d+)(?:\.(\d+))?(?:\.(\d+))?(-[^+]*)?', version)
+    if match is None:
+        return ((-1, -1, -1), 0, version)
+
+    core = tuple(int(part or 0) for part in match.group(1, 2, 3))
+    return (core, 0 if match.group(4) else 1, version)
+
+def write_atomically(path: str, content: bytes):
+    """Write a file so that readers only ever see the old or the new contents (never a partially written file).
+
+    Args:
+        path (str): The path of the file.
+        content (bytes): The contents of the file.
+    """
+
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(content)
+
+    # `mkstemp` only lets the owner read the file, but the repository is served by a web server that's likely running as another user (the same permissions as `helm repo index`)
+    os.chmod(temp_path, 0o644)
+    os.replace(temp_path, path)
+
+class ChartRepository:
+    def __init__(self, directory: str, url: str | None = None):
+        """A (plain HTTP) Helm chart repository in a local directory, whose `index.yaml` is maintained incrementally.
+
+        Unlike `helm repo index` (which re-reads and re-hashes every package each time), only the packages that were added (or changed) are read.
+        The entries of the index and the digest of every package are kept in a sidecar cache (`.index-cache.json`),
+        so the existing `index.yaml` is never parsed and unchanged packages (the same size and modification time) are never hashed again.
+        Without the cache (Ex. a repository created by `helm repo index`) every package in the directory is indexed once, so no existing entry is lost.
+        The index (and cache) are always written atomically, so the repository can be served while it's updated.
+
+        Args:
+            directory (str): The directory of the repository.
+            url (str, Optional): The URL the repository is served from (used for the URLs of the packages). Default None (relative URLs, the same as `helm repo index` without `--url`)
+        """
+
+        self.directory = directory
+        self.url = url.rstrip('/') if url is not None else None
+
+        # The entries of the index (the versions of each chart) and the cached details of each package (by filename)
+        self.entries: dict[str, list[dict]] = {}
+        self.packages: dict[str, dict] = {}
+
+        self.load()
+
+    def load(self):
+        """Load the sidecar cache (if there is one)."""
+
+        try:
+            with open(os.path.join(self.directory, CACHE_FILENAME), 'r') as f:
+                cache = json.load(f)
+        except (FileNotFoundError, ValueError):
+            # Without a (valid) cache every package is indexed again (Ex. a repository created by `helm repo index` or whose cache was deleted)
+            # Otherwise the next `save` would only have the packages added since
+            self.entries = {}
+            self.packages = {}
+            self.reindex()
+            return
+
+        self.entries = cache.get('entries', {})
+        self.packages = cache.get('packages', {})
+
+        # The URLs of unchanged packages are never recreated by `reindex`, so they're all rebuilt if the repository is now served from somewhere else
+        if 'url' not in cache or cache['url'] != self.url:
+            filenames = { (package['name'], package['version']): filename for filename, package in self.packages.items() }
+
+            for name, versions in self.entries.items():
+                for entry in versions:
+                    filename = filenames.get((name, entry['version']))
+                    if filename is not None:
+                        entry['urls'] = [self.get_url(filename)]
+
+    def get_url(self, filename: str) -> str:
+        """Get the URL of a package.
+
+        Args:
+            filename (str): The filename of the package.
+
+        Returns:
+            str: The URL of the package
+        """
+
+        return f'{self.url}/{filename}' if self.url is not None else filename
+
+    def create_entry(self, metadata: dict, digest: str, filename: str) -> dict:
+        """Create the index entry of a package.
+
+        Args:
+            metadata (dict): The metadata of the chart (the contents of `Chart.yaml`).
+            digest (str): The (hex) SHA-256 digest of the package.
+            filename (str): The filename of the package.
+
+        Returns:
+            dict: The entry
+        """
+
+        # Like `helm repo index`, empty fields are left out
+        entry = { key: value for key, value in metadata.items() if value is not None and value != '' and value != [] }
+        entry['created'] = datetime.datetime.now(datetime.timezone.utc).isoformat().replace('+00:00', 'Z')
+        entry['digest'] = digest
+        entry['urls'] = [self.get_url(filename)]
+
+        return entry
+
+    def put_entry(self, metadata: dict, digest: str, filename: str):
+        """Insert (or replace) the entry of a chart version.
+
+        An entry whose package didn't change (the same digest) is kept as is, so the index doesn't change for no reason.
+
+        Args:
+            metadata (dict): The metadata of the chart (the contents of `Chart.yaml`).
+            digest (str): The (hex) SHA-256 digest of the package.
+            filename (str): The filename of the package.
+        """
+
+        versions = self.entries.setdefault(metadata['name'], [])
+
+        for index, entry in enumerate(versions):
+            if entry['version'] == metadata['version']:
+                if entry['digest'] != digest or entry['urls'] != [self.get_url(filename)]:
+                    versions[index] = self.create_entry(metadata, digest, filename)
+                return
+
+        versions.append(self.create_entry(metadata, digest, filename))
+        versions.sort(key=lambda entry: version_key(entry['version']), reverse=True)
+
+    def remove_entry(self, name: str, version: str):
+        """Remove the entry of a chart version (if there is one).
+
+        Args:
+            name (str): The name of the chart.
+            version (str): The version of the chart.
+        """
+
+        versions = [entry for entry in self.entries.get(name, []) if entry['version'] != version]
+
+        if len(versions) > 0:
+            self.entries[name] = versions
+        else:
+            self.entries.pop(name, None)
+
+    def add(self, package: str, metadata: dict | None = None, archive: bytes | None = None) -> str:
+        """Add a packaged chart to the repository (copying it into the repository's directory if it isn't already there).
+
+        Args:
+            package (str): The path of the package (`<name>-<version>.tgz`).
+            metadata (dict, Optional): The metadata of the chart (the contents of `Chart.yaml`). Default None (read from the package)
+            archive (bytes, Optional): The contents of the package (if they're already in memory). Default None (read from `package`)
+
+        Returns:
+            str: The path of the package in the repository
+        """
+
+        if archive is None:
+            with open(package, 'rb') as f:
+                archive = f.read()
+
+        if metadata is None:
+            metadata = self.read_metadata(archive)
+
+        filename = os.path.basename(package)
+        path = os.path.join(self.directory, filename)
+
+        os.makedirs(self.directory, exist_ok=True)
+        if os.path.abspath(package) != os.path.abspath(path):
+            write_atomically(path, archive)
+
+        digest = hashlib.sha256(archive).hexdigest()
+        stat = os.stat(path)
+
+        self.packages[filename] = { 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'digest': digest, 'name': metadata['name'], 'version': metadata['version'] }
+        self.put_entry(metadata, digest, filename)
+
+        return path
+
+    @staticmethod
+    def read_metadata(archive: bytes) -> dict:
+        """Read the metadata of a chart (it's `Chart.yaml`) from it's package.
+
+        Args:
+            archive (bytes): The contents of the package.
+
+        Returns:
+            dict: The metadata of the chart
+        """
+
+        with tarfile.open(fileobj=io.BytesIO(archive), mode='r:gz') as tar:
+            for member in tar.getmembers():
+                # The `Chart.yaml` of the chart itself (not of a dependency under `charts/`)
+                if member.isfile() and member.name.count('/') == 1 and member.name.endswith('/Chart.yaml'):
+                    metadata = load(tar.extractfile(member).read().decode('utf-8'))
+                    if isinstance(metadata, dict) and 'name' in metadata and 'version' in metadata:
+                        return metadata
+
+        raise Exception('The package does not have a valid Chart.yaml.')
+
+    def reindex(self) -> dict[str, list[str]]:
+        """Bring the index up to date with the packages in the repository's directory (the incremental equivalent of `helm repo index`).
+
+        Only packages that are new or changed (by size or modification time) are read and hashed.
+        The entries of packages that no longer exist are removed.
+
+        Returns:
+            dict[str, list[str]]: The filenames of the packages that were `indexed` (read), `unchanged` and `removed`
+        """
+
+        changes = { 'indexed': [], 'unchanged': [], 'removed': [] }
+
+        filenames = sorted(filename for filename in os.listdir(self.directory) if filename.endswith('.tgz')) if os.path.isdir(self.directory) else []
+
+        for filename in filenames:
+            stat = os.stat(os.path.join(self.directory, filename))
+            cached = self.packages.get(filename)
+
+            if cached is not None and cached['size'] == stat.st_size and cached['mtime_ns'] == stat.st_mtime_ns:
+                changes['unchanged'].append(filename)
+                continue
+
+            if cached is not None:
+                self.remove_entry(cached['name'], cached['version'])
+
+            try:
+                self.add(os.path.join(self.directory, filename))
+            except Exception as e:
+                # Like `helm repo index`, anything that isn't a valid chart is skipped
+                print(f'Skipping {filename}: {e}')
+                self.packages.pop(filename, None)
+                continue
+
+            changes['indexed'].append(filename)
+
+        changes['removed'] = self.prune()
+
+        return changes
+
+    def prune(self) -> list[str]:
+        """Remove the entries of packages that no longer exist in the repository's directory.
+
+        Returns:
+            list[str]: The filenames of the packages that were removed
+        """
+
+        removed = [filename for filename in self.packages if not os.path.isfile(os.path.join(self.directory, filename))]
+
+        for filename in removed:
+            cached = self.packages.pop(filename)
+            self.remove_entry(cached['name'], cached['version'])
+
+        return removed
+
+    def create_index(self) -> str:
+        """Create the contents of the `index.yaml` file.
+
+        Returns:
+            str: The `index.yaml` file
+        """
+
+        # Every string is quoted so nothing in the metadata (Ex. a `{{` in a description) is written as is
+        def quote(value):
+            if isinstance(value, dict):
+                return { key: quote(item) for key, item in value.items() }
+            elif isinstance(value, list):
+                return [quote(item) for item in value]
+            elif isinstance(value, str):
+                return Quoted(value)
+
+            return value
+
+        entries = { name: quote(self.entries[name]) for name in sorted(self.entries) }
+        generated = datetime.datetime.now(datetime.timezone.utc).isoformat().replace('+00:00', 'Z')
+
+        return dump({ 'apiVersion': 'v1', 'entries': entries, 'generated': Quoted(generated) })
+
+    def save(self):
+        """Write the `index.yaml` file (and the sidecar cache) atomically."""
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        # Packages deleted since the cache was loaded are never left in the index
+        self.prune()
+
+        # The cache is written first, an index that's newer than the cache is only ever re-indexed (never wrong)
+        write_atomically(os.path.join(self.directory, CACHE_FILENAME), json.dumps({ 'url': self.url, 'entries': self.entries, 'packages': self.packages }).encode('utf-8'))
+        write_atomically(os.path.join(self.directory, INDEX_FILENAME), self.create_index().encode('utf-8'))
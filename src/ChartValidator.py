@@ -0,0 +1,110 @@
+from .GoTemplate import GoTemplate
+from .VirtualFileTree import VirtualFileTree
+from .YAML import load, load_all
+
+class ChartValidator:
+    def __init__(self, release_name: str = 'release-name', namespace: str = 'default', kube_version: str = 'v1.29.0'):
+        """A class for checking a rendered Helm chart without `helm` (see `GoTemplate`).
+
+        Every template is checked (in all it's branches) against the chart's `values.yaml`,
+        rendered with the default values (the same as `helm template` would) and the result parsed as YAML.
+
+        Args:
+            release_name (str, Optional): The name of the release to render with. Default 'release-name' (the same as `helm template`)
+            namespace (str, Optional): The namespace of the release to render with. Default 'default'
+            kube_version (str, Optional): The Kubernetes version to render with. Default 'v1.29.0'
+        """
+
+        self.release_name = release_name
+        self.namespace = namespace
+        self.kube_version = kube_version
+
+    def create_context(self, values: dict, chart: dict) -> dict:
+        """Create the top level objects given to every template (`.Values`, `.Release`, `.Chart`, etc...).
+
+        Args:
+            values (dict): The values (the contents of the `values.yaml` file).
+            chart (dict): The metadata of the chart (the contents of the `Chart.yaml` file).
+
+        Returns:
+            dict: The top level objects
+        """
+
+        major, minor, *_ = self.kube_version.lstrip('v').split('.') + ['0']
+
+        return {
+            'Values': values,
+            'Release': { 'Name': self.release_name, 'Namespace': self.namespace, 'Service': 'Helm', 'IsInstall': True, 'IsUpgrade': False, 'Revision': 1 },
+            # Like Helm, the fields of `Chart.yaml` are capitalized (Ex. `.Chart.AppVersion`)
+            'Chart': { key[0].upper() + key[1:]: value for key, value in chart.items() },
+            'Capabilities': { 'KubeVersion': { 'Version': self.kube_version, 'Major': major, 'Minor': minor } },
+            'Template': { 'BasePath': f'{chart.get("name")}/templates' },
+            'Files': {}
+        }
+
+    def validate(self, files: VirtualFileTree) -> list[str]:
+        """Check the rendered Helm chart.
+
+        Args:
+            files (VirtualFileTree): The rendered files of the Helm chart.
+
+        Returns:
+            list[str]: The problems found (empty if there weren't any)
+        """
+
+        problems = []
+
+        try:
+            values = load(files.read_file('values.yaml')) if 'values.yaml' in files else {}
+            chart = load(files.read_file('Chart.yaml'))
+        except Exception as e:
+            return [f'Failed to load the chart: {e}']
+
+        values = values if isinstance(values, dict) else {}
+        context = self.create_context(values, chart if isinstance(chart, dict) else {})
+
+        # Like Helm, every template is parsed before any are rendered, so they can include the named templates of any other (Ex. the `_helpers.tpl` file)
+        named_templates = {}
+        templates = []
+
+        for path in files.paths():
+            if not path.startswith('templates/') or not (path.endswith('.yaml') or path.endswith('.yml') or path.endswith('.tpl')):
+                continue
+
+            try:
+                templates.append(GoTemplate(files.read_file(path), path, named_templates))
+            except Exception as e:
+                problems.append(str(e))
+
+        for template in templates:
+            path = template.name
+
+            # Rendering would only fail on the same problems again
+            template_problems = template.check(values)
+            if len(template_problems) > 0:
+                problems.extend(template_problems)
+                continue
+
+            # Files starting with an underscore (and `.tpl` files) only hold named templates, they aren't manifests
+            if path.endswith('.tpl') or path.split('/')[-1].startswith('_'):
+                continue
+
+            try:
+                rendered = template.render(context)
+            except Exception as e:
+                problems.append(str(e))
+                continue
+
+            try:
+                documents = load_all(rendered)
+            except Exception as e:
+                problems.append(f'{path} (rendered): {e}')
+                continue
+
+            for document in documents:
+                if not isinstance(document, dict):
+                    problems.append(f'{path} (rendered): expected a Kubernetes object (mapping) but found {type(document).__name__}')
+                elif 'apiVersion' not in document or 'kind' not in document:
+                    problems.append(f'{path} (rendered): missing apiVersion or kind')
+
+        return problems
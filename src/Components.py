@@ -0,0 +1,39 @@
+import importlib
+
+# The kinds of components (templates) that can be part of a Helm chart
+# Each is defined in the module of the same name within this package (Ex. `Deployment` in `src/Deployment.py`)
+COMPONENTS = (
+    'Helpers',
+    'Ingress',
+    'Service',
+    'Deployment',
+    'Database',
+    'HashicorpVault',
+    'AzureKeyVault',
+    'MongoDB',
+    'AzureTableStorage',
+    'Redis',
+    'OAuth',
+    'ThirdPartyService'
+)
+
+def load_component(kind: str) -> type:
+    """Get the class of a kind of component, importing it's module the first time it's needed.
+
+    Components are only imported once an input actually references them.
+    So an input with (for instance) no NoSQL database never pays for importing the NoSQL templates.
+
+    Args:
+        kind (str): The kind of component (Ex. `Deployment`, `MongoDB`, etc...).
+    
+    Returns:
+        type: The class of the component (a subclass of `Template`)
+    """
+
+    if kind not in COMPONENTS:
+        raise Exception(f'Unknown component "{kind}".')
+
+    # `import_module` caches modules (in `sys.modules`) so this is only slow the first time
+    module = importlib.import_module(f'.{kind}', __package__)
+
+    return getattr(module, kind)
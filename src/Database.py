@@ -1,4 +1,6 @@
 from .Template import Template
+from .VirtualFileTree import VirtualFileTree
+from .YAML import Directive, Mapping
 
 class Database (Template):
     def __init__(self, name: str, host: str, user: str, password: str, create: bool = True, port: int = 5432, instance_id: str = ''):
@@ -48,95 +50,86 @@ class Database (Template):
         # Allows for distinguishing between multiple database instances/servers
         self.instance_id = instance_id
     
-    def write(self):
+    def create_credentials_data(self) -> Mapping:
+        """Creates the data of the database credentials Config Map(s).
+
+        Returns:
+            Mapping: The data of the Config Map
+        """
+
+        return Mapping([
+            ('db-host', '{{ .Values.database.host }}'),
+            ('db-name', '{{ .Values.database.name }}'),
+            ('db-user', '{{ .Values.database.user }}'),
+            Directive('{{- if .Values.database.port }}'),
+            ('db-port', '{{ .Values.database.port | quote }}'),
+            Directive('{{- else }}'),
+            ('db-port', '5432'),
+            Directive('{{- end }}')
+        ])
+    
+    def create_env_from_key_ref(self, ref_type: str, name: str, key: str) -> dict:
+        """Creates a reference (used by the operator) to a key of a Config Map or Secret in the Postgres Controller namespace.
+
+        Args:
+            ref_type (str): The type of reference (`configMapKeyRef` or `secretKeyRef`).
+            name (str): The name of the Config Map or Secret.
+            key (str): The key within the Config Map or Secret.
+
+        Returns:
+            dict: The reference
+        """
+
+        return {
+            'envFrom': {
+                ref_type: [
+                    {
+                        'name': name,
+                        'namespace': 'postgres-controller',
+                        'key': key
+                    }
+                ]
+            }
+        }
+    
+    def get_config(self) -> dict:
+        """None of the attributes affect the rendered files (everything comes from the `values.yaml` file)."""
+
+        return {}
+    
+    def write(self, files: VirtualFileTree):
         # Config Map file for use within the Postgres Controller namespace
         # This is required by the operator to function properly
-        with open('templates/db-credentials-config-map-postgres-controller.yaml', 'w') as f:
-            f.write('{{- if and (eq .Values.database.type "postgres") (.Values.database.create) -}}' + '\n')
-            f.write('apiVersion: v1' + '\n')
-            f.write('kind: ConfigMap' + '\n')
-            f.write('metadata:' + '\n')
-            f.write('  ' + 'name: {{ .Release.Name }}-db-credentials' + '\n')
-            f.write('  ' + 'namespace: postgres-controller' + '\n')
-            f.write('data:' + '\n')
-            f.write('  ' + 'db-host: {{ .Values.database.host }}' + '\n')
-            f.write('  ' + 'db-name: {{ .Values.database.name }}' + '\n')
-            f.write('  ' + 'db-user: {{ .Values.database.user }}' + '\n')
-            f.write('  ' + '{{- if .Values.database.port }}' + '\n')
-            f.write('  ' + 'db-port: {{ .Values.database.port | quote }}' + '\n')
-            f.write('  ' + '{{- else }}' + '\n')
-            f.write('  ' + 'db-port: "5432"' + '\n')
-            f.write('  ' + '{{- end }}' + '\n')
-            f.write('{{- end -}}' + '\n')
+        self.write_document(files, 'templates/db-credentials-config-map-postgres-controller.yaml', Directive('{{- if and (eq .Values.database.type "postgres") (.Values.database.create) -}}'), self.create_data_object('ConfigMap', '{{ .Release.Name }}-db-credentials', self.create_credentials_data(), namespace='postgres-controller'), Directive('{{- end -}}'))
         
         # Config Map file in the same namespace as the app
-        with open('templates/db-credentials-config-map.yaml', 'w') as f:
-            f.write('apiVersion: v1' + '\n')
-            f.write('kind: ConfigMap' + '\n')
-            f.write('metadata:' + '\n')
-            f.write('  ' + 'name: {{ .Release.Name }}-db-credentials' + '\n')
-            f.write('data:' + '\n')
-            f.write('  ' + 'db-host: {{ .Values.database.host }}' + '\n')
-            f.write('  ' + 'db-name: {{ .Values.database.name }}' + '\n')
-            f.write('  ' + 'db-user: {{ .Values.database.user }}' + '\n')
-            f.write('  ' + '{{- if .Values.database.port }}' + '\n')
-            f.write('  ' + 'db-port: {{ .Values.database.port | quote }}' + '\n')
-            f.write('  ' + '{{- else }}' + '\n')
-            f.write('  ' + 'db-port: "5432"' + '\n')
-            f.write('  ' + '{{- end }}' + '\n')
+        self.write_document(files, 'templates/db-credentials-config-map.yaml', self.create_data_object('ConfigMap', '{{ .Release.Name }}-db-credentials', self.create_credentials_data()))
         
         # Secret file for the password to access the database for use within the Postgres Controller namespace
         # This is required by the operator to function properly
-        with open('templates/db-password-secret-postgres-controller.yaml', 'w') as f:
-            f.write('{{- if and (eq .Values.database.type "postgres") (.Values.database.create) -}}' + '\n')
-            f.write('apiVersion: v1' + '\n')
-            f.write('kind: Secret' + '\n')
-            f.write('metadata:' + '\n')
-            f.write('  ' + 'name: {{ .Release.Name }}-db-password' + '\n')
-            f.write('  ' + 'namespace: postgres-controller' + '\n')
-            f.write('type: Opaque' + '\n')
-            f.write('data:' + '\n')
-            f.write('  ' + 'password: {{ .Values.database.password | b64enc }}' + '\n')
-            f.write('{{- end -}}' + '\n')
+        self.write_document(files, 'templates/db-password-secret-postgres-controller.yaml', Directive('{{- if and (eq .Values.database.type "postgres") (.Values.database.create) -}}'), self.create_data_object('Secret', '{{ .Release.Name }}-db-password', {
+            'password': '{{ .Values.database.password | b64enc }}'
+        }, namespace='postgres-controller'), Directive('{{- end -}}'))
         
         # Secret file for the password to access the database in the same namespace as the app
-        with open('templates/db-password-secret.yaml', 'w') as f:
-            f.write('apiVersion: v1' + '\n')
-            f.write('kind: Secret' + '\n')
-            f.write('metadata:' + '\n')
-            f.write('  ' + 'name: {{ .Release.Name }}-db-password' + '\n')
-            f.write('type: Opaque' + '\n')
-            f.write('data:' + '\n')
-            f.write('  ' + 'password: {{ .Values.database.password | b64enc }}' + '\n')
+        self.write_document(files, 'templates/db-password-secret.yaml', self.create_data_object('Secret', '{{ .Release.Name }}-db-password', {
+            'password': '{{ .Values.database.password | b64enc }}'
+        }))
 
         # Custom Resource Definition (CRD) file to create the database using the operator 
-        with open('templates/database.yaml', 'w') as f:
-            f.write('{{- if and (eq .Values.database.type "postgres") (.Values.database.create) -}}' + '\n')
-            f.write('apiVersion: postgresql.org/v1' + '\n')
-            f.write('kind: PostgresDatabase' + '\n')
-            f.write('metadata:' + '\n')
-            f.write('  ' + 'name: {{ .Release.Name }}-db' + '\n')
-            f.write('  ' + 'namespace: {{ .Release.Namespace }}' + '\n')
-            f.write('spec:' + '\n')
-            f.write('  ' + 'dbName:' + '\n')
-            f.write('  ' + '  ' + 'envFrom:' + '\n')
-            f.write('  ' + '  ' + '  ' + 'configMapKeyRef:' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '- name: {{ .Release.Name }}-db-credentials' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + 'namespace: postgres-controller' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + 'key: db-name' + '\n')
-            f.write('  ' + 'dbRoleName:' + '\n')
-            f.write('  ' + '  ' + 'envFrom:' + '\n')
-            f.write('  ' + '  ' + '  ' + 'configMapKeyRef:' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '- name: {{ .Release.Name }}-db-credentials' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + 'namespace: postgres-controller' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + 'key: db-user' + '\n')
-            f.write('  ' + 'dbRolePassword:' + '\n')
-            f.write('  ' + '  ' + 'envFrom:' + '\n')
-            f.write('  ' + '  ' + '  ' + 'secretKeyRef:' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '- name: {{ .Release.Name }}-db-password' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + 'namespace: postgres-controller' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + 'key: password' + '\n')
-            f.write('{{- if .Values.database.instance_id }}' + '\n')
-            f.write('  ' + 'dbInstanceId: {{ .Values.database.instance_id }}' + '\n')
-            f.write('{{- end }}' + '\n')
-            f.write('{{- end -}}' + '\n')
\ No newline at end of file
+        self.write_document(files, 'templates/database.yaml', Directive('{{- if and (eq .Values.database.type "postgres") (.Values.database.create) -}}'), {
+            'apiVersion': 'postgresql.org/v1',
+            'kind': 'PostgresDatabase',
+            'metadata': {
+                'name': '{{ .Release.Name }}-db',
+                'namespace': '{{ .Release.Namespace }}'
+            },
+            'spec': Mapping([
+                ('dbName', self.create_env_from_key_ref('configMapKeyRef', '{{ .Release.Name }}-db-credentials', 'db-name')),
+                ('dbRoleName', self.create_env_from_key_ref('configMapKeyRef', '{{ .Release.Name }}-db-credentials', 'db-user')),
+                ('dbRolePassword', self.create_env_from_key_ref('secretKeyRef', '{{ .Release.Name }}-db-password', 'password')),
+                Directive('{{- if .Values.database.instance_id }}'),
+                ('dbInstanceId', '{{ .Values.database.instance_id }}'),
+                Directive('{{- end }}')
+            ])
+        }, Directive('{{- end -}}'))
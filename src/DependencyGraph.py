@@ -0,0 +1,166 @@
+from .Template import Template
+
+# The values.yaml sections (named after their `create_..._section_of_values_yaml` method)
+IMAGE_SECTION = 'create_image_section_of_values_yaml'
+INGRESS_SECTION = 'create_ingress_section_of_values_yaml'
+EXTRA_VARS_SECTION = 'create_deployment_extra_vars_section_of_values_yaml'
+OAUTH_SECTION = 'create_oauth_section_of_values_yaml'
+DATABASE_SECTION = 'create_database_section_of_values_yaml'
+SECRETS_VAULT_SECTION = 'create_secrets_vault_section_of_values_yaml'
+NOSQL_SECTION = 'create_nosql_section_of_values_yaml'
+CACHE_SECTION = 'create_cache_section_of_values_yaml'
+THIRD_PARTY_SECTION = 'create_third_party_service_section_of_values_yaml'
+
+# The nodes (templates, `values.yaml` sections and `Chart.yaml`) that consume each key of the input document.
+#
+# A key is a dotted path where `*` matches any one key and `**` matches any number of keys (at least one).
+# A path only matches a key of the same depth (so `db` is the whole section being added, removed or turned off and `db.*` is one of it's fields).
+# The first key that matches a changed path is used, so more specific keys have to come first.
+#
+# Templates are named after their kind (Ex. `Database`), except third party services which are also named after the service (Ex. `ThirdPartyService:stripe`).
+# `{1}` is replaced with the second key of the path and `ThirdPartyService:*` is every third party service.
+#
+# Most templates only take their values from `values.yaml` (see `Template.get_config`), so changing most fields only affects a section of `values.yaml`.
+# Adding or removing a section also changes what the Deployment is wired up to (see `HelmChart.wire_deployment`).
+DEPENDENCIES: dict[str, list[str]] = {
+    'chart.**': ['Chart.yaml'],
+    'chart': ['Chart.yaml'],
+    'image.**': [IMAGE_SECTION],
+    'image': [IMAGE_SECTION],
+    'ingress.**': [INGRESS_SECTION],
+    'ingress': [INGRESS_SECTION],
+    'db.*': [DATABASE_SECTION],
+    'db': ['Database', 'Deployment', DATABASE_SECTION],
+    'vault.**': [SECRETS_VAULT_SECTION],
+    'vault': ['HashicorpVault', 'Deployment', SECRETS_VAULT_SECTION],
+    # The names of the tables are part of the MongoDB and Deployment templates
+    'nosql.tables.**': ['MongoDB', 'Deployment', NOSQL_SECTION],
+    'nosql.tables': ['MongoDB', 'Deployment', NOSQL_SECTION],
+    'nosql.*': [NOSQL_SECTION],
+    'nosql': ['MongoDB', 'Deployment', NOSQL_SECTION],
+    'cache.*': [CACHE_SECTION],
+    'cache': ['Redis', 'Deployment', CACHE_SECTION],
+    'oauth.*': [OAUTH_SECTION],
+    'oauth': ['OAuth', 'Deployment', OAUTH_SECTION],
+    'thirdPartyServices.*.*': [THIRD_PARTY_SECTION],
+    'thirdPartyServices.*': ['ThirdPartyService:{1}', 'Deployment', THIRD_PARTY_SECTION],
+    'thirdPartyServices': ['ThirdPartyService:*', 'Deployment', THIRD_PARTY_SECTION],
+    # The value and description of a Secret/ConfigMap environment variable only go in the `values.yaml` file
+    'extraEnvVars.*.value': [EXTRA_VARS_SECTION],
+    'extraEnvVars.*.description': [EXTRA_VARS_SECTION],
+    'extraEnvVars.*.*': ['Deployment', EXTRA_VARS_SECTION],
+    'extraEnvVars.*': ['Deployment', EXTRA_VARS_SECTION],
+    'extraEnvVars': ['Deployment', EXTRA_VARS_SECTION],
+    'consolidateEnvVars': ['Deployment'],
+    # `helpers` isn't here because turning the `_helpers.tpl` file on or off changes every template (so everything is regenerated)
+    # Only used when the chart is pushed
+    'registry': [],
+    # The values overlays of the environments are always regenerated (see `HelmChart.render`)
+    'environments.**': [],
+    'environments': []
+}
+
+def changed_paths(old: dict, new: dict, path: tuple[str, ...] = ()) -> list[tuple[str, ...]]:
+    """Get the paths of everything that changed between two input documents.
+
+    Mappings are compared key by key. Anything else (or a key that was added, removed or changed type) is a change of it's own path.
+
+    Args:
+        old (dict): The previous input document (or part of it).
+        new (dict): The new input document (or part of it).
+        path (tuple[str, ...], Optional): The path of the documents (when comparing part of them). Default `()` (the root)
+
+    Returns:
+        list[tuple[str, ...]]: The paths (as tuples of keys) that changed
+    """
+
+    changes = []
+
+    for key in list(old) + [key for key in new if key not in old]:
+        if key not in old or key not in new:
+            changes.append(path + (key,))
+        elif isinstance(old[key], dict) and isinstance(new[key], dict):
+            changes.extend(changed_paths(old[key], new[key], path + (key,)))
+        elif old[key] != new[key] or type(old[key]) != type(new[key]):
+            changes.append(path + (key,))
+
+    return changes
+
+def matches(pattern: str, path: tuple[str, ...]) -> bool:
+    """Check if a path matches a key of `DEPENDENCIES`.
+
+    Args:
+        pattern (str): The dotted key (Ex. `extraEnvVars.*.value`).
+        path (tuple[str, ...]): The path.
+
+    Returns:
+        bool: If the path matches
+    """
+
+    parts = pattern.split('.')
+
+    for index, part in enumerate(parts):
+        if part == '**':
+            return len(path) > index
+        if index >= len(path) or (part != '*' and part != path[index]):
+            return False
+
+    return len(path) == len(parts)
+
+def affected_nodes(old: dict, new: dict) -> set[str] | None:
+    """Get the nodes (templates, `values.yaml` sections and `Chart.yaml`) that consume anything that changed between two input documents.
+
+    Args:
+        old (dict): The previous input document.
+        new (dict): The new input document.
+
+    Returns:
+        set[str] | None: The affected nodes or None if something changed that isn't in the graph (so everything has to be regenerated)
+    """
+
+    # The named templates of the `_helpers.tpl` file are prefixed with the name of the chart, so renaming the chart changes every template that includes them
+    if new.get('helpers', False) and old.get('chart', {}).get('name') != new.get('chart', {}).get('name'):
+        return None
+
+    affected = set()
+
+    for path in changed_paths(old, new):
+        pattern = next((pattern for pattern in DEPENDENCIES if matches(pattern, path)), None)
+        if pattern is None:
+            return None
+
+        for node in DEPENDENCIES[pattern]:
+            affected.add(node.format(*path))
+
+    return affected
+
+def template_node(template: Template) -> str:
+    """Get the name of a template's node in the graph.
+
+    Args:
+        template (Template): The template.
+
+    Returns:
+        str: The name of the node (Ex. `Database` or `ThirdPartyService:stripe`)
+    """
+
+    kind = type(template).__name__
+
+    # There can be more than one third party service, so they're told apart by name
+    if kind == 'ThirdPartyService':
+        return f'{kind}:{template.name}'
+
+    return kind
+
+def is_affected(node: str, affected: set[str]) -> bool:
+    """Check if a node is affected (see `affected_nodes`).
+
+    Args:
+        node (str): The name of the node.
+        affected (set[str]): The affected nodes.
+
+    Returns:
+        bool: If the node is affected
+    """
+
+    return node in affected or (':' in node and node.split(':')[0] + ':*' in affected)
@@ -1,9 +1,16 @@
+from typing import TYPE_CHECKING
+
 from .Template import Template
-from .NoSQL import NoSQL
-from .ThirdPartyService import ThirdPartyService
+from .VirtualFileTree import VirtualFileTree
+from .YAML import Comment, Directive, Mapping, Quoted, Raw, Sequence
+
+# Only needed for the type hints (so the NoSQL and third party templates aren't loaded unless the input uses them)
+if TYPE_CHECKING:
+    from .NoSQL import NoSQL
+    from .ThirdPartyService import ThirdPartyService
 
 class Deployment (Template):
-    def __init__(self, image_repository: str, image_tag: str = 'v1.0.0', image_pull_policy: str = 'IfNotPresent', replica_count: int = 1, port: int = 8080, env: str = 'production', uses_oauth: bool = True, uses_db: bool = False, uses_secrets_vault: bool = False, nosql: NoSQL | None = None, uses_cache: bool = False, third_party_services: list[ThirdPartyService] = [], **extra_env_vars: dict[str, str | dict[str, str]]):
+    def __init__(self, image_repository: str, image_tag: str = 'v1.0.0', image_pull_policy: str = 'IfNotPresent', replica_count: int = 1, port: int = 8080, env: str = 'production', uses_oauth: bool = True, uses_db: bool = False, uses_secrets_vault: bool = False, nosql: 'NoSQL | None' = None, uses_cache: bool = False, third_party_services: 'list[ThirdPartyService]' = [], consolidate_env_vars: bool = False, **extra_env_vars: dict[str, str | dict[str, str]]):
         """A class for creating a/some template(s) related to the Deployment for the app.
         
         Args:
@@ -19,6 +26,7 @@ class Deployment (Template):
             nosql (NoSQL, Optional): The NoSQL template. If set, Determines if NoSQL database related environment variables need to be set on the Deployment. We require the object to get table names to set appropriate environment variables on the Deployment. Default None
             uses_cache (bool, Optional): Whether or not a cache server is to be used. Determines if cache related environment variables need to be set on the Deployment. Default False
             third_party_services (list[ThirdPartyService], Optional): The third party services to be used. Determines if third party service related environment variables need to be set on the Deployment. Default empty list (`[]`)
+            consolidate_env_vars (bool, Optional): Put the Secret/ConfigMap extra environment variables into one Secret and one ConfigMap (per `group`, if given) wired in with `envFrom`, instead of a Secret/ConfigMap and `valueFrom` for each variable. Default False
             extra_env_vars (dict[str, str | dict[str, str]]): Extra environment variables to be set on the Deployment. The key is the name of the environment variable and the value, if it's a string, is the value of the environment variable. If the value is a dictionary, than a file for the value as a secret or configmap is created and referenced by the environment variable.
         """
         
@@ -36,12 +44,29 @@ class Deployment (Template):
         self.nosql = nosql
         self.uses_cache = uses_cache
         self.third_party_services = third_party_services
+        self.consolidate_env_vars = consolidate_env_vars
         self.extra_env_vars = extra_env_vars
     
-    def write_extra_env_vars_secret_file(self, env_var_details: dict[str, str]):
+    def get_config(self) -> dict:
+        """Only the features used and the environment variables affect the rendered files (the image, replicas, etc... come from the `values.yaml` file)."""
+
+        return {
+            'uses_oauth': self.uses_oauth,
+            'uses_db': self.uses_db,
+            'uses_secrets_vault': self.uses_secrets_vault,
+            'nosql_tables': None if self.nosql is None else { key: value['name'] for key, value in self.nosql.tables.items() },
+            'uses_cache': self.uses_cache,
+            'third_party_services': [third_party.get_config() for third_party in self.third_party_services],
+            'consolidate_env_vars': self.consolidate_env_vars,
+            # The values (and descriptions) of the Secret/ConfigMap environment variables only go in the `values.yaml` file
+            'extra_env_vars': { key: { field: value.get(field) for field in ('type', 'name', 'key', 'group') } if isinstance(value, dict) else value for key, value in self.extra_env_vars.items() }
+        }
+    
+    def write_extra_env_vars_secret_file(self, files: VirtualFileTree, env_var_details: dict[str, str]):
         """Writes a Secret file for the extra environment variable.
         
         Args:
+            files (VirtualFileTree): The in-memory file tree to write to.
             env_var_details (dict[str, str]): The details of the environment variable.
         """
 
@@ -54,19 +79,15 @@ class Deployment (Template):
             if token != camel_case_name:
                 camel_case_name += token.capitalize()
 
-        with open(f'templates/{filename}-secret.yaml', 'w') as f:
-            f.write('apiVersion: v1' + '\n')
-            f.write('kind: Secret' + '\n')
-            f.write('metadata:' + '\n')
-            f.write('  ' + f'name: {env_var_details["name"]}' + '\n')
-            f.write('type: Opaque' + '\n')
-            f.write('data:' + '\n')
-            f.write('  ' + f'{env_var_details["key"]}: ' + '{{ .Values.' + camel_case_name + ' | b64enc }}' + '\n')
+        self.write_document(files, f'templates/{filename}-secret.yaml', self.create_data_object('Secret', env_var_details['name'], {
+            env_var_details['key']: '{{ .Values.' + camel_case_name + ' | b64enc }}'
+        }))
     
-    def write_extra_env_vars_configmap_file(self, env_var_details: dict[str, str]):
+    def write_extra_env_vars_configmap_file(self, files: VirtualFileTree, env_var_details: dict[str, str]):
         """Writes a ConfigMap file for the extra environment variable.
         
         Args:
+            files (VirtualFileTree): The in-memory file tree to write to.
             env_var_details (dict[str, str]): The details of the environment variable.
         """
 
@@ -74,319 +95,327 @@ class Deployment (Template):
         if filename.startswith('{{ .Release.Name }}'):
             filename = filename.replace('{{ .Release.Name }}-', '')
             
-            camel_case_name = filename.split('-')[0]
-            for token in filename.split('-'):
-                if token != camel_case_name:
-                    camel_case_name += token.capitalize()
-
-            with open(f'templates/{filename}-configmap.yaml', 'w') as f:
-                f.write('apiVersion: v1' + '\n')
-                f.write('kind: ConfigMap' + '\n')
-                f.write('metadata:' + '\n')
-                f.write('  ' + f'name: {env_var_details["name"]}' + '\n')
-                f.write('data:' + '\n')
-                f.write('  ' + f'{env_var_details["key"]}: {{ .Values.{camel_case_name} }}' + '\n')
+        camel_case_name = filename.split('-')[0]
+        for token in filename.split('-'):
+            if token != camel_case_name:
+                camel_case_name += token.capitalize()
+
+        self.write_document(files, f'templates/{filename}-configmap.yaml', self.create_data_object('ConfigMap', env_var_details['name'], {
+            env_var_details['key']: '{{ .Values.' + camel_case_name + ' }}'
+        }))
     
-    def write_extra_env_vars_files(self):
+    def get_values_key(self, env_var_details: dict[str, str]) -> str:
+        """Get the key of the `values.yaml` file an extra environment variable's value is under (the camelCase of it's name, without the release name).
+
+        Args:
+            env_var_details (dict[str, str]): The details of the environment variable.
+
+        Returns:
+            str: The key of the value in the `values.yaml` file
+        """
+
+        var_name = env_var_details['name'].replace('{{ .Release.Name }}-', '')
+
+        camel_case_name = var_name.split('-')[0]
+        for token in var_name.split('-'):
+            if token != camel_case_name:
+                camel_case_name += token.capitalize()
+
+        return camel_case_name
+
+    def get_consolidated_env_var_groups(self) -> dict[tuple[str, str | None], dict[str, dict[str, str]]]:
+        """Group the Secret/ConfigMap extra environment variables by their type and `group` (for `consolidate_env_vars`).
+
+        Returns:
+            dict[tuple[str, str | None], dict[str, dict[str, str]]]: The environment variables (name to details) of each type and group (in the order they're first used)
+        """
+
+        groups = {}
+
+        for key, value in self.extra_env_vars.items():
+            if isinstance(value, dict):
+                groups.setdefault((value['type'], value.get('group')), {})[key.upper()] = value
+
+        return groups
+
+    def get_consolidated_object_name(self, ref_type: str, group: str | None) -> str:
+        """Get the name of the consolidated Secret or ConfigMap of a group of extra environment variables.
+
+        Args:
+            ref_type (str): The type of object (`Secret` or `ConfigMap`).
+            group (str | None): The group of the environment variables (None for the ungrouped variables).
+
+        Returns:
+            str: The name of the Secret or ConfigMap (without the release name, Ex. `env-secret`)
+        """
+
+        return ('' if group is None else group + '-') + 'env-' + ('secret' if ref_type == 'Secret' else 'config')
+
+    def write_consolidated_extra_env_vars_files(self, files: VirtualFileTree):
+        """Writes one Secret and/or ConfigMap file (per group) holding all the Secret/ConfigMap extra environment variables.
+
+        The keys are the names of the environment variables, so they can be set with a single `envFrom` (see `create_extra_env_vars_deployment_env_from`).
+        """
+
+        for (ref_type, group), env_vars in self.get_consolidated_env_var_groups().items():
+            name = self.get_consolidated_object_name(ref_type, group)
+
+            if ref_type == 'Secret':
+                self.write_document(files, f'templates/{name}.yaml', self.create_data_object('Secret', '{{ .Release.Name }}-' + name, { key: '{{ .Values.' + self.get_values_key(value) + ' | b64enc }}' for key, value in env_vars.items() }))
+            elif ref_type == 'ConfigMap':
+                self.write_document(files, f'templates/{name}.yaml', self.create_data_object('ConfigMap', '{{ .Release.Name }}-' + name, { key: '{{ .Values.' + self.get_values_key(value) + ' }}' for key, value in env_vars.items() }))
+
+    def write_extra_env_vars_files(self, files: VirtualFileTree):
         """Writes any needed secret or configmap files for the extra environment variables."""
+
+        if self.consolidate_env_vars:
+            self.write_consolidated_extra_env_vars_files(files)
+            return
         
         for value in self.extra_env_vars.values():
             # We only need to crate a secret or configmap file if the value is a dictionary
             # Because if it's a string we'll just use it as the value of the environment variable
             if isinstance(value, dict):
                 if value['type'] == 'Secret':
-                    self.write_extra_env_vars_secret_file(value)
+                    self.write_extra_env_vars_secret_file(files, value)
                 elif value['type'] == 'ConfigMap':
-                    self.write_extra_env_vars_configmap_file(value)
+                    self.write_extra_env_vars_configmap_file(files, value)
 
-    def create_extra_env_vars_deployment_env_vars(self) -> str:
+    def create_env_var_from(self, name: str, ref_type: str, ref_name: str, key: str) -> dict:
+        """Creates an environment variable whose value comes from a key of a ConfigMap or Secret.
+
+        Args:
+            name (str): The name of the environment variable.
+            ref_type (str): The type of reference (`configMapKeyRef` or `secretKeyRef`).
+            ref_name (str): The name of the ConfigMap or Secret.
+            key (str): The key within the ConfigMap or Secret.
+
+        Returns:
+            dict: The environment variable
+        """
+
+        return {
+            'name': name,
+            'valueFrom': {
+                ref_type: {
+                    'name': ref_name,
+                    'key': key
+                }
+            }
+        }
+
+    def create_extra_env_vars_deployment_env_from(self) -> list:
+        """Creates the `envFrom` sources of the Deployment for the consolidated extra environment variables (see `consolidate_env_vars`)."""
+
+        output = []
+
+        for ref_type, group in self.get_consolidated_env_var_groups():
+            ref = 'secretRef' if ref_type == 'Secret' else 'configMapRef'
+            output.append({ ref: { 'name': '{{ .Release.Name }}-' + self.get_consolidated_object_name(ref_type, group) } })
+
+        return output
+
+    def create_extra_env_vars_deployment_env_vars(self) -> list:
         """Creates the extra environment variables actual variables for the Deployment."""
         
-        output = ''
+        output = []
 
         for key, value in self.extra_env_vars.items():
             # Check if the value is a dictionary or a string
             if isinstance(value, dict):
-                output += '  ' + '  ' + '  ' + '  ' + f'- name: {key.upper()}' + '\n'
-                output += '  ' + '  ' + '  ' + '  ' + '  ' + 'valueFrom:' + '\n'
-                
+                # The consolidated Secret/ConfigMap variables are all set by `envFrom` instead
+                if self.consolidate_env_vars:
+                    continue
+
                 if value['type'] == 'Secret':
-                    output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'secretKeyRef:' + '\n'
+                    output.append(self.create_env_var_from(key.upper(), 'secretKeyRef', value['name'], value['key']))
                 elif value['type'] == 'ConfigMap':
-                    output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'configMapKeyRef:' + '\n'
-                
-                output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'name: ' + value['name'] + '\n'
-                output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'key: ' + value['key'] + '\n'
+                    output.append(self.create_env_var_from(key.upper(), 'configMapKeyRef', value['name'], value['key']))
             else:
                 # Because the value is a string just use the value literally
-                output += '  ' + '  ' + '  ' + '  ' + f'- name: {key.upper()}' + '\n'
-                output += '  ' + '  ' + '  ' + '  ' + '  ' + f'value: {value}' + '\n'
+                output.append({ 'name': key.upper(), 'value': Raw(value) })
         
         return output
     
-    def create_oauth_deployment_env_vars(self) -> str:
+    def create_oauth_deployment_env_vars(self) -> list:
         """Creates the OAuth related environment variables for the Deployment."""
 
-        output = ''
-
-        output += '  ' + '  ' + '  ' + '  ' + '# OAuth Implementation Stuff' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '- name: BASE_APP_URL' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + 'valueFrom:' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'configMapKeyRef:' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'name: {{ .Release.Name }}-oauth-credentials' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'key: base-app-url' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '- name: APP_ABBRV' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + 'valueFrom:' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'configMapKeyRef:' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'name: {{ .Release.Name }}-oauth-credentials' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'key: app-abbreviation' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '- name: APP_NAME' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + 'valueFrom:' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'configMapKeyRef:' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'name: {{ .Release.Name }}-oauth-credentials' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'key: app-name' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '- name: SERVICE_NAME' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + 'valueFrom:' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'configMapKeyRef:' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'name: {{ .Release.Name }}-oauth-credentials' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'key: service-name' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '- name: DEV_PORT' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + 'valueFrom:' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'configMapKeyRef:' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'name: {{ .Release.Name }}-oauth-credentials' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'key: dev-port' + '\n'
-
-        return output
+        return [
+            Comment('OAuth Implementation Stuff'),
+            self.create_env_var_from('BASE_APP_URL', 'configMapKeyRef', '{{ .Release.Name }}-oauth-credentials', 'base-app-url'),
+            self.create_env_var_from('APP_ABBRV', 'configMapKeyRef', '{{ .Release.Name }}-oauth-credentials', 'app-abbreviation'),
+            self.create_env_var_from('APP_NAME', 'configMapKeyRef', '{{ .Release.Name }}-oauth-credentials', 'app-name'),
+            self.create_env_var_from('SERVICE_NAME', 'configMapKeyRef', '{{ .Release.Name }}-oauth-credentials', 'service-name'),
+            self.create_env_var_from('DEV_PORT', 'configMapKeyRef', '{{ .Release.Name }}-oauth-credentials', 'dev-port')
+        ]
     
-    def create_db_deployment_env_vars(self) -> str:
+    def create_db_deployment_env_vars(self) -> list:
         """Creates the database related environment variables for the Deployment."""
 
-        output = ''
-
-        output += '  ' + '  ' + '  ' + '  ' + '# Database credentials' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '- name: DB_HOST' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + 'valueFrom:' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'configMapKeyRef:' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'name: {{ .Release.Name }}-db-credentials' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'key: db-host' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '- name: DB_NAME' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + 'valueFrom:' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'configMapKeyRef:' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'name: {{ .Release.Name }}-db-credentials' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'key: db-name' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '- name: DB_PASSWORD' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + 'valueFrom:' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'secretKeyRef:' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'name: {{ .Release.Name }}-db-password' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'key: password' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '- name: DB_PORT' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + 'valueFrom:' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'configMapKeyRef:' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'name: {{ .Release.Name }}-db-credentials' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'key: db-port' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '- name: DB_USER' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + 'valueFrom:' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'configMapKeyRef:' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'name: {{ .Release.Name }}-db-credentials' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'key: db-user' + '\n'
-
-        return output
+        return [
+            Comment('Database credentials'),
+            self.create_env_var_from('DB_HOST', 'configMapKeyRef', '{{ .Release.Name }}-db-credentials', 'db-host'),
+            self.create_env_var_from('DB_NAME', 'configMapKeyRef', '{{ .Release.Name }}-db-credentials', 'db-name'),
+            self.create_env_var_from('DB_PASSWORD', 'secretKeyRef', '{{ .Release.Name }}-db-password', 'password'),
+            self.create_env_var_from('DB_PORT', 'configMapKeyRef', '{{ .Release.Name }}-db-credentials', 'db-port'),
+            self.create_env_var_from('DB_USER', 'configMapKeyRef', '{{ .Release.Name }}-db-credentials', 'db-user')
+        ]
     
-    def create_nosql_deployment_env_vars(self) -> str:
+    def create_nosql_deployment_env_vars(self) -> list:
         """Creates the NoSQL related environment variables for the Deployment."""
 
-        output = ''
-
-        output += '  ' + '  ' + '  ' + '  ' + '# NoSQL Credentials' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '{{- if eq .Values.nosql.type "mongodb" }}' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '- name: STORAGE_ACCOUNT_CONNECTION_STRING' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + 'valueFrom:' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'secretKeyRef:' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'name: {{ .Release.Name }}-mongo-credentials' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'key: connection-string' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '{{- else if eq .Values.nosql.type "azure" }}' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '- name: STORAGE_ACCOUNT_KEY' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + 'valueFrom:' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'secretKeyRef:' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'name: {{ .Release.Name }}-azure-tables-credentials' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'key: key' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '- name: STORAGE_ACCOUNT_NAME' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + 'valueFrom:' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'configMapKeyRef:' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'name: {{ .Release.Name }}-azure-tables-config' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'key: name' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '{{- end }}' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '# NoSQL Table Names' + '\n'
+        output = [
+            Comment('NoSQL Credentials'),
+            Directive('{{- if eq .Values.nosql.type "mongodb" }}'),
+            self.create_env_var_from('STORAGE_ACCOUNT_CONNECTION_STRING', 'secretKeyRef', '{{ .Release.Name }}-mongo-credentials', 'connection-string'),
+            Directive('{{- else if eq .Values.nosql.type "azure" }}'),
+            self.create_env_var_from('STORAGE_ACCOUNT_KEY', 'secretKeyRef', '{{ .Release.Name }}-azure-tables-credentials', 'key'),
+            self.create_env_var_from('STORAGE_ACCOUNT_NAME', 'configMapKeyRef', '{{ .Release.Name }}-azure-tables-config', 'name'),
+            Directive('{{- end }}'),
+            Comment('NoSQL Table Names')
+        ]
         
         for key, value in self.nosql.tables.items():
-            output += '  ' + '  ' + '  ' + '  ' + f'- name: {key.upper()}' + '\n'
-            output += '  ' + '  ' + '  ' + '  ' + '  ' + 'valueFrom:' + '\n'
-            output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'configMapKeyRef:' + '\n'
-            output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'name: {{ .Release.Name }}-storage-tables' + '\n'
-            output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + f'key: {value["name"]}' + '\n'
+            output.append(self.create_env_var_from(key.upper(), 'configMapKeyRef', '{{ .Release.Name }}-storage-tables', value['name']))
         
         return output
 
-    def create_secret_vault_deployment_env_vars(self) -> str:
+    def create_secret_vault_deployment_env_vars(self) -> list:
         """Creates the secret vault related environment variables for the Deployment."""
 
-        output = ''
-        
-        output += '  ' + '  ' + '  ' + '  ' + '# -- Secrets Vault (Hashicorp Vault OR Azure Key Vault) --' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '{{- if .Values.vault.enabled }}' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '{{- if eq .Values.vault.type "azure" }}' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '- name: KEYVAULT_CLIENT_ID' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + 'valueFrom:' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'secretKeyRef:' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'name: {{ .Release.Name }}-vault-secret' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'key: client-id' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '- name: KEYVAULT_CLIENT_SECRET' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + 'valueFrom:' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'secretKeyRef:' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'name: {{ .Release.Name }}-vault-secret' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'key: client-secret' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '- name: KEYVAULT_NAME' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + 'valueFrom:' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'secretKeyRef:' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'name: {{ .Release.Name }}-vault-secret' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'key: name' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '- name: KEYVAULT_TENANT_ID' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + 'valueFrom:' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'secretKeyRef:' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'name: {{ .Release.Name }}-vault-secret' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'key: tenant-id' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '{{- else if eq .Values.vault.type "hashicorp" }}' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '- name: VAULT_NAME' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + 'valueFrom:' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'secretKeyRef:' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'name: {{ .Release.Name }}-vault-secret' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'key: vault-name' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '- name: VAULT_PORT' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + 'valueFrom:' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'secretKeyRef:' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'name: {{ .Release.Name }}-vault-secret' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'key: vault-port' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '{{- end }}' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '{{- end }}' + '\n'
+        return [
+            Comment('-- Secrets Vault (Hashicorp Vault OR Azure Key Vault) --'),
+            Directive('{{- if .Values.vault.enabled }}'),
+            Directive('{{- if eq .Values.vault.type "azure" }}'),
+            self.create_env_var_from('KEYVAULT_CLIENT_ID', 'secretKeyRef', '{{ .Release.Name }}-vault-secret', 'client-id'),
+            self.create_env_var_from('KEYVAULT_CLIENT_SECRET', 'secretKeyRef', '{{ .Release.Name }}-vault-secret', 'client-secret'),
+            self.create_env_var_from('KEYVAULT_NAME', 'secretKeyRef', '{{ .Release.Name }}-vault-secret', 'name'),
+            self.create_env_var_from('KEYVAULT_TENANT_ID', 'secretKeyRef', '{{ .Release.Name }}-vault-secret', 'tenant-id'),
+            Directive('{{- else if eq .Values.vault.type "hashicorp" }}'),
+            self.create_env_var_from('VAULT_NAME', 'secretKeyRef', '{{ .Release.Name }}-vault-secret', 'vault-name'),
+            self.create_env_var_from('VAULT_PORT', 'secretKeyRef', '{{ .Release.Name }}-vault-secret', 'vault-port'),
+            Directive('{{- end }}'),
+            Directive('{{- end }}')
+        ]
 
-        return output
-
-    def create_cache_deployment_env_vars(self) -> str:
+    def create_cache_deployment_env_vars(self) -> list:
         """Creates the cache related environment variables for the Deployment."""
 
-        output = ''
-
-        output += '  ' + '  ' + '  ' + '  ' + '# Caching Server Variables' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '- name: CACHE_HOSTNAME' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + 'valueFrom:' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'configMapKeyRef:' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'name: {{ .Relese.name }}-cache-configmap' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'key: hostname' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '- name: CACHE_PORT' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + 'valueFrom:' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'configMapKeyRef:' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'name: {{ .Release.Name }}-cache-configmap' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'key: port' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '- name: CACHE_PASSWORD' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + 'valueFrom:' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'secretKeyRef:' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'name: {{ .Release.Name }}-cache-credentials' + '\n'
-        output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'key: password' + '\n'
-
-        return output
+        return [
+            Comment('Caching Server Variables'),
+            self.create_env_var_from('CACHE_HOSTNAME', 'configMapKeyRef', '{{ .Release.Name }}-cache-configmap', 'hostname'),
+            self.create_env_var_from('CACHE_PORT', 'configMapKeyRef', '{{ .Release.Name }}-cache-configmap', 'port'),
+            self.create_env_var_from('CACHE_PASSWORD', 'secretKeyRef', '{{ .Release.Name }}-cache-credentials', 'password')
+        ]
     
-    def create_third_party_services_deployment_env_vars(self) -> str:
+    def create_third_party_services_deployment_env_vars(self) -> list:
         """Creates the third party services related environment variables for the Deployment."""
         
-        output = ''
+        output = [Comment('Third-Party Integrations')]
 
-        output += '  ' + '  ' + '  ' + '  ' + '# Third-Party Integrations' + '\n'
         for third_party in self.third_party_services:
-            output += '  ' + '  ' + '  ' + '  ' + '{{- if .Values.thirdParty.' + third_party.name + '.enabled }}' + '\n'
+            output.append(Directive('{{- if .Values.thirdParty.' + third_party.name + '.enabled }}'))
                 
             for var in third_party.vars:
-                output += '  ' + '  ' + '  ' + '  ' + '- name: ' + third_party.name.upper() + '_' + var.upper() + '\n'
-                output += '  ' + '  ' + '  ' + '  ' + '  ' + 'valueFrom:' + '\n'
-                output += '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'secretKeyRef:' + '\n'
-                output += '  ' + '  '  '  ' + '  ' + '  ' + '  ' + '  ' + 'name: {{ .Release.Name }}-' + third_party.name + '-secret' + '\n'
-                output += '  ' + '  '  '  ' + '  ' + '  ' + '  ' + '  ' + f'key: {var.replace("_", "-")}' + '\n'
+                output.append(self.create_env_var_from(third_party.name.upper() + '_' + var.upper(), 'secretKeyRef', '{{ .Release.Name }}-' + third_party.name + '-secret', var.replace('_', '-')))
                 
-            output += '  ' + '  ' + '  ' + '  ' + '{{- end }}' + '\n'
+            output.append(Directive('{{- end }}'))
         
         return output
     
-    def write_deployment_file(self):
+    def write_deployment_file(self, files: VirtualFileTree):
         """Writes the Deployment file for the app."""
 
-        with open(f'templates/deployment.yaml', 'w') as f:
-            f.write('apiVersion: apps/v1' + '\n')
-            f.write('kind: Deployment' + '\n')
-            f.write('metadata:' + '\n')
-            f.write('  ' + 'name: {{ .Release.Name }}' + '\n')
-            f.write('  ' + 'labels:' + '\n')
-            f.write('  ' + '  ' + 'app: {{ .Release.Name }}' + '\n')
-            f.write('spec:' + '\n')
-            f.write('  ' + 'replicas: {{ .Values.replicaCount }}' + '\n')
-            f.write('  ' + 'selector:' + '\n')
-            f.write('  ' + '  ' + 'matchLabels:' + '\n')
-            f.write('  ' + '  ' + '  ' + 'app: {{ .Release.Name }}' + '\n')
-            f.write('  ' + 'template:' + '\n')
-            f.write('  ' + '  ' + 'metadata:' + '\n')
-            f.write('  ' + '  ' + '  ' + 'labels:' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + 'app: {{ .Release.Name }}' + '\n')
-            f.write('  ' + '  ' + 'spec:' + '\n')
-            f.write('  ' + '  ' + '  ' + 'containers:' + '\n')
-            f.write('  ' + '  ' + '  ' + '- name: {{ .Release.Name }}' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + 'image: {{ .Values.image.repository }}:{{ .Values.image.tag }}' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + 'imagePullPolicy: {{ .Values.image.pullPolicy }}' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + 'ports:' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '- containerPort: {{ .Values.container.port }}' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + 'env:' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '- name: NODE_ENV' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + 'value: {{ .Values.container.env }}' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '- name: PORT' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + 'value: "{{ .Values.container.port }}"' + '\n')
-            
-            # Add extra environment variables
-            f.write(self.create_extra_env_vars_deployment_env_vars())
+        env = Sequence([
+            { 'name': 'NODE_ENV', 'value': '{{ .Values.container.env }}' },
+            { 'name': 'PORT', 'value': Quoted('{{ .Values.container.port }}') }
+        ])
 
-            if self.uses_oauth:
-                f.write(self.create_oauth_deployment_env_vars())
-            
-            if self.uses_db:
-                f.write(self.create_db_deployment_env_vars())
-            
-            if self.nosql is not None:
-                f.write(self.create_nosql_deployment_env_vars())
-            
-            if self.uses_secrets_vault:
-                f.write(self.create_secret_vault_deployment_env_vars()) 
+        # Add extra environment variables
+        env.extend(self.create_extra_env_vars_deployment_env_vars())
 
-            if self.uses_cache:
-                f.write(self.create_cache_deployment_env_vars())
-            
-            if len(self.third_party_services) > 0:
-                f.write(self.create_third_party_services_deployment_env_vars())
-            
-            # Because of the way we implement Hashicorp Vault we need to mount the role_vars shared volume 
-            # This is because the Vault container populates this shared volume with the app credentials. 
-            # It's done this way because we don't know the credentials needed to access the vault at start time (because their generated by the Vault container)
-            # So, we need a mechanism to get these credentials in relatively real-time once they've been generated
-            if self.uses_secrets_vault:
-                f.write('  ' + '  ' + '  ' + '  ' + 'volumeMounts:' + '\n')
-                f.write('  ' + '  ' + '  ' + '  ' + '- name: role-vars' + '\n')
-                f.write('  ' + '  ' + '  ' + '  ' + '  ' + 'mountPath: /role_vars' + '\n')
-                f.write('  ' + '  ' + '  ' + '  ' + '  ' + 'readOnly: true' + '\n')
-                f.write('  ' + '  ' + '  ' + 'volumes:' + '\n')
-                f.write('  ' + '  ' + '  ' + '- name: role-vars' + '\n')
-                f.write('  ' + '  ' + '  ' + '  ' + 'persistentVolumeClaim:' + '\n')
-                f.write('  ' + '  ' + '  ' + '  ' + '  ' + 'claimName: {{ .Release.Name }}-vault-role-vars' + '\n')
+        if self.uses_oauth:
+            env.extend(self.create_oauth_deployment_env_vars())
+        
+        if self.uses_db:
+            env.extend(self.create_db_deployment_env_vars())
+        
+        if self.nosql is not None:
+            env.extend(self.create_nosql_deployment_env_vars())
+        
+        if self.uses_secrets_vault:
+            env.extend(self.create_secret_vault_deployment_env_vars())
+
+        if self.uses_cache:
+            env.extend(self.create_cache_deployment_env_vars())
+        
+        if len(self.third_party_services) > 0:
+            env.extend(self.create_third_party_services_deployment_env_vars())
+
+        container = Mapping({
+            'name': '{{ .Release.Name }}',
+            'image': '{{ .Values.image.repository }}:{{ .Values.image.tag }}',
+            'imagePullPolicy': '{{ .Values.image.pullPolicy }}',
+            'ports': [
+                { 'containerPort': '{{ .Values.container.port }}' }
+            ],
+            'env': env
+        })
+
+        if self.consolidate_env_vars:
+            env_from = self.create_extra_env_vars_deployment_env_from()
+            if len(env_from) > 0:
+                container.add('envFrom', env_from)
+
+        pod_spec = Mapping({ 'containers': [container] })
+        
+        # Because of the way we implement Hashicorp Vault we need to mount the role_vars shared volume 
+        # This is because the Vault container populates this shared volume with the app credentials. 
+        # It's done this way because we don't know the credentials needed to access the vault at start time (because their generated by the Vault container)
+        # So, we need a mechanism to get these credentials in relatively real-time once they've been generated
+        if self.uses_secrets_vault:
+            container.add('volumeMounts', [
+                {
+                    'name': 'role-vars',
+                    'mountPath': '/role_vars',
+                    'readOnly': True
+                }
+            ])
+            pod_spec.add('volumes', [
+                {
+                    'name': 'role-vars',
+                    'persistentVolumeClaim': {
+                        'claimName': '{{ .Release.Name }}-vault-role-vars'
+                    }
+                }
+            ])
+
+        self.write_document(files, 'templates/deployment.yaml', {
+            'apiVersion': 'apps/v1',
+            'kind': 'Deployment',
+            'metadata': {
+                'name': '{{ .Release.Name }}',
+                'labels': self.create_labels()
+            },
+            'spec': {
+                'replicas': '{{ .Values.replicaCount }}',
+                'selector': {
+                    'matchLabels': self.create_selector_labels()
+                },
+                'template': {
+                    'metadata': {
+                        'labels': self.create_selector_labels()
+                    },
+                    'spec': pod_spec
+                }
+            }
+        })
     
-    def write(self):
+    def write(self, files: VirtualFileTree):
         """Writes files related to the Deployment of the app."""
         
         # Create any needed secrets or configmaps for the extra environment variables
-        self.write_extra_env_vars_files()
+        self.write_extra_env_vars_files(files)
 
         # Create the Deployment file
-        self.write_deployment_file()
\ No newline at end of file
+        self.write_deployment_file(files)
\ No newline at end of file
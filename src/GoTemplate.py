@@ -0,0 +1,790 @@
+import base64, re
+
+# The top level objects Helm gives every template
+BUILT_IN_OBJECTS = ('Values', 'Release', 'Chart', 'Capabilities', 'Template', 'Files')
+
+# A `printf` verb (Ex. `%s`, `%d`, `%-5v`)
+PRINTF_VERB = re.compile(r'%([-+# 0]*)(\d*)(?:\.(\d+))?([a-zA-Z%])')
+
+# The tokens of an action (Ex. `if and (eq .Values.type "redis") .Values.create`)
+TOKEN = re.compile(r'''\s*(?:
+    (?P<string>"(?:[^"\\]|\\.)*")|
+    (?P<raw>`[^`]*`)|
+    (?P<field>(?:\.[A-Za-z_][A-Za-z0-9_]*)+|\.)|
+    (?P<number>[-+]?(?:0x[0-9a-fA-F]+|\d+(?:\.\d+)?(?:[eE][-+]?\d+)?))|
+    (?P<identifier>[A-Za-z_][A-Za-z0-9_]*)|
+    (?P<symbol>[()|])
+)''', re.VERBOSE)
+
+# The escape sequences of Go string literals (the common subset)
+STRING_ESCAPES = { '\\': '\\', '"': '"', 'n': '\n', 't': '\t', 'r': '\r' }
+
+def unquote_string(literal: str) -> str:
+    """Get the value of a Go (double quoted) string literal.
+
+    Args:
+        literal (str): The literal (including the quotes).
+
+    Returns:
+        str: The value of the literal
+    """
+
+    return re.sub(r'\\(.)', lambda match: STRING_ESCAPES.get(match.group(1), match.group(1)), literal[1:-1])
+
+class Field:
+    def __init__(self, path: list[str]):
+        """A field reference (Ex. `.Values.cache.type`).
+
+        Args:
+            path (list[str]): The names of the fields (Ex. `['Values', 'cache', 'type']`). Empty for the dot (`.`) itself.
+        """
+
+        self.path = path
+
+    def __str__(self) -> str:
+        return '.' + '.'.join(self.path)
+
+class Function:
+    def __init__(self, name: str):
+        """A reference to a function (Ex. `eq`).
+
+        Args:
+            name (str): The name of the function.
+        """
+
+        self.name = name
+
+    def __str__(self) -> str:
+        return self.name
+
+class Pipeline:
+    def __init__(self, commands: list[list]):
+        """A pipeline (Ex. `.Values.name | b64enc`).
+
+        Args:
+            commands (list[list]): The commands of the pipeline, each a list of operands (literals, `Field`s, `Function`s and nested `Pipeline`s).
+        """
+
+        self.commands = commands
+
+    def __str__(self) -> str:
+        return ' | '.join(' '.join(f'({operand})' if isinstance(operand, Pipeline) else (f'"{operand}"' if isinstance(operand, str) else str(operand)) for operand in command) for command in self.commands)
+
+class Action:
+    def __init__(self, pipeline: Pipeline, line: int):
+        """An action that outputs the value of a pipeline (Ex. `{{ .Release.Name }}`).
+
+        Args:
+            pipeline (Pipeline): The pipeline.
+            line (int): The line the action is on.
+        """
+
+        self.pipeline = pipeline
+        self.line = line
+
+class If:
+    def __init__(self, line: int):
+        """An `if` (and any `else if`s and `else`) block.
+
+        Args:
+            line (int): The line the `if` is on.
+        """
+
+        self.line = line
+        # The condition and body of the `if` and each `else if`
+        self.branches: list[tuple[Pipeline, list]] = []
+        self.otherwise: list | None = None
+
+class Define:
+    def __init__(self, name: str, line: int):
+        """A named template (`{{ define "<name>" }}...{{ end }}`), which other templates can `include` (or render with `template`).
+
+        Args:
+            name (str): The name of the template.
+            line (int): The line the `define` is on.
+        """
+
+        self.name = name
+        self.line = line
+        self.body: list = []
+
+        # The template the named template was defined in (see `GoTemplate`), which it's rendered (and errors are reported) with
+        self.owner: 'GoTemplate | None' = None
+
+def tokenize(text: str, line: int) -> list[tuple[str, object]]:
+    """Split the text of an action into tokens.
+
+    Args:
+        text (str): The text of the action (without the delimiters or trim markers).
+        line (int): The line the action is on (for errors).
+
+    Returns:
+        list[tuple[str, Any]]: The kind and value of each token
+    """
+
+    tokens = []
+    position = 0
+    text = text.rstrip()
+
+    while position < len(text):
+        match = TOKEN.match(text, position)
+        if match is None or match.end() == position:
+            raise Exception(f'{line}: unexpected "{text[position:].strip()[:20]}" in "{text}"')
+
+        kind = match.lastgroup
+        value = match.group(kind)
+
+        # A field has to be separated from what's before it (`.Values.name` not `x.Values.name`)
+        if kind == 'field' and position > 0 and match.start(kind) == position and not text[position - 1].isspace() and text[position - 1] not in '(|':
+            raise Exception(f'{line}: unexpected "{value}" in "{text}"')
+
+        if kind == 'string':
+            tokens.append(('literal', unquote_string(value)))
+        elif kind == 'raw':
+            tokens.append(('literal', value[1:-1]))
+        elif kind == 'field':
+            tokens.append(('field', Field([] if value == '.' else value[1:].split('.'))))
+        elif kind == 'number':
+            tokens.append(('literal', float(value) if '.' in value or 'e' in value.lower() and not value.lower().startswith('0x') else int(value, 0)))
+        elif kind == 'identifier':
+            if value in ('true', 'false'):
+                tokens.append(('literal', value == 'true'))
+            elif value == 'nil':
+                tokens.append(('literal', None))
+            else:
+                tokens.append(('identifier', value))
+        else:
+            tokens.append(('symbol', value))
+
+        position = match.end()
+
+    return tokens
+
+def parse_pipeline(tokens: list[tuple[str, object]], position: int, line: int, nested: bool = False) -> tuple[Pipeline, int]:
+    """Parse a pipeline from a list of tokens.
+
+    Args:
+        tokens (list[tuple[str, Any]]): The tokens.
+        position (int): The index of the first token of the pipeline.
+        line (int): The line the action is on (for errors).
+        nested (bool, Optional): If the pipeline is in parentheses (so ends at the closing parenthesis). Default False
+
+    Returns:
+        tuple[Pipeline, int]: The pipeline and the index of the first token after it
+    """
+
+    commands = [[]]
+
+    while position < len(tokens):
+        kind, value = tokens[position]
+
+        if kind == 'symbol' and value == ')':
+            if not nested:
+                raise Exception(f'{line}: unexpected ")"')
+            break
+        elif kind == 'symbol' and value == '(':
+            pipeline, position = parse_pipeline(tokens, position + 1, line, True)
+            if position >= len(tokens):
+                raise Exception(f'{line}: unclosed "("')
+            commands[-1].append(pipeline)
+        elif kind == 'symbol' and value == '|':
+            if len(commands[-1]) == 0:
+                raise Exception(f'{line}: missing command before "|"')
+            commands.append([])
+        elif kind == 'identifier':
+            commands[-1].append(Function(value))
+        else:
+            commands[-1].append(value)
+
+        position += 1
+
+    if len(commands[-1]) == 0:
+        raise Exception(f'{line}: missing value for command')
+
+    return (Pipeline(commands), position)
+
+def parse_expression(text: str, line: int) -> Pipeline:
+    """Parse the pipeline of an action.
+
+    Args:
+        text (str): The text of the pipeline.
+        line (int): The line the action is on (for errors).
+
+    Returns:
+        Pipeline: The pipeline
+    """
+
+    tokens = tokenize(text, line)
+    pipeline, position = parse_pipeline(tokens, 0, line)
+
+    if position < len(tokens):
+        raise Exception(f'{line}: unexpected "{tokens[position][1]}"')
+
+    return pipeline
+
+def lex(source: str) -> list[tuple[str, str, int]]:
+    """Split a template into text and actions (applying the `{{-`/`-}}` trim markers).
+
+    Args:
+        source (str): The template.
+
+    Returns:
+        list[tuple[str, str, int]]: The kind (`text` or `action`), content and line of each piece
+    """
+
+    pieces = []
+    position = 0
+    line = 1
+
+    while True:
+        start = source.find('{{', position)
+        if start == -1:
+            pieces.append(('text', source[position:], line))
+            break
+
+        text = source[position:start]
+        action_line = line + text.count('\n')
+
+        # Find the end of the action (skipping over any string literals, which could contain `}}`)
+        end = start + 2
+        quote = None
+        while end < len(source):
+            if quote is not None:
+                if source[end] == '\\' and quote == '"':
+                    end += 1
+                elif source[end] == quote:
+                    quote = None
+            elif source[end] in '"`':
+                quote = source[end]
+            elif source.startswith('}}', end):
+                break
+            end += 1
+
+        if end >= len(source):
+            raise Exception(f'{action_line}: unclosed action')
+
+        content = source[start + 2:end]
+
+        if content.startswith('- ') or content.startswith('-\n') or content == '-':
+            text = text.rstrip()
+            content = content[1:]
+
+        trim_right = content.endswith(' -') or content.endswith('\n-')
+        if trim_right:
+            content = content[:-1]
+
+        pieces.append(('text', text, line))
+        pieces.append(('action', content.strip(), action_line))
+
+        line = action_line + source[start:end + 2].count('\n')
+        position = end + 2
+
+        if trim_right:
+            rest = source[position:]
+            stripped = rest.lstrip()
+            line += rest[:len(rest) - len(stripped)].count('\n')
+            position += len(rest) - len(stripped)
+
+    return pieces
+
+def parse_template_name(text: str, keyword: str, line: int) -> tuple[str, str]:
+    """Parse the name of a named template from the start of a `define` or `template` action.
+
+    Args:
+        text (str): The rest of the action (after the keyword).
+        keyword (str): The keyword (for errors).
+        line (int): The line the action is on (for errors).
+
+    Returns:
+        tuple[str, str]: The name and the rest of the action after it
+    """
+
+    match = TOKEN.match(text)
+    if match is None or match.lastgroup not in ('string', 'raw'):
+        raise Exception(f'{line}: missing name of the template in {{{{{keyword}}}}}')
+
+    value = match.group(match.lastgroup)
+
+    return (unquote_string(value) if match.lastgroup == 'string' else value[1:-1], text[match.end():])
+
+def parse(source: str, defines: dict[str, Define] | None = None) -> list:
+    """Parse a template into a tree of text, `Action`s and `If`s.
+
+    Args:
+        source (str): The template.
+        defines (dict[str, Define], Optional): Where to add the named templates the template defines (by name). Default None (they're discarded)
+
+    Returns:
+        list: The nodes of the template
+    """
+
+    root = []
+    # The open `if`s (and `define`s) and the body currently being added to
+    stack: list[tuple[If | Define, list]] = []
+    body = root
+
+    if defines is None:
+        defines = {}
+
+    for kind, content, line in lex(source):
+        if kind == 'text':
+            if content != '':
+                body.append(content)
+            continue
+
+        if content.startswith('/*'):
+            if not content.endswith('*/'):
+                raise Exception(f'{line}: unclosed comment')
+            continue
+
+        keyword, _, rest = content.partition(' ')
+        keyword = keyword.strip()
+
+        if keyword == 'if':
+            block = If(line)
+            block.branches.append((parse_expression(rest, line), []))
+            body.append(block)
+            stack.append((block, body))
+            body = block.branches[-1][1]
+        elif keyword == 'else':
+            if len(stack) == 0 or not isinstance(stack[-1][0], If) or stack[-1][0].otherwise is not None:
+                raise Exception(f'{line}: unexpected {{{{else}}}}')
+
+            block = stack[-1][0]
+            condition = rest.strip()
+            if condition.startswith('if ') or condition == 'if':
+                block.branches.append((parse_expression(condition[2:], line), []))
+                body = block.branches[-1][1]
+            elif condition == '':
+                block.otherwise = []
+                body = block.otherwise
+            else:
+                raise Exception(f'{line}: unexpected "{condition}" after {{{{else}}}}')
+        elif keyword == 'end':
+            if len(stack) == 0:
+                raise Exception(f'{line}: unexpected {{{{end}}}}')
+            _, body = stack.pop()
+        elif keyword == 'define':
+            # Like Go, named templates can only be defined at the top level
+            if len(stack) > 0:
+                raise Exception(f'{line}: unexpected {{{{define}}}} inside {{{{if}}}}')
+
+            name, rest = parse_template_name(rest, keyword, line)
+            if rest.strip() != '':
+                raise Exception(f'{line}: unexpected "{rest.strip()}" in {{{{define}}}}')
+
+            block = Define(name, line)
+            defines[name] = block
+            stack.append((block, body))
+            body = block.body
+        elif keyword == 'template':
+            # Rendering a named template is the same as including it (only `include`'s output can be piped)
+            name, rest = parse_template_name(rest, keyword, line)
+            argument = parse_expression(rest, line) if rest.strip() != '' else None
+            body.append(Action(Pipeline([[Function('include'), name, argument]]), line))
+        elif keyword in ('range', 'with', 'block'):
+            raise Exception(f'{line}: "{keyword}" isn\'t supported')
+        else:
+            body.append(Action(parse_expression(content, line), line))
+
+    if len(stack) > 0:
+        raise Exception(f'{stack[-1][0].line}: unclosed {{{{{"if" if isinstance(stack[-1][0], If) else "define"}}}}} (missing {{{{end}}}})')
+
+    return root
+
+def is_true(value) -> bool:
+    """Check if a value is "true" (the same way Go templates do, where false, 0, nil and empty strings/maps/lists are false).
+
+    Args:
+        value (Any): The value.
+
+    Returns:
+        bool: If the value is true
+    """
+
+    if value is None or value is False:
+        return False
+    elif isinstance(value, (int, float, str, dict, list)):
+        return bool(value)
+
+    return True
+
+def to_text(value) -> str:
+    """Format a value the way Go templates print it (Helm prints nil as an empty string).
+
+    Args:
+        value (Any): The value.
+
+    Returns:
+        str: The formatted value
+    """
+
+    if value is None:
+        return ''
+    elif isinstance(value, bool):
+        return 'true' if value else 'false'
+    elif isinstance(value, float) and value.is_integer() and abs(value) < 1e21:
+        return str(int(value))
+    elif isinstance(value, dict):
+        return 'map[' + ' '.join(f'{key}:{to_text(item)}' for key, item in sorted(value.items())) + ']'
+    elif isinstance(value, list):
+        return '[' + ' '.join(to_text(item) for item in value) + ']'
+
+    return str(value)
+
+def printf(format: str, *args) -> str:
+    """Go's `printf` (`fmt.Sprintf`) for the common verbs (`%s`, `%d`, `%v`, `%q`, `%f` and `%%`).
+
+    Args:
+        format (str): The format.
+        args (Any): The values.
+
+    Returns:
+        str: The formatted string
+    """
+
+    remaining = list(args)
+
+    def replace(match: re.Match) -> str:
+        flags, width, precision, verb = match.groups()
+        if verb == '%':
+            return '%'
+
+        if len(remaining) == 0:
+            return f'%!{verb}(MISSING)'
+        value = remaining.pop(0)
+
+        if verb == 'd':
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                return f'%!d({type(value).__name__}={to_text(value)})'
+            text = str(int(value))
+        elif verb == 'f':
+            text = f'{float(value):.{precision or 6}f}'
+        elif verb == 'q':
+            text = '"' + to_text(value).replace('\\', '\\\\').replace('"', '\\"') + '"'
+        else:
+            text = to_text(value)
+
+        return text.ljust(int(width)) if '-' in flags and width else text.rjust(int(width or 0), '0' if '0' in flags else ' ')
+
+    result = PRINTF_VERB.sub(replace, format)
+
+    if len(remaining) > 0:
+        result += '%!(EXTRA ' + ', '.join(to_text(value) for value in remaining) + ')'
+
+    return result
+
+def default(fallback, value=None):
+    return value if is_true(value) else fallback
+
+def eq(first, *others) -> bool:
+    if len(others) == 0:
+        raise Exception('want at least 2 args got 1')
+
+    # Go's template `eq` doesn't compare values of incompatible types (Ex. a string with a number)
+    for other in others:
+        if first is not None and other is not None and type(first) != type(other) and not (isinstance(first, (int, float)) and isinstance(other, (int, float)) and not isinstance(first, bool) and not isinstance(other, bool)):
+            raise Exception(f'incompatible types for comparison ({type(first).__name__} and {type(other).__name__})')
+
+    return any(first == other for other in others)
+
+def and_(*args):
+    for value in args:
+        if not is_true(value):
+            return value
+    return args[-1]
+
+def or_(*args):
+    for value in args:
+        if is_true(value):
+            return value
+    return args[-1]
+
+def required(message: str, value=None):
+    if value is None or value == '':
+        raise Exception(message)
+    return value
+
+# The functions templates can use (and the number of arguments each takes, None for any number)
+FUNCTIONS = {
+    'and': (and_, None),
+    'or': (or_, None),
+    'not': (lambda value: not is_true(value), 1),
+    'eq': (eq, None),
+    'ne': (lambda first, second: not eq(first, second), 2),
+    'len': (lambda value: len(value), 1),
+    'print': (lambda *args: ''.join(to_text(value) for value in args), None),
+    'printf': (printf, None),
+    'b64enc': (lambda value: base64.b64encode(to_text(value).encode('utf-8')).decode('ascii'), 1),
+    'b64dec': (lambda value: base64.b64decode(to_text(value)).decode('utf-8'), 1),
+    'quote': (lambda *args: ' '.join('"' + to_text(value).replace('\\', '\\\\').replace('"', '\\"') + '"' for value in args if value is not None), None),
+    'squote': (lambda *args: ' '.join('\'' + to_text(value) + '\'' for value in args if value is not None), None),
+    'default': (default, None),
+    'empty': (lambda value: not is_true(value), 1),
+    'required': (required, 2),
+    'dict': (lambda *args: { to_text(key): value for key, value in zip(args[::2], args[1::2]) }, None),
+    # Needs the named templates, so it's called on the template itself (see `GoTemplate.include`)
+    'include': (None, 2),
+    'upper': (lambda value: to_text(value).upper(), 1),
+    'lower': (lambda value: to_text(value).lower(), 1),
+    'trim': (lambda value: to_text(value).strip(), 1),
+    'toString': (lambda value: to_text(value), 1),
+    'indent': (lambda spaces, value: '\n'.join(' ' * spaces + line for line in to_text(value).split('\n')), 2),
+    'nindent': (lambda spaces, value: '\n' + '\n'.join(' ' * spaces + line for line in to_text(value).split('\n')), 2)
+}
+
+class GoTemplate:
+    def __init__(self, source: str, name: str = 'template', templates: dict[str, Define] | None = None):
+        """A (parsed) template using the subset of Go templates (and Sprig functions) that the generator uses.
+
+        Supported are text, `{{ pipeline }}` actions, `if`/`else if`/`else`/`end`, comments, the trim markers (`{{-`/`-}}`),
+        fields (Ex. `.Values.cache.type`), string/number/boolean literals, parentheses, pipes, the functions in `FUNCTIONS`
+        and named templates (`define`, `template` and `include`).
+
+        Like Helm, the named templates are shared by every template of a chart (Ex. those of the `_helpers.tpl` file).
+        So the templates of a chart are given the same `templates` and all of them should be parsed before any are rendered.
+
+        Errors are reported the same way Helm would (Ex. a field of a missing value or an argument given to something that isn't a function).
+
+        Args:
+            source (str): The template.
+            name (str, Optional): The name of the template (used in errors). Default 'template'
+            templates (dict[str, Define], Optional): The named templates (by name) shared with the other templates of the chart, the ones this template defines are added to it. Default None (only it's own)
+        """
+
+        self.name = name
+        self.templates = templates if templates is not None else {}
+
+        defines = {}
+
+        try:
+            self.nodes = parse(source, defines)
+        except Exception as e:
+            raise Exception(f'{name}:{e}')
+
+        for define in defines.values():
+            define.owner = self
+
+        self.templates.update(defines)
+
+    def evaluate_field(self, field: Field, context: dict, line: int):
+        """Get the value of a field.
+
+        Args:
+            field (Field): The field.
+            context (dict): The top level objects (`.`).
+            line (int): The line of the action (for errors).
+
+        Returns:
+            Any: The value of the field (None if the last key doesn't exist)
+        """
+
+        value = context
+        for name in field.path:
+            if value is None:
+                raise Exception(f'{self.name}:{line}: nil pointer evaluating interface {{}}.{name} (in {field})')
+            elif not isinstance(value, dict):
+                raise Exception(f'{self.name}:{line}: can\'t evaluate field {name} in type {type(value).__name__} (in {field})')
+
+            value = value.get(name)
+
+        return value
+
+    def evaluate(self, pipeline: Pipeline, context: dict, line: int):
+        """Get the value of a pipeline.
+
+        Args:
+            pipeline (Pipeline): The pipeline.
+            context (dict): The top level objects (`.`).
+            line (int): The line of the action (for errors).
+
+        Returns:
+            Any: The value of the pipeline
+        """
+
+        result = None
+        for index, command in enumerate(pipeline.commands):
+            first = command[0]
+
+            if isinstance(first, Function):
+                if first.name not in FUNCTIONS:
+                    raise Exception(f'{self.name}:{line}: function "{first.name}" not defined')
+
+                function, arity = FUNCTIONS[first.name]
+                if first.name == 'include':
+                    function = self.include
+
+                args = [self.evaluate_operand(operand, context, line) for operand in command[1:]]
+                if index > 0:
+                    # The result of the previous command is passed as the last argument
+                    args.append(result)
+
+                if arity is not None and len(args) != arity:
+                    raise Exception(f'{self.name}:{line}: wrong number of args for {first.name}: want {arity} got {len(args)}')
+                elif arity is None and len(args) == 0:
+                    raise Exception(f'{self.name}:{line}: wrong number of args for {first.name}: want at least 1 got 0')
+
+                try:
+                    result = function(*args)
+                except Exception as e:
+                    raise Exception(f'{self.name}:{line}: error calling {first.name}: {e}')
+            else:
+                if len(command) > 1 or index > 0:
+                    raise Exception(f'{self.name}:{line}: can\'t give argument to non-function {first}')
+
+                result = self.evaluate_operand(first, context, line)
+
+        return result
+
+    def include(self, name: str, value) -> str:
+        """Render a named template (the `include` function).
+
+        Args:
+            name (str): The name of the template.
+            value (Any): The dot (`.`) of the template.
+
+        Returns:
+            str: The rendered template
+        """
+
+        if name not in self.templates:
+            raise Exception(f'no template "{name}" associated with template "{self.name}"')
+
+        define = self.templates[name]
+
+        output = []
+        define.owner.execute(define.body, value, output)
+        return ''.join(output)
+
+    def evaluate_operand(self, operand, context: dict, line: int):
+        """Get the value of an operand of a command.
+
+        Args:
+            operand (Any): The operand (a literal, `Field`, `Function` or `Pipeline`).
+            context (dict): The top level objects (`.`).
+            line (int): The line of the action (for errors).
+
+        Returns:
+            Any: The value of the operand
+        """
+
+        if isinstance(operand, Field):
+            return self.evaluate_field(operand, context, line)
+        elif isinstance(operand, Pipeline):
+            return self.evaluate(operand, context, line)
+        elif isinstance(operand, Function):
+            # A function without arguments (Ex. `(now)`)
+            return self.evaluate(Pipeline([[operand]]), context, line)
+
+        return operand
+
+    def execute(self, nodes: list, context: dict, output: list[str]):
+        """Render a list of nodes.
+
+        Args:
+            nodes (list): The nodes.
+            context (dict): The top level objects (`.`).
+            output (list[str]): The rendered pieces to add to.
+        """
+
+        for node in nodes:
+            if isinstance(node, str):
+                output.append(node)
+            elif isinstance(node, Action):
+                output.append(to_text(self.evaluate(node.pipeline, context, node.line)))
+            else:
+                for condition, body in node.branches:
+                    if is_true(self.evaluate(condition, context, node.line)):
+                        self.execute(body, context, output)
+                        break
+                else:
+                    if node.otherwise is not None:
+                        self.execute(node.otherwise, context, output)
+
+    def render(self, context: dict) -> str:
+        """Render the template.
+
+        Args:
+            context (dict): The top level objects (`.`, Ex. `{ 'Values': ..., 'Release': ... }`).
+
+        Returns:
+            str: The rendered template
+        """
+
+        output = []
+        self.execute(self.nodes, context, output)
+        return ''.join(output)
+
+    def check(self, values: dict) -> list[str]:
+        """Find problems in every branch of the template (including the ones that wouldn't be rendered with the given values).
+
+        - References to top level objects that don't exist (Ex. `.values` instead of `.Values`)
+        - Values whose parent isn't defined in the `values.yaml` file (Ex. `.Values.missing.port`, which always fails when `missing` isn't set)
+        - Arguments given to something that isn't a function (Ex. `(.Values.type "redis")` instead of `(eq .Values.type "redis")`)
+        - Functions (and named templates) that don't exist
+
+        The named templates the template defines are checked too, except for their fields (their dot is whatever they're given).
+
+        Args:
+            values (dict): The default values (the contents of the `values.yaml` file).
+
+        Returns:
+            list[str]: The problems found
+        """
+
+        problems = []
+
+        def check_pipeline(pipeline: Pipeline, line: int):
+            for index, command in enumerate(pipeline.commands):
+                first = command[0]
+                if isinstance(first, Function):
+                    if first.name not in FUNCTIONS:
+                        problems.append(f'{self.name}:{line}: function "{first.name}" not defined')
+                    elif first.name == 'include' and len(command) > 1 and isinstance(command[1], str) and command[1] not in self.templates:
+                        problems.append(f'{self.name}:{line}: no template "{command[1]}" associated with template "{self.name}"')
+                elif len(command) > 1 or index > 0:
+                    problems.append(f'{self.name}:{line}: can\'t give argument to non-function {first}')
+
+                for operand in command:
+                    if isinstance(operand, Pipeline):
+                        check_pipeline(operand, line)
+                    elif isinstance(operand, Field) and len(operand.path) > 0 and check_fields:
+                        check_field(operand, line)
+
+        def check_field(field: Field, line: int):
+            if field.path[0] not in BUILT_IN_OBJECTS:
+                problems.append(f'{self.name}:{line}: unknown object .{field.path[0]} (in {field})')
+                return
+
+            if field.path[0] != 'Values':
+                return
+
+            # Only the parents need to exist, the value itself can be left out (and be empty)
+            value = values
+            for depth, name in enumerate(field.path[1:-1], start=1):
+                if not isinstance(value, dict) or value.get(name) is None:
+                    problems.append(f'{self.name}:{line}: .{".".join(field.path[:depth + 1])} isn\'t defined in values.yaml (in {field})')
+                    return
+                value = value[name]
+
+        check_fields = True
+
+        def check_nodes(nodes: list):
+            for node in nodes:
+                if isinstance(node, Action):
+                    check_pipeline(node.pipeline, node.line)
+                elif isinstance(node, If):
+                    for condition, body in node.branches:
+                        check_pipeline(condition, node.line)
+                        check_nodes(body)
+                    if node.otherwise is not None:
+                        check_nodes(node.otherwise)
+
+        check_nodes(self.nodes)
+
+        check_fields = False
+        for define in self.templates.values():
+            if define.owner is self:
+                check_nodes(define.body)
+
+        return problems
@@ -1,4 +1,6 @@
 from .SecretsVault import SecretsVault
+from .VirtualFileTree import VirtualFileTree
+from .YAML import Comment, Directive, Mapping
 
 class HashicorpVault(SecretsVault):
     def __init__(self, create: bool = True, image: dict[str, str] | None = None, hostname: str | None = None, port: int = 8200, storage_class: str | None = None, storage_size: str = '512Mi'):
@@ -11,151 +13,185 @@ class HashicorpVault(SecretsVault):
         self.storage_class = storage_class
         self.storage_size = storage_size
     
-    def write_ingress(self):
-        with open('templates/vault-ingress.yaml', 'w') as f:
-            f.write('{{- if .Values.vault.create.ingress.enabled -}}' + '\n')
-            f.write('apiVersion: networking.k8s.io/v1' + '\n')
-            f.write('kind: Ingress' + '\n')
-            f.write('metadata:' + '\n')
-            f.write('  ' + 'name: {{ .Release.Name }}-vault-ingress' + '\n')
-            f.write('  ' + 'labels:' + '\n')
-            f.write('  ' + '  ' + 'app: {{ .Release.Name }}-vault' + '\n')
-            f.write('spec:' + '\n')
-            f.write('  ' + 'ingressClassName: nginx' + '\n')
-            f.write('  ' + 'rules:' + '\n')
-            f.write('  ' + '  ' + '- host: {{ .Values.vault.create.ingress.host }}' + '\n')
-            f.write('  ' + '  ' + '  ' + 'http:' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + 'paths:' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '- path: /' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + 'pathType: Prefix' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + 'backend:' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'service:' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'name: {{ .Release.Name }}-vault' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'port:' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'number: 80' + '\n')
-            f.write('{{- end -}}')
+    def get_config(self) -> dict:
+        """None of the attributes affect the rendered files (everything comes from the `values.yaml` file)."""
+
+        return {}
+    
+    def write_ingress(self, files: VirtualFileTree):
+        self.write_document(files, 'templates/vault-ingress.yaml', Directive('{{- if .Values.vault.create.ingress.enabled -}}'), {
+            'apiVersion': 'networking.k8s.io/v1',
+            'kind': 'Ingress',
+            'metadata': {
+                'name': '{{ .Release.Name }}-vault-ingress',
+                'labels': {
+                    'app': '{{ .Release.Name }}-vault'
+                }
+            },
+            'spec': {
+                'ingressClassName': 'nginx',
+                'rules': [
+                    {
+                        'host': '{{ .Values.vault.create.ingress.host }}',
+                        'http': {
+                            'paths': [
+                                {
+                                    'path': '/',
+                                    'pathType': 'Prefix',
+                                    'backend': {
+                                        'service': {
+                                            'name': '{{ .Release.Name }}-vault',
+                                            'port': {
+                                                'number': 80
+                                            }
+                                        }
+                                    }
+                                }
+                            ]
+                        }
+                    }
+                ]
+            }
+        }, Directive('{{- end -}}'))
     
-    def write_service(self):
-        with open('templates/vault-service.yaml', 'w') as f:
-            f.write('{{- if .Values.vault.create.enabled -}}' + '\n')
-            f.write('apiVersion: v1' + '\n')
-            f.write('kind: Service' + '\n')
-            f.write('metadata:' + '\n')
-            f.write('  ' + 'name: {{ .Release.Name }}-vault' + '\n')
-            f.write('  ' + 'labels:' + '\n')
-            f.write('  ' + '  ' + 'app: {{ .Release.Name }}-vault' + '\n')
-            f.write('spec:' + '\n')
-            f.write('  ' + 'selector:' + '\n')
-            f.write('  ' + '  ' + 'app: {{ .Release.Name }}-vault' + '\n')
-            f.write('  ' + 'ports:' + '\n')
-            f.write('  ' + '  ' + '- protocol: TCP' + '\n')
-            f.write('  ' + '  ' + '  ' + 'port: 80' + '\n')
-            f.write('  ' + '  ' + '  ' + 'targetPort: 8200' + '\n') 
-            f.write('{{- end -}}')
+    def write_service(self, files: VirtualFileTree):
+        self.write_document(files, 'templates/vault-service.yaml', Directive('{{- if .Values.vault.create.enabled -}}'), {
+            'apiVersion': 'v1',
+            'kind': 'Service',
+            'metadata': {
+                'name': '{{ .Release.Name }}-vault',
+                'labels': {
+                    'app': '{{ .Release.Name }}-vault'
+                }
+            },
+            'spec': {
+                'selector': {
+                    'app': '{{ .Release.Name }}-vault'
+                },
+                'ports': [
+                    {
+                        'protocol': 'TCP',
+                        'port': 80,
+                        'targetPort': 8200
+                    }
+                ]
+            }
+        }, Directive('{{- end -}}'))
     
-    def write_role_vars_persistent_volume_claim(self):
-        with open('templates/vault-role-vars-persistent-volume-claim.yaml', 'w') as f:
-            f.write('{{- if .Values.vault.create.enabled -}}' + '\n')
-            f.write('apiVersion: v1' + '\n')
-            f.write('kind: PersistentVolumeClaim' + '\n')
-            f.write('metadata:' + '\n')
-            f.write('  ' + 'name: {{ .Release.Name }}-vault-role-vars' + '\n')
-            f.write('  ' + 'labels:' + '\n')
-            f.write('  ' + '  ' + 'app: {{ .Release.Name }}-vault' + '\n')
-            f.write('spec:' + '\n')
-            f.write('  ' + 'storageClassName: {{ .Values.vault.create.storage.storageClass }}' + '\n')
-            f.write('  ' + 'accessModes:' + '\n')
-            f.write('  ' + '  ' + '- ReadWriteMany' + '\n')
-            f.write('  ' + 'resources:' + '\n')
-            f.write('  ' + '  ' + 'requests:' + '\n')
-            f.write('  ' + '  ' + '  ' + 'storage: {{ .Values.vault.create.storage.size }}' + '\n')
-            f.write('{{- end -}}')
+    def write_role_vars_persistent_volume_claim(self, files: VirtualFileTree):
+        self.write_document(files, 'templates/vault-role-vars-persistent-volume-claim.yaml', Directive('{{- if .Values.vault.create.enabled -}}'), {
+            'apiVersion': 'v1',
+            'kind': 'PersistentVolumeClaim',
+            'metadata': {
+                'name': '{{ .Release.Name }}-vault-role-vars',
+                'labels': {
+                    'app': '{{ .Release.Name }}-vault'
+                }
+            },
+            'spec': {
+                'storageClassName': '{{ .Values.vault.create.storage.storageClass }}',
+                'accessModes': ['ReadWriteMany'],
+                'resources': {
+                    'requests': {
+                        'storage': '{{ .Values.vault.create.storage.size }}'
+                    }
+                }
+            }
+        }, Directive('{{- end -}}'))
     
-    def write_deployment(self):
-        with open('templates/vault-deployment.yaml', 'w') as f:
-            f.write('{{- if and (.Values.vault.create.enabled) (eq .Values.vault.type "hashicorp") -}}' + '\n')
-            f.write('apiVersion: apps/v1' + '\n')
-            f.write('kind: Deployment' + '\n')
-            f.write('metadata:' + '\n')
-            f.write('  ' + 'name: {{ .Release.Name }}-vault' + '\n')
-            f.write('  ' + 'labels:' + '\n')
-            f.write('  ' + '  ' + 'app: {{ .Release.Name }}-vault' + '\n')
-            f.write('spec:' + '\n')
-            f.write('  ' + 'replicas: 1' + '\n')
-            f.write('  ' + 'selector:' + '\n')
-            f.write('  ' + '  ' + 'matchLabels:' + '\n')
-            f.write('  ' + '  ' + '  ' + 'app: {{ .Release.Name }}-vault' + '\n')
-            f.write('  ' + 'template:' + '\n')
-            f.write('  ' + '  ' + 'metadata:' + '\n')
-            f.write('  ' + '  ' + '  ' + 'labels:' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + 'app: {{ .Release.Name }}-vault' + '\n')
-            f.write('  ' + '  ' + 'spec:' + '\n')
-            f.write('  ' + '  ' + '  ' + 'containers:' + '\n')
-            f.write('  ' + '  ' + '  ' + '- name: {{ .Release.Name }}-vault' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + 'image: {{ .Values.vault.create.image.repository }}:{{ .Values.vault.create.image.tag }}' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + 'ports:' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '- containerPort: 8200' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '- containerPort: 8201' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + 'env:' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '- name: VAULT_ADDR' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + 'value: http://0.0.0.0:8200' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '- name: ROLE_ID_SECRET_NAME' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + 'value: VAULT_ROLE_ID' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '- name: SECRET_ID_SECRET_NAME' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + 'value: VAULT_SECRET_ID' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + 'volumeMounts:' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '- name: vault-data' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + 'mountPath: /vault/data' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '- name: vault-log' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + 'mountPath: /vault/logs' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '- name: vault-creds' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + 'mountPath: /vault/creds' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '- name: vault-role-vars' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + 'mountPath: /role_vars' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + 'capAdd:' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '- IPC_LOCK' + '\n')
-            f.write('  ' + '  ' + '  ' + 'volumes:' + '\n')
-            f.write('  ' + '  ' + '  ' + '- name: vault-data' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + 'emptyDir: {}' + '\n')
-            f.write('  ' + '  ' + '  ' + '- name: vault-log' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + 'emptyDir: {}' + '\n')
-            f.write('  ' + '  ' + '  ' + '- name: vault-creds' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + 'emptyDir: {}' + '\n')
-            f.write('  ' + '  ' + '  ' + '- name: vault-role-vars' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + 'persistentVolumeClaim:' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + 'claimName: {{ .Release.Name }}-vault-role-vars' + '\n')
-            f.write('{{- end -}}')
+    def write_deployment(self, files: VirtualFileTree):
+        self.write_document(files, 'templates/vault-deployment.yaml', Directive('{{- if and (.Values.vault.create.enabled) (eq .Values.vault.type "hashicorp") -}}'), {
+            'apiVersion': 'apps/v1',
+            'kind': 'Deployment',
+            'metadata': {
+                'name': '{{ .Release.Name }}-vault',
+                'labels': {
+                    'app': '{{ .Release.Name }}-vault'
+                }
+            },
+            'spec': {
+                'replicas': 1,
+                'selector': {
+                    'matchLabels': {
+                        'app': '{{ .Release.Name }}-vault'
+                    }
+                },
+                'template': {
+                    'metadata': {
+                        'labels': {
+                            'app': '{{ .Release.Name }}-vault'
+                        }
+                    },
+                    'spec': {
+                        'containers': [
+                            {
+                                'name': '{{ .Release.Name }}-vault',
+                                'image': '{{ .Values.vault.create.image.repository }}:{{ .Values.vault.create.image.tag }}',
+                                'ports': [
+                                    { 'containerPort': 8200 },
+                                    { 'containerPort': 8201 }
+                                ],
+                                'env': [
+                                    { 'name': 'VAULT_ADDR', 'value': 'http://0.0.0.0:8200' },
+                                    { 'name': 'ROLE_ID_SECRET_NAME', 'value': 'VAULT_ROLE_ID' },
+                                    { 'name': 'SECRET_ID_SECRET_NAME', 'value': 'VAULT_SECRET_ID' }
+                                ],
+                                'volumeMounts': [
+                                    { 'name': 'vault-data', 'mountPath': '/vault/data' },
+                                    { 'name': 'vault-log', 'mountPath': '/vault/logs' },
+                                    { 'name': 'vault-creds', 'mountPath': '/vault/creds' },
+                                    { 'name': 'vault-role-vars', 'mountPath': '/role_vars' }
+                                ],
+                                'capAdd': ['IPC_LOCK']
+                            }
+                        ],
+                        'volumes': [
+                            { 'name': 'vault-data', 'emptyDir': {} },
+                            { 'name': 'vault-log', 'emptyDir': {} },
+                            { 'name': 'vault-creds', 'emptyDir': {} },
+                            {
+                                'name': 'vault-role-vars',
+                                'persistentVolumeClaim': {
+                                    'claimName': '{{ .Release.Name }}-vault-role-vars'
+                                }
+                            }
+                        ]
+                    }
+                }
+            }
+        }, Directive('{{- end -}}'))
     
-    def write_secret(self):
-        with open('templates/vault-hashicorp-secret.yaml', 'w') as f:
-            f.write('{{- if and (.Values.vault.enabled) (eq .Values.vault.type "hashicorp") -}}' + '\n')
-            f.write('apiVersion: v1' + '\n')
-            f.write('kind: Secret' + '\n')
-            f.write('metadata:' + '\n')
-            f.write('  ' + 'name: {{ .Release.Name }}-vault-secret' + '\n')
-            f.write('type: opaque' + '\n')
-            f.write('data:' + '\n')
-            f.write('  ' + '{{- if .Values.vault.create.enabled }}' + '\n')
-            f.write('  ' + '# Because we create the Hashicorp Vault instance as part of the Helm chart, ' + '\n')
-            f.write('  ' + '# we can use the name of the created resource (utilizing k8s built-in container connections)' + '\n')
-            f.write('  ' + '# to connect to the Vault instance without having to hard-code the Vault name.' + '\n')
-            f.write('  ' + 'vault-name: {{ printf "%s-vault" .Release.Name | b64enc }}' + '\n')
-            f.write('  ' + '# Because we create the Hashicorp Vault instance as part of the Helm chart,' + '\n')
-            f.write('  ' + '# We know the port that the Vault instance is running on.' + '\n')
-            f.write('  ' + 'vault-port: {{ printf "%d" 80 | b64enc }}' + '\n')
-            f.write('  ' + '{{- else }}' + '\n')
-            f.write('  ' + '# Because the Vault wasn\'t created as part of the Helm chart,' + '\n')
-            f.write('  ' + '# we need the deployer to specify the name of the Vault instance to connect to.' + '\n')
-            f.write('  ' + 'vault-name: {{ .Values.vault.vaultName | b64enc }}' + '\n')
-            f.write('  ' + '# Because the Vault wasn\'t created as part of the Helm chart,' + '\n')
-            f.write('  ' + '# we need the deployer to specify the port that the Vault instance is running on.' + '\n')
-            f.write('  ' + 'vault-port: {{ .Values.passVault.vaultPort | b64enc }}' + '\n')
-            f.write('  ' + '{{- end }}' + '\n')
-            f.write('{{- end -}}')
+    def write_secret(self, files: VirtualFileTree):
+        self.write_document(files, 'templates/vault-hashicorp-secret.yaml', Directive('{{- if and (.Values.vault.enabled) (eq .Values.vault.type "hashicorp") -}}'), {
+            'apiVersion': 'v1',
+            'kind': 'Secret',
+            'metadata': {
+                'name': '{{ .Release.Name }}-vault-secret'
+            },
+            'type': 'opaque',
+            'data': Mapping([
+                Directive('{{- if .Values.vault.create.enabled }}'),
+                Comment('Because we create the Hashicorp Vault instance as part of the Helm chart,'),
+                Comment('we can use the name of the created resource (utilizing k8s built-in container connections)'),
+                Comment('to connect to the Vault instance without having to hard-code the Vault name.'),
+                ('vault-name', '{{ printf "%s-vault" .Release.Name | b64enc }}'),
+                Comment('Because we create the Hashicorp Vault instance as part of the Helm chart,'),
+                Comment('We know the port that the Vault instance is running on.'),
+                ('vault-port', '{{ printf "%d" 80 | b64enc }}'),
+                Directive('{{- else }}'),
+                Comment('Because the Vault wasn\'t created as part of the Helm chart,'),
+                Comment('we need the deployer to specify the name of the Vault instance to connect to.'),
+                ('vault-name', '{{ .Values.vault.vaultName | b64enc }}'),
+                Comment('Because the Vault wasn\'t created as part of the Helm chart,'),
+                Comment('we need the deployer to specify the port that the Vault instance is running on.'),
+                ('vault-port', '{{ .Values.vault.vaultPort | b64enc }}'),
+                Directive('{{- end }}')
+            ])
+        }, Directive('{{- end -}}'))
     
-    def write(self):
-        self.write_ingress()
-        self.write_service()
-        self.write_role_vars_persistent_volume_claim()
-        self.write_deployment()
-        self.write_secret()
\ No newline at end of file
+    def write(self, files: VirtualFileTree):
+        self.write_ingress(files)
+        self.write_service(files)
+        self.write_role_vars_persistent_volume_claim(files)
+        self.write_deployment(files)
+        self.write_secret(files)
\ No newline at end of file
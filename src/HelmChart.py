@@ -1,21 +1,56 @@
-import os, subprocess
+import hashlib, json, os, re, time
+from collections.abc import Iterator
+from typing import TYPE_CHECKING
 
+from .DependencyGraph import is_affected, template_node
+from .Metrics import Metrics
 from .Template import Template
-from .Ingress import Ingress
-from .Database import Database
-from .SecretsVault import SecretsVault
-from .HashicorpVault import HashicorpVault
-from .AzureKeyVault import AzureKeyVault
-from .NoSQL import NoSQL
-from .MongoDB import MongoDB
-from .AzureTableStorage import AzureTableStorage
-from .Redis import Redis
-from .OAuth import OAuth
-from .ThirdPartyService import ThirdPartyService
-from .Deployment import Deployment
+from .Version import get_source_digest
+from .ValuesOverlay import diff_values, merge_values
+from .VirtualFileTree import VirtualFileTree, MANIFEST_FILENAME
+from .YAML import Comment, Mapping, dump, load
+
+# The pools, packager and registry client (and the modules they depend on) are only imported when they're actually used.
+# The components (templates) are never imported here at all, they're looked up by kind (see `index_components`).
+# Which keeps the start up time of the generator down.
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+    from .OCIRegistryClient import OCIRegistryClient
+    from .PackageCache import PackageCache
+    from .RenderCache import RenderCache
+
+def render_template(template: Template) -> tuple[VirtualFileTree, int, int]:
+    """Render a single template into it's own in-memory file tree.
+    
+    This is a module level function (rather than a method) so that it can be sent to a process pool.
+    It's timed here (rather than by the caller) so the time spent waiting on the pool isn't counted.
+
+    Args:
+        template (Template): The template to render.
+    
+    Returns:
+        tuple[VirtualFileTree, int, int]: The file tree containing the rendered file(s) of the template and when rendering started and ended (nanoseconds since the epoch)
+    """
+
+    start = time.time_ns()
+    files = VirtualFileTree()
+    template.write(files)
+    return (files, start, time.time_ns())
+
+def build_section(builder) -> str:
+    """Call a `create_..._section_of_values_yaml` method and join it's lines (used to build the sections of the `values.yaml` file on a pool).
+
+    Args:
+        builder (Callable[[], Iterator[str]]): The bound section builder method to call.
+    
+    Returns:
+        str: The section of the `values.yaml` file
+    """
+
+    return ''.join(builder())
 
 class HelmChart:
-    def __init__(self, chartName: str, chartDescription: str, maintainers: list[dict[str, str]], chartHomepage: str, sources: list[str], appVersion: str = '1.0.0', chartVersion: str = '1.0.0', apiVersion: str = 'v1', *templates: Template):
+    def __init__(self, chartName: str, chartDescription: str, maintainers: list[dict[str, str]], chartHomepage: str, sources: list[str], appVersion: str = '1.0.0', chartVersion: str = '1.0.0', apiVersion: str = 'v1', *templates: Template, root: str = '.', parallel: str | None = None, max_workers: int | None = None, cache: 'RenderCache | None' = None, metrics: Metrics | None = None, environments: dict[str, 'HelmChart'] | None = None, values_overrides: dict | None = None, manifest_layout: str | None = None):
         """A class for creating a Helm chart.
         
         Args:
@@ -28,6 +63,14 @@ class HelmChart:
             chartVersion (str, Optional): The version of the Helm chart. Default '1.0.0'
             apiVersion (str, Optional): The API version of the Helm chart itself. Default 'v1'
             Templates (Template, Optional): The templates for the Helm chart. Default None
+            root (str, Optional): The directory the Helm chart is written (and packaged) into. Default '.'
+            parallel (str, Optional): Opt-in to rendering the templates and `values.yaml` sections concurrently. Either `'thread'` (a thread pool) or `'process'` (a process pool). Default None (render sequentially)
+            max_workers (int, Optional): The maximum number of workers of the pool when rendering concurrently. Default None (the pool's own default)
+            cache (RenderCache, Optional): The cache of rendered templates to reuse output from (and add to). Default None (always render)
+            metrics (Metrics, Optional): Where to record the timings and counters of generating the chart. Default None (a new `Metrics`)
+            environments (dict[str, HelmChart], Optional): The chart of each environment (Ex. `dev`, `prod`), only their values are used (see `write_environment_values_yaml`). Default None
+            values_overrides (dict, Optional): Values to merge into the generated values of the chart (only used when the chart is an environment of another chart). Default None
+            manifest_layout (str, Optional): Combine the templates into multi-document files. Either `'single'` (all of them in `templates/all.yaml`) or `'component'` (one file per component, Ex. `templates/mongo-db.yaml`). Default None (a file per template)
         """
         
         self.chartName = chartName
@@ -39,14 +82,261 @@ class HelmChart:
         self.chartVersion = chartVersion
         self.apiVersion = apiVersion
         self.templates = templates
+        self.root = root
+        self.parallel = parallel
+        self.max_workers = max_workers
+        # Without a digest of the generator's code, cached output can't be told apart from what an older version rendered
+        self.cache = cache if get_source_digest() is not None else None
+        self.metrics = metrics if metrics is not None else Metrics(chartName)
+        self.environments = environments or {}
+        self.values_overrides = values_overrides or {}
+
+        if manifest_layout not in (None, 'single', 'component'):
+            raise Exception(f'Unknown manifest layout "{manifest_layout}" (expected single or component).')
+        
+        self.manifest_layout = manifest_layout
+
+        # The packaged chart, if it was restored from a `PackageCache` (see `restore`)
+        self.archive: bytes | None = None
+
+        # The rendered output of each node (template and `values.yaml` section), so a later render can reuse what didn't change (see `render`)
+        self.rendered: dict[str, VirtualFileTree] = {}
+        self.sections: dict[str, str] = {}
+
+        if self.parallel not in (None, 'thread', 'process'):
+            raise Exception(f'Unknown parallel mode "{self.parallel}". Expected "thread" or "process".')
+
+        # The in-memory file tree that everything is rendered into before being written out (see `flush`)
+        self.files = VirtualFileTree()
+
+        # The templates indexed by kind (see `index_components`), so they never have to be searched for
+        self.components = self.index_components(self.templates)
+
+        self.validate_components()
+        self.wire_deployment()
+        self.wire_helpers()
     
-    def create_templates_folder(self):
-        """Create the templates folder for the Helm chart."""
+    @staticmethod
+    def index_components(templates: tuple[Template, ...]) -> dict[str, list[Template]]:
+        """Index templates by their kind.
+
+        Each template is indexed under the name of it's class and every parent class (up to `Template`).
+        So a `MongoDB` template can be found as either `MongoDB` or `NoSQL` and a `HashicorpVault` as either `HashicorpVault` or `SecretsVault`.
+
+        Args:
+            templates (tuple[Template, ...]): The templates to index (in order).
+        
+        Returns:
+            dict[str, list[Template]]: The templates of each kind (in the order they were provided)
+        """
+
+        components = {}
+
+        for template in templates:
+            for cls in type(template).__mro__:
+                if cls is Template:
+                    break
+
+                components.setdefault(cls.__name__, []).append(template)
+        
+        return components
+
+    def has_component(self, kind: str) -> bool:
+        """Check if the Helm chart has a component (template) of a kind.
+
+        Args:
+            kind (str): The kind of component (Ex. `Deployment`, `NoSQL`, etc...).
+        
+        Returns:
+            bool: If the Helm chart has at least one component of the kind
+        """
+
+        return kind in self.components
+
+    def get_components(self, kind: str) -> list[Template]:
+        """Get all the components (templates) of a kind.
+
+        Args:
+            kind (str): The kind of component (Ex. `ThirdPartyService`).
+        
+        Returns:
+            list[Template]: The components of the kind (in the order they were provided), empty if there aren't any
+        """
+
+        return self.components.get(kind, [])
+
+    def get_component(self, kind: str) -> Template:
+        """Get the component (template) of a kind.
+
+        Args:
+            kind (str): The kind of component (Ex. `Deployment`, `NoSQL`, etc...).
+        
+        Returns:
+            Template: The component of the kind
+        """
+
+        if kind not in self.components:
+            raise Exception(f'The Helm chart doesn\'t have a {kind} component.')
+        
+        return self.components[kind][0]
+
+    def validate_components(self):
+        """Check that the Helm chart has the components it needs (and no more than one of the components it can only have one of)."""
+
+        # Every chart needs these because the `values.yaml` file always has their sections
+        for kind in ('Deployment', 'Ingress'):
+            if not self.has_component(kind):
+                raise Exception(f'A Helm chart requires a {kind} component.')
+        
+        # The `values.yaml` file only has room for one of each of these
+        for kind in ('Helpers', 'Deployment', 'Ingress', 'Service', 'OAuth', 'Database', 'SecretsVault', 'NoSQL', 'Cache'):
+            if len(self.get_components(kind)) > 1:
+                raise Exception(f'A Helm chart can only have one {kind} component.')
+        
+        # Third party services are keyed by their name in the `values.yaml` file
+        names = [third_party.name for third_party in self.get_components('ThirdPartyService')]
+        for name in set(names):
+            if names.count(name) > 1:
+                raise Exception(f'A Helm chart can only have one "{name}" third party service.')
 
-        os.mkdir('templates')
+    def wire_deployment(self):
+        """Set what the Deployment uses (and so which environment variables it gets) based on the other components of the Helm chart."""
+
+        deployment = self.get_component('Deployment')
+
+        deployment.uses_oauth = self.has_component('OAuth')
+        deployment.uses_db = self.has_component('Database')
+        deployment.uses_secrets_vault = self.has_component('SecretsVault')
+        deployment.nosql = self.get_component('NoSQL') if self.has_component('NoSQL') else None
+        deployment.uses_cache = self.has_component('Cache')
+        deployment.third_party_services = self.get_components('ThirdPartyService')
+
+    def wire_helpers(self):
+        """Have every template include the named templates of the `_helpers.tpl` file (if the Helm chart has one) instead of repeating them."""
+
+        if not self.has_component('Helpers'):
+            return
+
+        prefix = self.get_component('Helpers').prefix
 
         for template in self.templates:
-            template.write()
+            template.helpers = prefix
+    
+    def create_executor(self) -> 'Executor':
+        """Create the pool used to render concurrently (based on the `parallel` setting of the chart).
+
+        Returns:
+            Executor: A thread or process pool
+        """
+
+        from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+        if self.parallel == 'process':
+            return ProcessPoolExecutor(max_workers=self.max_workers)
+        
+        return ThreadPoolExecutor(max_workers=self.max_workers)
+    
+    def create_templates_folder(self, previous: 'HelmChart | None' = None, affected: set[str] | None = None):
+        """Create the templates folder for the Helm chart.
+        
+        Note, the templates are only rendered into the in-memory file tree (`self.files`).
+        Nothing is written to disk until `flush` is called.
+
+        If the chart was created with a `parallel` mode each template is rendered into it's own tree on a pool.
+        The trees are then merged in the order the templates were provided so the result is the same as rendering sequentially.
+
+        If the chart was created with a render `cache`, templates whose configuration was already rendered aren't rendered again.
+
+        Args:
+            previous (HelmChart, Optional): A previous render of the chart to reuse the templates of. Default None
+            affected (set[str], Optional): The nodes affected since the `previous` render (see `DependencyGraph.affected_nodes`), the rest are reused. Default None
+        """
+
+        nodes = [template_node(template) for template in self.templates]
+        rendered = [None] * len(self.templates)
+
+        # Templates that don't consume anything that changed are reused as is (without even getting their configuration)
+        if previous is not None and affected is not None:
+            rendered = [previous.rendered.get(node) if not is_affected(node, affected) else None for node in nodes]
+        
+        reused = sum(1 for files in rendered if files is not None)
+
+        # Reuse whatever output the cache already has, so only the templates it's missing get rendered
+        keys = [template.config_key() if self.cache is not None and files is None else None for template, files in zip(self.templates, rendered)]
+        rendered = [self.cache.get(key) if key is not None else files for key, files in zip(keys, rendered)]
+        missing = [index for index, files in enumerate(rendered) if files is None]
+
+        self.metrics.count('templates.reused', reused)
+        self.metrics.count('templates.cached', len(self.templates) - len(missing) - reused)
+        self.metrics.count('templates.rendered', len(missing))
+
+        if self.parallel is None or len(missing) == 0:
+            results = [render_template(self.templates[index]) for index in missing]
+        else:
+            with self.create_executor() as executor:
+                results = list(executor.map(render_template, [self.templates[index] for index in missing]))
+        
+        for index, (files, start, end) in zip(missing, results):
+            rendered[index] = files
+
+            self.metrics.record('template.write', start, end, template=type(self.templates[index]).__name__, files=len(files), bytes=files.size())
+
+            if self.cache is not None:
+                self.cache.put(keys[index], files)
+        
+        self.rendered = dict(zip(nodes, rendered))
+
+        if self.manifest_layout is not None:
+            self.files.merge(self.combine_manifests(rendered))
+            return
+
+        for files in rendered:
+            self.files.merge(files)
+
+    def combine_manifests(self, rendered: list[VirtualFileTree]) -> VirtualFileTree:
+        """Combine the rendered templates into multi-document files (based on the `manifest_layout` of the chart).
+
+        The documents are kept in the order the templates were provided (and each template wrote them) and separated by `---`.
+        Each is preceded by a `# Source:` comment (the same as `helm template`) so it's easy to tell where it came from.
+        Anything other than a YAML manifest (Ex. a `.tpl` file) is left as it is.
+
+        Args:
+            rendered (list[VirtualFileTree]): The rendered files of each template (in the same order as `self.templates`).
+
+        Returns:
+            VirtualFileTree: The combined files
+        """
+
+        combined = VirtualFileTree()
+        documents: dict[str, list[str]] = {}
+
+        for template, files in zip(self.templates, rendered):
+            if self.manifest_layout == 'single':
+                path = 'templates/all.yaml'
+            else:
+                # Ex. `MongoDB` is `templates/mongo-db.yaml`
+                path = 'templates/' + re.sub(r'(?<=[a-z0-9])(?=[A-Z])', '-', type(template).__name__).lower() + '.yaml'
+
+            for source, content in files.files.items():
+                if not source.startswith('templates/') or not source.endswith('.yaml'):
+                    combined.write_file(source, content)
+                    continue
+
+                # A trim marker at the very start or end of a file only trims what's outside the file.
+                # Once combined it would trim the `---` separators (gluing the documents together), so they're removed.
+                if content.startswith('{{-'):
+                    content = '{{' + content[len('{{-'):]
+                
+                content = content.rstrip('\n')
+                if content.endswith('-}}'):
+                    content = content[:-len('-}}')].rstrip(' ') + ' }}'
+
+                documents.setdefault(path, []).append(f'# Source: {source}' + '\n' + content + '\n')
+
+        for path, contents in documents.items():
+            combined.write_file(path, '---\n'.join(contents))
+
+        return combined
 
     def write_yaml(self):
         """Write the Chart.yaml file for the Helm chart.
@@ -54,7 +344,7 @@ class HelmChart:
         This provides the metadata about the Helm chart itself.
         """
 
-        with open('Chart.yaml', 'w') as f:
+        with self.files.open('Chart.yaml') as f:
             f.write(f'apiVersion: {self.apiVersion}' + '\n')
             f.write(f'appVersion: "{self.appVersion}"' + '\n')
             f.write(f'description: {self.chartDescription}' + '\n')
@@ -69,7 +359,7 @@ class HelmChart:
                 f.write(f'- {source}' + '\n')
             f.write(f'version: "{self.chartVersion}"' + '\n')
     
-    def create_replicas_section_of_values_yaml(self) -> str:
+    def create_replicas_section_of_values_yaml(self) -> Iterator[str]:
         """Create the replicas section of the `values.yaml` file for the Helm chart.
 
         Unlike most of the other `create_..._section_of_values_yaml` methods, 
@@ -79,103 +369,87 @@ class HelmChart:
         Particularly, at time of writing the `replicaCount` field which is how many replicas of the app to run.
         
         Returns:
-            str: The replicas section of the `values.yaml` file
+            Iterator[str]: The lines of the replicas section of the `values.yaml` file
         """
 
-        output = ''
-
-        # Get the Deployment templates from the templates provided
-        deployment_template = next(template for template in self.templates if isinstance(template, Deployment))
+        # Get the Deployment template from the components of the chart
+        deployment_template = self.get_component('Deployment')
 
-        output += '# The number of instances (replicas) of the app to run' + '\n'
-        output += f'replicaCount: {deployment_template.replica_count}' + '\n'
-        output += '\n'
+        yield '# The number of instances (replicas) of the app to run' + '\n'
+        yield f'replicaCount: {deployment_template.replica_count}' + '\n'
+        yield '\n'
 
-        return output
-
-    def create_image_section_of_values_yaml(self) -> str:
+    def create_image_section_of_values_yaml(self) -> Iterator[str]:
         """Create the image section of the `values.yaml` file for the Helm chart.
         
         The image section is used to define the image that the app will use.
 
         Returns:
-            str: The image section of the `values.yaml` file
+            Iterator[str]: The lines of the image section of the `values.yaml` file
         """
 
-        output = ''
-
-        # Get the Deployment templates from the templates provided
-        deployment_template = next(template for template in self.templates if isinstance(template, Deployment))
-
-        output += 'image:' + '\n'
-        output += '  ' + '# The repository of the image to use for the app' + '\n'
-        output += '  ' + '# Should be in the format `<Image Repository (Ex. containers.example.com)>/<Image Name (Ex. app)>`' + '\n'
-        output += '  ' + f'repository: "{deployment_template.image_repository}"' + '\n'
-        output += '  ' + '# The specific image tag to use. It\'s recommended to use some kind of versioning tag scheme as it makes updating the container without having to fully redeploy easier.' + '\n'
-        output += '  ' + '# Ex. v1.0.0' + '\n'
-        output += '  ' + f'tag: "{deployment_template.image_tag}"' + '\n'
-        output += '  ' + '# How often the image should be pulled. The possible values are "Always", "Never", and "IfNotPresent"' + '\n'
-        output += '  ' + '# It\'s recommended for production to use "IfNotPresent" to avoid pulling the image every time the pod starts' + '\n'
-        output += '  ' + '# Though, for development, "Always" is recommended to ensure the latest changes are being tested' + '\n'
-        output += '  ' + f'pullPolicy: "{deployment_template.image_pull_policy}"' + '\n'
-        output += '\n'
-
-        return output
-
-    def create_container_section_of_values_yaml(self) -> str:
+        # Get the Deployment template from the components of the chart
+        deployment_template = self.get_component('Deployment')
+
+        yield 'image:' + '\n'
+        yield '  ' + '# The repository of the image to use for the app' + '\n'
+        yield '  ' + '# Should be in the format `<Image Repository (Ex. containers.example.com)>/<Image Name (Ex. app)>`' + '\n'
+        yield '  ' + f'repository: "{deployment_template.image_repository}"' + '\n'
+        yield '  ' + '# The specific image tag to use. It\'s recommended to use some kind of versioning tag scheme as it makes updating the container without having to fully redeploy easier.' + '\n'
+        yield '  ' + '# Ex. v1.0.0' + '\n'
+        yield '  ' + f'tag: "{deployment_template.image_tag}"' + '\n'
+        yield '  ' + '# How often the image should be pulled. The possible values are "Always", "Never", and "IfNotPresent"' + '\n'
+        yield '  ' + '# It\'s recommended for production to use "IfNotPresent" to avoid pulling the image every time the pod starts' + '\n'
+        yield '  ' + '# Though, for development, "Always" is recommended to ensure the latest changes are being tested' + '\n'
+        yield '  ' + f'pullPolicy: "{deployment_template.image_pull_policy}"' + '\n'
+        yield '\n'
+
+    def create_container_section_of_values_yaml(self) -> Iterator[str]:
         """Create the container section of the `values.yaml` file for the Helm chart.
         
         The container section is used to define the environment that the container is running in.
         Ex. the environment type (development, production, etc...) and the port that the container listens on.
 
         Returns:
-            str: The container section of the `values.yaml` file
+            Iterator[str]: The lines of the container section of the `values.yaml` file
         """
 
-        output = ''
-
-        # Get the Deployment templates from the templates provided
-        deployment_template = next(template for template in self.templates if isinstance(template, Deployment))
-
-        output += 'container:' + '\n'
-        output += '  ' + '# The port that the container listens on (Ex. 8080)' + '\n'
-        output += '  ' + f'port: {deployment_template.port}' + '\n'
-        output += '  ' + '\n'
-        output += '  ' + '# The environment that the container is running in (Ex. development, production, etc...)' + '\n'
-        output += '  ' + '# This is used for the NODE_ENV environment variable' + '\n'
-        output += '  ' + f'env: "{deployment_template.env}"' + '\n'
-        output += '\n'
+        # Get the Deployment template from the components of the chart
+        deployment_template = self.get_component('Deployment')
 
-        return output
+        yield 'container:' + '\n'
+        yield '  ' + '# The port that the container listens on (Ex. 8080)' + '\n'
+        yield '  ' + f'port: {deployment_template.port}' + '\n'
+        yield '  ' + '\n'
+        yield '  ' + '# The environment that the container is running in (Ex. development, production, etc...)' + '\n'
+        yield '  ' + '# This is used for the NODE_ENV environment variable' + '\n'
+        yield '  ' + f'env: "{deployment_template.env}"' + '\n'
+        yield '\n'
 
-    def create_ingress_section_of_values_yaml(self) -> str:
+    def create_ingress_section_of_values_yaml(self) -> Iterator[str]:
         """Create the ingress section of the `values.yaml` file for the Helm chart.
         
         The ingress section is used to define the ingress resource that the app will use.
         That is how the app will be accessed from outside the cluster.
 
         Returns:
-            str: The ingress section of the `values.yaml` file
+            Iterator[str]: The lines of the ingress section of the `values.yaml` file
         """
 
-        output = ''
-
-        # Get the Ingress templates from the templates provided
-        ingress_template = next(template for template in self.templates if isinstance(template, Ingress))
-
-        output += 'ingress:' + '\n'
-        output += '  ' + '# We want an ingress resource if we are deploying to a cluster that has a ingress controller/load balancer' + '\n'
-        output += '  ' + '# This includes most public cloud providers like EKS, GKE, and AKS' + '\n'
-        output += '  ' + 'enabled: true' + '\n'
-        output += '  ' + '# The DNS Name (Ex. app.example.com) where the app will be accessible' + '\n'
-        output += '  ' + f'host: "{ingress_template.hostname}"' + '\n'
-        output += '  ' + '# The class of the ingress controller that is being used (defaulted here to an NGINX ingress controller as it\'s popular for Kubernetes clusters)' + '\n'
-        output += '  ' + 'class: nginx' + '\n'
-        output += '\n'
-
-        return output
+        # Get the Ingress template from the components of the chart
+        ingress_template = self.get_component('Ingress')
+
+        yield 'ingress:' + '\n'
+        yield '  ' + '# We want an ingress resource if we are deploying to a cluster that has a ingress controller/load balancer' + '\n'
+        yield '  ' + '# This includes most public cloud providers like EKS, GKE, and AKS' + '\n'
+        yield '  ' + 'enabled: true' + '\n'
+        yield '  ' + '# The DNS Name (Ex. app.example.com) where the app will be accessible' + '\n'
+        yield '  ' + f'host: "{ingress_template.hostname}"' + '\n'
+        yield '  ' + '# The class of the ingress controller that is being used (defaulted here to an NGINX ingress controller as it\'s popular for Kubernetes clusters)' + '\n'
+        yield '  ' + 'class: nginx' + '\n'
+        yield '\n'
     
-    def create_deployment_extra_vars_section_of_values_yaml(self) -> str:
+    def create_deployment_extra_vars_section_of_values_yaml(self) -> Iterator[str]:
         """Create the extra environment variables for the deployment section of the `values.yaml` file for the Helm chart.
         
         Somewhat similar to the "replicas" section, the "extra environment variables" aren't a real "section" in the sense that they don't have subfields of an `extraEnvVars` field.
@@ -184,19 +458,17 @@ class HelmChart:
         This is useful for providing extra configuration to the app that is being deployed.
 
         Returns:
-            str: The extra environment variables section of the `values.yaml` file
+            Iterator[str]: The lines of the extra environment variables section of the `values.yaml` file
         """
 
-        output = ''
-
-        # Get the Deployment templates from the templates provided
-        deployment_template = next(template for template in self.templates if isinstance(template, Deployment))
+        # Get the Deployment template from the components of the chart
+        deployment_template = self.get_component('Deployment')
 
         for value in deployment_template.extra_env_vars.values():
             if isinstance(value, dict):
                 # If a description is provided for the environment variable than we want to include it as a comment above the value in the `values.yaml` file.
                 if 'description' in value:
-                    output += f'# {value["description"]}' + '\n'
+                    yield f'# {value["description"]}' + '\n'
                 
                 # Because the name given within the value in the dictionary is intended as the unique name of the configmap/secret that contains the value 
                 # It usually contains a reference to the Helm release name.
@@ -209,14 +481,12 @@ class HelmChart:
                     if token != camel_case_name:
                         camel_case_name += token.capitalize()
                     
-                output += f'{camel_case_name}: "{value["value"]}"' + '\n'
+                yield f'{camel_case_name}: "{value["value"]}"' + '\n'
             
             # For readability of the `values.yaml` file we put an extra line between each extra deployment environment variable
-            output += '\n'
-
-        return output
+            yield '\n'
     
-    def create_oauth_section_of_values_yaml(self) -> str:
+    def create_oauth_section_of_values_yaml(self) -> Iterator[str]:
         """Create the OAuth section of the `values.yaml` file for the Helm chart.
 
         The OAuth section is used to define the OAuth configuration that the app will use.
@@ -225,314 +495,300 @@ class HelmChart:
         Note, this assumes the app uses the Bridgeman Accessible OAuth implementation etc...
 
         Returns:
-            str: The OAuth section of the `values.yaml` file
+            Iterator[str]: The lines of the OAuth section of the `values.yaml` file
         """
 
-        output = ''
-
-        # Get the OAuth template from the templates provided
-        oauth_template = next(template for template in self.templates if isinstance(template, OAuth))
-
-        output += '# Configuration for using OAuth within the app' + '\n'
-        output += 'oauth:' + '\n'
-        output += '  ' + f'baseAppUrl: "{oauth_template.base_app_url}"' + '\n'
-        output += '  ' + f'appAbbreviation: "{oauth_template.app_abbreviation}"' + '\n'
-        output += '  ' + f'appName: "{oauth_template.app_name}"' + '\n'
-        output += '  ' + f'serviceName: "{oauth_template.service_name}"' + '\n'
-        output += '  ' + f'devPort: "{oauth_template.dev_port}"' + '\n'
-        output += '\n'
-
-        return output
+        # Get the OAuth template from the components of the chart
+        oauth_template = self.get_component('OAuth')
+
+        yield '# Configuration for using OAuth within the app' + '\n'
+        yield 'oauth:' + '\n'
+        yield '  ' + f'baseAppUrl: "{oauth_template.base_app_url}"' + '\n'
+        yield '  ' + f'appAbbreviation: "{oauth_template.app_abbreviation}"' + '\n'
+        yield '  ' + f'appName: "{oauth_template.app_name}"' + '\n'
+        yield '  ' + f'serviceName: "{oauth_template.service_name}"' + '\n'
+        yield '  ' + f'devPort: "{oauth_template.dev_port}"' + '\n'
+        yield '\n'
     
-    def create_database_section_of_values_yaml(self) -> str:
+    def create_database_section_of_values_yaml(self) -> Iterator[str]:
         """Create the Database section of the `values.yaml` file for the Helm chart.
 
         The Database section is used to define the database configuration that the app will use.
 
         Returns:
-            str: The Database section of the `values.yaml` file
-        """
-
-        output = ''
-        
-        # Get the Database template from the templates provided
-        database_template = next(template for template in self.templates if isinstance(template, Database))
-
-        output += '# Configuration for the relational database' + '\n'
-        output += 'database:' + '\n'
-        output += '  ' + '# The type of the relational database that is used.' + '\n'
-        output += '  ' + '# ' + '\n'
-        output += '  ' + '# The following table lists the possible values for this field:' + '\n'
-        output += '  ' + '# ' + '\n'
-        output += '  ' + '# | Value      | Description                                |' + '\n'
-        output += '  ' + '# | ---------- | ------------------------------------------ |' + '\n'
-        output += '  ' + '# | `postgres` | Uses PostgreSQL as the relational database |' + '\n'
-        output += '  ' + '# ' + '\n'
-        output += '  ' + '# Note, for use of `postgres`, it uses a [`postgres-controller` CRD](https://github.com/AlanBridgeman/postgres-controller) to create the database' + '\n'
-        output += '  ' + '# ' + '\n'
-        output += '  ' + f'type: "{database_template.type}"' + '\n'
-        output += '  ' + '\n'
-        output += '  ' + '# If set to `true`, the database will be created as part of the deployment' + '\n'
-        output += '  ' + '# This uses the [`postgres-controller` CRD](https://github.com/AlanBridgeman/postgres-controller) to create the database' + '\n'
-        output += '  ' + f'create: {str(database_template.create).lower()}' + '\n'
-        output += '  ' + '\n'
-        output += '  ' + '# The host that the database is located on ' + '\n'
-        output += '  ' + f'host: "{database_template.host}"' + '\n'
-        output += '  ' + '\n'
-        output += '  ' + '# The name of the database to be used' + '\n'
-        output += '  ' + f'name: "{database_template.name}"' + '\n'
-        output += '  ' + '\n'
-        output += '  ' + '# The user that is used to access the database' + '\n'
-        output += '  ' + f'user: "{database_template.user}"' + '\n'
-        output += '  ' + '\n'
-        output += '  ' + '# The password that is used to access the database' + '\n'
-        output += '  ' + f'password: "{database_template.password}"' + '\n'
-        output += '  ' + '\n'
-        output += '  ' + '# The port that the database listens on' + '\n'
-        output += '  ' + f'#port: {database_template.port}' + '\n'
-        output += '  ' + '\n'
-        output += '  ' + '# Allows for distinguishing between multiple database instances/servers' + '\n'
-        output += '  ' + f'#instance_id: "{database_template.instance_id}"' + '\n'
-        output += '\n'
-
-        return output
+            Iterator[str]: The lines of the Database section of the `values.yaml` file
+        """
+
+        # Get the Database template from the components of the chart
+        database_template = self.get_component('Database')
+
+        yield '# Configuration for the relational database' + '\n'
+        yield 'database:' + '\n'
+        yield '  ' + '# The type of the relational database that is used.' + '\n'
+        yield '  ' + '# ' + '\n'
+        yield '  ' + '# The following table lists the possible values for this field:' + '\n'
+        yield '  ' + '# ' + '\n'
+        yield '  ' + '# | Value      | Description                                |' + '\n'
+        yield '  ' + '# | ---------- | ------------------------------------------ |' + '\n'
+        yield '  ' + '# | `postgres` | Uses PostgreSQL as the relational database |' + '\n'
+        yield '  ' + '# ' + '\n'
+        yield '  ' + '# Note, for use of `postgres`, it uses a [`postgres-controller` CRD](https://github.com/AlanBridgeman/postgres-controller) to create the database' + '\n'
+        yield '  ' + '# ' + '\n'
+        yield '  ' + f'type: "{database_template.type}"' + '\n'
+        yield '  ' + '\n'
+        yield '  ' + '# If set to `true`, the database will be created as part of the deployment' + '\n'
+        yield '  ' + '# This uses the [`postgres-controller` CRD](https://github.com/AlanBridgeman/postgres-controller) to create the database' + '\n'
+        yield '  ' + f'create: {str(database_template.create).lower()}' + '\n'
+        yield '  ' + '\n'
+        yield '  ' + '# The host that the database is located on ' + '\n'
+        yield '  ' + f'host: "{database_template.host}"' + '\n'
+        yield '  ' + '\n'
+        yield '  ' + '# The name of the database to be used' + '\n'
+        yield '  ' + f'name: "{database_template.name}"' + '\n'
+        yield '  ' + '\n'
+        yield '  ' + '# The user that is used to access the database' + '\n'
+        yield '  ' + f'user: "{database_template.user}"' + '\n'
+        yield '  ' + '\n'
+        yield '  ' + '# The password that is used to access the database' + '\n'
+        yield '  ' + f'password: "{database_template.password}"' + '\n'
+        yield '  ' + '\n'
+        yield '  ' + '# The port that the database listens on' + '\n'
+        yield '  ' + f'#port: {database_template.port}' + '\n'
+        yield '  ' + '\n'
+        yield '  ' + '# Allows for distinguishing between multiple database instances/servers' + '\n'
+        yield '  ' + f'#instance_id: "{database_template.instance_id}"' + '\n'
+        yield '\n'
     
-    def create_secrets_vault_section_of_values_yaml(self) -> str:
+    def create_secrets_vault_section_of_values_yaml(self) -> Iterator[str]:
         """Create the Secrets Vault section of the `values.yaml` file for the Helm chart.
 
         The Secrets Vault section is used to define the Secrets Vault configuration that the app will use.
 
         Returns:
-            str: The Secrets Vault section of the `values.yaml` file
-        """
-
-        output = ''
-
-        # Get the Secrets Vault template from the templates provided
-        secrets_vault_template = next(template for template in self.templates if isinstance(template, SecretsVault))
-
-        output += '# Configurations for the secrets vault' + '\n'
-        output += 'vault:' + '\n'
-        output += '  ' + '# If a secrets vault should be used' + '\n'
-        output += '  ' + '# That is, if a dedicated software for secret management should be used' + '\n'
-        output += '  ' + '# This should virtually always be true if storing any kind of sensitive information as it\'s the most secure option' + '\n'
-        output += '  ' + 'enabled: true' + '\n'
-        output += '  ' + '\n'
-        output += '  ' + '# The type of secrets vault to use.' + '\n'
-        output += '  ' + '# ' + '\n'
-        output += '  ' + '# Vaults' + '\n'
-        output += '  ' + '# ------' + '\n'
-        output += '  ' + '# The following table lists the supported vault types:' + '\n'
-        output += '  ' + '# ' + '\n'
-        output += '  ' + '# | Type        | Description          | Current Status | Required Fields                                     |' + '\n'
-        output += '  ' + '# | ----------- | -------------------- | -------------- | --------------------------------------------------- |' + '\n'
-        output += '  ' + '# | `hashicorp` | Uses Hashicorp Vault | Implemented    | `vaultName` (if `create` not true)                  |' + '\n'
-        output += '  ' + '# | `azure`     | Uses Azure Key Vault | Implemented    | `vaultName`, `clientId`, `clientSecret`, `tenantId` |' + '\n'
-        output += '  ' + '# ' + '\n'
-        output += '  ' + f'type: "{secrets_vault_template.type}"' + '\n'
-        output += '  ' + '\n'
-        output += '  ' + '# Configurations to create a Hashicorp Vault instance as part of the Helm chart' + '\n'
-        output += '  ' + '# ' + '\n'
-        output += '  ' + '# THIS IS ONLY RELEVANT IF `type` IS SET TO `hashicorp`' + '\n'
-        output += '  ' + 'create:' + '\n'
-        output += '  ' + '  ' + '# If a Hashicorp Vault instance should be created as part of the Helm chart' + '\n'
-        if isinstance(secrets_vault_template, HashicorpVault):
-            output += '  ' + '  ' + f'enabled: {str(secrets_vault_template.create).lower()}' + '\n'
+            Iterator[str]: The lines of the Secrets Vault section of the `values.yaml` file
+        """
+
+        # Get the Secrets Vault template from the components of the chart
+        secrets_vault_template = self.get_component('SecretsVault')
+
+        yield '# Configurations for the secrets vault' + '\n'
+        yield 'vault:' + '\n'
+        yield '  ' + '# If a secrets vault should be used' + '\n'
+        yield '  ' + '# That is, if a dedicated software for secret management should be used' + '\n'
+        yield '  ' + '# This should virtually always be true if storing any kind of sensitive information as it\'s the most secure option' + '\n'
+        yield '  ' + 'enabled: true' + '\n'
+        yield '  ' + '\n'
+        yield '  ' + '# The type of secrets vault to use.' + '\n'
+        yield '  ' + '# ' + '\n'
+        yield '  ' + '# Vaults' + '\n'
+        yield '  ' + '# ------' + '\n'
+        yield '  ' + '# The following table lists the supported vault types:' + '\n'
+        yield '  ' + '# ' + '\n'
+        yield '  ' + '# | Type        | Description          | Current Status | Required Fields                                     |' + '\n'
+        yield '  ' + '# | ----------- | -------------------- | -------------- | --------------------------------------------------- |' + '\n'
+        yield '  ' + '# | `hashicorp` | Uses Hashicorp Vault | Implemented    | `vaultName` (if `create` not true)                  |' + '\n'
+        yield '  ' + '# | `azure`     | Uses Azure Key Vault | Implemented    | `vaultName`, `clientId`, `clientSecret`, `tenantId` |' + '\n'
+        yield '  ' + '# ' + '\n'
+        yield '  ' + f'type: "{secrets_vault_template.type}"' + '\n'
+        yield '  ' + '\n'
+        yield '  ' + '# Configurations to create a Hashicorp Vault instance as part of the Helm chart' + '\n'
+        yield '  ' + '# ' + '\n'
+        yield '  ' + '# THIS IS ONLY RELEVANT IF `type` IS SET TO `hashicorp`' + '\n'
+        yield '  ' + 'create:' + '\n'
+        yield '  ' + '  ' + '# If a Hashicorp Vault instance should be created as part of the Helm chart' + '\n'
+        if secrets_vault_template.type == 'hashicorp':
+            yield '  ' + '  ' + f'enabled: {str(secrets_vault_template.create).lower()}' + '\n'
         else:
-            output += '  ' + '  ' + 'enabled: <true/false>' + '\n'
-        output += '  ' + '  ' + '\n'
-        output += '  ' + '  ' + '# Configurations for the image to use if creating the Hashicorp Vault instance' + '\n'
-        output += '  ' + '  ' + '# as part of the Helm chart' + '\n'
-        output += '  ' + '  ' + 'image:' + '\n'
-        output += '  ' + '  ' + '  ' + '# The repository of the image to use' + '\n'
-        if isinstance(secrets_vault_template, HashicorpVault):
-            output += '  ' + '  ' + '  ' + f'repository: {secrets_vault_template.image["repository"]}' + '\n'
+            yield '  ' + '  ' + 'enabled: <true/false>' + '\n'
+        yield '  ' + '  ' + '\n'
+        yield '  ' + '  ' + '# Configurations for the image to use if creating the Hashicorp Vault instance' + '\n'
+        yield '  ' + '  ' + '# as part of the Helm chart' + '\n'
+        yield '  ' + '  ' + 'image:' + '\n'
+        yield '  ' + '  ' + '  ' + '# The repository of the image to use' + '\n'
+        if secrets_vault_template.type == 'hashicorp':
+            yield '  ' + '  ' + '  ' + f'repository: {secrets_vault_template.image["repository"]}' + '\n'
         else:
-            output += '  ' + '  ' + '  ' + 'repository: <image repository>' + '\n'
-        output += '  ' + '  ' + '  ' + '\n'
-        output += '  ' + '  ' + '  ' + '# The tag of the image to use' + '\n'
-        if isinstance(secrets_vault_template, HashicorpVault):
-            output += '  ' + '  ' + '  ' + f'tag: {secrets_vault_template.image["tag"]}' + '\n'
+            yield '  ' + '  ' + '  ' + 'repository: <image repository>' + '\n'
+        yield '  ' + '  ' + '  ' + '\n'
+        yield '  ' + '  ' + '  ' + '# The tag of the image to use' + '\n'
+        if secrets_vault_template.type == 'hashicorp':
+            yield '  ' + '  ' + '  ' + f'tag: {secrets_vault_template.image["tag"]}' + '\n'
         else:
-            output += '  ' + '  ' + '  ' + 'tag: <image tag>' + '\n'
-        output += '  ' + '  ' + '\n'
-        output += '  ' + '  ' + '# Configurations for the ingress of the created Hashicorp Vault instance' + '\n'
-        output += '  ' + '  ' + 'ingress:' + '\n'
-        output += '  ' + '  ' + '  ' + '# If an ingress should be created for the created Hashicorp Vault instance' + '\n'
-        if isinstance(secrets_vault_template, HashicorpVault):
-            output += '  ' + '  ' + '  ' + f'enabled: {str(secrets_vault_template.create and secrets_vault_template.hostname != None).lower()}' + '\n'
+            yield '  ' + '  ' + '  ' + 'tag: <image tag>' + '\n'
+        yield '  ' + '  ' + '\n'
+        yield '  ' + '  ' + '# Configurations for the ingress of the created Hashicorp Vault instance' + '\n'
+        yield '  ' + '  ' + 'ingress:' + '\n'
+        yield '  ' + '  ' + '  ' + '# If an ingress should be created for the created Hashicorp Vault instance' + '\n'
+        if secrets_vault_template.type == 'hashicorp':
+            yield '  ' + '  ' + '  ' + f'enabled: {str(secrets_vault_template.create and secrets_vault_template.hostname != None).lower()}' + '\n'
         else:
-            output += '  ' + '  ' + '  ' + 'enabled: <true/false>' + '\n'
-        output += '  ' + '  ' + '  ' + '\n'
-        output += '  ' + '  ' + '  ' + '# The host of the ingress for the created Hashicorp Vault instance' + '\n'
-        if isinstance(secrets_vault_template, HashicorpVault):
-            output += '  ' + '  ' + '  ' + f'host: {secrets_vault_template.hostname}' + '\n'
+            yield '  ' + '  ' + '  ' + 'enabled: <true/false>' + '\n'
+        yield '  ' + '  ' + '  ' + '\n'
+        yield '  ' + '  ' + '  ' + '# The host of the ingress for the created Hashicorp Vault instance' + '\n'
+        if secrets_vault_template.type == 'hashicorp':
+            yield '  ' + '  ' + '  ' + f'host: {secrets_vault_template.hostname}' + '\n'
         else:
-            output += '  ' + '  ' + '  ' + 'host: <DNS Name for vault>' + '\n'
-        output += '  ' + '  ' + '\n'
-        output += '  ' + '  ' + '# Configurations for the storage of the created Hashicorp Vault instance' + '\n'
-        output += '  ' + '  ' + 'storage:' + '\n'
-        output += '  ' + '  ' + '  ' + '# The storage class to use for the created Hashicorp Vault instance\'s Persistent Volume Claim' + '\n'
-        if isinstance(secrets_vault_template, HashicorpVault):
+            yield '  ' + '  ' + '  ' + 'host: <DNS Name for vault>' + '\n'
+        yield '  ' + '  ' + '\n'
+        yield '  ' + '  ' + '# Configurations for the storage of the created Hashicorp Vault instance' + '\n'
+        yield '  ' + '  ' + 'storage:' + '\n'
+        yield '  ' + '  ' + '  ' + '# The storage class to use for the created Hashicorp Vault instance\'s Persistent Volume Claim' + '\n'
+        if secrets_vault_template.type == 'hashicorp':
             if secrets_vault_template.create:
-                output += '  ' + '  ' + '  ' + f'class: {secrets_vault_template.storage_class}' + '\n'
+                yield '  ' + '  ' + '  ' + f'class: {secrets_vault_template.storage_class}' + '\n'
             else:
-                output += '  ' + '  ' + '  ' + 'class: <storage class>' + '\n'
+                yield '  ' + '  ' + '  ' + 'class: <storage class>' + '\n'
         else:
-            output += '  ' + '  ' + '  ' + 'class: <storage class>' + '\n'
-        output += '  ' + '  ' + '  ' + '\n'
-        output += '  ' + '  ' + '  ' + '# The size of the created Hashicorp Vault instance\'s Persistent Volume Claim' + '\n'
-        if isinstance(secrets_vault_template, HashicorpVault):
+            yield '  ' + '  ' + '  ' + 'class: <storage class>' + '\n'
+        yield '  ' + '  ' + '  ' + '\n'
+        yield '  ' + '  ' + '  ' + '# The size of the created Hashicorp Vault instance\'s Persistent Volume Claim' + '\n'
+        if secrets_vault_template.type == 'hashicorp':
             if secrets_vault_template.create:
-                output += '  ' + '  ' + '  ' + f'size: {secrets_vault_template.storage_size}' + '\n'
+                yield '  ' + '  ' + '  ' + f'size: {secrets_vault_template.storage_size}' + '\n'
             else:
-                output += '  ' + '  ' + '  ' + 'size: <storage size>' + '\n'
+                yield '  ' + '  ' + '  ' + 'size: <storage size>' + '\n'
         else:
-            output += '  ' + '  ' + '  ' + 'size: <storage size>' + '\n'
-        output += '  ' + '\n'
-        output += '  ' + '# The name of the vault instance to connect to' + '\n'
-        output += '  ' + '# ' + '\n'
-        output += '  ' + '# This is relevant if type is set to `hashicorp` or `azure`' + '\n'
-        output += '  ' + '# Note, if `create` is true this is ignored' + '\n'
-        output += '  ' + '# ' + '\n'
-        output += '  ' + '# For `hashicorp`, this is generally the hostname of the Hashicorp Vault instance to connect to' + '\n'
-        output += '  ' + '# For `azure`, this is the name of the Azure Key Vault instance to connect to' + '\n'
-        if isinstance(secrets_vault_template, HashicorpVault):
+            yield '  ' + '  ' + '  ' + 'size: <storage size>' + '\n'
+        yield '  ' + '\n'
+        yield '  ' + '# The name of the vault instance to connect to' + '\n'
+        yield '  ' + '# ' + '\n'
+        yield '  ' + '# This is relevant if type is set to `hashicorp` or `azure`' + '\n'
+        yield '  ' + '# Note, if `create` is true this is ignored' + '\n'
+        yield '  ' + '# ' + '\n'
+        yield '  ' + '# For `hashicorp`, this is generally the hostname of the Hashicorp Vault instance to connect to' + '\n'
+        yield '  ' + '# For `azure`, this is the name of the Azure Key Vault instance to connect to' + '\n'
+        if secrets_vault_template.type == 'hashicorp':
             if secrets_vault_template.create:
-                output += '  ' + f'#vaultName: "<vault name>"' + '\n'
+                yield '  ' + f'#vaultName: "<vault name>"' + '\n'
             else:
-                output += '  ' + f'vaultName: "{secrets_vault_template.hostname}"' + '\n'
-        elif isinstance(secrets_vault_template, AzureKeyVault):
-            output += '  ' + f'vaultName: "{secrets_vault_template.name}"' + '\n'
-        output += '  ' + '\n'
-        output += '  ' + '# The port of the vault instance to connect to' + '\n'
-        output += '  ' + '# ' + '\n'
-        output += '  ' + '# ONLY RELEVANT iF `type` IS SET TO `hashicorp` AND `create` IS NOT TRUE' + '\n'
-        if isinstance(secrets_vault_template, HashicorpVault):
+                yield '  ' + f'vaultName: "{secrets_vault_template.hostname}"' + '\n'
+        elif secrets_vault_template.type == 'azure':
+            yield '  ' + f'vaultName: "{secrets_vault_template.name}"' + '\n'
+        yield '  ' + '\n'
+        yield '  ' + '# The port of the vault instance to connect to' + '\n'
+        yield '  ' + '# ' + '\n'
+        yield '  ' + '# ONLY RELEVANT iF `type` IS SET TO `hashicorp` AND `create` IS NOT TRUE' + '\n'
+        if secrets_vault_template.type == 'hashicorp':
             if not secrets_vault_template.create:
-                output += '  ' + f'#vaultPort: {secrets_vault_template.port}' + '\n'
+                yield '  ' + f'#vaultPort: {secrets_vault_template.port}' + '\n'
             else:
-                output += '  ' + f'vaultPort: {secrets_vault_template.port}' + '\n'
+                yield '  ' + f'vaultPort: {secrets_vault_template.port}' + '\n'
         else:
-            output += '  ' + '#vaultPort: <vault port>' + '\n'
-        output += '  ' + '\n'
-        output += '  ' + '# The client ID of the Azure Key Vault instance' + '\n'
-        output += '  ' + '# ' + '\n'
-        output += '  ' + '# ONLY RELEVANT IF `type` IS SET TO `azure`' + '\n'
-        if isinstance(secrets_vault_template, AzureKeyVault):
-            output += '  ' + f'client-id: "{secrets_vault_template.client_id}"' + '\n'
+            yield '  ' + '#vaultPort: <vault port>' + '\n'
+        yield '  ' + '\n'
+        yield '  ' + '# The client ID of the Azure Key Vault instance' + '\n'
+        yield '  ' + '# ' + '\n'
+        yield '  ' + '# ONLY RELEVANT IF `type` IS SET TO `azure`' + '\n'
+        if secrets_vault_template.type == 'azure':
+            yield '  ' + f'client-id: "{secrets_vault_template.client_id}"' + '\n'
         else:
-            output += '  ' + '#client-id: <Azure Key Vault Client ID>' + '\n'
-        output += '  ' + '\n'
-        output += '  ' + '# The client secret of the Azure Key Vault instance' + '\n'
-        output += '  ' + '# ' + '\n'
-        output += '  ' + '# ONLY RELEVANT IF `type` IS SET TO `azure`' + '\n'
-        if isinstance(secrets_vault_template, AzureKeyVault):
-            output += '  ' + f'client-secret: "{secrets_vault_template.client_secret}"' + '\n'
+            yield '  ' + '#client-id: <Azure Key Vault Client ID>' + '\n'
+        yield '  ' + '\n'
+        yield '  ' + '# The client secret of the Azure Key Vault instance' + '\n'
+        yield '  ' + '# ' + '\n'
+        yield '  ' + '# ONLY RELEVANT IF `type` IS SET TO `azure`' + '\n'
+        if secrets_vault_template.type == 'azure':
+            yield '  ' + f'client-secret: "{secrets_vault_template.client_secret}"' + '\n'
         else:
-            output += '  ' + '#client-secret: <Azure Key Vault Client Secret>' + '\n'
-        output += '  ' + '\n'
-        output += '  ' + '# The tenant ID of the Azure Key Vault instance' + '\n'
-        output += '  ' + '# ' + '\n'
-        output += '  ' + '# ONLY RELEVANT IF `type` IS SET TO `azure`' + '\n'
-        if isinstance(secrets_vault_template, AzureKeyVault):
-            output += '  ' + f'tenant-id: "{secrets_vault_template.tenant_id}"' + '\n'
+            yield '  ' + '#client-secret: <Azure Key Vault Client Secret>' + '\n'
+        yield '  ' + '\n'
+        yield '  ' + '# The tenant ID of the Azure Key Vault instance' + '\n'
+        yield '  ' + '# ' + '\n'
+        yield '  ' + '# ONLY RELEVANT IF `type` IS SET TO `azure`' + '\n'
+        if secrets_vault_template.type == 'azure':
+            yield '  ' + f'tenant-id: "{secrets_vault_template.tenant_id}"' + '\n'
         else:
-            output += '  ' + '#tenant-id: <Azure Key Vault Tenant ID>' + '\n' 
+            yield '  ' + '#tenant-id: <Azure Key Vault Tenant ID>' + '\n' 
 
-        return output
-
-    def create_nosql_section_of_values_yaml(self) -> str:
+    def create_nosql_section_of_values_yaml(self) -> Iterator[str]:
         """Create the NoSQL section of the `values.yaml` file for the Helm chart.
 
         The NoSQL section is used to define the NoSQL storage configuration that the app will use.
 
         Returns:
-            str: The NoSQL section of the `values.yaml` file
+            Iterator[str]: The lines of the NoSQL section of the `values.yaml` file
         """
 
-        output = ''
-
-        nosql_template = next(template for template in self.templates if isinstance(template, NoSQL))
+        nosql_template = self.get_component('NoSQL')
                 
-        output += '# Configuration the NoSQL database' + '\n'
-        output += '# Within the parlance of the system these are often called "properties" databases (and store less structured data)' + '\n'
-        output += 'nosql:' + '\n'
-        output += '  ' + '# Determines the type of NoSQL storage that is used' + '\n'
-        output += '  ' + '# ' + '\n'
-        output += '  ' + '# The following table lists the possible values for this field:' + '\n'
-        output += '  ' + '# ' + '\n'
-        output += '  ' + '# | Value     | Description                                                                                |' + '\n'
-        output += '  ' + '# | --------- | ------------------------------------------------------------------------------------------ |' + '\n'
-        output += '  ' + '# | `mongodb` | Uses MongoDB as the NoSQL database for the default account properties database             |' + '\n'
-        output += '  ' + '# | `azure`   | Uses Azure Table Storage as the NoSQL database for the default account properties database |' + '\n'
-        output += '  ' + '# ' + '\n'
-        output += '  ' + f'type: {nosql_template.type}' + '\n'
-        output += '  ' + '\n'
+        yield '# Configuration the NoSQL database' + '\n'
+        yield '# Within the parlance of the system these are often called "properties" databases (and store less structured data)' + '\n'
+        yield 'nosql:' + '\n'
+        yield '  ' + '# Determines the type of NoSQL storage that is used' + '\n'
+        yield '  ' + '# ' + '\n'
+        yield '  ' + '# The following table lists the possible values for this field:' + '\n'
+        yield '  ' + '# ' + '\n'
+        yield '  ' + '# | Value     | Description                                                                                |' + '\n'
+        yield '  ' + '# | --------- | ------------------------------------------------------------------------------------------ |' + '\n'
+        yield '  ' + '# | `mongodb` | Uses MongoDB as the NoSQL database for the default account properties database             |' + '\n'
+        yield '  ' + '# | `azure`   | Uses Azure Table Storage as the NoSQL database for the default account properties database |' + '\n'
+        yield '  ' + '# ' + '\n'
+        yield '  ' + f'type: {nosql_template.type}' + '\n'
+        yield '  ' + '\n'
                 
-        output += '  ' + '# If to create a resource as part of the deployment process' + '\n'
-        output += '  ' + '# ONLY relevant if `type` is set to `mongodb`' + '\n'
-        output += '  ' + '# This uses the [MongoDBCommunity CRD](https://github.com/mongodb/mongodb-kubernetes-operator) to create the resource' + '\n'
-        output += '  ' + f'create: {str(nosql_template.create).lower()}' + '\n'
-        output += '  ' + '\n'
+        yield '  ' + '# If to create a resource as part of the deployment process' + '\n'
+        yield '  ' + '# ONLY relevant if `type` is set to `mongodb`' + '\n'
+        yield '  ' + '# This uses the [MongoDBCommunity CRD](https://github.com/mongodb/mongodb-kubernetes-operator) to create the resource' + '\n'
+        yield '  ' + f'create: {str(nosql_template.create).lower()}' + '\n'
+        yield '  ' + '\n'
                 
-        output += '  ' + '# The number of replicas/members as part of the Mongo deployment' + '\n'
-        output += '  ' + '# See the `member` parameter of the [MongoDBCommunity CRD](https://github.com/mongodb/mongodb-kubernetes-operator) for more information' + '\n'
-        output += '  ' + '# ONLY relevant if `type` is set to `mongodb` and `create` is set to `true`' + '\n'
-        if isinstance(nosql_template, MongoDB):
-            output += '  ' + f'replicaCount: {nosql_template.replica_count}' + '\n'
+        yield '  ' + '# The number of replicas/members as part of the Mongo deployment' + '\n'
+        yield '  ' + '# See the `member` parameter of the [MongoDBCommunity CRD](https://github.com/mongodb/mongodb-kubernetes-operator) for more information' + '\n'
+        yield '  ' + '# ONLY relevant if `type` is set to `mongodb` and `create` is set to `true`' + '\n'
+        if nosql_template.type == 'mongodb':
+            yield '  ' + f'replicaCount: {nosql_template.replica_count}' + '\n'
         else:
-            output += '  ' + '#replicaCount: <Number of replicas>' + '\n'
-        output += '  ' + '\n'
+            yield '  ' + '#replicaCount: <Number of replicas>' + '\n'
+        yield '  ' + '\n'
                 
-        output += '  ' + '# The TLS configuration for the connection to the NoSQL database' + '\n'
-        output += '  ' + '# ONLY relevant if `type` is set to `mongodb` and `create` is set to `true`' + '\n'
-        output += '  ' + 'tls:' + '\n'
-        output += '  ' + '  ' + '# If to use TLS for the connection to the NoSQL database' + '\n'
-        if isinstance(nosql_template, MongoDB):
-            output += '  ' + '  ' + f'enabled: {str(nosql_template.tls_enabled).lower()}' + '\n'
+        yield '  ' + '# The TLS configuration for the connection to the NoSQL database' + '\n'
+        yield '  ' + '# ONLY relevant if `type` is set to `mongodb` and `create` is set to `true`' + '\n'
+        yield '  ' + 'tls:' + '\n'
+        yield '  ' + '  ' + '# If to use TLS for the connection to the NoSQL database' + '\n'
+        if nosql_template.type == 'mongodb':
+            yield '  ' + '  ' + f'enabled: {str(nosql_template.tls_enabled).lower()}' + '\n'
         else:
-            output += '  ' + '  ' + 'enabled: <true/false>' + '\n'
-        output += '  ' + '\n'
+            yield '  ' + '  ' + 'enabled: <true/false>' + '\n'
+        yield '  ' + '\n'
                 
-        output += '  ' + '# The connection string used to access the NoSQL database' + '\n'
-        output += '  ' + '# ONLY relevant if `type` is set to `mongodb` and `create` is set to `false`' + '\n'
-        output += '  ' + '# Should be in the following format: `mongodb://<hostname>:<port>`' + '\n'
-        output += '  ' + '#connectionString: "mongodb://mongo.example.com:27017"' + '\n'
-        output += '  ' + '\n'
+        yield '  ' + '# The connection string used to access the NoSQL database' + '\n'
+        yield '  ' + '# ONLY relevant if `type` is set to `mongodb` and `create` is set to `false`' + '\n'
+        yield '  ' + '# Should be in the following format: `mongodb://<hostname>:<port>`' + '\n'
+        yield '  ' + '#connectionString: "mongodb://mongo.example.com:27017"' + '\n'
+        yield '  ' + '\n'
                 
-        output += '  ' + '# The key used to access the NoSQL database' + '\n'
-        output += '  ' + '# ONLY relevant if `type` is set to `azure`' + '\n'
-        if isinstance(nosql_template, AzureTableStorage):
-            output += '  ' + f'key: "{nosql_template.key}"' + '\n'
+        yield '  ' + '# The key used to access the NoSQL database' + '\n'
+        yield '  ' + '# ONLY relevant if `type` is set to `azure`' + '\n'
+        if nosql_template.type == 'azure':
+            yield '  ' + f'key: "{nosql_template.key}"' + '\n'
         else:
-            output += '  ' + '#key: ""' + '\n'
-        output += '  ' + '\n'
+            yield '  ' + '#key: ""' + '\n'
+        yield '  ' + '\n'
         
-        output += '  ' + '# The name of the NoSQL database' + '\n'
-        output += '  ' + f'name: "{nosql_template.db_name}"' + '\n'
-        output += '  ' + '\n'
+        yield '  ' + '# The name of the NoSQL database' + '\n'
+        yield '  ' + f'name: "{nosql_template.db_name}"' + '\n'
+        yield '  ' + '\n'
                 
-        output += '  ' + '# The username used to access the NoSQL database' + '\n'
-        output += '  ' + '# ONLY relevant if `type` is set to `mongodb`' + '\n'
-        if isinstance(nosql_template, MongoDB):
-            output += '  ' + f'user: "{nosql_template.user}"' + '\n'
+        yield '  ' + '# The username used to access the NoSQL database' + '\n'
+        yield '  ' + '# ONLY relevant if `type` is set to `mongodb`' + '\n'
+        if nosql_template.type == 'mongodb':
+            yield '  ' + f'user: "{nosql_template.user}"' + '\n'
         else:
-            output += '  ' + 'user: "<mongo user>"' + '\n'
-        output += '  ' + '\n'
+            yield '  ' + 'user: "<mongo user>"' + '\n'
+        yield '  ' + '\n'
                 
-        output += '  ' + '# The password used to access the NoSQL database' + '\n'
-        output += '  ' + '# ONLY relevant if `type` is set to `mongodb`' + '\n'
-        if isinstance(nosql_template, MongoDB):
-            output += '  ' + f'password: "{nosql_template.password}"' + '\n'
+        yield '  ' + '# The password used to access the NoSQL database' + '\n'
+        yield '  ' + '# ONLY relevant if `type` is set to `mongodb`' + '\n'
+        if nosql_template.type == 'mongodb':
+            yield '  ' + f'password: "{nosql_template.password}"' + '\n'
         else:
-            output += '  ' + 'password: "<mongo password>"' + '\n'
-        output += '\n'
+            yield '  ' + 'password: "<mongo password>"' + '\n'
+        yield '\n'
                 
-        output += '# Configurable NoSQL information groupings' + '\n'
-        output += '# For Azure Table Storage these are table names' + '\n'
-        output += '# For MongoDB these are collection names' + '\n'
-        output += 'tables:' + '\n'
+        yield '# Configurable NoSQL information groupings' + '\n'
+        yield '# For Azure Table Storage these are table names' + '\n'
+        yield '# For MongoDB these are collection names' + '\n'
+        yield 'tables:' + '\n'
                 
         for value in nosql_template.tables.values():
             camel_case_name = value['name'].split('-')[0]
@@ -540,168 +796,237 @@ class HelmChart:
                 if token != camel_case_name:
                     camel_case_name += token.capitalize()
             
-            output += '  ' + f'{camel_case_name}: "{value["value"]}"' + '\n'
+            yield '  ' + f'{camel_case_name}: "{value["value"]}"' + '\n'
                 
-        output += '\n'
+        yield '\n'
 
-        return output
-
-    def create_cache_section_of_values_yaml(self) -> str:
+    def create_cache_section_of_values_yaml(self) -> Iterator[str]:
         """Create the Cache section of the `values.yaml` file for the Helm chart.
 
         The Cache section is used to define the cache (usually Redis) configuration that the app will use.
 
         Returns:
-            str: The Cache section of the `values.yaml` file
+            Iterator[str]: The lines of the Cache section of the `values.yaml` file
         """
 
-        output = ''
-        
-        # Get the Redis template from the templates provided
-        redis_template = next(template for template in self.templates if isinstance(template, Redis))
+        # Get the Redis template from the components of the chart
+        redis_template = self.get_component('Redis')
                 
-        output += '# Configuration for cache server' + '\n'
-        output += 'cache:' + '\n'
-        output += '  ' + 'type: "redis"' + '\n'
-        output += '  ' + '\n'
+        yield '# Configuration for cache server' + '\n'
+        yield 'cache:' + '\n'
+        yield '  ' + 'type: "redis"' + '\n'
+        yield '  ' + '\n'
 
-        output += '  ' + '# If to create a Redis instance/resource as part of the deployment process' + '\n'
-        output += '  ' + f'create: {str(redis_template.create).lower()}' + '\n'
-        output += '  ' + '\n'
+        yield '  ' + '# If to create a Redis instance/resource as part of the deployment process' + '\n'
+        yield '  ' + f'create: {str(redis_template.create).lower()}' + '\n'
+        yield '  ' + '\n'
 
-        output += '  ' + '# The image to use for the Redis instance' + '\n'
-        output += '  ' + '# ONLY relevant if `create` is set to `true`' + '\n'
+        yield '  ' + '# The image to use for the Redis instance' + '\n'
+        yield '  ' + '# ONLY relevant if `create` is set to `true`' + '\n'
         # If the image dictionary is not empty than we want to include the image values
         if redis_template.create and len(redis_template.image) > 0:
-            output += '  ' + 'image' + '\n'
+            yield '  ' + 'image:' + '\n'
 
             # Loop through the image dictionary and write the image values
             for key, value in redis_template.image.items():
-                output += '  ' + '  ' + f'{key}: "{value}"' + '\n'
+                yield '  ' + '  ' + f'{key}: "{value}"' + '\n'
         else:
-            output += '  ' + 'image: {}' + '\n'
-        output += '  ' + '\n'
+            yield '  ' + 'image: {}' + '\n'
+        yield '  ' + '\n'
 
-        output += '  ' + '# The number of replicas of the Redis instance' + '\n'
-        output += '  ' + '# ONLY relevant if `create` is set to `true`' + '\n'
+        yield '  ' + '# The number of replicas of the Redis instance' + '\n'
+        yield '  ' + '# ONLY relevant if `create` is set to `true`' + '\n'
         if redis_template.create:
-            output += '  ' + f'replicaCount: {redis_template.replicaCount}' + '\n'
+            yield '  ' + f'replicaCount: {redis_template.replicaCount}' + '\n'
         else:
-            output += '  ' + '#replicaCount: <Number of replicas (Ex. 1)>' + '\n'
-        output += '  ' + '\n'
+            yield '  ' + '#replicaCount: <Number of replicas (Ex. 1)>' + '\n'
+        yield '  ' + '\n'
 
-        output += '  ' + '# Hostname of the Redis server' + '\n'
-        output += '  ' + '# ONLY relevant if `create` is set to `false`' + '\n'
+        yield '  ' + '# Hostname of the Redis server' + '\n'
+        yield '  ' + '# ONLY relevant if `create` is set to `false`' + '\n'
         if redis_template.create:
-            output += '  ' + '#hostName: "<Redis Host Name>"' + '\n'
+            yield '  ' + '#hostName: "<Redis Host Name>"' + '\n'
         else:
-            output += '  ' + f'hostName: "{redis_template.hostName}"' + '\n'
-        output += '  ' + '\n'
-
-        output += '  ' + '# The password to use for the Redis server' + '\n'
-        output += '  ' + f'password: "{redis_template.password}"' + '\n'
-        output += '  ' + '\n'
-
-        output += '  ' + '# The port of the Redis server' + '\n'
-        output += '  ' + f'port: "{redis_template.port}"' + '\n'
-        output += '  ' + '\n'
-
-        output += '  ' + '# Redis TLS Configurations' + '\n'
-        output += '  ' + 'tls:' + '\n'
-        output += '  ' + '  ' + '# If TLS is enabled for the Redis instance' + '\n'
-        output += '  ' + '  ' + f'enabled: {str(redis_template.tls_enabled).lower()}' + '\n'
-        output += '  ' + '  ' + '\n'
-        output += '  ' + '  ' + '# The port of the Redis instance for TLS' + '\n'
-        output += '  ' + '  ' + '# ONLY relevant if `tls.enabled` is set to `true`' + '\n'
+            yield '  ' + f'hostName: "{redis_template.hostName}"' + '\n'
+        yield '  ' + '\n'
+
+        yield '  ' + '# The password to use for the Redis server' + '\n'
+        yield '  ' + f'password: "{redis_template.password}"' + '\n'
+        yield '  ' + '\n'
+
+        yield '  ' + '# The port of the Redis server' + '\n'
+        yield '  ' + f'port: "{redis_template.port}"' + '\n'
+        yield '  ' + '\n'
+
+        yield '  ' + '# Redis TLS Configurations' + '\n'
+        yield '  ' + 'tls:' + '\n'
+        yield '  ' + '  ' + '# If TLS is enabled for the Redis instance' + '\n'
+        yield '  ' + '  ' + f'enabled: {str(redis_template.tls_enabled).lower()}' + '\n'
+        yield '  ' + '  ' + '\n'
+        yield '  ' + '  ' + '# The port of the Redis instance for TLS' + '\n'
+        yield '  ' + '  ' + '# ONLY relevant if `tls.enabled` is set to `true`' + '\n'
         if redis_template.tls_enabled:
-            output += '  ' + '  ' + f'port: "{redis_template.tls_port}"' + '\n'
+            yield '  ' + '  ' + f'port: "{redis_template.tls_port}"' + '\n'
         else:
-            output += '  ' + '  ' + '#port: "<TLS Port (Ex. 6380)>"' + '\n'
-        output += '  ' + '\n'
-
-        return output
+            yield '  ' + '  ' + '#port: "<TLS Port (Ex. 6380)>"' + '\n'
+        yield '  ' + '\n'
     
-    def create_third_party_service_section_of_values_yaml(self) -> str:
+    def create_third_party_service_section_of_values_yaml(self) -> Iterator[str]:
         """Create the Third Party Service section of the `values.yaml` file for the Helm chart.
 
         The Third Party Service section is used to define any third-party service configurations that the app will use.
         Ex. OpenAI, Stripe, etc...
 
         Returns:
-            str: The Third Party Service section of the `values.yaml` file
+            Iterator[str]: The lines of the Third Party Service section of the `values.yaml` file
+        """
+
+        yield '# Configurations for integration with third-party services' + '\n'
+        yield 'thirdParty:' + '\n'
+        for template in self.get_components('ThirdPartyService'):
+            yield '  ' + '# Configurations for the ' + template.name.capitalize() + ' integration' + '\n'
+            yield '  ' + f'{template.name}:' + '\n'
+            yield '  ' + '  ' + '# If the integration is enabled' + '\n'
+            yield '  ' + '  ' + f'enabled: {str(template.enabled).lower()}' + '\n'
+            yield '  ' + '  ' + '\n'
+            for key, value in template.vars.items():
+                camel_case_name = key.split('_')[0]
+                for token in key.split('_'):
+                    if token != camel_case_name:
+                        camel_case_name += token.capitalize()
+                
+                yield '  ' + '  ' + f'{camel_case_name}: {value}' + '\n'
+            yield '  ' + '  ' + '\n'
+
+    def get_values_yaml_section_builders(self) -> list:
+        """Get the `create_..._section_of_values_yaml` methods needed for the templates provided (in the order the sections should be written).
+
+        Returns:
+            list[Callable[[], Iterator[str]]]: The section builders for the `values.yaml` file
         """
 
-        output = ''
+        builders = []
+
+        # replicas section (mostly just `replicaCount` but...)
+        builders.append(self.create_replicas_section_of_values_yaml)
         
-        output += '# Configurations for integration with third-party services' + '\n'
-        output += 'thirdParty:' + '\n'
-        for template in self.templates:
-            if isinstance(template, ThirdPartyService):
-                output += '  ' + '# Configurations for the ' + template.name.capitalize() + ' integration' + '\n'
-                output += '  ' + f'{template.name}:' + '\n'
-                output += '  ' + '  ' + '# If the integration is enabled' + '\n'
-                output += '  ' + '  ' + f'enabled: {str(template.enabled).lower()}' + '\n'
-                output += '  ' + '  ' + '\n'
-                for key, value in template.vars.items():
-                    camel_case_name = key.split('_')[0]
-                    for token in key.split('_'):
-                        if token != camel_case_name:
-                            camel_case_name += token.capitalize()
-                    
-                    output += '  ' + '  ' + f'{camel_case_name}: {value}' + '\n'
-                output += '  ' + '  ' + '\n'
+        # image section
+        builders.append(self.create_image_section_of_values_yaml)
+        
+        # container section
+        builders.append(self.create_container_section_of_values_yaml)
+        
+        # ingress section
+        builders.append(self.create_ingress_section_of_values_yaml)
         
-        return output
+        # Add the extra environment variables for the deployment to the `values.yaml` file
+        builders.append(self.create_deployment_extra_vars_section_of_values_yaml)
 
-    def write_values_yaml(self):
+        # If a OAuth template is included in the provided templates than we want to include the appropriate section to the `values.yaml` file.
+        if self.has_component('OAuth'):
+            builders.append(self.create_oauth_section_of_values_yaml)
+        
+        # If a Database template is included in the provided templates than we want to include the appropriate section to the `values.yaml` file.
+        if self.has_component('Database'):
+            builders.append(self.create_database_section_of_values_yaml)
+        
+        # If a Secrets Vault template is included in the provided templates than we want to include the appropriate section to the `values.yaml` file.
+        if self.has_component('SecretsVault'):
+            builders.append(self.create_secrets_vault_section_of_values_yaml)
+
+        # If a Database template is included in the provided templates than we want to include the appropriate section to the `values.yaml` file.
+        if self.has_component('NoSQL'):
+            builders.append(self.create_nosql_section_of_values_yaml)
+        
+        # If a Redis template is included in the provided templates than we want to include the appropriate section to the `values.yaml` file.
+        if self.has_component('Redis'):
+            builders.append(self.create_cache_section_of_values_yaml)
+        
+        # If any Third Party Service templates are included in the provided templates than we want to include the appropriate section to the `values.yaml` file.
+        if self.has_component('ThirdPartyService'):
+            builders.append(self.create_third_party_service_section_of_values_yaml)
+
+        return builders
+
+    def write_values_yaml(self, previous: 'HelmChart | None' = None, affected: set[str] | None = None):
         """Write the `values.yaml` file for the Helm chart.
         
         Note, that this generates a `values.yaml` file that is specific to the templates provided.
         This means, that it's generally better for usage than distribution.
 
         In other words, because it's likely it could contain sensitive information, it's not recommended to distribute this file (or include it in git etc...)
+
+        Args:
+            previous (HelmChart, Optional): A previous render of the chart to reuse the sections of. Default None
+            affected (set[str], Optional): The nodes affected since the `previous` render (see `DependencyGraph.affected_nodes`), the rest are reused. Default None
         """
 
-        with open('values.yaml', 'w') as f:
-            # replicas section (mostly just `replicaCount` but...)
-            f.write(self.create_replicas_section_of_values_yaml())
+        # Because the sections don't depend on each other they can be built in any order (or concurrently)
+        # But are always written in the order given by `get_values_yaml_section_builders`
+        builders = self.get_values_yaml_section_builders()
+
+        if previous is None or affected is None:
+            with self.files.open('values.yaml') as f:
+                if self.parallel is None:
+                    # Each line is written as soon as it's produced, so no section is ever held in memory as a whole
+                    for builder in builders:
+                        f.writelines(builder())
+                else:
+                    with self.create_executor() as executor:
+                        for section in executor.map(build_section, builders):
+                            f.write(section)
             
-            # image section
-            f.write(self.create_image_section_of_values_yaml())
-            
-            # container section
-            f.write(self.create_container_section_of_values_yaml())
-            
-            # ingress section
-            f.write(self.create_ingress_section_of_values_yaml())
-            
-            # Add the extra environment variables for the deployment to the `values.yaml` file
-            f.write(self.create_deployment_extra_vars_section_of_values_yaml())
+            # The sections aren't kept, so the next render given this one as it's `previous` builds all of them (but only the affected ones after that)
+            return
 
-            # If a OAuth template is included in the provided templates than we want to include the appropriate section to the `values.yaml` file.
-            if any(isinstance(template, OAuth) for template in self.templates):
-                f.write(self.create_oauth_section_of_values_yaml())
-            
-            # If a Database template is included in the provided templates than we want to include the appropriate section to the `values.yaml` file.
-            if any(isinstance(template, Database) for template in self.templates):
-                f.write(self.create_database_section_of_values_yaml())
-            
-            # If a Secrets Vault template is included in the provided templates than we want to include the appropriate section to the `values.yaml` file.
-            if any(isinstance(template, SecretsVault) for template in self.templates):
-                f.write(self.create_secrets_vault_section_of_values_yaml())
+        names = [builder.__name__ for builder in builders]
 
-            # If a Database template is included in the provided templates than we want to include the appropriate section to the `values.yaml` file.
-            if any(isinstance(template, NoSQL) for template in self.templates):
-                f.write(self.create_nosql_section_of_values_yaml())
-            
-            # If a Redis template is included in the provided templates than we want to include the appropriate section to the `values.yaml` file.
-            if any(isinstance(template, Redis) for template in self.templates):
-                f.write(self.create_cache_section_of_values_yaml())
-            
-            # If any Third Party Service templates are included in the provided templates than we want to include the appropriate section to the `values.yaml` file.
-            if any(isinstance(template, ThirdPartyService) for template in self.templates):
-                f.write(self.create_third_party_service_section_of_values_yaml())
+        # Sections that don't consume anything that changed are reused as is
+        sections = [previous.sections.get(name) if name not in affected else None for name in names]
+        missing = [index for index, section in enumerate(sections) if section is None]
+
+        if self.parallel is None or len(missing) == 0:
+            for index in missing:
+                sections[index] = build_section(builders[index])
+        else:
+            with self.create_executor() as executor:
+                for index, section in zip(missing, executor.map(build_section, [builders[index] for index in missing])):
+                    sections[index] = section
+        
+        self.sections = dict(zip(names, sections))
+
+        self.files.write_file('values.yaml', ''.join(sections))
     
+    def get_values(self) -> dict:
+        """Get the values of the chart (the generated `values.yaml` file, with any `values_overrides` merged in) as a dictionary.
+
+        Returns:
+            dict: The values of the chart
+        """
+
+        values = load(''.join(''.join(builder()) for builder in self.get_values_yaml_section_builders())) or {}
+
+        return merge_values(values, self.values_overrides)
+
+    def write_environment_values_yaml(self):
+        """Write a values overlay (`values-<environment>.yaml`) for each environment of the chart.
+
+        The templates (and base `values.yaml`) are shared by every environment, so are only rendered once.
+        Each overlay only has the values that differ from the base `values.yaml` (Ex. the replica count or the hostname).
+        So deploying an environment is `helm install -f values-<environment>.yaml ...`.
+        """
+
+        if len(self.environments) == 0:
+            return
+
+        base = load(self.files.read_file('values.yaml')) or {}
+
+        # That the environments only change values (so the templates can be shared) is checked by `build_helm_chart`
+        for name, environment in self.environments.items():
+            overlay = diff_values(base, environment.get_values())
+
+            self.files.write_file(f'values-{name}.yaml', dump(Comment(f'The values of the {name} environment (only the values that differ from values.yaml)'), Mapping(overlay)))
+
     def write_helmignore(self):
         """Write the .helmignore file for the Helm chart.
         
@@ -709,50 +1034,327 @@ class HelmChart:
         This makes the chart smaller and more efficient.
         """
 
-        with open('.helmignore', 'w') as f:
+        with self.files.open('.helmignore') as f:
             f.write('# Ignore the ignore file' + '\n')
             f.write('.helmignore' + '\n')
             
             f.write('# Ignore the Helm chart\'s packaged tarball' + '\n')
             f.write('*.tgz' + '\n')
+
+            f.write('# Ignore the manifest of generated files (used for incremental regeneration)' + '\n')
+            f.write(MANIFEST_FILENAME + '\n')
             
-            if os.path.exists('.git'):
+            if os.path.exists(os.path.join(self.root, '.git')):
                 f.write('# Ignore git files (In case done in the same directory as code)' + '\n')
                 f.write('.git' + '\n')
             
-            if os.path.exists('.gitignore'):
+            if os.path.exists(os.path.join(self.root, '.gitignore')):
                 f.write('.gitignore' + '\n')
             
-            if os.path.exists('README.md'):
+            if os.path.exists(os.path.join(self.root, 'README.md')):
                 f.write('# Ignore the README file (In case done in the same directory as code)' + '\n')
                 f.write('README.md' + '\n')
             
-            if os.path.exists('requirements.txt'):
+            if os.path.exists(os.path.join(self.root, 'requirements.txt')):
                 f.write('# Ignore the requirements file (In case done in the same directory as code)' + '\n')
                 f.write('requirements.txt' + '\n')
             
-            if os.path.exists('create-helm-chart.py'):
+            if os.path.exists(os.path.join(self.root, 'create-helm-chart.py')):
                 f.write('# Ignore this file (In case done in the same directory as code)' + '\n')
                 f.write('create-helm-chart.py' + '\n')
 
-    def package(self):
-        """Package the Helm chart for publishing."""
+    def render(self, previous: 'HelmChart | None' = None, affected: set[str] | None = None):
+        """Render the whole Helm chart (templates, `Chart.yaml`, `values.yaml` and `.helmignore`) into the in-memory file tree.
+
+        Given a `previous` render of the chart and the nodes `affected` since then (see `DependencyGraph.affected_nodes`),
+        only the affected templates and `values.yaml` sections are rendered, everything else is reused from the previous render.
+        The values overlays of the environments (if any) are always regenerated because they depend on all the values.
+
+        Args:
+            previous (HelmChart, Optional): A previous render of the chart (Ex. before the input was edited). Default None
+            affected (set[str], Optional): The nodes affected since the `previous` render. Default None (render everything)
+        """
+
+        with self.metrics.span('render') as span:
+            with self.metrics.span('create_templates_folder'):
+                self.create_templates_folder(previous, affected)
+            with self.metrics.span('write_yaml'):
+                if previous is not None and affected is not None and 'Chart.yaml' not in affected and 'Chart.yaml' in previous.files:
+                    self.files.write_file('Chart.yaml', previous.files.read_file('Chart.yaml'))
+                else:
+                    self.write_yaml()
+            with self.metrics.span('write_values_yaml') as values_span:
+                self.write_values_yaml(previous, affected)
+                values_span.attributes['bytes'] = len(self.files.read_file('values.yaml').encode('utf-8'))
+            with self.metrics.span('write_environment_values_yaml', environments=len(self.environments)):
+                self.write_environment_values_yaml()
+            with self.metrics.span('write_helmignore'):
+                self.write_helmignore()
+
+            span.attributes['files'] = len(self.files)
+            span.attributes['bytes'] = self.files.size()
+
+    def flush(self, root: str | None = None, incremental: bool = False) -> dict[str, list[str]] | None:
+        """Write the rendered Helm chart (templates, `Chart.yaml`, `values.yaml`, etc...) to disk in one batched step.
+        
+        Args:
+            root (str, Optional): The directory to write the Helm chart into. Default None (the `root` of the chart)
+            incremental (bool, Optional): Only write files whose content changed and delete files that are no longer generated (see `VirtualFileTree.flush_incremental`). Default False
+        
+        Returns:
+            dict[str, list[str]] | None: The paths that were `written`, `unchanged` and `deleted` if `incremental` otherwise None
+        """
+
+        with self.metrics.span('flush', incremental=incremental) as span:
+            if incremental:
+                changes = self.files.flush_incremental(root if root is not None else self.root)
+
+                span.attributes['files'] = len(changes['written'])
+                span.attributes['bytes'] = sum(len(self.files.read_file(path).encode('utf-8')) for path in changes['written'])
+                self.metrics.count('files.created', len(changes['written']))
+                self.metrics.count('bytes.written', span.attributes['bytes'])
+
+                return changes
+
+            self.files.flush(root if root is not None else self.root)
+
+            span.attributes['files'] = len(self.files)
+            span.attributes['bytes'] = self.files.size()
+            self.metrics.count('files.created', len(self.files))
+            self.metrics.count('bytes.written', span.attributes['bytes'])
+
+    def digest(self, gzip_level: int = 9) -> str:
+        """Get a digest of everything the packaged Helm chart depends on.
+
+        That's the generator's code (see `Version.get_source_digest`), the metadata of the chart, the configuration of every template (see `Template.config_key`),
+        the values (and environments), the manifest layout and the modification time and gzip compression level of the package (see `ChartPackager`).
+        None of the templates are rendered to get it, so it's a lot cheaper than rendering the chart.
+        Two charts with the same digest package to the same `.tgz`.
+
+        Args:
+            gzip_level (int, Optional): The gzip compression level of the package. Default 9
+
+        Returns:
+            str: The (hex) SHA-256 digest
+        """
+
+        document = {
+            'generator': get_source_digest(),
+            'chart': self.get_chart_metadata(),
+            'templates': [template.config_key() for template in self.templates],
+            'values': ''.join(''.join(builder()) for builder in self.get_values_yaml_section_builders()),
+            'environments': { name: environment.get_values() for name, environment in self.environments.items() },
+            'manifest_layout': self.manifest_layout,
+            'mtime': int(os.environ.get('SOURCE_DATE_EPOCH', 0)),
+            'gzip_level': gzip_level
+        }
+
+        return hashlib.sha256(json.dumps(document, sort_keys=True, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+    def restore(self, cache: 'PackageCache', gzip_level: int = 9) -> bool:
+        """Restore the Helm chart from a package cache instead of rendering it (if the cache has a package of the chart's `digest`).
+
+        The files of the chart are unpacked from the cached package (so it can still be flushed and validated) and `package` reuses it as is.
+
+        Args:
+            cache (PackageCache): The package cache.
+            gzip_level (int, Optional): The gzip compression level of the package (the same as given to `package`). Default 9
+
+        Returns:
+            bool: If the chart was restored (otherwise it still needs to be rendered)
+        """
+
+        # Without a digest of the generator's code, a cached package can't be told apart from what an older version packaged
+        if get_source_digest() is None:
+            return False
+
+        with self.metrics.span('restore') as span:
+            archive = cache.get(self.digest(gzip_level))
 
-        result = subprocess.run(['helm', 'package', '.'])
+            span.attributes['hit'] = archive is not None
+            self.metrics.count('package_cache.hits' if archive is not None else 'package_cache.misses')
+
+            if archive is None:
+                return False
+            
+            from .ChartPackager import ChartPackager
+
+            self.files = ChartPackager.unpack(archive, self.chartName)
+            # The `.helmignore` file ignores itself, so it's never in the package
+            self.write_helmignore()
+            self.archive = archive
+
+            span.attributes['bytes'] = len(archive)
+            return True
+
+    def get_package_filename(self) -> str:
+        """Get the path of the Helm chart's packaged tarball (`<root>/<name>-<version>.tgz`).
+
+        Returns:
+            str: The path of the packaged tarball
+        """
+
+        return os.path.join(self.root, f'{self.chartName}-{self.chartVersion}.tgz')
+
+    def create_archive(self, gzip_level: int = 9) -> bytes:
+        """Package the rendered Helm chart in-process (see `ChartPackager`) without writing anything to disk.
+
+        Args:
+            gzip_level (int, Optional): The gzip compression level of the package. Default 9
+        
+        Returns:
+            bytes: The contents of the packaged tarball
+        """
+
+        from .ChartPackager import ChartPackager
+
+        return ChartPackager(gzip_level).package(self.files, self.chartName)
+
+    def package(self, use_helm: bool = False, gzip_level: int = 9, cache: 'PackageCache | None' = None) -> str:
+        """Package the Helm chart for publishing.
+
+        By default the chart is packaged in-process straight from the in-memory file tree (see `ChartPackager`).
+        So the package is reproducible and doesn't require the chart to have been written to disk (or `helm` to be installed).
+
+        Args:
+            use_helm (bool, Optional): Use `helm package` instead (requires the chart to have been flushed to disk). Default False
+            gzip_level (int, Optional): The gzip compression level of the package (ignored if `use_helm`). Default 9
+            cache (PackageCache, Optional): Store the package in a package cache (see `restore`), ignored if `use_helm`. Default None
+        
+        Returns:
+            str: The path of the packaged tarball
+        """
+
+        with self.metrics.span('package', use_helm=use_helm) as span:
+            if use_helm:
+                import subprocess
+
+                result = subprocess.run(['helm', 'package', self.root, '--destination', self.root])
+
+                if result.returncode != 0:
+                    raise Exception('Failed to package the Helm chart.')
+            
+                span.attributes['bytes'] = os.path.getsize(self.get_package_filename())
+                return self.get_package_filename()
+        
+            if self.archive is not None:
+                # Restored from the package cache, so there's nothing to package
+                archive = self.archive
+                span.attributes['cached'] = True
+            else:
+                archive = self.create_archive(gzip_level)
+
+                if cache is not None and get_source_digest() is not None:
+                    cache.put(self.digest(gzip_level), archive)
+
+            os.makedirs(self.root, exist_ok=True)
+            with open(self.get_package_filename(), 'wb') as f:
+                f.write(archive)
+        
+            span.attributes['bytes'] = len(archive)
+            return self.get_package_filename()
+    
+    def verify_package(self):
+        """Check that `helm` accepts the packaged Helm chart (using `helm show chart`).
+        
+        This is mostly useful to confirm the compatibility of packages created in-process.
+        """
+
+        import shutil, subprocess
+
+        if shutil.which('helm') is None:
+            raise Exception('Can\'t verify the package because helm isn\'t installed.')
+        
+        result = subprocess.run(['helm', 'show', 'chart', self.get_package_filename()], capture_output=True, text=True)
 
         if result.returncode != 0:
-            raise Exception('Failed to package the Helm chart.')
+            raise Exception(f'Helm rejected the packaged Helm chart: {result.stderr.strip()}')
     
-    def push(self, registry: str):
+    def validate(self) -> list[str]:
+        """Check the rendered Helm chart in-process, without `helm` (see `ChartValidator`).
+
+        Returns:
+            list[str]: The problems found (empty if there weren't any)
+        """
+
+        from .ChartValidator import ChartValidator
+
+        return ChartValidator().validate(self.files)
+
+    def lint(self):
+        """Check the Helm chart (on disk) with `helm lint`."""
+
+        import shutil, subprocess
+
+        if shutil.which('helm') is None:
+            raise Exception('Can\'t lint the Helm chart because helm isn\'t installed.')
+        
+        result = subprocess.run(['helm', 'lint', self.root], capture_output=True, text=True)
+
+        if result.returncode != 0:
+            raise Exception(f'helm lint found problems with the Helm chart: {result.stdout.strip()}')
+
+    def get_chart_metadata(self) -> dict:
+        """Get the metadata of the Helm chart (the contents of `Chart.yaml`) as a dictionary.
+
+        Returns:
+            dict: The metadata of the Helm chart
+        """
+
+        return {
+            'apiVersion': self.apiVersion,
+            'appVersion': self.appVersion,
+            'description': self.chartDescription,
+            'home': self.chartHomepage,
+            'maintainers': self.maintainers,
+            'name': self.chartName,
+            'sources': self.sources,
+            'version': self.chartVersion
+        }
+
+    def push(self, registry: str, use_helm: bool = False, client: 'OCIRegistryClient | None' = None) -> str | None:
         """Push the Helm chart to the Helm remote registry.
+
+        By default the chart is pushed in-process using an `OCIRegistryClient`.
+        Passing a client allows it's connections to be reused across charts.
         
         Args:
             registry (str): The URL of the Helm remote registry
+            use_helm (bool, Optional): Use `helm push` instead. Default False
+            client (OCIRegistryClient, Optional): The client to push with. Default None (a new client that's closed afterwards)
+        
+        Returns:
+            str | None: The reference of the pushed chart (`<registry>/<name>:<version>@<digest>`) or None if `use_helm`
         """
 
-        if not os.path.exists(f'{self.chartName}-{self.chartVersion}.tgz'):
-            raise Exception('The Helm chart has not been packaged yet.')
+        with self.metrics.span('push', use_helm=use_helm, registry=registry) as span:
+            package_file = self.get_package_filename()
+
+            if not os.path.exists(package_file):
+                raise Exception('The Helm chart has not been packaged yet.')
         
-        print(f'Pushing {self.chartName}-{self.chartVersion}.tgz to {registry}')
+            print(f'Pushing {self.chartName}-{self.chartVersion}.tgz to {registry}')
         
-        subprocess.run(['helm', 'push', f'{self.chartName}-{self.chartVersion}.tgz', f'oci://{registry}'])
\ No newline at end of file
+            if use_helm:
+                import subprocess
+
+                result = subprocess.run(['helm', 'push', package_file, f'oci://{registry}'])
+
+                if result.returncode != 0:
+                    raise Exception('Failed to push the Helm chart.')
+            
+                span.attributes['bytes'] = os.path.getsize(package_file)
+                return None
+        
+            with open(package_file, 'rb') as f:
+                archive = f.read()
+
+            span.attributes['bytes'] = len(archive)
+
+            if client is not None:
+                return client.push_chart(registry, self.chartName, self.chartVersion, archive, self.get_chart_metadata())
+        
+            from .OCIRegistryClient import OCIRegistryClient
+
+            with OCIRegistryClient() as client:
+                return client.push_chart(registry, self.chartName, self.chartVersion, archive, self.get_chart_metadata())
\ No newline at end of file
@@ -0,0 +1,65 @@
+from .Template import Template
+from .VirtualFileTree import VirtualFileTree
+
+class Helpers (Template):
+    def __init__(self, prefix: str):
+        """A class for creating the `_helpers.tpl` file of the Helm chart.
+
+        The file has the named templates that the other templates include instead of repeating the same boilerplate in every file (see `Template.create_labels` and `Template.create_data_object`).
+        Which keeps the labels and the Secret/ConfigMap boilerplate in one place.
+        The file itself costs about as much as it saves, so the templates only get smaller for charts with a lot of Secrets/ConfigMaps (Ex. dozens of extra environment variables).
+
+        - `<prefix>.labels`: The labels of the app's objects
+        - `<prefix>.selectorLabels`: The labels used to select the app's pods
+        - `<prefix>.metadata`: The `metadata` of an object of the release
+        - `<prefix>.secret`: Everything of an `Opaque` Secret but it's `data`
+        - `<prefix>.configMap`: Everything of a ConfigMap but it's `data`
+
+        The last three are given a dictionary of the top level objects (`context`), the name of the object without the release name (`name`),
+        the `namespace` of the object (if it's set) and if the object has the app's labels (`labeled`).
+        Ex. `{{ include "<prefix>.secret" (dict "context" . "name" "db-password") }}`
+
+        Args:
+            prefix (str): The prefix of the named templates (the name of the chart, so they don't clash with the named templates of any other chart it's used with).
+        """
+
+        super().__init__()
+
+        self.prefix = prefix
+
+    def write(self, files: VirtualFileTree):
+        # Files starting with an underscore are never rendered as manifests, they only hold named templates
+        with files.open('templates/_helpers.tpl') as f:
+            f.write('{{/* Named templates shared by the other templates (see the generator\'s `Helpers` component for their arguments) */}}' + '\n')
+            f.write(f'{{{{- define "{self.prefix}.labels" -}}}}' + '\n')
+            f.write('app: {{ .Release.Name }}' + '\n')
+            f.write('{{- end }}' + '\n')
+            f.write('\n')
+            f.write(f'{{{{- define "{self.prefix}.selectorLabels" -}}}}' + '\n')
+            f.write('app: {{ .Release.Name }}' + '\n')
+            f.write('{{- end }}' + '\n')
+            f.write('\n')
+            f.write(f'{{{{- define "{self.prefix}.metadata" -}}}}' + '\n')
+            f.write('metadata:' + '\n')
+            f.write('  ' + 'name: {{ .context.Release.Name }}-{{ .name }}' + '\n')
+            f.write('  ' + '{{- if .namespace }}' + '\n')
+            f.write('  ' + 'namespace: {{ .namespace }}' + '\n')
+            f.write('  ' + '{{- end }}' + '\n')
+            f.write('  ' + '{{- if .labeled }}' + '\n')
+            f.write('  ' + 'labels:' + '\n')
+            f.write('  ' + '  ' + f'{{{{- include "{self.prefix}.labels" .context | nindent 4 }}}}' + '\n')
+            f.write('  ' + '{{- end }}' + '\n')
+            f.write('{{- end }}' + '\n')
+            f.write('\n')
+            f.write(f'{{{{- define "{self.prefix}.secret" -}}}}' + '\n')
+            f.write('apiVersion: v1' + '\n')
+            f.write('kind: Secret' + '\n')
+            f.write(f'{{{{ include "{self.prefix}.metadata" . }}}}' + '\n')
+            f.write('type: Opaque' + '\n')
+            f.write('{{- end }}' + '\n')
+            f.write('\n')
+            f.write(f'{{{{- define "{self.prefix}.configMap" -}}}}' + '\n')
+            f.write('apiVersion: v1' + '\n')
+            f.write('kind: ConfigMap' + '\n')
+            f.write(f'{{{{ include "{self.prefix}.metadata" . }}}}' + '\n')
+            f.write('{{- end }}' + '\n')
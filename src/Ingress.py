@@ -1,4 +1,6 @@
 from .Template import Template
+from .VirtualFileTree import VirtualFileTree
+from .YAML import Directive
 
 class Ingress (Template):
     def __init__(self, hostname: str):
@@ -12,28 +14,45 @@ class Ingress (Template):
 
         self.hostname = hostname
     
-    def write(self):
+    def get_config(self) -> dict:
+        """None of the attributes affect the rendered files (the hostname comes from the `values.yaml` file)."""
+
+        return {}
+    
+    def write(self, files: VirtualFileTree):
         """Write the Ingress template to a file."""
         
-        with open(f'templates/ingress.yaml', 'w') as f:
-            f.write('{{- if .Values.ingress.enabled -}}' + '\n')
-            f.write('apiVersion: networking.k8s.io/v1' + '\n')
-            f.write('kind: Ingress' + '\n')
-            f.write('metadata:' + '\n')
-            f.write('  ' + 'name: {{ .Release.Name }}' + '\n')
-            f.write('  ' + 'annotations:' + '\n')
-            f.write('  ' + '  ' + 'nginx.ingress.kubernetes.io/rewrite-target: /' + '\n')
-            f.write('spec:' + '\n')
-            f.write('  ' + 'rules:' + '\n')
-            f.write('  ' + '- host: {{ .Values.ingress.host }}' + '\n')
-            f.write('  ' + '  ' + 'http:' + '\n')
-            f.write('  ' + '  ' + '  ' + 'paths:' + '\n')
-            f.write('  ' + '  ' + '  ' + '- path: /' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + 'pathType: Prefix' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + 'backend:' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + 'service:' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'name: {{ .Release.Name }}' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'port:' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'number: 80' + '\n')
-            f.write('  ' + 'ingressClassName: {{ .Values.ingress.class }}' + '\n')
-            f.write('{{- end -}}')
\ No newline at end of file
+        self.write_document(files, 'templates/ingress.yaml', Directive('{{- if .Values.ingress.enabled -}}'), {
+            'apiVersion': 'networking.k8s.io/v1',
+            'kind': 'Ingress',
+            'metadata': {
+                'name': '{{ .Release.Name }}',
+                'annotations': {
+                    'nginx.ingress.kubernetes.io/rewrite-target': '/'
+                }
+            },
+            'spec': {
+                'rules': [
+                    {
+                        'host': '{{ .Values.ingress.host }}',
+                        'http': {
+                            'paths': [
+                                {
+                                    'path': '/',
+                                    'pathType': 'Prefix',
+                                    'backend': {
+                                        'service': {
+                                            'name': '{{ .Release.Name }}',
+                                            'port': {
+                                                'number': 80
+                                            }
+                                        }
+                                    }
+                                }
+                            ]
+                        }
+                    }
+                ],
+                'ingressClassName': '{{ .Values.ingress.class }}'
+            }
+        }, Directive('{{- end -}}'))
@@ -0,0 +1,429 @@
+import hashlib, json, marshal, os, re, sys
+
+from .Version import VERSION
+
+# Any non-empty string
+STRING = { 'type': 'string', 'minLength': 1 }
+
+def section(properties: dict, required: list[str] | None = None) -> dict:
+    """Create the schema of an optional section of the input (an object that can also be set to `false` to turn it off).
+
+    Args:
+        properties (dict): The schemas of the properties of the section.
+        required (list[str], Optional): The required properties. Default None (all of them)
+
+    Returns:
+        dict: The schema of the section
+    """
+
+    return {
+        'anyOf': [
+            { 'const': False },
+            { 'type': 'object', 'properties': properties, 'required': list(properties) if required is None else required }
+        ]
+    }
+
+# The schema of the input document (`input.json`), a subset of JSON Schema (`type`, `const`, `enum`, `minLength`, `pattern` (matching the whole string), `properties`, `required`, `additionalProperties`, `items` and `anyOf`)
+SCHEMA = {
+    'type': 'object',
+    'required': ['chart', 'image', 'ingress'],
+    'properties': {
+        'chart': {
+            'type': 'object',
+            'required': ['apiVersion', 'appVersion', 'description', 'homepage', 'maintainers', 'name', 'sources', 'version'],
+            'properties': {
+                'apiVersion': STRING,
+                'appVersion': STRING,
+                'description': { 'type': 'string' },
+                'homepage': { 'type': 'string' },
+                'maintainers': {
+                    'type': 'array',
+                    'items': {
+                        'type': 'object',
+                        'required': ['name', 'email'],
+                        'properties': { 'name': STRING, 'email': { 'type': 'string' } }
+                    }
+                },
+                # The name of the Helm chart is also the name of it's directory and package (Ex. in batch mode), so it can't be a path (the same rules as Helm's chart names)
+                'name': { 'type': 'string', 'pattern': r'[a-z0-9]([a-z0-9-]*[a-z0-9])?' },
+                'sources': { 'type': 'array', 'items': { 'type': 'string' } },
+                'version': STRING
+            }
+        },
+        'image': {
+            'type': 'object',
+            'required': ['repository', 'pullPolicy'],
+            'properties': {
+                'repository': STRING,
+                'pullPolicy': { 'enum': ['Always', 'IfNotPresent', 'Never'] }
+            }
+        },
+        'ingress': {
+            'type': 'object',
+            'required': ['hostname'],
+            'properties': { 'hostname': STRING }
+        },
+        'db': section({ 'name': STRING, 'host': STRING, 'user': STRING, 'password': { 'type': 'string' } }),
+        'vault': section({
+            'image': {
+                'type': 'object',
+                'required': ['repository', 'tag'],
+                'properties': { 'repository': STRING, 'tag': STRING }
+            },
+            'hostname': STRING,
+            'storageClass': STRING
+        }),
+        'nosql': section({
+            'dbName': STRING,
+            'user': STRING,
+            'password': { 'type': 'string' },
+            'tables': {
+                'type': 'object',
+                'additionalProperties': {
+                    'type': 'object',
+                    'required': ['name', 'value'],
+                    'properties': { 'name': STRING, 'value': STRING }
+                }
+            }
+        }),
+        'cache': section({ 'password': { 'type': 'string' } }),
+        'oauth': section({
+            'baseAppUrl': STRING,
+            'appAbbreviation': STRING,
+            'appName': STRING,
+            'serviceName': STRING,
+            'devPort': { 'type': ['string', 'integer'] },
+            'clientId': { 'type': 'string' },
+            'clientSecret': { 'type': 'string' }
+        }, ['baseAppUrl', 'appAbbreviation', 'appName', 'serviceName', 'devPort']),
+        'thirdPartyServices': {
+            'type': 'object',
+            'properties': {
+                'openai': {
+                    'type': 'object',
+                    'required': ['apiKey'],
+                    'properties': { 'apiKey': { 'type': 'string' } }
+                },
+                'stripe': {
+                    'type': 'object',
+                    'required': ['publicKey', 'secretKey', 'testPublicKey', 'testSecretKey'],
+                    'properties': {
+                        'publicKey': { 'type': 'string' },
+                        'secretKey': { 'type': 'string' },
+                        'testPublicKey': { 'type': 'string' },
+                        'testSecretKey': { 'type': 'string' }
+                    }
+                }
+            },
+            # Any other service would be silently left out of the chart
+            'additionalProperties': False
+        },
+        'extraEnvVars': {
+            'type': 'object',
+            'additionalProperties': {
+                'anyOf': [
+                    { 'type': 'string' },
+                    {
+                        'type': 'object',
+                        'required': ['type', 'name', 'key', 'value'],
+                        'properties': {
+                            'type': { 'enum': ['Secret', 'ConfigMap'] },
+                            'name': STRING,
+                            'key': STRING,
+                            'group': STRING,
+                            'description': { 'type': 'string' },
+                            'value': { 'type': 'string' }
+                        }
+                    }
+                ]
+            }
+        },
+        'consolidateEnvVars': { 'type': 'boolean' },
+        'helpers': { 'type': 'boolean' },
+        'registry': STRING,
+        # Overrides of the input (and values) for each environment (Ex. `dev`, `prod`), see `HelmChart.write_environment_values_yaml`
+        'environments': {
+            'type': 'object',
+            'additionalProperties': {
+                'type': 'object',
+                'properties': { 'values': { 'type': 'object' } }
+            }
+        }
+    }
+}
+
+# The Python check for each JSON type
+TYPE_CHECKS = {
+    'object': 'isinstance({0}, dict)',
+    'array': 'isinstance({0}, list)',
+    'string': 'isinstance({0}, str)',
+    'boolean': 'isinstance({0}, bool)',
+    'integer': '(isinstance({0}, int) and not isinstance({0}, bool))',
+    'number': '(isinstance({0}, (int, float)) and not isinstance({0}, bool))',
+    'null': '{0} is None'
+}
+
+def describe(value) -> str:
+    """Describe the JSON type of a value (for errors).
+
+    Args:
+        value (Any): The value.
+
+    Returns:
+        str: The JSON type of the value
+    """
+
+    if value is None:
+        return 'null'
+    elif isinstance(value, bool):
+        return 'boolean'
+    elif isinstance(value, (int, float)):
+        return 'number'
+    elif isinstance(value, str):
+        return 'string'
+    elif isinstance(value, list):
+        return 'array'
+
+    return 'object'
+
+def join_path(path: str, key) -> str:
+    """Add a key (or index) to a JSON path (Ex. `$.chart` and `name` is `$.chart.name`).
+
+    Args:
+        path (str): The JSON path.
+        key (str | int): The key (or index).
+
+    Returns:
+        str: The JSON path of the key
+    """
+
+    if isinstance(key, int):
+        return f'{path}[{key}]'
+    elif key.isidentifier():
+        return f'{path}.{key}'
+
+    return f'{path}[{json.dumps(key)}]'
+
+class SchemaCompiler:
+    def __init__(self):
+        """Compiles a schema into the source of a Python function that checks a document in one pass (without interpreting the schema)."""
+
+        self.lines: list[str] = []
+        self.counter = 0
+
+    def name(self) -> str:
+        """Get a new (unique) variable name.
+
+        Returns:
+            str: The variable name
+        """
+
+        self.counter += 1
+        return f'v{self.counter}'
+
+    def emit(self, indent: int, line: str):
+        self.lines.append('    ' * indent + line)
+
+    def describe_schema(self, schema: dict) -> str:
+        """Describe what a schema expects (for errors).
+
+        Args:
+            schema (dict): The schema.
+
+        Returns:
+            str: The description (Ex. `object or false`)
+        """
+
+        if 'anyOf' in schema:
+            return ' or '.join(self.describe_schema(alternative) for alternative in schema['anyOf'])
+        elif 'const' in schema:
+            return json.dumps(schema['const'])
+        elif 'enum' in schema:
+            return 'one of ' + ', '.join(json.dumps(value) for value in schema['enum'])
+
+        types = schema.get('type', 'any')
+        return ' or '.join(types) if isinstance(types, list) else types
+
+    def type_condition(self, schema: dict, variable: str) -> str | None:
+        """Get the Python condition that checks the type of a value (None if any type is allowed).
+
+        Args:
+            schema (dict): The schema.
+            variable (str): The variable holding the value.
+
+        Returns:
+            str | None: The condition
+        """
+
+        if 'const' in schema:
+            return f'{variable} is {schema["const"]!r}' if schema['const'] in (True, False, None) else f'{variable} == {schema["const"]!r}'
+        elif 'anyOf' in schema:
+            conditions = [self.type_condition(alternative, variable) for alternative in schema['anyOf']]
+            return None if None in conditions else '(' + ' or '.join(conditions) + ')'
+        elif 'type' not in schema:
+            return None
+
+        types = schema['type'] if isinstance(schema['type'], list) else [schema['type']]
+        return '(' + ' or '.join(TYPE_CHECKS[type].format(variable) for type in types) + ')'
+
+    def compile_node(self, schema: dict, variable: str, path: str, indent: int):
+        """Emit the checks of a schema.
+
+        Args:
+            schema (dict): The schema.
+            variable (str): The variable holding the value being checked.
+            path (str): A Python expression for the JSON path of the value (only evaluated if there's an error).
+            indent (int): The indentation of the emitted code.
+        """
+
+        if 'anyOf' in schema:
+            # The alternatives are told apart by their type, so only the checks of the one that matches are run
+            for index, alternative in enumerate(schema['anyOf']):
+                condition = self.type_condition(alternative, variable) or 'True'
+                self.emit(indent, f'{"if" if index == 0 else "elif"} {condition}:')
+                self.emit(indent + 1, 'pass')
+                self.compile_node({ key: value for key, value in alternative.items() if key not in ('type', 'const') }, variable, path, indent + 1)
+            self.emit(indent, 'else:')
+            self.emit(indent + 1, f'errors.append(({path}, {("expected " + self.describe_schema(schema) + " but found ")!r} + describe({variable})))')
+            return
+
+        condition = self.type_condition(schema, variable)
+        if condition is not None:
+            self.emit(indent, f'if not {condition}:')
+            self.emit(indent + 1, f'errors.append(({path}, {("expected " + self.describe_schema(schema) + " but found ")!r} + describe({variable})))')
+            self.emit(indent, 'else:')
+            indent += 1
+            self.emit(indent, 'pass')
+
+        if 'enum' in schema:
+            self.emit(indent, f'if {variable} not in {tuple(schema["enum"])!r}:')
+            self.emit(indent + 1, f'errors.append(({path}, {("expected " + self.describe_schema(schema) + " but found ")!r} + json.dumps({variable})))')
+
+        if 'minLength' in schema:
+            self.emit(indent, f'if len({variable}) < {schema["minLength"]}:')
+            self.emit(indent + 1, f'errors.append(({path}, "can\'t be empty" if {schema["minLength"]} == 1 else "is too short"))')
+
+        if 'pattern' in schema:
+            self.emit(indent, f'if re.fullmatch({schema["pattern"]!r}, {variable}) is None:')
+            self.emit(indent + 1, f'errors.append(({path}, {("does not match the pattern " + schema["pattern"])!r}))')
+
+        for key in schema.get('required', []):
+            self.emit(indent, f'if {key!r} not in {variable}:')
+            self.emit(indent + 1, f'errors.append(({path}, {("missing required key " + json.dumps(key))!r}))')
+
+        properties = schema.get('properties', {})
+        for key, property_schema in properties.items():
+            child = self.name()
+            self.emit(indent, f'if {key!r} in {variable}:')
+            self.emit(indent + 1, f'{child} = {variable}[{key!r}]')
+            self.compile_node(property_schema, child, f'{path} + {join_path("", key)!r}', indent + 1)
+
+        additional = schema.get('additionalProperties', True)
+        if additional is not True:
+            key_variable = self.name()
+            child = self.name()
+            self.emit(indent, f'for {key_variable}, {child} in {variable}.items():')
+            if len(properties) > 0:
+                self.emit(indent + 1, f'if {key_variable} in {tuple(properties)!r}:')
+                self.emit(indent + 2, 'continue')
+
+            if additional is False:
+                self.emit(indent + 1, f'errors.append((join_path({path}, {key_variable}), "unknown key"))')
+            else:
+                self.compile_node(additional, child, f'join_path({path}, {key_variable})', indent + 1)
+
+        if 'items' in schema:
+            index_variable = self.name()
+            child = self.name()
+            self.emit(indent, f'for {index_variable}, {child} in enumerate({variable}):')
+            self.compile_node(schema['items'], child, f'join_path({path}, {index_variable})', indent + 1)
+
+    def compile(self, schema: dict) -> str:
+        """Compile a schema.
+
+        Args:
+            schema (dict): The schema.
+
+        Returns:
+            str: The source of the `check(document, errors)` function
+        """
+
+        self.lines = ['def check(v0, errors):']
+        self.compile_node(schema, 'v0', '"$"', 1)
+
+        return '\n'.join(self.lines) + '\n'
+
+def get_cache_path(digest: str) -> str:
+    """Get the path of the on-disk cache of a compiled schema (next to the generator's own bytecode).
+
+    Args:
+        digest (str): The digest of the schema (and generator version).
+
+    Returns:
+        str: The path of the cached (marshalled) code
+    """
+
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), '__pycache__', f'InputSchema.{digest[:16]}.{sys.implementation.cache_tag}.bin')
+
+def compile_schema(schema: dict):
+    """Get the compiled checker of a schema, loading it from the on-disk cache if it was already compiled.
+
+    Args:
+        schema (dict): The schema.
+
+    Returns:
+        Callable[[Any, list], None]: The checker (adds a `(path, message)` for every problem to the list)
+    """
+
+    digest = hashlib.sha256((VERSION + json.dumps(schema, sort_keys=True)).encode('utf-8')).hexdigest()
+    cache_path = get_cache_path(digest)
+
+    code = None
+    try:
+        with open(cache_path, 'rb') as f:
+            code = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+
+    if code is None:
+        code = compile(SchemaCompiler().compile(schema), f'<input schema {digest[:16]}>', 'exec')
+
+        # The cache is only an optimization, so it not being writable (Ex. a read-only install or the zipapp) is fine
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            temporary_path = f'{cache_path}.{os.getpid()}.tmp'
+            with open(temporary_path, 'wb') as f:
+                marshal.dump(code, f)
+            os.replace(temporary_path, cache_path)
+        except OSError:
+            pass
+
+    namespace = { 'json': json, 're': re, 'describe': describe, 'join_path': join_path }
+    exec(code, namespace)
+
+    return namespace['check']
+
+# The compiled checker of `SCHEMA` (compiled the first time it's needed)
+checker = None
+
+def validate_input(data) -> list[str]:
+    """Check an input document against the schema of the input format.
+
+    The whole document is checked (rather than stopping at the first problem).
+
+    Args:
+        data (Any): The input document.
+
+    Returns:
+        list[str]: Every problem found (`<JSON path>: <problem>`), empty if the document is valid
+    """
+
+    global checker
+
+    if checker is None:
+        checker = compile_schema(SCHEMA)
+
+    errors = []
+    checker(data, errors)
+
+    return [f'{path}: {message}' for path, message in errors]
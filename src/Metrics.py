@@ -0,0 +1,268 @@
+import json, os, threading, time
+from contextlib import contextmanager
+from typing import Iterator
+
+class Span:
+    def __init__(self, name: str, span_id: str, parent_id: str | None, start: int, attributes: dict | None = None):
+        """A timed stage of generating a chart (Ex. rendering a template or packaging the chart).
+
+        Args:
+            name (str): The name of the stage (Ex. `template.write`).
+            span_id (str): The ID of the span (16 hex characters).
+            parent_id (str | None): The ID of the span this span is part of (if any).
+            start (int): When the stage started (nanoseconds since the epoch).
+            attributes (dict, Optional): Anything else about the stage (Ex. the bytes written). Default None
+        """
+
+        self.name = name
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.start = start
+        self.end = start
+        self.attributes = dict(attributes or {})
+
+    def to_dict(self) -> dict:
+        """Get the span as a (JSON serializable) dictionary.
+
+        Returns:
+            dict: The span
+        """
+
+        return {
+            'name': self.name,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'start_ns': self.start,
+            'end_ns': self.end,
+            'duration_ms': (self.end - self.start) / 1e6,
+            'attributes': self.attributes
+        }
+
+class Metrics:
+    def __init__(self, chart_name: str | None = None):
+        """The timings (spans) and counters of generating a single chart.
+
+        Spans started within another span (on the same thread) are recorded as part of it.
+        So the spans form a tree (Ex. `render` > `create_templates_folder` > `template.write`).
+
+        Args:
+            chart_name (str, Optional): The name of the chart (included in the exported metrics). Default None
+        """
+
+        self.chart_name = chart_name
+        self.trace_id = os.urandom(16).hex()
+        self.spans: list[Span] = []
+        self.counters: dict[str, int] = {}
+
+        self.lock = threading.Lock()
+        # The stack of open spans of each thread (so nested spans know their parent)
+        self.local = threading.local()
+
+    def __getstate__(self) -> dict:
+        # Only the identity of the metrics is sent to other processes (Ex. when the chart is sent to a process pool)
+        # Anything recorded by another process isn't part of these metrics (only what the process sends back is)
+        return { 'chart_name': self.chart_name, 'trace_id': self.trace_id }
+
+    def __setstate__(self, state: dict):
+        self.__init__(state['chart_name'])
+        self.trace_id = state['trace_id']
+
+    def get_stack(self) -> list[Span]:
+        """Get the stack of open spans of the current thread.
+
+        Returns:
+            list[Span]: The open spans (innermost last)
+        """
+
+        if not hasattr(self.local, 'stack'):
+            self.local.stack = []
+
+        return self.local.stack
+
+    def create_span(self, name: str, start: int, attributes: dict | None = None) -> Span:
+        """Create (and keep) a span as part of the innermost open span of the current thread.
+
+        Args:
+            name (str): The name of the stage.
+            start (int): When the stage started (nanoseconds since the epoch).
+            attributes (dict, Optional): Anything else about the stage. Default None
+
+        Returns:
+            Span: The span
+        """
+
+        stack = self.get_stack()
+        span = Span(name, os.urandom(8).hex(), stack[-1].span_id if len(stack) > 0 else None, start, attributes)
+
+        with self.lock:
+            self.spans.append(span)
+
+        return span
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Span]:
+        """Time a stage.
+
+        Ex.
+        ```
+        with metrics.span('package') as span:
+            archive = ...
+            span.attributes['bytes'] = len(archive)
+        ```
+
+        Args:
+            name (str): The name of the stage.
+            attributes (Any, Optional): Anything else about the stage.
+
+        Returns:
+            Iterator[Span]: The span (so attributes can be added while the stage runs)
+        """
+
+        span = self.create_span(name, time.time_ns(), attributes)
+
+        stack = self.get_stack()
+        stack.append(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.attributes['error'] = f'{type(e).__name__}: {e}'
+            raise
+        finally:
+            span.end = time.time_ns()
+            stack.pop()
+
+    def record(self, name: str, start: int, end: int, **attributes) -> Span:
+        """Record a stage that was timed elsewhere (Ex. a template rendered on a process pool).
+
+        Args:
+            name (str): The name of the stage.
+            start (int): When the stage started (nanoseconds since the epoch).
+            end (int): When the stage ended (nanoseconds since the epoch).
+            attributes (Any, Optional): Anything else about the stage.
+
+        Returns:
+            Span: The span
+        """
+
+        span = self.create_span(name, start, attributes)
+        span.end = end
+
+        return span
+
+    def count(self, name: str, value: int = 1):
+        """Add to a counter.
+
+        Args:
+            name (str): The name of the counter (Ex. `files.created`).
+            value (int, Optional): The amount to add. Default 1
+        """
+
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def to_dict(self) -> dict:
+        """Get the metrics as a (JSON serializable) dictionary.
+
+        Returns:
+            dict: The chart name, trace ID, spans and counters
+        """
+
+        with self.lock:
+            return {
+                'chart': self.chart_name,
+                'trace_id': self.trace_id,
+                'spans': [span.to_dict() for span in self.spans],
+                'counters': dict(self.counters)
+            }
+
+def to_otel_attributes(attributes: dict) -> list[dict]:
+    """Convert attributes to OpenTelemetry (OTLP JSON) key/value pairs.
+
+    Args:
+        attributes (dict): The attributes.
+
+    Returns:
+        list[dict]: The key/value pairs
+    """
+
+    pairs = []
+    for key, value in attributes.items():
+        if isinstance(value, bool):
+            pairs.append({ 'key': key, 'value': { 'boolValue': value } })
+        elif isinstance(value, int):
+            # OTLP JSON encodes 64 bit integers as strings
+            pairs.append({ 'key': key, 'value': { 'intValue': str(value) } })
+        elif isinstance(value, float):
+            pairs.append({ 'key': key, 'value': { 'doubleValue': value } })
+        else:
+            pairs.append({ 'key': key, 'value': { 'stringValue': str(value) } })
+
+    return pairs
+
+def to_otel(reports: list[dict]) -> dict:
+    """Convert the metrics of one or more charts to OpenTelemetry spans (an OTLP JSON `ExportTraceServiceRequest`).
+
+    Each chart is it's own resource (and trace) and it's counters are added as attributes of the resource.
+
+    Args:
+        reports (list[dict]): The metrics of each chart (see `Metrics.to_dict`).
+
+    Returns:
+        dict: The OTLP JSON document
+    """
+
+    resource_spans = []
+    for report in reports:
+        resource_attributes = { 'service.name': 'helm-chart-generator' }
+        if report['chart'] is not None:
+            resource_attributes['helm.chart.name'] = report['chart']
+        for name, value in report['counters'].items():
+            resource_attributes[f'helm.generator.{name}'] = value
+
+        spans = []
+        for span in report['spans']:
+            otel_span = {
+                'traceId': report['trace_id'],
+                'spanId': span['span_id'],
+                'name': span['name'],
+                # SPAN_KIND_INTERNAL
+                'kind': 1,
+                'startTimeUnixNano': str(span['start_ns']),
+                'endTimeUnixNano': str(span['end_ns']),
+                'attributes': to_otel_attributes(span['attributes'])
+            }
+
+            if span['parent_id'] is not None:
+                otel_span['parentSpanId'] = span['parent_id']
+
+            if 'error' in span['attributes']:
+                # STATUS_CODE_ERROR
+                otel_span['status'] = { 'code': 2, 'message': span['attributes']['error'] }
+
+            spans.append(otel_span)
+
+        resource_spans.append({
+            'resource': { 'attributes': to_otel_attributes(resource_attributes) },
+            'scopeSpans': [{ 'scope': { 'name': 'helm-chart-generator' }, 'spans': spans }]
+        })
+
+    return { 'resourceSpans': resource_spans }
+
+def export_metrics(path: str, reports: list[dict], format: str = 'json'):
+    """Write the metrics of one or more charts to a file.
+
+    Args:
+        path (str): The file to write the metrics to.
+        reports (list[dict]): The metrics of each chart (see `Metrics.to_dict`).
+        format (str, Optional): Either `json` (the metrics as is) or `otel` (OpenTelemetry spans, see `to_otel`). Default 'json'
+    """
+
+    if format == 'otel':
+        document = to_otel(reports)
+    elif format == 'json':
+        document = { 'charts': reports }
+    else:
+        raise Exception(f'Unknown metrics format "{format}". Expected "json" or "otel".')
+
+    with open(path, 'w') as f:
+        json.dump(document, f, indent=2)
@@ -1,4 +1,5 @@
 from .Template import Template
+from .VirtualFileTree import VirtualFileTree
 
 class NoSQL (Template):
     def __init__(self, type: str, db_name: str, tables: dict[str, dict[str, str]], create: bool = True):
@@ -18,21 +19,21 @@ class NoSQL (Template):
         self.tables = tables
         self.create = create
     
-    def write(self):
-        with open('templates/storage-tables-config-map.yaml', 'w') as f:
-            f.write('apiVersion: v1' + '\n')
-            f.write('kind: ConfigMap' + '\n')
-            f.write('metadata:' + '\n')
-            f.write('  ' + 'name: {{ .Release.Name }}-storage-tables' +'\n')
-            f.write('  ' + 'labels:' + '\n')
-            f.write('  ' + '  ' + 'app: {{ .Release.Name }}' + '\n')
-            f.write('data:' + '\n')
+    def get_config(self) -> dict:
+        """Only the (intermediate) names of the tables affect the rendered files (everything else comes from the `values.yaml` file)."""
 
-            # Loop over tables dictionary and get the values
-            for value in self.tables.values():
-                snake_case_name = value['name'].split('-')[0]
-                for token in value['name'].split('-'):
-                    if token != snake_case_name:
-                        snake_case_name += token.capitalize()
-                
-                f.write('  ' + value['name'] + ': {{ .Values.tables.' + snake_case_name + ' }}' + '\n')
\ No newline at end of file
+        return { 'tables': [value['name'] for value in self.tables.values()] }
+    
+    def write(self, files: VirtualFileTree):
+        data = {}
+
+        # Loop over tables dictionary and get the values
+        for value in self.tables.values():
+            snake_case_name = value['name'].split('-')[0]
+            for token in value['name'].split('-'):
+                if token != snake_case_name:
+                    snake_case_name += token.capitalize()
+            
+            data[value['name']] = '{{ .Values.tables.' + snake_case_name + ' }}'
+
+        self.write_document(files, 'templates/storage-tables-config-map.yaml', self.create_data_object('ConfigMap', '{{ .Release.Name }}-storage-tables', data, labeled=True))
@@ -1,4 +1,5 @@
 from .Template import Template
+from .VirtualFileTree import VirtualFileTree
 
 class OAuth (Template):
     def __init__(self, base_app_url: str, app_abbreviation: str, app_name: str, service_name: str, dev_port: str):
@@ -10,17 +11,16 @@ class OAuth (Template):
         self.service_name = service_name
         self.dev_port = dev_port
     
-    def write(self):
-        with open('templates/oauth-credentials-config-map.yaml', 'w') as f:
-            f.write('apiVersion: v1' + '\n')
-            f.write('kind: ConfigMap' + '\n')
-            f.write('metadata:' + '\n')
-            f.write('  ' + 'name: {{ .Release.Name }}-oauth-credentials' + '\n')
-            f.write('  ' + 'labels:' + '\n')
-            f.write('  ' + '  ' + 'app: {{ .Release.Name }}' + '\n')
-            f.write('data:' + '\n')
-            f.write('  ' + 'base-app-url: {{ .Values.oauth.baseAppUrl }}' + '\n')
-            f.write('  ' + 'app-abbreviation: {{ .Values.oauth.appAbbreviation }}' + '\n')
-            f.write('  ' + 'app-name: {{ .Values.oauth.appName }}' + '\n')
-            f.write('  ' + 'service-name: {{ .Values.oauth.serviceName }}' + '\n')
-            f.write('  ' + 'dev-port: {{ .Values.oauth.devPort | quote }}' + '\n')
\ No newline at end of file
+    def get_config(self) -> dict:
+        """None of the attributes affect the rendered files (everything comes from the `values.yaml` file)."""
+
+        return {}
+    
+    def write(self, files: VirtualFileTree):
+        self.write_document(files, 'templates/oauth-credentials-config-map.yaml', self.create_data_object('ConfigMap', '{{ .Release.Name }}-oauth-credentials', {
+            'base-app-url': '{{ .Values.oauth.baseAppUrl }}',
+            'app-abbreviation': '{{ .Values.oauth.appAbbreviation }}',
+            'app-name': '{{ .Values.oauth.appName }}',
+            'service-name': '{{ .Values.oauth.serviceName }}',
+            'dev-port': '{{ .Values.oauth.devPort | quote }}'
+        }, labeled=True))
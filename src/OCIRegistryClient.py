@@ -0,0 +1,331 @@
+import base64, hashlib, http.client, json, os, re, urllib.parse
+
+# The media types Helm uses when storing a chart in an OCI registry
+MANIFEST_MEDIA_TYPE = 'application/vnd.oci.image.manifest.v1+json'
+CONFIG_MEDIA_TYPE = 'application/vnd.cncf.helm.config.v1+json'
+CHART_LAYER_MEDIA_TYPE = 'application/vnd.cncf.helm.chart.content.v1.tar+gzip'
+
+class RegistryError (Exception):
+    def __init__(self, message: str, status: int):
+        """An error response from a registry (or it's token service).
+
+        Args:
+            message (str): The error message.
+            status (int): The HTTP status of the response.
+        """
+
+        super().__init__(message)
+
+        self.status = status
+
+class OCIRegistryClient:
+    def __init__(self, username: str | None = None, password: str | None = None, plain_http: bool = False, timeout: float = 60):
+        """A (minimal) client for pushing Helm charts to an OCI registry using the OCI distribution API.
+
+        One connection is kept open (and reused) per registry host, so pushing many charts only pays for the TLS handshake once.
+        Blobs the registry already has (checked with a `HEAD` by digest) aren't uploaded again.
+
+        If no credentials are given, the ones saved by `helm registry login` (`~/.config/helm/registry/config.json`) are used.
+
+        Args:
+            username (str, Optional): The username to authenticate with. Default None
+            password (str, Optional): The password (or token) to authenticate with. Default None
+            plain_http (bool, Optional): Use HTTP instead of HTTPS (Ex. for a local registry). Default False
+            timeout (float, Optional): The timeout (in seconds) of each request. Default 60
+        """
+
+        self.username = username
+        self.password = password
+        self.plain_http = plain_http
+        self.timeout = timeout
+
+        # Open connections (keyed by scheme and host) and authorization headers (keyed by host and scope)
+        self.connections: dict[tuple[str, str], http.client.HTTPConnection] = {}
+        self.tokens: dict[tuple[str, str], str] = {}
+
+    def __enter__(self) -> 'OCIRegistryClient':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Close all the open connections."""
+
+        for connection in self.connections.values():
+            connection.close()
+
+        self.connections.clear()
+
+    def get_credentials(self, host: str) -> tuple[str, str] | None:
+        """Get the credentials to use for a registry.
+
+        Args:
+            host (str): The host of the registry.
+
+        Returns:
+            tuple[str, str] | None: The username and password or None if there aren't any
+        """
+
+        if self.username is not None:
+            return (self.username, self.password or '')
+
+        config_file = os.path.join(os.path.expanduser('~'), '.config', 'helm', 'registry', 'config.json')
+        if not os.path.exists(config_file):
+            return None
+
+        with open(config_file, 'r') as f:
+            auths = json.load(f).get('auths', {})
+
+        if host in auths and 'auth' in auths[host]:
+            username, _, password = base64.b64decode(auths[host]['auth']).decode('utf-8').partition(':')
+            return (username, password)
+
+        return None
+
+    def get_connection(self, scheme: str, host: str) -> http.client.HTTPConnection:
+        """Get the (reused) connection to a host, opening it if needed.
+
+        Args:
+            scheme (str): Either `http` or `https`.
+            host (str): The host (and port) to connect to.
+
+        Returns:
+            http.client.HTTPConnection: The connection to the host
+        """
+
+        if (scheme, host) not in self.connections:
+            if scheme == 'http':
+                self.connections[(scheme, host)] = http.client.HTTPConnection(host, timeout=self.timeout)
+            else:
+                self.connections[(scheme, host)] = http.client.HTTPSConnection(host, timeout=self.timeout)
+
+        return self.connections[(scheme, host)]
+
+    def send(self, host: str, method: str, path: str, body: bytes | None = None, headers: dict[str, str] | None = None, scheme: str | None = None) -> tuple[int, http.client.HTTPMessage, bytes]:
+        """Send a single request over the connection to a host.
+
+        If the registry closed the (idle) connection it's reopened and the request is retried once.
+
+        Args:
+            host (str): The host to send the request to.
+            method (str): The HTTP method.
+            path (str): The path (and query) of the request.
+            body (bytes, Optional): The body of the request. Default None
+            headers (dict[str, str], Optional): The headers of the request. Default None
+            scheme (str, Optional): Either `http` or `https`. Default None (based on `plain_http`)
+
+        Returns:
+            tuple[int, http.client.HTTPMessage, bytes]: The status, headers and body of the response
+        """
+
+        if scheme is None:
+            scheme = 'http' if self.plain_http else 'https'
+
+        for attempt in range(2):
+            connection = self.get_connection(scheme, host)
+            try:
+                connection.request(method, path, body=body, headers=headers or {})
+                response = connection.getresponse()
+
+                # The body always has to be read fully before the connection can be reused
+                return (response.status, response.headers, response.read())
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                connection.close()
+                del self.connections[(scheme, host)]
+
+                if attempt == 1:
+                    raise
+
+    def authenticate(self, host: str, challenge: str, scope: str):
+        """Respond to an authentication challenge (the `WWW-Authenticate` header of a 401 response).
+
+        For a `Bearer` challenge a token is requested from the registry's token service (and cached).
+        For a `Basic` challenge the credentials are used directly.
+
+        Args:
+            host (str): The host of the registry.
+            challenge (str): The value of the `WWW-Authenticate` header.
+            scope (str): The scope being requested (Ex. `repository:charts/app:pull,push`).
+        """
+
+        scheme, _, parameters = challenge.partition(' ')
+        credentials = self.get_credentials(host)
+
+        if scheme.lower() == 'basic':
+            if credentials is None:
+                raise RegistryError(f'The registry {host} requires credentials.', 401)
+
+            self.tokens[(host, scope)] = 'Basic ' + base64.b64encode(':'.join(credentials).encode('utf-8')).decode('ascii')
+            return
+
+        # Ex. `realm="https://auth.example.com/token",service="registry.example.com",scope="repository:app:pull"`
+        fields = dict(re.findall(r'(\w+)="([^"]*)"', parameters))
+
+        query = { 'scope': scope }
+        if 'service' in fields:
+            query['service'] = fields['service']
+
+        realm = urllib.parse.urlsplit(fields['realm'])
+
+        headers = {}
+        if credentials is not None:
+            headers['Authorization'] = 'Basic ' + base64.b64encode(':'.join(credentials).encode('utf-8')).decode('ascii')
+
+        # The token service is often on a different host than the registry, but the same connection pooling applies
+        status, _, body = self.send(realm.netloc, 'GET', f'{realm.path}?{urllib.parse.urlencode(query)}', headers=headers, scheme=realm.scheme)
+
+        if status != 200:
+            raise RegistryError(f'Failed to authenticate with {host} ({status}): {body.decode("utf-8", "replace")}', status)
+
+        response = json.loads(body)
+        self.tokens[(host, scope)] = 'Bearer ' + response.get('token', response.get('access_token', ''))
+
+    def request(self, host: str, method: str, path: str, scope: str, body: bytes | None = None, headers: dict[str, str] | None = None) -> tuple[int, http.client.HTTPMessage, bytes]:
+        """Send an (authenticated) request to a registry.
+
+        Args:
+            host (str): The host of the registry.
+            method (str): The HTTP method.
+            path (str): The path (and query) of the request.
+            scope (str): The scope needed for the request (used if the registry asks for authentication).
+            body (bytes, Optional): The body of the request. Default None
+            headers (dict[str, str], Optional): The headers of the request. Default None
+
+        Returns:
+            tuple[int, http.client.HTTPMessage, bytes]: The status, headers and body of the response
+        """
+
+        headers = dict(headers or {})
+
+        for attempt in range(2):
+            if (host, scope) in self.tokens:
+                headers['Authorization'] = self.tokens[(host, scope)]
+
+            status, response_headers, response_body = self.send(host, method, path, body, headers)
+
+            if status != 401 or attempt == 1 or 'WWW-Authenticate' not in response_headers:
+                return (status, response_headers, response_body)
+
+            self.authenticate(host, response_headers['WWW-Authenticate'], scope)
+
+    def blob_exists(self, host: str, repository: str, digest: str) -> bool:
+        """Check if a registry already has a blob.
+
+        Args:
+            host (str): The host of the registry.
+            repository (str): The repository (Ex. `charts/app`).
+            digest (str): The digest of the blob (Ex. `sha256:...`).
+
+        Returns:
+            bool: If the blob exists in the repository
+        """
+
+        status, _, body = self.request(host, 'HEAD', f'/v2/{repository}/blobs/{digest}', f'repository:{repository}:pull,push')
+
+        if status == 200:
+            return True
+        elif status == 404:
+            return False
+
+        raise RegistryError(f'Failed to check for blob {digest} in {host}/{repository} ({status}): {body.decode("utf-8", "replace")}', status)
+
+    def upload_blob(self, host: str, repository: str, data: bytes) -> str:
+        """Upload a blob to a registry (unless the registry already has it).
+
+        Args:
+            host (str): The host of the registry.
+            repository (str): The repository (Ex. `charts/app`).
+            data (bytes): The contents of the blob.
+
+        Returns:
+            str: The digest of the blob
+        """
+
+        digest = 'sha256:' + hashlib.sha256(data).hexdigest()
+        scope = f'repository:{repository}:pull,push'
+
+        if self.blob_exists(host, repository, digest):
+            return digest
+
+        status, headers, body = self.request(host, 'POST', f'/v2/{repository}/blobs/uploads/', scope, b'', { 'Content-Length': '0' })
+
+        if status != 202 or 'Location' not in headers:
+            raise RegistryError(f'Failed to start the upload of blob {digest} to {host}/{repository} ({status}): {body.decode("utf-8", "replace")}', status)
+
+        # The location can be absolute or relative and can already have a query
+        location = urllib.parse.urlsplit(headers['Location'])
+        query = urllib.parse.parse_qsl(location.query) + [('digest', digest)]
+        path = f'{location.path}?{urllib.parse.urlencode(query)}'
+
+        status, _, body = self.request(location.netloc or host, 'PUT', path, scope, data, { 'Content-Type': 'application/octet-stream', 'Content-Length': str(len(data)) })
+
+        if status != 201:
+            raise RegistryError(f'Failed to upload blob {digest} to {host}/{repository} ({status}): {body.decode("utf-8", "replace")}', status)
+
+        return digest
+
+    def push_manifest(self, host: str, repository: str, reference: str, manifest: bytes) -> str:
+        """Push a manifest to a registry.
+
+        Args:
+            host (str): The host of the registry.
+            repository (str): The repository (Ex. `charts/app`).
+            reference (str): The tag of the manifest (Ex. `1.0.0`).
+            manifest (bytes): The (serialized) manifest.
+
+        Returns:
+            str: The digest of the manifest
+        """
+
+        status, headers, body = self.request(host, 'PUT', f'/v2/{repository}/manifests/{reference}', f'repository:{repository}:pull,push', manifest, { 'Content-Type': MANIFEST_MEDIA_TYPE })
+
+        if status != 201:
+            raise RegistryError(f'Failed to push the manifest {repository}:{reference} to {host} ({status}): {body.decode("utf-8", "replace")}', status)
+
+        return headers.get('Docker-Content-Digest', 'sha256:' + hashlib.sha256(manifest).hexdigest())
+
+    def push_chart(self, registry: str, chart_name: str, chart_version: str, archive: bytes, metadata: dict) -> str:
+        """Push a packaged Helm chart to an OCI registry (the equivalent of `helm push <package> oci://<registry>`).
+
+        Args:
+            registry (str): The registry (and optional namespace) to push to, with or without the `oci://` prefix (Ex. `registry.example.com/charts`).
+            chart_name (str): The name of the Helm chart.
+            chart_version (str): The version of the Helm chart.
+            archive (bytes): The packaged Helm chart (`.tgz`).
+            metadata (dict): The metadata of the Helm chart (the contents of `Chart.yaml`), used as the config blob.
+
+        Returns:
+            str: The reference of the pushed chart (`<registry>/<name>:<version>@<digest>`)
+        """
+
+        if registry.startswith('oci://'):
+            registry = registry[len('oci://'):]
+
+        host, _, namespace = registry.rstrip('/').partition('/')
+        repository = f'{namespace}/{chart_name}' if namespace else chart_name
+
+        # Like Helm, `+` isn't allowed in a tag so it's replaced with `_`
+        tag = chart_version.replace('+', '_')
+
+        config = json.dumps(metadata, separators=(',', ':'), sort_keys=True).encode('utf-8')
+
+        config_digest = self.upload_blob(host, repository, config)
+        chart_digest = self.upload_blob(host, repository, archive)
+
+        manifest = json.dumps({
+            'schemaVersion': 2,
+            'mediaType': MANIFEST_MEDIA_TYPE,
+            'config': { 'mediaType': CONFIG_MEDIA_TYPE, 'digest': config_digest, 'size': len(config) },
+            'layers': [
+                { 'mediaType': CHART_LAYER_MEDIA_TYPE, 'digest': chart_digest, 'size': len(archive) }
+            ],
+            'annotations': {
+                'org.opencontainers.image.title': chart_name,
+                'org.opencontainers.image.version': chart_version
+            }
+        }, separators=(',', ':')).encode('utf-8')
+
+        digest = self.push_manifest(host, repository, tag, manifest)
+
+        return f'{host}/{repository}:{tag}@{digest}'
@@ -0,0 +1,166 @@
+import os, tempfile, threading
+
+class PackageCache:
+    def __init__(self, directory: str, max_bytes: int = 1024 * 1024 * 1024):
+        """A content-addressed cache of packaged Helm charts (`.tgz`), keyed by the digest of the chart (see `HelmChart.digest`).
+
+        The cache is just a directory, so it can be shared between runs and CI runners (Ex. a mounted volume or a restored CI cache).
+        Entries are written atomically, so concurrent writers (processes or runners) never see a partially written package.
+
+        Once the cache is bigger than `max_bytes` the least recently used packages are removed.
+        A hit updates the modification time of the package, which is what "recently used" is based on (so it works across processes).
+
+        Args:
+            directory (str): The directory of the cache.
+            max_bytes (int, Optional): The maximum total size (in bytes) of the cached packages. Default 1 GiB
+        """
+
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __getstate__(self) -> dict:
+        # Only the settings are sent to other processes, never the statistics or lock
+        return { 'directory': self.directory, 'max_bytes': self.max_bytes }
+
+    def __setstate__(self, state: dict):
+        self.__init__(**state)
+
+    def get_entry_path(self, digest: str) -> str:
+        """Get the path of a cached package.
+
+        Args:
+            digest (str): The digest of the chart.
+
+        Returns:
+            str: The path of the package
+        """
+
+        # Entries are spread over sub-directories so no single directory gets too big
+        return os.path.join(self.directory, digest[:2], f'{digest}.tgz')
+
+    def get(self, digest: str) -> bytes | None:
+        """Get a cached package.
+
+        Args:
+            digest (str): The digest of the chart.
+
+        Returns:
+            bytes | None: The contents of the package or None if it isn't cached
+        """
+
+        path = self.get_entry_path(digest)
+
+        try:
+            with open(path, 'rb') as f:
+                archive = f.read()
+        except FileNotFoundError:
+            archive = None
+
+        with self.lock:
+            if archive is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+
+        try:
+            # Mark the package as recently used (for eviction)
+            os.utime(path)
+        except OSError:
+            # It may have been evicted by another process in the meantime, which doesn't matter now it's been read
+            pass
+
+        return archive
+
+    def put(self, digest: str, archive: bytes):
+        """Store a package (then evict the least recently used packages if the cache is too big).
+
+        Args:
+            digest (str): The digest of the chart.
+            archive (bytes): The contents of the package.
+        """
+
+        path = self.get_entry_path(digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Write to a temporary file first so other processes never see a partially written package
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(archive)
+        os.replace(temp_path, path)
+
+        self.evict()
+
+    def list_entries(self) -> list[tuple[float, int, str]]:
+        """Get the packages in the cache.
+
+        Returns:
+            list[tuple[float, int, str]]: The last use (modification time), size and path of each package
+        """
+
+        entries = []
+
+        if not os.path.isdir(self.directory):
+            return entries
+
+        for prefix in os.listdir(self.directory):
+            folder = os.path.join(self.directory, prefix)
+            if not os.path.isdir(folder):
+                continue
+
+            for filename in os.listdir(folder):
+                if not filename.endswith('.tgz'):
+                    continue
+
+                path = os.path.join(folder, filename)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        return entries
+
+    def evict(self):
+        """Remove the least recently used packages until the cache is no bigger than `max_bytes`."""
+
+        entries = self.list_entries()
+        total = sum(size for _, size, _ in entries)
+
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                # Already evicted by another process
+                pass
+
+            total -= size
+            with self.lock:
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        """Get the statistics of the cache.
+
+        Returns:
+            dict: The `hits`, `misses` and `evictions` (of this process) and the number of `entries` and total `bytes` of the cache
+        """
+
+        entries = self.list_entries()
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(entries),
+            'bytes': sum(size for _, size, _ in entries)
+        }
@@ -0,0 +1,231 @@
+import asyncio, http.client, random, time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+from .OCIRegistryClient import OCIRegistryClient, RegistryError
+
+def is_retryable(error: Exception) -> bool:
+    """Check if a failed push could succeed if it's tried again.
+
+    Only connection errors, rate limiting (429) and server errors (5xx) are retried.
+    Anything else (Ex. bad credentials or an invalid manifest) would only fail the same way again.
+
+    Args:
+        error (Exception): The error of the failed push.
+
+    Returns:
+        bool: If the push should be retried
+    """
+
+    if isinstance(error, RegistryError):
+        return error.status == 429 or error.status >= 500
+
+    return isinstance(error, (OSError, http.client.HTTPException))
+
+class PublishResult:
+    def __init__(self, name: str, reference: str, success: bool, result: str | None = None, error: str | None = None, attempts: int = 0, latency: float = 0.0, index: int = 0):
+        """The outcome of publishing (pushing) a single chart.
+
+        Args:
+            name (str): The name used to identify the chart (Ex. within a batch).
+            reference (str): Where the chart was pushed to (`<registry>/<name>:<version>`).
+            success (bool): If the chart was pushed successfully.
+            result (str, Optional): The reference of the pushed chart (including it's digest, see `OCIRegistryClient.push_chart`). Default None
+            error (str, Optional): The error of the last attempt if the chart couldn't be pushed. Default None
+            attempts (int, Optional): How many times pushing the chart was attempted. Default 0
+            latency (float, Optional): How long (in seconds) from the chart being submitted to it being pushed (or given up on). Default 0.0
+            index (int, Optional): The index of the chart in the order it was submitted (see `PublishQueue.submit`), as the name may not be unique. Default 0
+        """
+
+        self.name = name
+        self.reference = reference
+        self.success = success
+        self.result = result
+        self.error = error
+        self.attempts = attempts
+        self.latency = latency
+        self.index = index
+
+class PublishQueue:
+    def __init__(self, concurrency: int = 4, retries: int = 3, backoff: float = 0.5, max_backoff: float = 30.0, rate_limit: float | None = None, client_factory: Callable[[], OCIRegistryClient] = OCIRegistryClient):
+        """An asynchronous queue that pushes packaged charts (as they're submitted) to OCI registries.
+
+        Up to `concurrency` charts are pushed at once, each worker using it's own `OCIRegistryClient` (so connections are reused between the charts it pushes).
+        A failed push is retried (with exponential backoff and jitter) up to `retries` times, if the error could be transient (a connection error, 429 or 5xx).
+        If a `rate_limit` is given, pushes to the same registry host are started no more often than that (per second).
+
+        Use it as an async context manager, submit charts with `submit` and get the outcome of every chart from `close` (or `results` after the context ends).
+
+        Args:
+            concurrency (int, Optional): The maximum number of charts pushed at once. Default 4
+            retries (int, Optional): How many times a failed push is retried. Default 3
+            backoff (float, Optional): How long (in seconds) to wait before the first retry (doubling for each retry after). Default 0.5
+            max_backoff (float, Optional): The longest (in seconds) to wait before a retry. Default 30.0
+            rate_limit (float, Optional): The maximum number of pushes started per second per registry host. Default None (no limit)
+            client_factory (Callable[[], OCIRegistryClient], Optional): Creates the client of each worker. Default `OCIRegistryClient`
+        """
+
+        if concurrency < 1:
+            raise Exception('The concurrency of the publish queue must be at least 1.')
+
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.rate_limit = rate_limit
+        self.client_factory = client_factory
+
+        self.results: list[PublishResult] = []
+        self.submitted = 0
+
+        self.queue: asyncio.Queue | None = None
+        self.workers: list[asyncio.Task] = []
+        self.executor: ThreadPoolExecutor | None = None
+
+        # When the next push to each registry host can start (see `wait_for_rate_limit`)
+        self.next_start: dict[str, float] = {}
+        self.rate_limit_lock: asyncio.Lock | None = None
+
+    async def __aenter__(self) -> 'PublishQueue':
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def start(self):
+        """Start the workers (on the running event loop)."""
+
+        self.queue = asyncio.Queue()
+        self.rate_limit_lock = asyncio.Lock()
+        # The client is synchronous, so every push runs on a thread of it's own
+        self.executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='publish')
+        self.workers = [asyncio.create_task(self.work()) for _ in range(self.concurrency)]
+
+    def submit(self, name: str, registry: str, chart_name: str, chart_version: str, archive: bytes, metadata: dict) -> int:
+        """Add a packaged chart to the queue.
+
+        Args:
+            name (str): The name used to identify the chart (in it's `PublishResult`).
+            registry (str): The registry to push to (see `OCIRegistryClient.push_chart`).
+            chart_name (str): The name of the chart.
+            chart_version (str): The version of the chart.
+            archive (bytes): The packaged chart (`.tgz`).
+            metadata (dict): The metadata of the chart (the contents of `Chart.yaml`).
+
+        Returns:
+            int: The index of the chart in the order it was submitted (the `index` of it's `PublishResult`)
+        """
+
+        if self.queue is None:
+            raise Exception('The publish queue has not been started.')
+
+        index = self.submitted
+        self.submitted += 1
+
+        self.queue.put_nowait((index, name, registry, chart_name, chart_version, archive, metadata, time.perf_counter()))
+
+        return index
+
+    async def close(self) -> list[PublishResult]:
+        """Wait for every submitted chart to be pushed (or given up on) then stop the workers.
+
+        Returns:
+            list[PublishResult]: The outcome of every chart (in the order they finished)
+        """
+
+        if self.queue is None:
+            return self.results
+
+        # One stop signal per worker, after everything already submitted
+        for _ in self.workers:
+            self.queue.put_nowait(None)
+
+        await asyncio.gather(*self.workers)
+        self.executor.shutdown()
+
+        self.queue = None
+        self.workers = []
+
+        return self.results
+
+    async def wait_for_rate_limit(self, host: str):
+        """Wait until another push to a registry host can start (based on the `rate_limit`).
+
+        Args:
+            host (str): The host of the registry.
+        """
+
+        if self.rate_limit is None:
+            return
+
+        loop = asyncio.get_running_loop()
+
+        # Reserve the next slot (so concurrent workers queue up behind each other) then wait for it
+        async with self.rate_limit_lock:
+            now = loop.time()
+            start = max(now, self.next_start.get(host, now))
+            self.next_start[host] = start + 1 / self.rate_limit
+
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    async def work(self):
+        """Push charts from the queue until told to stop."""
+
+        loop = asyncio.get_running_loop()
+        client = self.client_factory()
+
+        try:
+            while True:
+                item = await self.queue.get()
+                if item is None:
+                    break
+
+                index, name, registry, chart_name, chart_version, archive, metadata, submitted = item
+                host = registry[len('oci://'):] if registry.startswith('oci://') else registry
+                host = host.split('/')[0]
+
+                reference = f'{registry}/{chart_name}:{chart_version}'
+                error = None
+
+                for attempt in range(1, self.retries + 2):
+                    await self.wait_for_rate_limit(host)
+
+                    try:
+                        result = await loop.run_in_executor(self.executor, client.push_chart, registry, chart_name, chart_version, archive, metadata)
+                    except Exception as e:
+                        error = f'{type(e).__name__}: {e}'
+
+                        # The connection may be broken, so the next attempt starts with a new one
+                        client.close()
+
+                        if attempt <= self.retries and is_retryable(e):
+                            delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+                            # Jitter, so charts that failed together don't all retry at the same time
+                            await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+                            continue
+
+                        self.results.append(PublishResult(name, reference, False, error=error, attempts=attempt, latency=time.perf_counter() - submitted, index=index))
+                        break
+
+                    self.results.append(PublishResult(name, reference, True, result, attempts=attempt, latency=time.perf_counter() - submitted, index=index))
+                    break
+        finally:
+            client.close()
+
+def print_publish_summary(results: list[PublishResult]):
+    """Print the per-chart outcome (and latency) of publishing followed by the totals.
+
+    Args:
+        results (list[PublishResult]): The outcome of each chart.
+    """
+
+    for result in results:
+        if result.success:
+            print(f'PUSHED  {result.name} ({result.latency:.3f}s, {result.attempts} attempt(s)) -> {result.result}')
+        else:
+            print(f'FAILED  {result.name} ({result.latency:.3f}s, {result.attempts} attempt(s)): {result.error}')
+
+    succeeded = sum(1 for result in results if result.success)
+    print(f'{succeeded} pushed, {len(results) - succeeded} failed ({len(results)} total)')
@@ -1,4 +1,6 @@
 from .Cache import Cache
+from .VirtualFileTree import VirtualFileTree
+from .YAML import Comment, Directive, Quoted, Sequence
 
 class Redis (Cache):
     def __init__(self, password: str, create: bool = True, hostName: str = '{{ .Release.Name }}-redis', replicaCount: int = 1, port: str = '6379', tls_enabled: bool = False, tls_port: str = '6380', image: dict[str, str] = {}):
@@ -22,77 +24,108 @@ class Redis (Cache):
         self.tls_port = tls_port
         self.image = image
 
-    def write(self):
+    def get_config(self) -> dict:
+        """None of the attributes affect the rendered files (everything comes from the `values.yaml` file)."""
+
+        return {}
+    
+    def write(self, files: VirtualFileTree):
         # Call parent class's method/function to write the generic cache templates
-        super().write_generic_cache_templates('redis', '{{ .Release.Name }}-redis')
+        super().write_generic_cache_templates(files, 'redis', '{{ .Release.Name }}-redis')
         
         # Create the Redis service file
-        with open('templates/redis-service.yaml', 'w') as f:
-            f.write('{{- if and (.Values.cache.type "redis") (.Values.cache.create) -}}' + '\n')
-            f.write('apiVersion: v1' + '\n')
-            f.write('kind: Service' + '\n')
-            f.write('metadata:' + '\n')
-            f.write('  ' + 'name: {{ .Release.Name }}-redis' + '\n')
-            f.write('  ' + 'labels:' + '\n')
-            f.write('  ' + '  ' + 'app: redis' + '\n')
-            f.write('spec:' + '\n')
-            f.write('  ' + 'ports:' + '\n')
-            f.write('  ' + '  ' + '- port: {{ .Values.cache.port }}' + '\n')
-            f.write('  ' + '  ' + '  ' + 'targetPort: {{ .Values.cache.port }}' + '\n')
-            f.write('  ' + 'selector:' + '\n')
-            f.write('  ' + '  ' + 'app: redis' + '\n')
-            f.write('  ' + 'type: ClusterIP' + '\n')
-            f.write('{{- end -}}')
-
+        self.write_document(files, 'templates/redis-service.yaml', Directive('{{- if and (eq .Values.cache.type "redis") (.Values.cache.create) -}}'), {
+            'apiVersion': 'v1',
+            'kind': 'Service',
+            'metadata': {
+                'name': '{{ .Release.Name }}-redis',
+                'labels': {
+                    'app': 'redis'
+                }
+            },
+            'spec': {
+                'ports': [
+                    {
+                        'port': '{{ .Values.cache.port }}',
+                        'targetPort': '{{ .Values.cache.port }}'
+                    }
+                ],
+                'selector': {
+                    'app': 'redis'
+                },
+                'type': 'ClusterIP'
+            }
+        }, Directive('{{- end -}}'))
 
         # Create the Redis deployment file
-        with open('templates/redis-deployment.yaml', 'w') as f:
-            f.write('{{- if and (.Values.cache.type "redis") (.Values.cache.create) -}}' + '\n')
-            f.write('apiVersion: apps/v1' + '\n')
-            f.write('kind: Deployment' + '\n')
-            f.write('metadata:' + '\n')
-            f.write('  ' + 'name: {{ .Release.Name }}-redis' + '\n')
-            f.write('  ' + 'labels:' + '\n')
-            f.write('  ' + '  ' + 'app: redis' + '\n')
-            f.write('spec:' + '\n')
-            f.write('  ' + 'replicas: {{ .Values.cache.replicaCount }}' + '\n')
-            f.write('  ' + 'selector:' + '\n')
-            f.write('  ' + '  ' + 'matchLabels:' + '\n')
-            f.write('  ' + '  ' + '  ' + 'app: redis' + '\n')
-            f.write('  ' + 'template:' + '\n')
-            f.write('  ' + '  ' + 'metadata:' + '\n')
-            f.write('  ' + '  ' + '  ' + 'labels:' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + 'app: redis' + '\n')
-            f.write('  ' + '  ' + 'spec:' + '\n')
-            f.write('  ' + '  ' + '  ' + 'containers:' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '- name: redis' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + 'image: {{ .Values.cache.image.repository | default "bitnami/redis" }}:{{ .Values.cache.image.tag | default "7.0.5" }}' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + 'ports:' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '- containerPort: {{ .Values.cache.port }}' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '{{- if .Values.cache.tls.enabled }}' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '- containerPort: {{ .Values.cache.tls.port }}' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '{{- end }}' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + 'env:' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '- name: ALLOW_EMPTY_PASSWORD' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'value: "false"' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '- name: REDIS_PASSWORD' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'valueFrom:' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'secretKeyRef:' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'name: {{ .Release.Name }}-cache-credentials' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'key: password' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '- name: REDIS_DISABLE_COMMANDS' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'value: "FLUSHDB,FLUSHALL"' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '# TLS configuration' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '#- name: REDIS_TLS_ENABLED' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '#  value: "{{ .Values.cache.tls.enabled }}"' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '#- name: REDIS_TLS_AUTH_CLIENTS' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '#  value: "yes"' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '#- name: REDIS_TLS_PORT_NUMBER' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '#  value: "{{ .Values.cache.tls.port }}"' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + 'volumeMounts:' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '- name: redis-data' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + '  ' + '  ' + 'mountPath: /bitnami/redis' + '\n')
-            f.write('  ' + '  ' + '  ' + 'volumes:' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '- name: redis-data' + '\n')
-            f.write('  ' + '  ' + '  ' + '  ' + '  ' + 'emptyDir: {}' + '\n')
-            f.write('{{- end -}}')
\ No newline at end of file
+        self.write_document(files, 'templates/redis-deployment.yaml', Directive('{{- if and (eq .Values.cache.type "redis") (.Values.cache.create) -}}'), {
+            'apiVersion': 'apps/v1',
+            'kind': 'Deployment',
+            'metadata': {
+                'name': '{{ .Release.Name }}-redis',
+                'labels': {
+                    'app': 'redis'
+                }
+            },
+            'spec': {
+                'replicas': '{{ .Values.cache.replicaCount }}',
+                'selector': {
+                    'matchLabels': {
+                        'app': 'redis'
+                    }
+                },
+                'template': {
+                    'metadata': {
+                        'labels': {
+                            'app': 'redis'
+                        }
+                    },
+                    'spec': {
+                        'containers': [
+                            {
+                                'name': 'redis',
+                                'image': '{{ .Values.cache.image.repository | default "bitnami/redis" }}:{{ .Values.cache.image.tag | default "7.0.5" }}',
+                                'ports': Sequence([
+                                    { 'containerPort': '{{ .Values.cache.port }}' },
+                                    Directive('{{- if .Values.cache.tls.enabled }}'),
+                                    { 'containerPort': '{{ .Values.cache.tls.port }}' },
+                                    Directive('{{- end }}')
+                                ]),
+                                'env': Sequence([
+                                    { 'name': 'ALLOW_EMPTY_PASSWORD', 'value': 'false' },
+                                    {
+                                        'name': 'REDIS_PASSWORD',
+                                        'valueFrom': {
+                                            'secretKeyRef': {
+                                                'name': '{{ .Release.Name }}-cache-credentials',
+                                                'key': 'password'
+                                            }
+                                        }
+                                    },
+                                    { 'name': 'REDIS_DISABLE_COMMANDS', 'value': Quoted('FLUSHDB,FLUSHALL') },
+                                    Comment('TLS configuration'),
+                                    Comment('- name: REDIS_TLS_ENABLED'),
+                                    Comment('  value: "{{ .Values.cache.tls.enabled }}"'),
+                                    Comment('- name: REDIS_TLS_AUTH_CLIENTS'),
+                                    Comment('  value: "yes"'),
+                                    Comment('- name: REDIS_TLS_PORT_NUMBER'),
+                                    Comment('  value: "{{ .Values.cache.tls.port }}"')
+                                ]),
+                                'volumeMounts': [
+                                    {
+                                        'name': 'redis-data',
+                                        'mountPath': '/bitnami/redis'
+                                    }
+                                ]
+                            }
+                        ],
+                        'volumes': [
+                            {
+                                'name': 'redis-data',
+                                'emptyDir': {}
+                            }
+                        ]
+                    }
+                }
+            }
+        }, Directive('{{- end -}}'))
@@ -0,0 +1,125 @@
+import json, os, tempfile, threading
+from collections import OrderedDict
+
+from .VirtualFileTree import VirtualFileTree
+
+class RenderCache:
+    def __init__(self, max_entries: int = 256, directory: str | None = None):
+        """A cache of rendered templates, keyed by the template's configuration (see `Template.config_key`).
+
+        Most of the generated files only depend on a few settings (or none at all), so when generating many charts the same output would otherwise be rendered over and over again.
+        
+        Rendered output is kept in memory (evicting the least recently used entries once `max_entries` is reached).
+        If a directory is given, entries are also stored on disk so they can be shared between runs (and processes).
+
+        Args:
+            max_entries (int, Optional): The maximum number of entries kept in memory. Default 256
+            directory (str, Optional): The directory of the on-disk store. Default None (in memory only)
+        """
+
+        self.max_entries = max_entries
+        self.directory = directory
+
+        self.entries: OrderedDict[str, dict[str, str]] = OrderedDict()
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def __getstate__(self) -> dict:
+        # Only the settings are sent to other processes (Ex. when the chart is pickled for a process pool), never the entries or lock
+        return { 'max_entries': self.max_entries, 'directory': self.directory }
+
+    def __setstate__(self, state: dict):
+        self.__init__(**state)
+
+    def get_entry_path(self, key: str) -> str:
+        """Get the path of an entry in the on-disk store.
+
+        Args:
+            key (str): The key of the entry.
+        
+        Returns:
+            str: The path of the entry's file
+        """
+
+        # Entries are spread over sub-directories so no single directory gets too big
+        return os.path.join(self.directory, key[:2], f'{key}.json')
+
+    def remember(self, key: str, files: dict[str, str]):
+        """Add an entry to the in-memory cache (evicting the least recently used entry if it's full).
+
+        Args:
+            key (str): The key of the entry.
+            files (dict[str, str]): The rendered files (path to contents).
+        """
+
+        with self.lock:
+            self.entries[key] = files
+            self.entries.move_to_end(key)
+
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def get(self, key: str) -> VirtualFileTree | None:
+        """Get the rendered output of a template.
+
+        Args:
+            key (str): The configuration key of the template.
+        
+        Returns:
+            VirtualFileTree | None: A (new) tree of the rendered files or None if it isn't cached
+        """
+
+        with self.lock:
+            files = self.entries.get(key)
+            if files is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return VirtualFileTree(files)
+        
+        if self.directory is not None and os.path.exists(self.get_entry_path(key)):
+            try:
+                with open(self.get_entry_path(key), 'r') as f:
+                    files = json.load(f)
+            except ValueError:
+                # A corrupt (Ex. partially written) entry is treated as a miss and overwritten
+                files = None
+            
+            if files is not None:
+                self.remember(key, files)
+                with self.lock:
+                    self.hits += 1
+                return VirtualFileTree(files)
+        
+        with self.lock:
+            self.misses += 1
+        
+        return None
+
+    def put(self, key: str, files: VirtualFileTree):
+        """Store the rendered output of a template.
+
+        Args:
+            key (str): The configuration key of the template.
+            files (VirtualFileTree): The rendered files of the template.
+        """
+
+        contents = dict(files.files)
+        self.remember(key, contents)
+
+        if self.directory is not None:
+            path = self.get_entry_path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+            # Write to a temporary file first so other processes never see a partially written entry
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(contents, f)
+            os.replace(temp_path, path)
+
+    def clear(self):
+        """Remove every entry from the in-memory cache (the on-disk store is left as is)."""
+
+        with self.lock:
+            self.entries.clear()
@@ -1,4 +1,5 @@
 from .Template import Template
+from .VirtualFileTree import VirtualFileTree
 
 class SecretsVault(Template):
     def __init__(self, type: str):
@@ -6,5 +7,5 @@ class SecretsVault(Template):
 
         self.type = type
     
-    def write(self):
+    def write(self, files: VirtualFileTree):
         pass
\ No newline at end of file
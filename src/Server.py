@@ -0,0 +1,204 @@
+import json, os, socketserver, stat, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .ChartBuilder import build_helm_chart
+from .Components import COMPONENTS, load_component
+from .InputSchema import validate_input
+from .RenderCache import RenderCache
+
+# The largest input document accepted (in bytes)
+MAX_REQUEST_SIZE = 16 * 1024 * 1024
+
+# How many connections can be waiting to be accepted (the default of 5 makes bursts of requests wait on the client's SYN retry)
+REQUEST_QUEUE_SIZE = 128
+
+class GeneratorHTTPServer (ThreadingHTTPServer):
+    """An HTTP server listening on a TCP port (handling each request on it's own thread)."""
+
+    request_queue_size = REQUEST_QUEUE_SIZE
+
+class GeneratorUnixHTTPServer (socketserver.ThreadingUnixStreamServer):
+    """An HTTP server listening on a Unix socket (handling each request on it's own thread)."""
+
+    daemon_threads = True
+    request_queue_size = REQUEST_QUEUE_SIZE
+
+class GeneratorRequestHandler (BaseHTTPRequestHandler):
+    """Handles the requests to the generator server.
+
+    - `POST /render`: Render the input document (the body) and return the files of the chart as JSON (`{ "files": { <path>: <contents> } }`)
+    - `POST /package`: Render and package the input document (the body) and return the `.tgz`
+    - `GET /health`: Check the server is up (and get the render cache's statistics)
+    """
+
+    server_version = 'HelmChartGenerator'
+    protocol_version = 'HTTP/1.1'
+
+    def address_string(self) -> str:
+        # There is no client address on a Unix socket
+        return self.client_address[0] if isinstance(self.client_address, tuple) and len(self.client_address) > 0 else 'unix'
+
+    def log_message(self, format: str, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def send_body(self, status: int, body: bytes, content_type: str, headers: dict[str, str] | None = None):
+        """Send a response.
+
+        Args:
+            status (int): The HTTP status.
+            body (bytes): The body of the response.
+            content_type (str): The content type of the body.
+            headers (dict[str, str], Optional): Any other headers. Default None
+        """
+
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+
+        self.wfile.write(body)
+
+    def send_json(self, status: int, document: dict, headers: dict[str, str] | None = None):
+        """Send a JSON response.
+
+        Args:
+            status (int): The HTTP status.
+            document (dict): The body of the response.
+            headers (dict[str, str], Optional): Any other headers. Default None
+        """
+
+        self.send_body(status, json.dumps(document).encode('utf-8'), 'application/json', headers)
+
+    def read_input(self) -> dict | None:
+        """Read the input document from the body of the request (sending an error response if it isn't valid).
+
+        Returns:
+            dict | None: The input document or None if it wasn't valid
+        """
+
+        length = int(self.headers.get('Content-Length', 0))
+
+        if length <= 0 or length > MAX_REQUEST_SIZE:
+            # The body isn't read, so the connection can't be reused
+            self.close_connection = True
+            self.send_json(400 if length <= 0 else 413, { 'error': 'The body must be an input document (JSON).' if length <= 0 else 'The input document is too large.' })
+            return None
+
+        try:
+            data = json.loads(self.rfile.read(length))
+        except ValueError as e:
+            self.send_json(400, { 'error': f'Invalid JSON: {e}' })
+            return None
+
+        return data
+
+    def do_GET(self):
+        if self.path != '/health':
+            self.send_json(404, { 'error': f'Unknown path "{self.path}".' })
+            return
+
+        cache = self.server.render_cache
+        self.send_json(200, { 'status': 'ok', 'cache': { 'entries': len(cache.entries), 'hits': cache.hits, 'misses': cache.misses } })
+
+    def do_POST(self):
+        if self.path not in ('/render', '/package'):
+            self.send_json(404, { 'error': f'Unknown path "{self.path}".' })
+            return
+
+        data = self.read_input()
+        if data is None:
+            return
+
+        start = time.perf_counter()
+
+        problems = validate_input(data)
+        if len(problems) > 0:
+            self.send_json(400, { 'error': f'The input document has {len(problems)} problem(s).', 'problems': problems })
+            return
+
+        try:
+            # Nothing is ever written to disk, so the root of the chart doesn't matter
+            helmChart = build_helm_chart(data, self.server.root, cache=self.server.render_cache)
+            helmChart.render()
+        except Exception as e:
+            self.send_json(400, { 'error': str(e) })
+            return
+
+        if self.path == '/render':
+            headers = { 'Server-Timing': f'render;dur={(time.perf_counter() - start) * 1000:.3f}' }
+            self.send_json(200, { 'files': helmChart.files.files }, headers)
+            return
+
+        archive = helmChart.create_archive()
+        headers = {
+            'Content-Disposition': f'attachment; filename="{helmChart.chartName}-{helmChart.chartVersion}.tgz"',
+            'Server-Timing': f'render;dur={(time.perf_counter() - start) * 1000:.3f}'
+        }
+        self.send_body(200, archive, 'application/gzip', headers)
+
+def create_server(address: str, render_cache: RenderCache | None = None, quiet: bool = False) -> socketserver.BaseServer:
+    """Create (but don't start) the generator server.
+
+    The server is long-running, so everything a request needs (the components and render cache) is loaded once up front and kept warm.
+    Each request is handled on it's own thread.
+
+    Args:
+        address (str): Where to listen, either `<host>:<port>` (Ex. `127.0.0.1:8080`) or `unix:<path>` (Ex. `unix:/run/helm-generator.sock`).
+        render_cache (RenderCache, Optional): The cache of rendered templates shared by every request. Default None (a new in-memory cache)
+        quiet (bool, Optional): Don't log each request. Default False
+
+    Returns:
+        socketserver.BaseServer: The server
+    """
+
+    if address.startswith('unix:'):
+        path = address[len('unix:'):]
+
+        # A socket left behind by a previous server would stop this one from binding
+        # But anything else at the path (Ex. a regular file) is never removed
+        if os.path.lexists(path):
+            if not stat.S_ISSOCK(os.lstat(path).st_mode):
+                raise Exception(f'Can\'t listen on "{path}", it already exists and isn\'t a socket.')
+
+            os.remove(path)
+
+        server = GeneratorUnixHTTPServer(path, GeneratorRequestHandler)
+    else:
+        host, _, port = address.rpartition(':')
+        if host == '' or not port.isdigit():
+            raise Exception(f'Invalid address "{address}". Expected <host>:<port> or unix:<path>.')
+
+        server = GeneratorHTTPServer((host, int(port)), GeneratorRequestHandler)
+
+    # Import every component now, rather than on the first request that uses it
+    for kind in COMPONENTS:
+        load_component(kind)
+
+    server.render_cache = render_cache if render_cache is not None else RenderCache(max_entries=4096)
+    server.root = os.getcwd()
+    server.quiet = quiet
+
+    return server
+
+def serve(address: str, render_cache: RenderCache | None = None, quiet: bool = False):
+    """Run the generator server until it's interrupted (Ex. Ctrl+C).
+
+    Args:
+        address (str): Where to listen (see `create_server`).
+        render_cache (RenderCache, Optional): The cache of rendered templates shared by every request. Default None (a new in-memory cache)
+        quiet (bool, Optional): Don't log each request. Default False
+    """
+
+    with create_server(address, render_cache, quiet) as server:
+        print(f'Listening on {address}')
+
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if address.startswith('unix:') and os.path.exists(address[len('unix:'):]):
+                os.remove(address[len('unix:'):])
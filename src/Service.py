@@ -1,4 +1,5 @@
 from .Template import Template
+from .VirtualFileTree import VirtualFileTree
 
 class Service (Template):
     def __init__(self):
@@ -6,18 +7,23 @@ class Service (Template):
         
         super().__init__()
     
-    def write(self):
+    def write(self, files: VirtualFileTree):
         """Write the Service template to a file."""
         
-        with open(f'templates/service.yaml', 'w') as f:
-            f.write('apiVersion: v1' + '\n')
-            f.write('kind: Service' + '\n')
-            f.write('metadata:' + '\n')
-            f.write('  ' + 'name: {{ .Release.Name }}' + '\n')
-            f.write('spec:' + '\n')
-            f.write('  ' + 'selector:' + '\n')
-            f.write('  ' + '  ' + 'app: {{ .Release.Name }}' + '\n')
-            f.write('  ' + 'ports:' + '\n')
-            f.write('  ' + '  ' + '- protocol: TCP' + '\n')
-            f.write('  ' + '  ' + '  ' + 'port: 80' + '\n')
-            f.write('  ' + '  ' + '  ' + 'targetPort: {{ .Values.container.port }}' + '\n')
\ No newline at end of file
+        self.write_document(files, 'templates/service.yaml', {
+            'apiVersion': 'v1',
+            'kind': 'Service',
+            'metadata': {
+                'name': '{{ .Release.Name }}'
+            },
+            'spec': {
+                'selector': self.create_selector_labels(),
+                'ports': [
+                    {
+                        'protocol': 'TCP',
+                        'port': 80,
+                        'targetPort': '{{ .Values.container.port }}'
+                    }
+                ]
+            }
+        })
@@ -1,10 +1,139 @@
+import hashlib, json
 from abc import ABC, abstractmethod
 
+from .VirtualFileTree import VirtualFileTree
+from .YAML import Include, Mapping, dump
+from .Version import get_source_digest
+
 class Template(ABC):
     """An abstract class for creating a/some template(s)."""
 
+    # The prefix of the named templates in the chart's `_helpers.tpl` file (see `Helpers`), set by the `HelmChart`. None if the chart doesn't have one
+    helpers: str | None = None
+
     @abstractmethod
-    def write(self):
-        """Write the template to a file."""
+    def write(self, files: VirtualFileTree):
+        """Write the template to a file.
+
+        Args:
+            files (VirtualFileTree): The in-memory file tree to render the template's file(s) into.
+        """
         
-        pass
\ No newline at end of file
+        pass
+
+    def write_document(self, files: VirtualFileTree, path: str, *nodes):
+        """Serialize a YAML document (see `YAML.dump`) and write it to a file.
+
+        Args:
+            files (VirtualFileTree): The in-memory file tree to write to.
+            path (str): The path of the file (Ex. `templates/service.yaml`).
+            nodes (Any): The top level nodes of the document (Ex. a `{{- if }}` directive, the manifest and the `{{- end }}` directive).
+        """
+
+        files.write_file(path, dump(*nodes))
+
+    def create_labels(self) -> dict | Include:
+        """Create the labels of the app's objects (Ex. the Deployment).
+
+        Returns:
+            dict | Include: The labels (or the named template that has them, if the chart has a `_helpers.tpl` file)
+        """
+
+        if self.helpers is not None:
+            return Include(f'{self.helpers}.labels')
+
+        return { 'app': '{{ .Release.Name }}' }
+
+    def create_selector_labels(self) -> dict | Include:
+        """Create the labels used to select the app's pods (Ex. the selector of the Service).
+
+        Returns:
+            dict | Include: The labels (or the named template that has them, if the chart has a `_helpers.tpl` file)
+        """
+
+        if self.helpers is not None:
+            return Include(f'{self.helpers}.selectorLabels')
+
+        return { 'app': '{{ .Release.Name }}' }
+
+    def create_data_object(self, kind: str, name: str, data, namespace: str | None = None, labeled: bool = False) -> Mapping:
+        """Create a (`Opaque`) Secret or ConfigMap.
+
+        If the chart has a `_helpers.tpl` file everything but the `data` comes from it's `secret`/`configMap` named template.
+        Unless the name isn't prefixed with the release name or the namespace is a template expression other than the release's namespace, which the named templates can't make.
+
+        Args:
+            kind (str): The kind of object (`Secret` or `ConfigMap`).
+            name (str): The name of the object (Ex. `{{ .Release.Name }}-db-password`).
+            data (dict | Mapping): The data of the object.
+            namespace (str, Optional): The namespace of the object. Default None (the release's namespace, without setting it)
+            labeled (bool, Optional): If the object has the app's labels (see `create_labels`). Default False
+
+        Returns:
+            Mapping: The object
+        """
+
+        release_prefix = '{{ .Release.Name }}-'
+
+        if self.helpers is not None and name.startswith(release_prefix) and (namespace is None or namespace == '{{ .Release.Namespace }}' or '{{' not in namespace):
+            # The arguments of the named template (see `Helpers`), as Go string literals
+            argument = '(dict "context" . "name" "' + name[len(release_prefix):].replace('\\', '\\\\').replace('"', '\\"') + '"'
+            if namespace == '{{ .Release.Namespace }}':
+                argument += ' "namespace" .Release.Namespace'
+            elif namespace is not None:
+                argument += ' "namespace" "' + namespace.replace('\\', '\\\\').replace('"', '\\"') + '"'
+            if labeled:
+                argument += ' "labeled" true'
+            argument += ')'
+
+            return Mapping([Include(f'{self.helpers}.' + ('secret' if kind == 'Secret' else 'configMap'), argument), ('data', data)])
+
+        metadata = { 'name': name }
+        if namespace is not None:
+            metadata['namespace'] = namespace
+        if labeled:
+            metadata['labels'] = self.create_labels()
+
+        manifest = { 'apiVersion': 'v1', 'kind': kind, 'metadata': metadata }
+        if kind == 'Secret':
+            manifest['type'] = 'Opaque'
+        manifest['data'] = data
+
+        return Mapping(manifest)
+
+    def get_config(self) -> dict:
+        """Get the configuration that determines what the template renders.
+
+        By default this is every attribute of the template.
+        Templates whose output doesn't depend on (some of) their attributes (Ex. because the value comes from `values.yaml`) override this to only include what actually matters.
+        Which lets templates that only differ by those attributes share a render cache entry.
+
+        Returns:
+            dict: The configuration of the template
+        """
+
+        return vars(self)
+
+    def config_key(self) -> str:
+        """Get a stable key of the template's configuration (used by the `RenderCache`).
+
+        Two templates with the same key render exactly the same files.
+
+        Returns:
+            str: The hex digest (SHA-256) of the template's type, configuration and the generator's code (see `Version.get_source_digest`)
+        """
+
+        config = {
+            'generator': get_source_digest(),
+            'template': f'{type(self).__module__}.{type(self).__qualname__}',
+            'config': self.get_config()
+        }
+
+        # What's in the `_helpers.tpl` file is included instead (only added when used so the keys of charts without one don't change)
+        if self.helpers is not None:
+            config['helpers'] = self.helpers
+
+        # Nested templates (Ex. the NoSQL template of the Deployment) are represented by their own key
+        serialized = json.dumps(config, sort_keys=True, separators=(',', ':'), default=lambda value: value.config_key() if isinstance(value, Template) else repr(value))
+
+        return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
@@ -1,4 +1,6 @@
 from .Template import Template
+from .VirtualFileTree import VirtualFileTree
+from .YAML import Directive
 
 class ThirdPartyService (Template):
     def __init__(self, name: str, enabled: bool, **vars: str):
@@ -8,23 +10,19 @@ class ThirdPartyService (Template):
         self.enabled = enabled
         self.vars = vars
 
-    def write(self):
-        with open(f'templates/{self.name}-secret.yaml', 'w') as f:
-            f.write('{{- if .Values.thirdParty.' + self.name + '.enabled -}}' + '\n')
-            f.write('apiVersion: v1' + '\n')
-            f.write('kind: Secret' + '\n')
-            f.write('metadata:' + '\n')
-            f.write('  ' + 'name: {{ .Release.Name }}-' + self.name + '-secret' + '\n')
-            f.write('  ' + 'labels:' + '\n')
-            f.write('  ' + '  ' + 'app: {{ .Release.Name }}' + '\n')
-            f.write('type: Opaque' + '\n')
-            f.write('data:' + '\n')
-            for key, value in self.vars.items():
-                snake_case_name = key.split('_')[0]
-                for token in key.split('_'):
-                    if token != snake_case_name:
-                        snake_case_name += token.capitalize()
-                
-                f.write('  ' + key.replace('_', '-') + ': {{ .Values.thirdParty.' + self.name + '.' + snake_case_name + ' | b64enc }}' + '\n')
+    def get_config(self) -> dict:
+        """Only the name of the service and the names of it's variables affect the rendered files (the values come from the `values.yaml` file)."""
+
+        return { 'name': self.name, 'vars': list(self.vars) }
+
+    def write(self, files: VirtualFileTree):
+        data = {}
+        for key in self.vars:
+            snake_case_name = key.split('_')[0]
+            for token in key.split('_'):
+                if token != snake_case_name:
+                    snake_case_name += token.capitalize()
             
-            f.write('{{- end -}}' + '\n')
\ No newline at end of file
+            data[key.replace('_', '-')] = '{{ .Values.thirdParty.' + self.name + '.' + snake_case_name + ' | b64enc }}'
+
+        self.write_document(files, f'templates/{self.name}-secret.yaml', Directive('{{- if .Values.thirdParty.' + self.name + '.enabled -}}'), self.create_data_object('Secret', '{{ .Release.Name }}-' + self.name + '-secret', data, labeled=True), Directive('{{- end -}}'))
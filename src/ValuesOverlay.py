@@ -0,0 +1,53 @@
+def merge_values(base: dict, overrides: dict) -> dict:
+    """Merge overrides into values (the same way Helm merges a `-f` values file into the chart's `values.yaml`).
+
+    Mappings are merged recursively, anything else (including lists) is replaced and a `None` (null) removes the key.
+
+    Args:
+        base (dict): The values.
+        overrides (dict): The values to merge in.
+
+    Returns:
+        dict: The merged values (neither of the inputs are modified)
+    """
+
+    merged = dict(base)
+
+    for key, value in overrides.items():
+        if value is None:
+            merged.pop(key, None)
+        elif isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_values(merged[key], value)
+        else:
+            merged[key] = value
+
+    return merged
+
+def diff_values(base: dict, target: dict) -> dict:
+    """Get the smallest overlay that turns one set of values into another (when merged with `merge_values`).
+
+    Args:
+        base (dict): The values the overlay is applied to.
+        target (dict): The values the overlay should result in.
+
+    Returns:
+        dict: The overlay (only the keys that differ, removed keys are `None`)
+    """
+
+    overlay = {}
+
+    for key, value in target.items():
+        if key not in base:
+            overlay[key] = value
+        elif isinstance(value, dict) and isinstance(base[key], dict):
+            nested = diff_values(base[key], value)
+            if len(nested) > 0:
+                overlay[key] = nested
+        elif value != base[key] or type(value) != type(base[key]):
+            overlay[key] = value
+
+    for key in base:
+        if key not in target:
+            overlay[key] = None
+
+    return overlay
@@ -0,0 +1,43 @@
+import functools, hashlib, os
+
+# The version of the generator itself
+VERSION = '1.1.0'
+
+@functools.cache
+def get_source_digest() -> str | None:
+    """Get a digest of the generator's own code (every module of this package).
+
+    This is part of every render cache key (and package digest), so cached output from any other version of the generator is never reused.
+    Unlike `VERSION` it doesn't have to be bumped by hand, any change to the code changes it.
+    It's only computed once per process.
+
+    Returns:
+        str | None: The (hex) SHA-256 digest or None if the code couldn't be read (so nothing should be cached)
+    """
+
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256()
+
+    try:
+        if os.path.isdir(package_dir):
+            for name in sorted(name for name in os.listdir(package_dir) if name.endswith('.py')):
+                with open(os.path.join(package_dir, name), 'rb') as f:
+                    digest.update(name.encode('utf-8') + b'\0' + f.read() + b'\0')
+        else:
+            # The zipapp (see `build-zipapp.py`) only has the bytecode of the modules, which includes a hash of each module's source
+            archive = getattr(__loader__, 'archive', None)
+            if archive is None:
+                return None
+
+            import zipfile
+
+            try:
+                with zipfile.ZipFile(archive) as z:
+                    for name in sorted(name for name in z.namelist() if name.startswith('src/') and name.endswith('.pyc')):
+                        digest.update(name.encode('utf-8') + b'\0' + z.read(name) + b'\0')
+            except zipfile.BadZipFile:
+                return None
+    except OSError:
+        return None
+
+    return digest.hexdigest()
@@ -0,0 +1,214 @@
+import hashlib, io, json, os
+
+# The name of the file (in the root of the output) that tracks what was generated by the last incremental flush
+MANIFEST_FILENAME = '.helm-generator-manifest.json'
+
+class VirtualFile (io.StringIO):
+    def __init__(self, tree: 'VirtualFileTree', path: str):
+        """A writable in-memory file that is committed to it's tree when closed.
+
+        Args:
+            tree (VirtualFileTree): The tree the file belongs to.
+            path (str): The path of the file relative to the root of the tree.
+        """
+
+        super().__init__()
+
+        self.tree = tree
+        self.path = path
+
+    def close(self):
+        """Commit the contents of the file to the tree and close it."""
+
+        if not self.closed:
+            self.tree.write_file(self.path, self.getvalue())
+
+        super().close()
+
+class VirtualFileTree:
+    def __init__(self, files: dict[str, str] | None = None):
+        """An in-memory tree of files.
+
+        Templates render into the tree instead of writing to disk directly.
+        Which means the whole tree can be written out in one batched step (to disk, to an archive, or not at all).
+
+        Paths are always relative to the root of the tree and use forward slashes (Ex. `templates/deployment.yaml`).
+
+        Args:
+            files (dict[str, str], Optional): The initial files of the tree (path to contents). Default None
+        """
+
+        self.files: dict[str, str] = dict(files or {})
+
+    def open(self, path: str) -> VirtualFile:
+        """Open a file in the tree for writing.
+
+        Similar to the built-in `open(path, 'w')`, the file is truncated and it's contents are replaced once closed.
+
+        Args:
+            path (str): The path of the file relative to the root of the tree.
+
+        Returns:
+            VirtualFile: A writable file like object
+        """
+
+        return VirtualFile(self, path)
+
+    def write_file(self, path: str, content: str):
+        """Set the contents of a file in the tree.
+
+        Args:
+            path (str): The path of the file relative to the root of the tree.
+            content (str): The contents of the file.
+        """
+
+        self.files[path] = content
+
+    def read_file(self, path: str) -> str:
+        """Get the contents of a file in the tree.
+
+        Args:
+            path (str): The path of the file relative to the root of the tree.
+
+        Returns:
+            str: The contents of the file
+        """
+
+        return self.files[path]
+
+    def merge(self, other: 'VirtualFileTree'):
+        """Add all the files of another tree to this tree.
+
+        Files that exist in both trees are overwritten by the other tree's version.
+
+        Args:
+            other (VirtualFileTree): The tree to merge into this one.
+        """
+
+        self.files.update(other.files)
+
+    def paths(self) -> list[str]:
+        """Get the paths of all the files in the tree (sorted).
+
+        Returns:
+            list[str]: The sorted paths of the files in the tree
+        """
+
+        return sorted(self.files)
+
+    def __contains__(self, path: str) -> bool:
+        return path in self.files
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    def size(self) -> int:
+        """Get the total size (in bytes, UTF-8 encoded) of all the files in the tree.
+
+        Returns:
+            int: The total size of the files in the tree
+        """
+
+        return sum(len(content.encode('utf-8')) for content in self.files.values())
+
+    def flush(self, root: str = '.'):
+        """Write the whole tree to disk.
+
+        Each directory is only created once and each file is written with a single call.
+
+        Args:
+            root (str, Optional): The directory to write the tree into. Default '.'
+        """
+
+        created = set()
+        for path, content in self.files.items():
+            directory = os.path.dirname(os.path.join(root, path))
+            if directory not in created:
+                os.makedirs(directory, exist_ok=True)
+                created.add(directory)
+
+            with open(os.path.join(root, path), 'w') as f:
+                f.write(content)
+
+    def digest(self, path: str) -> str:
+        """Get the content digest (SHA-256) of a file in the tree.
+
+        Args:
+            path (str): The path of the file relative to the root of the tree.
+
+        Returns:
+            str: The hex digest of the file's contents
+        """
+
+        return hashlib.sha256(self.files[path].encode('utf-8')).hexdigest()
+
+    def flush_incremental(self, root: str = '.') -> dict[str, list[str]]:
+        """Write only the files that changed since the last incremental flush to disk.
+
+        A manifest of the content digest of every generated file is kept in the root (see `MANIFEST_FILENAME`).
+        Files whose digest matches the manifest are left alone (so their mtime doesn't change).
+        Files that were generated last time but aren't part of the tree anymore are deleted.
+
+        If there is no manifest yet (Ex. the first incremental run over an existing chart), the files on disk are compared instead.
+
+        Args:
+            root (str, Optional): The directory to write the tree into. Default '.'
+
+        Returns:
+            dict[str, list[str]]: The paths that were `written`, `unchanged` and `deleted`
+        """
+
+        manifest_path = os.path.join(root, MANIFEST_FILENAME)
+
+        previous = {}
+        if os.path.exists(manifest_path):
+            try:
+                with open(manifest_path, 'r') as f:
+                    previous = json.load(f)
+            except ValueError:
+                # A corrupt manifest is treated the same as no manifest (everything gets compared against the disk)
+                previous = {}
+
+        manifest = {}
+        result = { 'written': [], 'unchanged': [], 'deleted': [] }
+        created = set()
+
+        for path in self.paths():
+            digest = self.digest(path)
+            manifest[path] = digest
+
+            full_path = os.path.join(root, path)
+            if os.path.exists(full_path):
+                if path in previous:
+                    unchanged = previous[path] == digest
+                else:
+                    with open(full_path, 'rb') as f:
+                        unchanged = hashlib.sha256(f.read()).hexdigest() == digest
+                
+                if unchanged:
+                    result['unchanged'].append(path)
+                    continue
+            
+            directory = os.path.dirname(full_path)
+            if directory not in created:
+                os.makedirs(directory, exist_ok=True)
+                created.add(directory)
+
+            with open(full_path, 'w') as f:
+                f.write(self.files[path])
+            
+            result['written'].append(path)
+        
+        # Remove anything that was generated previously but isn't anymore
+        for path in sorted(set(previous) - set(manifest)):
+            full_path = os.path.join(root, path)
+            if os.path.exists(full_path):
+                os.remove(full_path)
+            
+            result['deleted'].append(path)
+
+        if manifest != previous:
+            with open(manifest_path, 'w') as f:
+                json.dump(manifest, f, indent=2, sort_keys=True)
+        
+        return result
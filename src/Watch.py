@@ -0,0 +1,95 @@
+import hashlib, json, os, time
+
+from .ChartBuilder import build_helm_chart
+from .DependencyGraph import affected_nodes
+from .HelmChart import HelmChart
+from .RenderCache import RenderCache
+
+def regenerate(data: dict, output: str, cache: RenderCache, lint: bool = False, manifest_layout: str | None = None, previous: tuple[dict, HelmChart] | None = None) -> tuple[HelmChart, dict[str, list[str]]]:
+    """Regenerate a chart, only rendering the templates whose configuration changed and only writing the files whose contents changed.
+
+    Given the previous input document (and it's chart) only the templates and `values.yaml` sections that consume what changed in the input are rendered (see `DependencyGraph`).
+
+    Args:
+        data (dict): The input document.
+        output (str): The directory of the chart.
+        cache (RenderCache): The cache of rendered templates (kept between regenerations).
+        lint (bool, Optional): Run `helm lint` on the chart afterwards. Default False
+        manifest_layout (str, Optional): Combine the templates into multi-document files (see `HelmChart`). Default None (a file per template)
+        previous (tuple[dict, HelmChart], Optional): The previous input document and the chart rendered from it. Default None (render everything)
+
+    Returns:
+        tuple[HelmChart, dict[str, list[str]]]: The chart and the paths that were `written`, `unchanged` and `deleted`
+    """
+
+    helmChart = build_helm_chart(data, output, cache=cache, manifest_layout=manifest_layout)
+
+    if previous is not None:
+        previous_data, previous_chart = previous
+        helmChart.render(previous_chart, affected_nodes(previous_data, data))
+    else:
+        helmChart.render()
+    
+    changes = helmChart.flush(incremental=True)
+
+    if lint:
+        helmChart.lint()
+
+    return helmChart, changes
+
+def watch(input_file: str, output: str, interval: float = 0.2, lint: bool = False, render_cache: RenderCache | None = None, manifest_layout: str | None = None):
+    """Regenerate a chart every time it's input file is saved (until interrupted, Ex. Ctrl+C).
+
+    The input file is polled (so this works the same on every platform and file system).
+    A save that doesn't change the contents of the input (Ex. only touching it) doesn't regenerate anything.
+    If the input can't be parsed (Ex. it's saved part way through an edit) the error is printed and the previous output is left alone.
+
+    Args:
+        input_file (str): The input file to watch.
+        output (str): The directory of the chart.
+        interval (float, Optional): How often (in seconds) to check the input file. Default 0.2
+        lint (bool, Optional): Run `helm lint` on the chart after each regeneration. Default False
+        render_cache (RenderCache, Optional): The cache of rendered templates. Default None (a new in-memory cache)
+        manifest_layout (str, Optional): Combine the templates into multi-document files (see `HelmChart`). Default None (a file per template)
+    """
+
+    cache = render_cache if render_cache is not None else RenderCache()
+
+    last_stat = None
+    last_digest = None
+    # The last input that was successfully generated (and it's chart)
+    previous = None
+
+    print(f'Watching {input_file} (Ctrl+C to stop)', flush=True)
+
+    try:
+        while True:
+            try:
+                stat = os.stat(input_file)
+                current_stat = (stat.st_mtime_ns, stat.st_size)
+            except FileNotFoundError:
+                # Some editors save by replacing the file, so it can briefly not exist
+                current_stat = None
+
+            if current_stat is not None and current_stat != last_stat:
+                last_stat = current_stat
+
+                with open(input_file, 'rb') as f:
+                    content = f.read()
+
+                digest = hashlib.sha256(content).hexdigest()
+                if digest != last_digest:
+                    last_digest = digest
+
+                    start = time.perf_counter()
+                    try:
+                        data = json.loads(content)
+                        helmChart, changes = regenerate(data, output, cache, lint, manifest_layout, previous)
+                        previous = (data, helmChart)
+                        print(f'Regenerated in {(time.perf_counter() - start) * 1000:.1f} ms: {len(changes["written"])} file(s) written, {len(changes["deleted"])} file(s) removed, {len(changes["unchanged"])} file(s) unchanged', flush=True)
+                    except Exception as e:
+                        print(f'Failed to regenerate the chart ({type(e).__name__}: {e})', flush=True)
+
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
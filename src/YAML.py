@@ -0,0 +1,629 @@
+import re
+
+# Plain (unquoted) scalars that YAML would read as something other than a string
+AMBIGUOUS_SCALAR = re.compile(r'^(~|null|Null|NULL|true|True|TRUE|false|False|FALSE|yes|Yes|YES|no|No|NO|on|On|ON|off|Off|OFF|[-+]?(\d[\d_]*)?\.?\d+([eE][-+]?\d+)?|0x[0-9a-fA-F]+|0o[0-7]+|[-+]?\.(inf|Inf|INF)|\.(nan|NaN|NAN))$')
+
+# Plain scalars that YAML 1.1 (Ex. `helm`) would read as a timestamp (a date, optionally followed by a time)
+TIMESTAMP_SCALAR = re.compile(r'^\d{4}-\d\d?-\d\d?([Tt\s]|$)')
+
+# Characters that can't be written as is (even within a quoted scalar) and their escape sequences
+CONTROL_CHARACTER = re.compile(r'[\x00-\x1f\x7f]')
+CONTROL_ESCAPES = { '\n': '\\n', '\t': '\\t', '\r': '\\r', '\0': '\\0' }
+
+class Directive:
+    def __init__(self, text: str):
+        """A raw (Go template) line (Ex. `{{- if .Values.ingress.enabled -}}`).
+
+        It's written as-is at the indentation of the mapping/sequence it's part of.
+
+        Args:
+            text (str): The line (without indentation).
+        """
+
+        self.text = text
+
+class Comment:
+    def __init__(self, text: str):
+        """A comment line.
+
+        Args:
+            text (str): The text of the comment (without the leading `#`).
+        """
+
+        self.text = text
+
+class Include:
+    def __init__(self, name: str, argument: str = '.'):
+        """A named template (Ex. from the chart's `_helpers.tpl` file) included in place of the entries of a mapping (or as the value of a key).
+
+        At the top level of a document it's written as is (`{{ include "<name>" <argument> }}`).
+        Anywhere else it's indented to fit where it's included (Ex. `{{- include "app.labels" . | nindent 4 }}`).
+
+        Args:
+            name (str): The name of the named template.
+            argument (str, Optional): The argument (pipeline) the named template is given as it's dot. Default `.` (the top level objects)
+        """
+
+        self.name = name
+        self.argument = argument
+
+    def to_text(self, indent: int) -> str:
+        """Get the action that includes the named template.
+
+        Args:
+            indent (int): The indentation (in spaces) the output of the named template has to have.
+
+        Returns:
+            str: The action
+        """
+
+        if indent == 0:
+            return f'{{{{ include "{self.name}" {self.argument} }}}}'
+
+        return f'{{{{- include "{self.name}" {self.argument} | nindent {indent} }}}}'
+
+class Quoted (str):
+    """A string scalar that is always double quoted (Ex. `value: "{{ .Values.container.port }}"`)."""
+
+    pass
+
+class Raw (str):
+    """A scalar that is written exactly as is (Ex. a value from the input that is already valid YAML)."""
+
+    pass
+
+class Mapping:
+    def __init__(self, entries: dict | list | None = None):
+        """An (ordered) YAML mapping.
+
+        Unlike a dictionary, a mapping can contain directives and comments between it's entries and can repeat a key.
+        (Ex. the same key in both branches of a `{{- if }}`/`{{- else }}`)
+
+        Args:
+            entries (dict | list, Optional): The initial entries. Either a dictionary or a list of `(key, value)` pairs, `Directive`s, `Comment`s and `Include`s. Default None
+        """
+
+        self.entries: list = []
+
+        if isinstance(entries, dict):
+            entries = entries.items()
+
+        for entry in entries or []:
+            if isinstance(entry, (Directive, Comment, Include)):
+                self.entries.append(entry)
+            else:
+                self.add(*entry)
+
+    def add(self, key: str, value) -> 'Mapping':
+        """Add an entry to the mapping.
+
+        Dictionaries and lists are converted to `Mapping`s and `Sequence`s.
+
+        Args:
+            key (str): The key of the entry.
+            value (Any): The value of the entry.
+
+        Returns:
+            Mapping: The mapping (so calls can be chained)
+        """
+
+        self.entries.append((key, to_node(value)))
+        return self
+
+    def directive(self, text: str) -> 'Mapping':
+        """Add a `Directive` to the mapping.
+
+        Args:
+            text (str): The directive (Ex. `{{- end }}`).
+
+        Returns:
+            Mapping: The mapping (so calls can be chained)
+        """
+
+        self.entries.append(Directive(text))
+        return self
+
+    def comment(self, text: str) -> 'Mapping':
+        """Add a `Comment` to the mapping.
+
+        Args:
+            text (str): The text of the comment.
+
+        Returns:
+            Mapping: The mapping (so calls can be chained)
+        """
+
+        self.entries.append(Comment(text))
+        return self
+
+    def get(self, key: str, default=None):
+        """Get the value of the first entry with a key.
+
+        Args:
+            key (str): The key of the entry.
+            default (Any, Optional): The value to return if there is no entry with the key. Default None
+
+        Returns:
+            Any: The value of the entry
+        """
+
+        for entry in self.entries:
+            if isinstance(entry, tuple) and entry[0] == key:
+                return entry[1]
+
+        return default
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+class Sequence:
+    def __init__(self, items: list | None = None):
+        """A YAML sequence.
+
+        Like a `Mapping`, a sequence can contain directives and comments between it's items.
+
+        Args:
+            items (list, Optional): The initial items. Default None
+        """
+
+        self.items: list = []
+
+        for item in items or []:
+            self.append(item)
+
+    def append(self, item) -> 'Sequence':
+        """Add an item to the sequence.
+
+        Dictionaries and lists are converted to `Mapping`s and `Sequence`s.
+
+        Args:
+            item (Any): The item.
+
+        Returns:
+            Sequence: The sequence (so calls can be chained)
+        """
+
+        self.items.append(item if isinstance(item, (Directive, Comment)) else to_node(item))
+        return self
+
+    def extend(self, items: list) -> 'Sequence':
+        """Add several items to the sequence.
+
+        Args:
+            items (list): The items.
+
+        Returns:
+            Sequence: The sequence (so calls can be chained)
+        """
+
+        for item in items:
+            self.append(item)
+
+        return self
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+def to_node(value):
+    """Convert dictionaries and lists (recursively) to `Mapping`s and `Sequence`s.
+
+    Args:
+        value (Any): The value to convert.
+
+    Returns:
+        Any: The converted value (anything else is returned as is)
+    """
+
+    if isinstance(value, dict):
+        return Mapping(value)
+    elif isinstance(value, list):
+        return Sequence(value)
+
+    return value
+
+def format_scalar(value) -> str:
+    """Format a scalar value.
+
+    Strings are written as is unless they would be read back as something other than a string.
+    In which case (or if it's a `Quoted` string) they are double quoted.
+    Strings containing a Go template expression are always written as is (unless it's a `Quoted` string), as are `Raw` strings.
+
+    Args:
+        value (Any): The scalar.
+
+    Returns:
+        str: The formatted scalar
+    """
+
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    elif value is None:
+        return 'null'
+    elif isinstance(value, (int, float)):
+        return str(value)
+
+    if isinstance(value, Raw):
+        return str(value)
+
+    value_is_quoted = isinstance(value, Quoted)
+    value = str(value)
+
+    # Go template expressions are rendered before the YAML is parsed, so they're left exactly as they are
+    if not value_is_quoted and '{{' in value:
+        return value
+
+    # Ex. a leading `- ` is a sequence item, a trailing `:` a mapping key and `2024-01-01` a timestamp
+    if (value_is_quoted or value == '' or AMBIGUOUS_SCALAR.match(value) or TIMESTAMP_SCALAR.match(value) or value[0] in '-!&*#?|>@%`\'",[]{}' or value != value.strip()
+        or ': ' in value or ' #' in value or value.endswith(':') or CONTROL_CHARACTER.search(value)):
+        value = value.replace('\\', '\\\\').replace('"', '\\"')
+        return '"' + CONTROL_CHARACTER.sub(lambda match: CONTROL_ESCAPES.get(match.group(), f'\\x{ord(match.group()):02x}'), value) + '"'
+
+    return value
+
+def emit_mapping(mapping: Mapping, indent: int, lines: list[str]):
+    """Write the lines of a mapping.
+
+    Args:
+        mapping (Mapping): The mapping.
+        indent (int): The indentation (in spaces) of the mapping.
+        lines (list[str]): The lines to add to.
+    """
+
+    prefix = ' ' * indent
+
+    for entry in mapping.entries:
+        if isinstance(entry, Directive):
+            lines.append(prefix + entry.text)
+        elif isinstance(entry, Comment):
+            lines.append(prefix + '# ' + entry.text)
+        elif isinstance(entry, Include):
+            lines.append(prefix + entry.to_text(indent))
+        else:
+            key, value = entry
+
+            if isinstance(value, Include):
+                lines.append(f'{prefix}{key}:')
+                lines.append(' ' * (indent + 2) + value.to_text(indent + 2))
+            elif isinstance(value, Mapping) and len(value) > 0:
+                lines.append(f'{prefix}{key}:')
+                emit_mapping(value, indent + 2, lines)
+            elif isinstance(value, Sequence) and len(value) > 0:
+                lines.append(f'{prefix}{key}:')
+                emit_sequence(value, indent + 2, lines)
+            elif isinstance(value, Mapping):
+                lines.append(f'{prefix}{key}: {{}}')
+            elif isinstance(value, Sequence):
+                lines.append(f'{prefix}{key}: []')
+            else:
+                lines.append(f'{prefix}{key}: {format_scalar(value)}')
+
+def emit_sequence(sequence: Sequence, indent: int, lines: list[str]):
+    """Write the lines of a sequence.
+
+    Args:
+        sequence (Sequence): The sequence.
+        indent (int): The indentation (in spaces) of the sequence.
+        lines (list[str]): The lines to add to.
+    """
+
+    prefix = ' ' * indent
+
+    for item in sequence.items:
+        if isinstance(item, Directive):
+            lines.append(prefix + item.text)
+        elif isinstance(item, Comment):
+            lines.append(prefix + '# ' + item.text)
+        elif isinstance(item, (Mapping, Sequence)) and len(item) > 0:
+            # The first line of the item is put on the same line as the dash (if it's an actual entry/item)
+            start = len(lines)
+            if isinstance(item, Mapping):
+                emit_mapping(item, indent + 2, lines)
+            else:
+                emit_sequence(item, indent + 2, lines)
+
+            first = item.entries[0] if isinstance(item, Mapping) else item.items[0]
+            if isinstance(first, (Directive, Comment)):
+                lines.insert(start, prefix + '-')
+            else:
+                lines[start] = prefix + '- ' + lines[start][indent + 2:]
+        elif isinstance(item, Mapping):
+            lines.append(prefix + '- {}')
+        elif isinstance(item, Sequence):
+            lines.append(prefix + '- []')
+        else:
+            lines.append(prefix + '- ' + format_scalar(item))
+
+def dump(*nodes) -> str:
+    """Serialize one or more nodes (Ex. `{{- if }}` directive, the manifest's mapping and the `{{- end }}` directive) to a YAML document.
+
+    Args:
+        nodes (Any): The top level nodes of the document (in order).
+
+    Returns:
+        str: The YAML document
+    """
+
+    lines = []
+
+    for node in nodes:
+        node = to_node(node)
+
+        if isinstance(node, Directive):
+            lines.append(node.text)
+        elif isinstance(node, Comment):
+            lines.append('# ' + node.text)
+        elif isinstance(node, Include):
+            lines.append(node.to_text(0))
+        elif isinstance(node, Mapping):
+            emit_mapping(node, 0, lines)
+        elif isinstance(node, Sequence):
+            emit_sequence(node, 0, lines)
+        else:
+            lines.append(format_scalar(node))
+
+    return '\n'.join(lines) + '\n'
+
+# The escape sequences of double quoted scalars (the common subset)
+DOUBLE_QUOTED_ESCAPES = { '\\': '\\', '"': '"', '/': '/', 'n': '\n', 't': '\t', 'r': '\r', '0': '\0', ' ': ' ' }
+
+def parse_quoted(text: str, line_number: int) -> tuple[str, str]:
+    """Parse a quoted scalar from the start of some text.
+
+    Args:
+        text (str): The text, starting with the opening quote.
+        line_number (int): The line the text is on (for errors).
+
+    Returns:
+        tuple[str, str]: The value of the scalar and the rest of the text after the closing quote
+    """
+
+    quote = text[0]
+    value = []
+    i = 1
+    while i < len(text):
+        character = text[i]
+
+        if quote == '"' and character == '\\' and text[i + 1:i + 2] == 'x' and re.match(r'[0-9a-fA-F]{2}$', text[i + 2:i + 4]):
+            value.append(chr(int(text[i + 2:i + 4], 16)))
+            i += 4
+        elif quote == '"' and character == '\\':
+            if i + 1 >= len(text) or text[i + 1] not in DOUBLE_QUOTED_ESCAPES:
+                raise Exception(f'Invalid YAML on line {line_number}: unknown escape sequence in {text}')
+
+            value.append(DOUBLE_QUOTED_ESCAPES[text[i + 1]])
+            i += 2
+        elif quote == '\'' and character == '\'' and text[i + 1:i + 2] == '\'':
+            value.append('\'')
+            i += 2
+        elif character == quote:
+            return (''.join(value), text[i + 1:])
+        else:
+            value.append(character)
+            i += 1
+
+    raise Exception(f'Invalid YAML on line {line_number}: unterminated quoted scalar {text}')
+
+def strip_comment(text: str) -> str:
+    """Remove the comment (if any) from the end of a line.
+
+    Args:
+        text (str): The line (without indentation).
+
+    Returns:
+        str: The line without the comment
+    """
+
+    if text.startswith('#'):
+        return ''
+
+    quote = None
+    for i, character in enumerate(text):
+        if quote is not None:
+            if character == quote:
+                quote = None
+        elif character in '"\'' and (i == 0 or text[i - 1] in ' :-[{,'):
+            quote = character
+        elif character == '#' and text[i - 1] in ' \t':
+            return text[:i].rstrip()
+
+    return text.rstrip()
+
+def parse_scalar(text: str, line_number: int):
+    """Parse a (flow) scalar.
+
+    Plain scalars are resolved the same way Kubernetes does (YAML 1.1 booleans, null, integers and floats).
+
+    Args:
+        text (str): The scalar.
+        line_number (int): The line the scalar is on (for errors).
+
+    Returns:
+        Any: The value of the scalar
+    """
+
+    if text == '':
+        return None
+    elif text[0] in '"\'':
+        value, rest = parse_quoted(text, line_number)
+        if rest.strip() != '':
+            raise Exception(f'Invalid YAML on line {line_number}: unexpected "{rest.strip()}" after a quoted scalar')
+        return value
+    elif text == '{}':
+        return {}
+    elif text == '[]':
+        return []
+    elif text[0] in '{[':
+        raise Exception(f'Invalid YAML on line {line_number}: flow collections ({text}) aren\'t supported')
+    elif text[0] in '&*!|>@`%':
+        raise Exception(f'Invalid YAML on line {line_number}: a plain scalar can\'t start with "{text[0]}"')
+    elif ': ' in text or text.endswith(':'):
+        raise Exception(f'Invalid YAML on line {line_number}: mapping values are not allowed here ({text})')
+
+    if text in ('~', 'null', 'Null', 'NULL'):
+        return None
+    elif text in ('true', 'True', 'TRUE', 'yes', 'Yes', 'YES', 'on', 'On', 'ON'):
+        return True
+    elif text in ('false', 'False', 'FALSE', 'no', 'No', 'NO', 'off', 'Off', 'OFF'):
+        return False
+
+    try:
+        return int(text.replace('_', ''), 0)
+    except ValueError:
+        pass
+
+    if AMBIGUOUS_SCALAR.match(text):
+        try:
+            return float(text.replace('_', ''))
+        except ValueError:
+            pass
+
+    return text
+
+def split_key(text: str, line_number: int) -> tuple[str, str] | None:
+    """Split a mapping entry into it's key and (the text of it's) value.
+
+    Args:
+        text (str): The line (without indentation or comment).
+        line_number (int): The line number (for errors).
+
+    Returns:
+        tuple[str, str] | None: The key and the rest of the line or None if the line isn't a mapping entry
+    """
+
+    if text[0] in '"\'':
+        key, rest = parse_quoted(text, line_number)
+        if rest == ':' or rest.startswith(': '):
+            return (key, rest[1:].strip())
+        return None
+
+    index = text.find(': ')
+    if text.endswith(':') and (index == -1 or index == len(text) - 1):
+        index = len(text) - 1
+
+    if index <= 0:
+        return None
+
+    return (text[:index], text[index + 1:].strip())
+
+def parse_block(lines: list[tuple[int, int, str]], start: int, indent: int) -> tuple[object, int]:
+    """Parse a block mapping or sequence (or a single scalar) at an indentation.
+
+    Args:
+        lines (list[tuple[int, int, str]]): The line number, indentation and content of every (non-blank) line.
+        start (int): The index of the first line of the block.
+        indent (int): The indentation of the block.
+
+    Returns:
+        tuple[Any, int]: The value of the block and the index of the first line after it
+    """
+
+    line_number, _, text = lines[start]
+
+    if text == '-' or text.startswith('- '):
+        items = []
+        i = start
+        while i < len(lines) and lines[i][1] == indent and (lines[i][2] == '-' or lines[i][2].startswith('- ')):
+            line_number, _, text = lines[i]
+            rest = text[1:].lstrip()
+
+            if rest == '':
+                # The item is on the following (more indented) lines
+                if i + 1 < len(lines) and lines[i + 1][1] > indent:
+                    value, i = parse_block(lines, i + 1, lines[i + 1][1])
+                else:
+                    value, i = None, i + 1
+            else:
+                # The item starts on the same line as the dash (Ex. `- name: app`), so it's indented to where it starts
+                item_indent = indent + len(text) - len(rest)
+                lines[i] = (line_number, item_indent, rest)
+                value, i = parse_block(lines, i, item_indent)
+
+            items.append(value)
+
+        return (items, i)
+
+    if split_key(text, line_number) is None:
+        if start + 1 < len(lines) and lines[start + 1][1] > indent:
+            raise Exception(f'Invalid YAML on line {lines[start + 1][0]}: unexpected indentation')
+        return (parse_scalar(text, line_number), start + 1)
+
+    mapping = {}
+    i = start
+    while i < len(lines) and lines[i][1] == indent:
+        line_number, _, text = lines[i]
+
+        entry = split_key(text, line_number)
+        if entry is None:
+            raise Exception(f'Invalid YAML on line {line_number}: expected a mapping entry but found "{text}"')
+
+        key, rest = entry
+        if key in mapping:
+            raise Exception(f'Invalid YAML on line {line_number}: duplicate key "{key}"')
+
+        if rest != '':
+            mapping[key] = parse_scalar(rest, line_number)
+            i += 1
+        elif i + 1 < len(lines) and (lines[i + 1][1] > indent or (lines[i + 1][1] == indent and (lines[i + 1][2] == '-' or lines[i + 1][2].startswith('- ')))):
+            # A sequence can be at the same indentation as it's key
+            mapping[key], i = parse_block(lines, i + 1, lines[i + 1][1])
+        else:
+            mapping[key] = None
+            i += 1
+
+    if i < len(lines) and lines[i][1] > indent:
+        raise Exception(f'Invalid YAML on line {lines[i][0]}: unexpected indentation')
+
+    return (mapping, i)
+
+def load_all(text: str) -> list:
+    """Parse a (multi-document) YAML stream.
+
+    Only the subset of YAML that's used by the generated files is supported: block mappings and sequences, plain and quoted scalars, empty flow collections (`{}`/`[]`) and comments.
+    Anything else (Ex. anchors or block scalars) is reported as an error, as are duplicate keys.
+
+    Args:
+        text (str): The YAML.
+
+    Returns:
+        list: The documents (empty documents are left out)
+    """
+
+    documents = []
+    lines = []
+
+    for line_number, line in enumerate(text.split('\n') + ['---'], start=1):
+        if line.rstrip() == '---' or line.startswith('--- '):
+            if len(lines) > 0:
+                value, end = parse_block(lines, 0, lines[0][1])
+                if end < len(lines):
+                    raise Exception(f'Invalid YAML on line {lines[end][0]}: unexpected indentation')
+                documents.append(value)
+            lines = []
+            continue
+
+        stripped = line.lstrip(' ')
+        if stripped.startswith('\t'):
+            raise Exception(f'Invalid YAML on line {line_number}: tabs can\'t be used for indentation')
+
+        content = strip_comment(stripped)
+        if content != '':
+            lines.append((line_number, len(line) - len(stripped), content))
+
+    return documents
+
+def load(text: str):
+    """Parse a (single document) YAML file (see `load_all` for what's supported).
+
+    Args:
+        text (str): The YAML.
+
+    Returns:
+        Any: The document (None if it's empty)
+    """
+
+    documents = load_all(text)
+
+    if len(documents) > 1:
+        raise Exception('Expected a single YAML document but found several.')
+
+    return documents[0] if len(documents) > 0 else None
@@ -0,0 +1,36 @@
+import json, os, tempfile, unittest
+
+from benchmarks.fake_registry import start_fake_registry
+from src.Batch import run_batch
+from src.OCIRegistryClient import OCIRegistryClient
+from src.PublishQueue import PublishQueue
+
+class BatchPublishTest (unittest.TestCase):
+    def test_results_with_the_same_name(self):
+        server = start_fake_registry()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'input.example.json'), 'r') as f:
+            data = json.load(f)
+
+        # Invalid JSON on line 1 is named `line-1`, the same as the chart on line 2
+        data['chart']['name'] = 'line-1'
+        data['registry'] = f'127.0.0.1:{server.server_address[1]}/charts'
+
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, 'batch.jsonl')
+            with open(source, 'w') as f:
+                f.write('{ not json\n' + json.dumps(data) + '\n')
+
+            publish_queue = PublishQueue(client_factory=lambda: OCIRegistryClient(plain_http=True))
+            results = run_batch(source, os.path.join(directory, 'charts'), 1, publish_queue=publish_queue)
+
+        self.assertEqual([result.name for result in results], ['line-1', 'line-1'])
+        self.assertFalse(results[0].success)
+        self.assertIsNone(results[0].publish)
+        self.assertTrue(results[1].success)
+        self.assertTrue(results[1].publish.success)
+
+if __name__ == '__main__':
+    unittest.main()
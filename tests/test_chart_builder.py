@@ -0,0 +1,42 @@
+import json, os, tempfile, unittest
+
+from src.ChartBuilder import InputError, build_helm_chart
+
+def read_example() -> dict:
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'input.example.json'), 'r') as f:
+        data = json.load(f)
+
+    data['chart']['name'] = 'app'
+    return data
+
+class EnvironmentsTest (unittest.TestCase):
+    def build(self, environments: dict):
+        data = read_example()
+        data['environments'] = environments
+
+        with tempfile.TemporaryDirectory() as directory:
+            return build_helm_chart(data, directory)
+
+    def test_values_overrides(self):
+        chart = self.build({ 'prod': { 'values': { 'replicaCount': 3 } } })
+
+        self.assertEqual(list(chart.environments), ['prod'])
+
+    def test_chart_overrides_are_problems(self):
+        with self.assertRaises(InputError) as context:
+            self.build({ 'prod': { 'chart': { 'version': '2.0.0', 'appVersion': '9.9.9', 'name': 'app' } } })
+
+        self.assertEqual(context.exception.problems, [
+            '$.environments.prod.chart.version: can\'t differ between environments (only values can, the Chart.yaml file is shared)',
+            '$.environments.prod.chart.appVersion: can\'t differ between environments (only values can, the Chart.yaml file is shared)'
+        ])
+
+class PackageDigestTest (unittest.TestCase):
+    def test_gzip_level(self):
+        chart = build_helm_chart(read_example())
+
+        self.assertEqual(chart.digest(), chart.digest(9))
+        self.assertNotEqual(chart.digest(1), chart.digest(9))
+
+if __name__ == '__main__':
+    unittest.main()
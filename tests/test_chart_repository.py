@@ -0,0 +1,106 @@
+import json, os, tempfile, unittest
+
+from src.ChartPackager import ChartPackager
+from src.ChartRepository import CACHE_FILENAME, INDEX_FILENAME, ChartRepository
+from src.VirtualFileTree import VirtualFileTree
+from src.YAML import load
+
+def write_package(directory: str, name: str, version: str) -> str:
+    """Package a minimal chart into a directory.
+
+    Args:
+        directory (str): The directory to write the package into.
+        name (str): The name of the chart.
+        version (str): The version of the chart.
+
+    Returns:
+        str: The path of the package
+    """
+
+    files = VirtualFileTree()
+    files.write_file('Chart.yaml', f'apiVersion: v2\nname: {name}\nversion: {version}\n')
+
+    path = os.path.join(directory, f'{name}-{version}.tgz')
+    with open(path, 'wb') as f:
+        f.write(ChartPackager().package(files, name))
+
+    return path
+
+def read_index(directory: str) -> dict:
+    with open(os.path.join(directory, INDEX_FILENAME), 'r') as f:
+        return load(f.read())
+
+class ChartRepositoryTest (unittest.TestCase):
+    def setUp(self):
+        self.temporary = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.temporary.name, 'repo')
+        self.packages = os.path.join(self.temporary.name, 'packages')
+        os.makedirs(self.packages)
+
+    def tearDown(self):
+        self.temporary.cleanup()
+
+    def add(self, name: str, version: str):
+        repository = ChartRepository(self.directory)
+        repository.add(write_package(self.packages, name, version))
+        repository.save()
+
+    def test_add_keeps_existing_entries(self):
+        self.add('app', '1.0.0')
+        self.add('app', '1.1.0')
+        self.add('other', '0.1.0')
+
+        entries = read_index(self.directory)['entries']
+        self.assertEqual([entry['version'] for entry in entries['app']], ['1.1.0', '1.0.0'])
+        self.assertEqual([entry['version'] for entry in entries['other']], ['0.1.0'])
+
+    def test_missing_cache_reindexes_the_directory(self):
+        self.add('app', '1.0.0')
+        self.add('app', '1.1.0')
+        self.add('other', '0.1.0')
+
+        # Ex. a repository created by `helm repo index` (or whose cache was deleted)
+        os.remove(os.path.join(self.directory, CACHE_FILENAME))
+        self.add('another', '2.0.0')
+
+        entries = read_index(self.directory)['entries']
+        self.assertEqual(sorted(entries), ['another', 'app', 'other'])
+        self.assertEqual(len(entries['app']), 2)
+
+    def test_invalid_cache_reindexes_the_directory(self):
+        self.add('app', '1.0.0')
+
+        with open(os.path.join(self.directory, CACHE_FILENAME), 'w') as f:
+            f.write('{ not json')
+        self.add('other', '0.1.0')
+
+        self.assertEqual(sorted(read_index(self.directory)['entries']), ['app', 'other'])
+
+    def test_deleted_packages_are_removed(self):
+        self.add('app', '1.0.0')
+        self.add('app', '1.1.0')
+
+        os.remove(os.path.join(self.directory, 'app-1.0.0.tgz'))
+        self.add('other', '0.1.0')
+
+        entries = read_index(self.directory)['entries']
+        self.assertEqual([entry['version'] for entry in entries['app']], ['1.1.0'])
+
+        with open(os.path.join(self.directory, CACHE_FILENAME), 'r') as f:
+            self.assertNotIn('app-1.0.0.tgz', json.load(f)['packages'])
+
+    def test_url_change_rebuilds_urls(self):
+        repository = ChartRepository(self.directory, 'http://old.example.com')
+        repository.add(write_package(self.packages, 'app', '1.0.0'))
+        repository.save()
+
+        repository = ChartRepository(self.directory, 'http://new.example.com/')
+        repository.add(write_package(self.packages, 'other', '0.1.0'))
+        repository.save()
+
+        entries = read_index(self.directory)['entries']
+        self.assertEqual(entries['app'][0]['urls'], ['http://new.example.com/app-1.0.0.tgz'])
+        self.assertEqual(entries['other'][0]['urls'], ['http://new.example.com/other-0.1.0.tgz'])
+
+if __name__ == '__main__':
+    unittest.main()
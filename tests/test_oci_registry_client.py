@@ -0,0 +1,103 @@
+import contextlib, io, json, os, socket, tempfile, unittest
+
+from benchmarks.fake_registry import start_fake_registry
+from src.CLI import main
+from src.OCIRegistryClient import OCIRegistryClient
+
+ARCHIVE = b'not really a chart, the fake registry never checks'
+METADATA = { 'apiVersion': 'v2', 'name': 'app', 'version': '1.0.0' }
+
+def get_free_port() -> int:
+    """Get a local port nothing is listening on."""
+
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+class OCIRegistryClientTest (unittest.TestCase):
+    def start_registry(self, **options):
+        server = start_fake_registry(**options)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        return server, f'127.0.0.1:{server.server_address[1]}/charts'
+
+    def test_push(self):
+        server, registry = self.start_registry()
+
+        with OCIRegistryClient(plain_http=True) as client:
+            reference = client.push_chart(registry, 'app', '1.0.0+build', ARCHIVE, METADATA)
+
+        self.assertTrue(reference.startswith(f'{registry}/app:1.0.0_build@sha256:'))
+        self.assertEqual(len(server.blobs), 2)
+        self.assertEqual(server.manifests, 1)
+
+    def test_existing_blobs_are_not_uploaded_again(self):
+        server, registry = self.start_registry()
+
+        with OCIRegistryClient(plain_http=True) as client:
+            client.push_chart(registry, 'app', '1.0.0', ARCHIVE, METADATA)
+            server.requests.clear()
+            client.push_chart(registry, 'app', '1.0.1', ARCHIVE, METADATA)
+
+        methods = [method for method, path in server.requests]
+        self.assertEqual(methods, ['HEAD', 'HEAD', 'PUT'])
+        self.assertIn('/manifests/1.0.1', server.requests[-1][1])
+
+    def test_token_authentication(self):
+        server, registry = self.start_registry(token='secret-token', username='user', password='password')
+
+        with OCIRegistryClient('user', 'password', plain_http=True) as client:
+            client.push_chart(registry, 'app', '1.0.0', ARCHIVE, METADATA)
+            client.push_chart(registry, 'app', '1.0.1', ARCHIVE, METADATA)
+
+        # The token is only requested once (for the repository's scope) and reused
+        token_requests = [path for method, path in server.requests if path.startswith('/token')]
+        self.assertEqual(len(token_requests), 1)
+        self.assertIn('scope=repository%3Acharts%2Fapp%3Apull%2Cpush', token_requests[0])
+        self.assertEqual(server.manifests, 2)
+
+    def test_wrong_credentials(self):
+        server, registry = self.start_registry(token='secret-token', username='user', password='password')
+
+        with OCIRegistryClient('user', 'wrong', plain_http=True) as client:
+            with self.assertRaisesRegex(Exception, r'Failed to authenticate .* \(401\): invalid credentials'):
+                client.push_chart(registry, 'app', '1.0.0', ARCHIVE, METADATA)
+
+        self.assertEqual(server.blobs, set())
+        self.assertEqual(server.manifests, 0)
+
+    def test_rejected_manifest(self):
+        server, registry = self.start_registry(manifest_status=400)
+
+        with OCIRegistryClient(plain_http=True) as client:
+            with self.assertRaisesRegex(Exception, r'Failed to push the manifest charts/app:1.0.0 .* \(400\): manifest rejected'):
+                client.push_chart(registry, 'app', '1.0.0', ARCHIVE, METADATA)
+
+    def test_unreachable_registry(self):
+        with OCIRegistryClient(plain_http=True, timeout=5) as client:
+            with self.assertRaises(ConnectionRefusedError):
+                client.push_chart(f'127.0.0.1:{get_free_port()}/charts', 'app', '1.0.0', ARCHIVE, METADATA)
+
+class CLIPushTest (unittest.TestCase):
+    def test_failed_push_exits_with_an_error(self):
+        with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'input.example.json'), 'r') as f:
+            data = json.load(f)
+
+        data['chart']['name'] = 'app'
+        data['registry'] = f'127.0.0.1:{get_free_port()}/charts'
+
+        with tempfile.TemporaryDirectory() as directory:
+            input_file = os.path.join(directory, 'input.json')
+            with open(input_file, 'w') as f:
+                json.dump(data, f)
+
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                code = main(['--input', input_file, '--output', os.path.join(directory, 'chart'), '--plain-http'])
+
+        self.assertEqual(code, 1)
+        self.assertIn('Push to the registry failed', output.getvalue())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import asyncio, functools, unittest
+
+from benchmarks.fake_registry import start_fake_registry
+from src.OCIRegistryClient import OCIRegistryClient
+from src.PublishQueue import PublishQueue
+
+ARCHIVE = b'not really a chart, the fake registry never checks'
+METADATA = { 'apiVersion': 'v2', 'name': 'app', 'version': '1.0.0' }
+
+class PublishQueueRetryTest (unittest.TestCase):
+    def publish(self, retries: int = 2, **options):
+        server = start_fake_registry(**options)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        async def run():
+            async with PublishQueue(retries=retries, backoff=0.0, client_factory=functools.partial(OCIRegistryClient, plain_http=True)) as queue:
+                queue.submit('app', f'127.0.0.1:{server.server_address[1]}/charts', 'app', '1.0.0', ARCHIVE, METADATA)
+            return queue.results
+
+        [result] = asyncio.run(run())
+        return server, result
+
+    def test_server_errors_are_retried(self):
+        server, result = self.publish(manifest_status=503)
+
+        self.assertFalse(result.success)
+        self.assertEqual(result.attempts, 3)
+        self.assertEqual(server.manifests, 3)
+
+    def test_rate_limiting_is_retried(self):
+        server, result = self.publish(manifest_status=429)
+
+        self.assertEqual(result.attempts, 3)
+
+    def test_client_errors_are_not_retried(self):
+        for status in [400, 401, 403]:
+            with self.subTest(status=status):
+                server, result = self.publish(manifest_status=status)
+
+                self.assertFalse(result.success)
+                self.assertEqual(result.attempts, 1)
+                self.assertEqual(server.manifests, 1)
+                self.assertIn(f'({status})', result.error)
+
+    def test_wrong_credentials_are_not_retried(self):
+        server, result = self.publish(token='secret-token')
+
+        self.assertFalse(result.success)
+        self.assertEqual(result.attempts, 1)
+        self.assertEqual(len([path for method, path in server.requests if path.startswith('/token')]), 1)
+
+if __name__ == '__main__':
+    unittest.main()
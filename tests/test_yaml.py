@@ -0,0 +1,61 @@
+import unittest
+
+from src.YAML import Mapping, Sequence, dump, load
+
+# Strings that YAML would read as something other than the same string if they were written as is
+AMBIGUOUS_STRINGS = [
+    '- x',
+    '-',
+    '-x',
+    '--flag',
+    'p4ss:',
+    'key: value',
+    'a #comment',
+    'line one\nline two',
+    'tab\tseparated',
+    'carriage\rreturn',
+    'bell\x07',
+    '2024-01-01',
+    '2024-1-1',
+    '2024-01-01T10:00:00Z',
+    '2024-01-01 10:00:00',
+    'true',
+    'no',
+    'null',
+    '~',
+    '1.5',
+    '0x1F',
+    '',
+    ' padded ',
+    '"quoted"',
+    'back\\slash',
+    '#hash',
+    '*alias',
+    '[list]',
+    '{map}'
+]
+
+class YAMLRoundTripTest (unittest.TestCase):
+    def test_mapping_values(self):
+        for value in AMBIGUOUS_STRINGS:
+            with self.subTest(value=value):
+                self.assertEqual(load(dump(Mapping({ 'key': value }))), { 'key': value })
+
+    def test_sequence_items(self):
+        for value in AMBIGUOUS_STRINGS:
+            with self.subTest(value=value):
+                self.assertEqual(load(dump(Mapping({ 'items': Sequence([value]) }))), { 'items': [value] })
+
+    def test_nested_environment_overlay(self):
+        # Ex. the values overlay of an environment that overrides the hostname and a password
+        values = { 'ingress': { 'hostname': '- x' }, 'database': { 'password': 'p4ss:', 'created': '2024-01-01' } }
+
+        self.assertEqual(load(dump(Mapping(values))), values)
+
+    def test_plain_strings_stay_unquoted(self):
+        self.assertEqual(dump(Mapping({ 'key': 'example.com' })).strip(), 'key: example.com')
+        self.assertEqual(dump(Mapping({ 'key': 'a-b' })).strip(), 'key: a-b')
+        self.assertEqual(dump(Mapping({ 'key': '2024' })).strip(), 'key: "2024"')
+
+if __name__ == '__main__':
+    unittest.main()